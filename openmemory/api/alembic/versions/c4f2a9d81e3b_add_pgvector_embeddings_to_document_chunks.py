@@ -0,0 +1,46 @@
+"""add pgvector embeddings to document chunks
+
+Revision ID: c4f2a9d81e3b
+Revises: 49aad20c1d17
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f2a9d81e3b'
+down_revision: Union[str, None] = '49aad20c1d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+
+    # The float[] column was never populated, so it is replaced rather than cast
+    op.execute("""
+        ALTER TABLE document_chunks
+        ALTER COLUMN embedding TYPE vector(1536) USING NULL
+    """)
+
+    # HNSW (cosine) index for semantic chunk search; built concurrently so
+    # chunk writes are not blocked on large tables
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_document_chunks_embedding_hnsw
+            ON document_chunks
+            USING hnsw (embedding vector_cosine_ops)
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_document_chunks_embedding_hnsw")
+    op.execute("""
+        ALTER TABLE document_chunks
+        ALTER COLUMN embedding TYPE double precision[] USING NULL
+    """)
@@ -0,0 +1,48 @@
+"""add stored tsvector to document chunks
+
+Revision ID: d7a3e5b2f901
+Revises: c4f2a9d81e3b
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3e5b2f901'
+down_revision: Union[str, None] = 'c4f2a9d81e3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Stored so searches do not re-run to_tsvector over every matching chunk
+    # to rank it (the expression index could only be used for the match)
+    op.execute("""
+        ALTER TABLE document_chunks
+        ADD COLUMN IF NOT EXISTS content_tsv tsvector
+        GENERATED ALWAYS AS (to_tsvector('english', content)) STORED
+    """)
+
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_document_chunks_content_tsv
+            ON document_chunks
+            USING gin (content_tsv)
+        """)
+        # Superseded by the index on the stored column
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_document_chunks_content_fts")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_document_chunks_content_fts
+            ON document_chunks
+            USING gin(to_tsvector('english', content))
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_document_chunks_content_tsv")
+    op.execute("ALTER TABLE document_chunks DROP COLUMN IF EXISTS content_tsv")
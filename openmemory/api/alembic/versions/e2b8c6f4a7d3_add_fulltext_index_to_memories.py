@@ -0,0 +1,34 @@
+"""add fulltext search index to memories
+
+Revision ID: e2b8c6f4a7d3
+Revises: d7a3e5b2f901
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b8c6f4a7d3'
+down_revision: Union[str, None] = 'd7a3e5b2f901'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Lexical retriever of hybrid search. An expression index rather than a stored
+    # column: memories is large and adding a generated column would rewrite it
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_memories_content_fts
+            ON memories
+            USING gin (to_tsvector('english', content))
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_memories_content_fts")
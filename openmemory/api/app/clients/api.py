@@ -35,6 +35,12 @@ class APIProfile(BaseClientProfile):
                 "inputSchema": {"type": "object", "properties": {"text": {"type": "string", "description": "The information to store"}, "tags": {"type": "array", "items": {"type": "string"}, "description": "Optional list of tags"}}, "required": ["text"]},
                 "annotations": {"readOnly": False, "sensitive": True, "destructive": False}
             },
+            {
+                "name": "add_memories_bulk",
+                "description": "Store many pieces of information in one call (imports, backfills, lists of facts). Much faster than calling add_memories repeatedly.",
+                "inputSchema": {"type": "object", "properties": {"texts": {"type": "array", "items": {"type": "string"}, "description": "The pieces of information to store"}, "tags": {"type": "array", "items": {"type": "string"}, "description": "Optional list of tags applied to every memory"}}, "required": ["texts"]},
+                "annotations": {"readOnly": False, "sensitive": True, "destructive": False}
+            },
             {
                 "name": "store_document",
                 "description": "📄 LARGE DOCUMENT storage. Store entire markdown files, code files, essays, documentation, or any large text content. Perfect for preserving complete documents that you want to reference later. Creates searchable summaries automatically.",
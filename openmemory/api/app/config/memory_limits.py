@@ -48,6 +48,9 @@ class MemoryLimits(BaseModel):
     sync_batch_delay_seconds: int = 0.5  # Shorter delay (was 2)
     sync_max_post_size: int = 200000  # Allow larger posts up to 200KB (was 50KB)
     
+    # Bulk ingestion (add_memories_bulk tool and POST /memories/bulk)
+    bulk_add_max: int = 500  # Max memories per bulk request
+    
     @classmethod
     def get_defaults(cls) -> "MemoryLimits":
         """Get default memory limits"""
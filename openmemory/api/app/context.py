@@ -1,4 +1,5 @@
 import contextvars
+from typing import Optional
 from fastapi import BackgroundTasks
 
 # Centralized context variables to be used across different modules.
@@ -6,4 +7,6 @@ from fastapi import BackgroundTasks
 
 user_id_var: contextvars.ContextVar[str] = contextvars.ContextVar("supa_user_id")
 client_name_var: contextvars.ContextVar[str] = contextvars.ContextVar("client_name")
-background_tasks_var: contextvars.ContextVar["BackgroundTasks"] = contextvars.ContextVar("background_tasks") 
\ No newline at end of file
+background_tasks_var: contextvars.ContextVar["BackgroundTasks"] = contextvars.ContextVar("background_tasks")
+# MCP progress reporter for the current tools/call (None when the client can't receive progress)
+progress_reporter_var: contextvars.ContextVar[Optional["ProgressReporter"]] = contextvars.ContextVar("progress_reporter", default=None)
@@ -5,16 +5,59 @@ Handles initial setup for local development
 import logging
 from sqlalchemy.orm import Session
 from sqlalchemy import text
+from sqlalchemy.exc import CompileError
+from sqlalchemy.schema import CreateTable
+from pgvector.sqlalchemy import Vector
 from .database import engine, SessionLocal, Base
 from .models import User, App
 from .settings import config
 
 logger = logging.getLogger(__name__)
 
+def _ensure_vector_extension() -> bool:
+    """Create the pgvector extension if possible; returns whether it is installed"""
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+            conn.commit()
+        return True
+    except Exception as e:
+        logger.warning(f"Could not create the vector extension: {e}")
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'vector'")).first() is not None
+    except Exception:
+        return False
+
+
+def _creatable_tables():
+    """
+    Tables create_all can build on this database. Tables using types the
+    dialect can't render (e.g. TSVECTOR on SQLite) or vector columns without
+    the pgvector extension are left to the Alembic migrations.
+    """
+    has_vector = engine.dialect.name == "postgresql" and _ensure_vector_extension()
+    tables, skipped = [], []
+    for table in Base.metadata.sorted_tables:
+        if not has_vector and any(isinstance(column.type, Vector) for column in table.columns):
+            skipped.append(table.name)
+            continue
+        try:
+            CreateTable(table).compile(dialect=engine.dialect)
+        except CompileError:
+            skipped.append(table.name)
+            continue
+        tables.append(table)
+    if skipped:
+        logger.warning(f"Not creating tables unsupported by {engine.dialect.name} "
+                       f"(run the Alembic migrations on PostgreSQL with pgvector): {', '.join(skipped)}")
+    return tables
+
+
 def init_database():
     """Initialize the database with required extensions and base data"""
     logger.info("Ensuring all tables are created in the database...")
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=engine, tables=_creatable_tables())
     logger.info("Table check complete.")
 
     if config.is_local_development:
@@ -141,7 +141,7 @@ class NotionService:
             logger.info(f"Processing block type: {block_type}")
             
             # Handle blocks with rich_text property
-            if block_type in ["paragraph", "heading_1", "heading_2", "heading_3", "bulleted_list_item", "numbered_list_item", "toggle", "callout"]:
+            if block_type in ["paragraph", "bulleted_list_item", "numbered_list_item", "toggle", "callout"]:
                 rich_text = block.get(block_type, {}).get("rich_text", [])
                 for text_obj in rich_text:
                     if text_obj.get("type") == "text":
@@ -149,6 +149,16 @@ class NotionService:
                         if content.strip():
                             text_content.append(content)
             
+            # Headings keep their level as Markdown so documents can be chunked by section
+            elif block_type in ["heading_1", "heading_2", "heading_3"]:
+                rich_text = block.get(block_type, {}).get("rich_text", [])
+                heading = "".join(
+                    text_obj.get("text", {}).get("content", "")
+                    for text_obj in rich_text if text_obj.get("type") == "text"
+                ).strip()
+                if heading:
+                    text_content.append(f"{'#' * int(block_type[-1])} {heading}")
+            
             elif block_type == "quote":
                 rich_text = block.get("quote", {}).get("rich_text", [])
                 for text_obj in rich_text:
@@ -349,8 +349,8 @@ async def sync_substack_to_memory(
     Sync Substack posts to memory using Jean Memory V2.
     Adapts existing infrastructure to follow Twitter integration pattern.
     """
-    from app.models import Memory, App, User
-    from app.utils.memory import get_async_memory_client
+    from app.models import App, User
+    from app.services.memory_ingestion import BulkMemoryItem, ingest_memories_bulk
     from sqlalchemy.sql import exists
     from uuid import UUID
     import re
@@ -370,9 +370,6 @@ async def sync_substack_to_memory(
         if progress_callback:
             progress_callback(progress, message, count)
 
-    # Get Jean Memory V2 client
-    memory_client = await get_async_memory_client()
-    
     # Validate and extract username from URL
     normalized_url = SubstackService.normalize_substack_url(substack_url)
     username = SubstackService.extract_username_from_url(normalized_url)
@@ -453,95 +450,43 @@ async def sync_substack_to_memory(
                 
             memory_contents.append(memory_text)
         
-        # Store posts using memory client - following Twitter pattern exactly
-        synced_count = 0
-        failed_count = 0
-        
-        # Process posts in smaller batches (posts are longer than tweets)
-        batch_size = 3  # Process 3 posts at a time
-        
-        for i in range(0, len(memory_contents), batch_size):
-            batch = memory_contents[i:i + batch_size]
-            logger.info(f"Processing batch {i//batch_size + 1}/{(len(memory_contents) + batch_size - 1)//batch_size} ({len(batch)} posts)")
-            
-            for j, content in enumerate(batch):
-                try:
-                    post_index = i + j
-                    logger.debug(f"Adding post {post_index+1} to memory: {posts[post_index].title}")
-                    
-                    # Create memory metadata - following Twitter pattern
-                    memory_metadata = {
-                        'source': 'substack',
-                        'source_app': 'substack',
-                        'username': username,
-                        'type': 'post',
-                        'post_index': post_index,
-                        'post_data': {
-                            'title': posts[post_index].title,
-                            'url': posts[post_index].url,
-                            'date': posts[post_index].date.isoformat() if posts[post_index].date else None
-                        }
-                    }
-                    
-                    # Create database record - following Twitter pattern
-                    db_memory = Memory(
-                        user_id=safe_uuid(user_id),
-                        app_id=safe_uuid(app_id),
-                        content=content,
-                        metadata_=memory_metadata
-                    )
-                    db_session.add(db_memory)
-                    db_session.flush()  # Get the ID without committing
-                    
-                    # Add to vector store using Jean Memory V2 async client - EXACTLY like Twitter
-                    try:
-                        response = await memory_client.add(
-                            messages=content,
-                            user_id=user_id,  # This should be the Supabase user ID
-                            metadata={
-                                **memory_metadata,
-                                'db_memory_id': str(db_memory.id),  # Link to database record
-                                'app_id': app_id,
-                                'app_db_id': app_id
-                            }
-                        )
-                    except Exception as mem_error:
-                        logger.warning(f"Failed to add to Jean Memory V2: {mem_error}. Continuing with database storage only.")
-                        response = None
-                    
-                    logger.debug(f"Memory client response: {response}")
-                    synced_count += 1
-                    
-                    # Small delay to prevent overwhelming the system
-                    await asyncio.sleep(0.2)
-                    
-                except Exception as e:
-                    logger.error(f"Failed to add post {post_index+1} to memory: {e}")
-                    failed_count += 1
-                    db_session.rollback()
-                    continue
-            
-            # Commit the batch - following Twitter pattern
-            try:
-                db_session.commit()
-                logger.info(f"Committed batch {i//batch_size + 1} to database")
-                
-                # Update progress after each successful batch
-                batch_progress = 20 + int(((i + len(batch)) / len(memory_contents)) * 70)
-                report_progress(batch_progress, f"Synced batch {i//batch_size + 1}", synced_count)
-                
-            except Exception as e:
-                logger.error(f"Failed to commit batch: {e}")
-                db_session.rollback()
-                failed_count += len(batch)
-                synced_count -= len(batch)
-            
-            # Longer delay between batches (posts are more substantial than tweets)
-            if i + batch_size < len(memory_contents):
-                logger.info(f"Batch complete. Waiting 3 seconds before next batch...")
-                await asyncio.sleep(3)
+        # Store all posts with one batched ingestion instead of one engine call per post
+        items = [
+            BulkMemoryItem(
+                content=content,
+                metadata={
+                    'source': 'substack',
+                    'source_app': 'substack',
+                    'username': username,
+                    'type': 'post',
+                    'post_index': post_index,
+                    'post_data': {
+                        'title': post.title,
+                        'url': post.url,
+                        'date': post.date.isoformat() if post.date else None
+                    },
+                    'app_id': app_id
+                }
+            )
+            for post_index, (post, content) in enumerate(zip(posts, memory_contents))
+        ]
+
+        def on_ingest_progress(done: int, total: int):
+            report_progress(20 + int(done / total * 70), f"Synced {done}/{total} posts", done)
+
+        result = await ingest_memories_bulk(
+            db_session, user_uuid, app_uuid, user_id, items,
+            progress_callback=on_ingest_progress
+        )
+        synced_count = result["added"]
+        if result["skipped"]:
+            logger.info(f"Skipped {result['skipped']} posts with nothing memorable to store "
+                        f"(indices {result['skipped_indices'][:20]})")
+        if result["failed"]:
+            logger.warning(f"Failed to sync {result['failed']} Substack posts: {result['errors'][:3]}")
         
-        report_progress(100, f"Sync complete. Added {synced_count} new posts.", synced_count)
+        skipped_note = f" Skipped {result['skipped']} with nothing to remember." if result["skipped"] else ""
+        report_progress(100, f"Sync complete. Added {synced_count} new posts.{skipped_note}", synced_count)
         return synced_count
         
     except Exception as e:
@@ -202,8 +202,8 @@ async def sync_twitter_to_memory(
     Sync a Twitter user's recent tweets to memory.
     This can be called from an API endpoint or MCP tool.
     """
-    from app.models import Memory, App, User
-    from app.utils.memory import get_memory_client
+    from app.models import App, User
+    from app.services.memory_ingestion import BulkMemoryItem, ingest_memories_bulk
     from sqlalchemy.sql import exists
     from uuid import UUID
     
@@ -223,7 +223,6 @@ async def sync_twitter_to_memory(
             progress_callback(progress, message, count)
 
     service = TwitterService()
-    memory_client = get_memory_client()
     
     # For local development, ensure the user and app exist
     user_uuid = safe_uuid(user_id)
@@ -275,81 +274,39 @@ async def sync_twitter_to_memory(
         
         memory_contents = service.format_tweets_for_memory(tweets, username)
         
-        # Store tweets using memory client (which handles vector embeddings)
-        synced_count = 0
-        failed_count = 0
-        
-        # Process tweets in smaller batches to prevent resource exhaustion
-        batch_size = 5  # Process 5 tweets at a time
-        
-        for i in range(0, len(memory_contents), batch_size):
-            batch = memory_contents[i:i + batch_size]
-            logger.info(f"Processing batch {i//batch_size + 1}/{(len(memory_contents) + batch_size - 1)//batch_size} ({len(batch)} tweets)")
-            
-            for j, content in enumerate(batch):
-                try:
-                    logger.debug(f"Adding tweet {i+j+1} to memory: {content[:50]}...")
-                    
-                    # Create memory in database first
-                    memory_metadata = {
-                        'source': 'twitter',
-                        'source_app': 'twitter',
-                        'username': username,
-                        'type': 'tweet',
-                        'tweet_index': i + j,
-                        'tweet_data': tweets[i + j] if i + j < len(tweets) else {}
-                    }
-                    
-                    # Create database record
-                    db_memory = Memory(
-                        user_id=safe_uuid(user_id),
-                        app_id=safe_uuid(app_id),
-                        content=content,
-                        metadata_=memory_metadata
-                    )
-                    db_session.add(db_memory)
-                    db_session.flush()  # Get the ID without committing
-                    
-                    # Add to vector store using mem0 client with the database ID
-                    response = memory_client.add(
-                        messages=content,
-                        user_id=user_id,  # This should be the Supabase user ID
-                        metadata={
-                            **memory_metadata,
-                            'db_memory_id': str(db_memory.id),  # Link to database record
-                            'app_id': app_id,
-                            'app_db_id': app_id
-                        }
-                    )
-                    
-                    logger.debug(f"Memory client response: {response}")
-                    synced_count += 1
-                    
-                    # Small delay to prevent overwhelming the system
-                    await asyncio.sleep(0.1)
-                    
-                except Exception as e:
-                    logger.error(f"Failed to add tweet {i+j+1} to memory: {e}")
-                    failed_count += 1
-                    db_session.rollback()
-                    continue
-            
-            # Commit the batch
-            try:
-                db_session.commit()
-                logger.info(f"Committed batch {i//batch_size + 1} to database")
-            except Exception as e:
-                logger.error(f"Failed to commit batch: {e}")
-                db_session.rollback()
-                failed_count += len(batch)
-                synced_count -= len(batch)
-            
-            # Longer delay between batches
-            if i + batch_size < len(memory_contents):
-                logger.info(f"Batch complete. Waiting 2 seconds before next batch...")
-                await asyncio.sleep(2)
+        # Store all tweets with one batched ingestion instead of one engine call per tweet
+        items = [
+            BulkMemoryItem(
+                content=content,
+                metadata={
+                    'source': 'twitter',
+                    'source_app': 'twitter',
+                    'username': username,
+                    'type': 'tweet',
+                    'tweet_index': i,
+                    'tweet_data': tweets[i] if i < len(tweets) else {},
+                    'app_id': app_id
+                }
+            )
+            for i, content in enumerate(memory_contents)
+        ]
+
+        def on_ingest_progress(done: int, total: int):
+            report_progress(50 + int(done / total * 45), f"Synced {done}/{total} tweets", done)
+
+        result = await ingest_memories_bulk(
+            db_session, user_uuid, app_uuid, user_id, items,
+            progress_callback=on_ingest_progress
+        )
+        synced_count = result["added"]
+        if result["skipped"]:
+            logger.info(f"Skipped {result['skipped']} tweets with nothing memorable to store "
+                        f"(indices {result['skipped_indices'][:20]})")
+        if result["failed"]:
+            logger.warning(f"Failed to sync {result['failed']} tweets: {result['errors'][:3]}")
         
-        report_progress(100, f"Sync complete. Added {synced_count} new tweets.", synced_count)
+        skipped_note = f" Skipped {result['skipped']} with nothing to remember." if result["skipped"] else ""
+        report_progress(100, f"Sync complete. Added {synced_count} new tweets.{skipped_note}", synced_count)
         return synced_count
         
     except Exception as e:
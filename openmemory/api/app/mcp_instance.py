@@ -21,6 +21,7 @@ def register_all_tools():
         memory.search_memory = mcp.tool(description="⚠️ USE jean_memory INSTEAD - Direct memory search that bypasses intelligent orchestration.")(memory.search_memory)
         memory.search_memory_v2 = mcp.tool(description="⚠️ USE jean_memory INSTEAD - Direct memory search that bypasses intelligent orchestration.")(memory.search_memory_v2)
         memory.add_memories = mcp.tool(description="Add new memories to the user's memory")(memory.add_memories)
+        memory.add_memories_bulk = mcp.tool(description="Add many memories at once (imports, lists of facts)")(memory.add_memories_bulk)
         memory.add_observation = mcp.tool(description="Add an observation or factual statement to memory")(memory.add_observation)
         memory.list_memories = mcp.tool(description="List all memories for the user")(memory.list_memories)
         memory.delete_all_memories = mcp.tool(description="Delete all memories for the user (requires confirmation)")(memory.delete_all_memories)
@@ -10,19 +10,27 @@ import logging
 import time
 import re
 from typing import Dict, List, Optional, Tuple, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
 from fastapi import BackgroundTasks
 import functools
 from app.database import SessionLocal
+from app.settings import config
 
 
 
-from app.models import Memory, MemoryState, UserNarrative
+from sqlalchemy import func
+
+from app.models import Memory, MemoryState, User, UserNarrative
+from app.services.narrative_jobs import NarrativeJobQueue
 from app.utils.db import get_user_and_app
 from app.utils.mcp_modules.cache_manager import ContextCacheManager
+from app.utils.mcp_modules.context_packing import pack_memories
 from app.utils.mcp_modules.ai_service import MCPAIService
 from app.utils.mcp_modules.background_tasks import MCPBackgroundTaskHandler
 from app.utils.mcp_modules.memory_analysis import MemoryAnalyzer
+from app.utils.mcp_modules.narrative_cache import NarrativeCache, NarrativeEntry
+from app.utils.mcp_modules.progress_stream import HeldProgressReporter, start_with_held_progress
+from app.utils.mcp_modules.single_flight import get_orchestration_single_flight, make_interaction_id
 from app.tools.memory import ask_memory # Import ask_memory
 
 logger = logging.getLogger(__name__)
@@ -45,6 +53,19 @@ class SmartContextOrchestrator:
         
         # Content-based deduplication to prevent saving identical memory content
         self._saved_content_hashes = set()
+        
+        # Speculative default retrieval outcomes in standard orchestration
+        self._speculation_stats = {"used": 0, "discarded": 0}
+        
+        # In-process narrative tier in front of user_narratives, and background refreshes
+        self.narrative_cache = NarrativeCache(config.NARRATIVE_CACHE_SIZE, config.NARRATIVE_REVALIDATE_SECONDS)
+        self._narrative_refreshes: Dict[str, float] = {}
+        self.narrative_jobs = NarrativeJobQueue(
+            generate=self._generate_narrative_job,
+            save=self._save_narrative_to_cache,
+            workers=config.NARRATIVE_JOB_WORKERS,
+            max_retries=config.NARRATIVE_JOB_MAX_RETRIES
+        )
 
     async def _add_memory_with_content_deduplication(self, content: str, user_id: str, client_name: str, priority: bool = False):
         """
@@ -77,31 +98,43 @@ class SmartContextOrchestrator:
     def _get_tools(self):
         if self._tools_cache is None:
             from app.tools.memory import (
-                add_memories, search_memory, list_memories, 
-                ask_memory
+                add_memories, search_memory, search_memory_batch,
+                list_memories, ask_memory
             )
             from app.tools.documents import deep_memory_query
             self._tools_cache = {
                 'add_memories': add_memories,
                 'search_memory': search_memory,
+                'search_memory_batch': search_memory_batch,
                 'list_memories': list_memories,
                 'ask_memory': ask_memory,
                 'deep_memory_query': deep_memory_query
             }
         return self._tools_cache
     
+    async def _search_many(self, queries: List[str], limit: int, with_vectors: bool = False) -> List[List[Dict]]:
+        """
+        Run several memory searches as one batch (one embedding request, one Qdrant query).
+        Returns one list of memory dicts per query; failures yield empty lists.
+        """
+        try:
+            return await self._get_tools()['search_memory_batch'](queries, limit=limit, with_vectors=with_vectors)
+        except Exception as e:
+            logger.error(f"Batch search failed for {len(queries)} queries: {e}")
+            return [[] for _ in queries]
+    
     def _get_gemini(self):
         if self._gemini_service is None:
             from app.utils.gemini import GeminiService
             self._gemini_service = GeminiService()
         return self._gemini_service
     
-    async def _ai_create_context_plan(self, user_message: str) -> Dict:
+    async def _ai_create_context_plan(self, user_message: str, interaction_id: str = None) -> Dict:
         """
         Uses AI to create a comprehensive context engineering plan for continuing conversations.
         This is the core "brain" of the orchestrator - implementing top-down context theory.
         """
-        return await self.ai_service.create_context_plan(user_message)
+        return await self.ai_service.create_context_plan(user_message, interaction_id)
 
     def _get_fallback_plan(self, user_message: str) -> Dict:
         """Fast fallback when AI planning fails or times out"""
@@ -178,54 +211,25 @@ class SmartContextOrchestrator:
         
         analysis_start_time = time.time()
         logger.info(f"⚡ [Fast Deep] Starting fast deep analysis for user {user_id}")
+        memory_list = []
         
         try:
             # 1. Get comprehensive memory context (faster than documents)
             memory_search_start = time.time()
-            
-            # Multiple targeted searches for rich context
-            search_queries = [
-                "personal background values personality traits",
-                "work projects technical expertise professional",
-                "current goals interests preferences habits",
-                "important experiences thoughts insights"
-            ]
-            
-            tasks = [self._get_tools()['search_memory'](query=query, limit=50) for query in search_queries]
-            search_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Collect unique memories
-            all_memories = {}
-            for query, result in zip(search_queries, search_results):
-                if isinstance(result, Exception):
-                    logger.warning(f"Search failed for '{query}': {result}")
-                    continue
-                    
-                try:
-                    memories = json.loads(result)
-                    for mem in memories:
-                        if isinstance(mem, dict):
-                            memory_id = mem.get('id')
-                            memory_content = mem.get('memory', mem.get('content', ''))
-                            if memory_id and memory_content and memory_id not in all_memories:
-                                all_memories[memory_id] = memory_content
-                except (json.JSONDecodeError, TypeError):
-                    logger.warning(f"Failed to parse search result for '{query}'")
-            
+            memory_count, memory_list = await self._get_fast_deep_memories(user_id)
             memory_search_time = time.time() - memory_search_start
-            logger.info(f"⚡ [Fast Deep] Memory search completed in {memory_search_time:.2f}s. Found {len(all_memories)} unique memories.")
+            logger.info(f"⚡ [Fast Deep] Memory search completed in {memory_search_time:.2f}s. Found {memory_count} unique memories.")
             
             # 2. Use Gemini Flash for intelligent synthesis
             gemini_start_time = time.time()
             gemini_service = GeminiService()
             
             # Check if we have sufficient memories to generate a narrative
-            memory_list = list(all_memories.values())
-            if len(memory_list) < 3:
-                logger.warning(f"⚡ [Fast Deep] Insufficient memories ({len(memory_list)}) for user {user_id}. Cannot generate life narrative.")
+            if memory_count < 3:
+                logger.warning(f"⚡ [Fast Deep] Insufficient memories ({memory_count}) for user {user_id}. Cannot generate life narrative.")
                 return "I don't have enough context about you yet. Please continue our conversation so I can learn more about you."
             
-            memories_text = "\n".join([f"• {mem}" for mem in memory_list[:20]])  # Limit for speed
+            memories_text = "\n".join([f"• {mem}" for mem in memory_list])
             
             # Optimized prompt for conversation instantiation
             prompt = f"""You are providing context for a conversation with this user. Analyze their memories and create a rich understanding.
@@ -255,12 +259,52 @@ Provide rich context that helps understand them deeply, but keep it conversation
         except Exception as e:
             logger.error(f"⚡ [Fast Deep] Error in fast deep analysis: {e}")
             # Fallback to basic memory context
-            memory_list = list(all_memories.values()) if 'all_memories' in locals() else []
             if memory_list:
                 return f"Key context about this user:\n" + "\n".join([f"• {mem}" for mem in memory_list[:8]])
             else:
                 return "Unable to retrieve context at this time."
 
+    async def _get_fast_deep_memories(self, user_id: str) -> Tuple[int, List[str]]:
+        """
+        Retrieve and pack the user's broad memory context for fast deep analysis.
+        The queries don't depend on the message, so the packed result is kept in
+        the context cache until it expires or the user's memories change.
+        Returns the number of unique memories found and the packed texts.
+        """
+        cache_key = f"fast_deep_memories:{user_id}"
+        cached = self._get_cached_context(cache_key)
+        if cached is not None:
+            context_data = cached['context_data']
+            logger.info(f"⚡ [Fast Deep] Using cached memory context for user {user_id}")
+            return context_data['memory_count'], context_data['memories']
+
+        # Multiple targeted searches for rich context
+        search_queries = [
+            "personal background values personality traits",
+            "work projects technical expertise professional",
+            "current goals interests preferences habits",
+            "important experiences thoughts insights"
+        ]
+        
+        search_results = await self._search_many(
+            search_queries, limit=50, with_vectors=config.CONTEXT_PACK_USE_STORED_EMBEDDINGS
+        )
+        
+        # Collect unique memories, keeping each one's best score across queries
+        all_memories = {}
+        for memories in search_results:
+            for mem in memories:
+                memory_id = mem.get('id')
+                memory_content = mem.get('memory', mem.get('content', ''))
+                if not memory_id or not memory_content:
+                    continue
+                if memory_id not in all_memories or (mem.get('score') or 0) > (all_memories[memory_id].get('score') or 0):
+                    all_memories[memory_id] = mem
+        
+        memory_list = pack_memories(list(all_memories.values()), "gemini-2.5-flash") if len(all_memories) >= 3 else []
+        self._update_context_cache(cache_key, {"memory_count": len(all_memories), "memories": memory_list}, user_id)
+        return len(all_memories), memory_list
+
     async def _standard_orchestration(
         self, 
         user_message: str, 
@@ -276,10 +320,21 @@ Provide rich context that helps understand them deeply, but keep it conversation
         orchestration_start_time = time.time()
         logger.info(f"🔍 [Standard] Starting standard orchestration for user {user_id}")
         
+        # Speculatively start the default retrieval while the planner runs; every strategy
+        # except comprehensive_analysis uses it, so the plan is off the critical path
+        # Its progress notifications are held back until the plan picks it
+        speculative_task = speculative_progress = None
+        if config.SPECULATIVE_CONTEXT_RETRIEVAL:
+            speculative_task, speculative_progress = start_with_held_progress(
+                lambda: ask_memory(question=user_message)
+            )
+        
         try:
             # Step 1: Create plan for saving memory and determining context strategy
             plan_start_time = time.time()
-            plan = await self._ai_create_context_plan(user_message)
+            plan = await self._ai_create_context_plan(
+                user_message, interaction_id or make_interaction_id(user_id, user_message)
+            )
             logger.info(f"[PERF] AI Plan Creation took {time.time() - plan_start_time:.4f}s")
             
             # Extract strategy and handle new schema
@@ -289,7 +344,15 @@ Provide rich context that helps understand them deeply, but keep it conversation
             context_task = None
             if context_strategy == "comprehensive_analysis":
                 logger.info("🔬 [Standard] Executing comprehensive analysis with deep memory query (Level 4 - Maximum Depth).")
+                self._discard_speculative_retrieval(speculative_task, speculative_progress)
+                speculative_task = None
                 context_task = self._execute_deep_comprehensive_analysis(plan, user_message, user_id, client_name)
+            elif speculative_task is not None:
+                self._speculation_stats["used"] += 1
+                logger.info("⚡ [Standard] Using speculative 'ask_memory' retrieval started alongside planning.")
+                if speculative_progress is not None:
+                    await speculative_progress.release()
+                context_task, speculative_task = speculative_task, None
             else:
                 # --- FIX IMPLEMENTED ---
                 # Default to the reliable 'balanced' mode (ask_memory) for all other cases.
@@ -324,6 +387,19 @@ Provide rich context that helps understand them deeply, but keep it conversation
             logger.error(f"❌ [Standard] Error in standard orchestration: {e}", exc_info=True)
             # Return a meaningful fallback instead of empty string
             return f"I apologize, but I encountered an issue while retrieving your context. The system is experiencing some technical difficulties. Please try again in a moment."
+        finally:
+            # Only still set if the orchestration failed before consuming it
+            self._discard_speculative_retrieval(speculative_task, speculative_progress)
+
+    def _discard_speculative_retrieval(self, task: Optional[asyncio.Task], progress: Optional[HeldProgressReporter] = None):
+        """Cancel a speculative retrieval the plan didn't use, dropping its held progress"""
+        if task is None:
+            return
+        self._speculation_stats["discarded"] += 1
+        if progress is not None:
+            progress.close()
+        if not task.done():
+            task.cancel()
 
     async def _handle_background_memory_saving(
         self, 
@@ -450,10 +526,28 @@ Provide rich context that helps understand them deeply, but keep it conversation
         - Narrative Cache: Check for cached user narrative ONLY for new conversations
         - Deep Memory Analysis: For new conversations when no cache exists
         - Standard Orchestration: For continuing conversations (5-10s, targeted)
+        
+        Identical concurrent calls (client retries) are coalesced by interaction ID
+        and share one computation.
         """
         # Generate unique interaction ID for deduplication
-        import hashlib
-        interaction_id = f"{user_id}_{hashlib.md5(user_message.encode()).hexdigest()}"
+        interaction_id = make_interaction_id(user_id, user_message)
+        return await get_orchestration_single_flight().run(
+            f"orchestrate:{interaction_id}:{is_new_conversation}",
+            lambda: self._orchestrate_smart_context_impl(
+                user_message, user_id, client_name, is_new_conversation, background_tasks, interaction_id
+            )
+        )
+
+    async def _orchestrate_smart_context_impl(
+        self,
+        user_message: str,
+        user_id: str,
+        client_name: str,
+        is_new_conversation: bool,
+        background_tasks: BackgroundTasks,
+        interaction_id: str
+    ) -> str:
         system_prompt = "\n\n[SYSTEM PROMPT: Jean Memory provides context. Use it for every user message to maintain continuity and deeper understanding.]"
         
         logger.info(f"🚀 [Jean Memory] Enhanced orchestration started for user {user_id}. Interaction: {interaction_id}. New convo: {is_new_conversation}")
@@ -480,7 +574,7 @@ Provide rich context that helps understand them deeply, but keep it conversation
                     # Get memories for background narrative generation
                     memories = await self._get_user_memories(user_id, limit=50)
                     if memories:
-                        memories_text = "\n".join([f"• {mem}" for mem in memories[:25]])
+                        memories_text = "\n".join([f"• {mem}" for mem in pack_memories(memories, "gemini-2.5-pro")])
                         # Start background narrative generation with Pro model
                         await self._generate_and_cache_narrative(user_id, memories_text, background_tasks)
                         logger.info(f"🔄 [Smart Cache] Started background narrative generation for user {user_id}")
@@ -562,27 +656,18 @@ Provide rich context that helps understand them deeply, but keep it conversation
         # Let the AI decide what to search for, not hard-coded categories
         search_limit = 100  # Use Gemini's 1M+ token capacity for comprehensive understanding
         
-        # Execute AI-determined searches in parallel
-        tasks = [self._get_tools()['search_memory'](query=query, limit=search_limit) for query in search_queries]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Execute AI-determined searches as one batch
+        results = await self._search_many(search_queries, limit=search_limit)
         
         # Organize results based on what the AI found most relevant
         all_context = []
-        for query, result in zip(search_queries, results):
-            if isinstance(result, Exception):
-                logger.error(f"Error in AI-guided search '{query}': {result}")
-                continue
-                
-            try:
-                memories = json.loads(result)
-                for mem in memories:
-                    if isinstance(mem, dict):
-                        memory_content = mem.get('memory', mem.get('content', ''))
-                        if memory_content and memory_content not in all_context:
-                            all_context.append(memory_content)
-                        
-            except (json.JSONDecodeError, TypeError):
-                logger.warning(f"Could not parse AI-guided search result for '{query}': {result}")
+        seen_context = set()
+        for memories in results:
+            for mem in memories:
+                memory_content = mem.get('memory', mem.get('content', ''))
+                if memory_content and memory_content not in seen_context:
+                    seen_context.add(memory_content)
+                    all_context.append(memory_content)
         
         # Debug logging
         logger.info(f"📋 [Context Engineering] AI-guided primer collected {len(all_context)} context items")
@@ -610,28 +695,17 @@ Provide rich context that helps understand them deeply, but keep it conversation
         user_id_var.set(user_id)
         client_name_var.set(client_name)
         
-        # Execute comprehensive searches
-        tasks = [self._get_tools()['search_memory'](query=query, limit=comprehensive_limit) for query in search_queries]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Execute comprehensive searches as one batch
+        results = await self._search_many(search_queries, limit=comprehensive_limit)
         
         # Collect all unique memories for comprehensive view
         all_memories = {}
-        for query, result in zip(search_queries, results):
-            if isinstance(result, Exception):
-                logger.error(f"Error in comprehensive search '{query}': {result}")
-                continue
-                
-            try:
-                memories = json.loads(result)
-                for mem in memories:
-                    if isinstance(mem, dict):
-                        memory_id = mem.get('id', len(all_memories))
-                        memory_content = mem.get('memory', mem.get('content', ''))
-                        if memory_content and memory_id not in all_memories:
-                            all_memories[memory_id] = memory_content
-                        
-            except (json.JSONDecodeError, TypeError):
-                logger.warning(f"Could not parse comprehensive search result for '{query}': {result}")
+        for memories in results:
+            for mem in memories:
+                memory_id = mem.get('id', len(all_memories))
+                memory_content = mem.get('memory', mem.get('content', ''))
+                if memory_content and memory_id not in all_memories:
+                    all_memories[memory_id] = memory_content
         
         return {"comprehensive_memories": all_memories}
 
@@ -683,43 +757,17 @@ Provide rich context that helps understand them deeply, but keep it conversation
         user_id_var.set(user_id)
         client_name_var.set(client_name)
 
-        tasks = [self._get_tools()['search_memory'](query=q, limit=100) for q in search_queries]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results = await self._search_many(search_queries, limit=100)
 
         relevant_memories = {}
-        for query, result in zip(search_queries, results):
-            if isinstance(result, Exception):
-                logger.error(f"Error searching for '{query}': {result}")
-                continue
-            try:
-                # Parse the JSON response from the search tool
-                result_data = json.loads(result)
-                logger.debug(f"🔍 [Search] Parsed result for '{query}': {type(result_data)} with keys: {list(result_data.keys()) if isinstance(result_data, dict) else 'not a dict'}")
-                
-                # Check for error responses first
-                if isinstance(result_data, dict) and 'status' in result_data and result_data.get('status') == 'error':
-                    error_msg = result_data.get('error', 'unknown error')
-                    logger.warning(f"🔍 [Search] Search tool returned error for query '{query}': {error_msg}")
-                    continue
-                
-                # Extract memories from the structured response  
-                if isinstance(result_data, dict) and 'memories' in result_data:
-                    memories = result_data['memories']
-                    logger.debug(f"🔍 [Search] Found {len(memories)} memories for query '{query}'")
-                    for mem in memories:
-                        if isinstance(mem, dict):
-                            # Use memory ID as key to deduplicate
-                            memory_id = mem.get('id', len(relevant_memories))
-                            memory_content = mem.get('memory', mem.get('content', ''))
-                            if memory_content:  # Only add non-empty memories
-                                relevant_memories[memory_id] = memory_content
-                                logger.debug(f"🔍 [Search] Added memory {memory_id}: {memory_content[:50]}...")
-                else:
-                    logger.warning(f"🔍 [Search] Unexpected result structure for query '{query}': {type(result_data)} - {list(result_data.keys()) if isinstance(result_data, dict) else 'not a dict'}")
-                    logger.debug(f"🔍 [Search] Full result data: {result_data}")
-            except (json.JSONDecodeError, TypeError) as e:
-                logger.warning(f"🔍 [Search] Could not parse search result for query '{query}': {e}")
-                logger.debug(f"🔍 [Search] Raw result was: {result[:200]}...")
+        for query, memories in zip(search_queries, results):
+            logger.debug(f"🔍 [Search] Found {len(memories)} memories for query '{query}'")
+            for mem in memories:
+                # Use memory ID as key to deduplicate
+                memory_id = mem.get('id', len(relevant_memories))
+                memory_content = mem.get('memory', mem.get('content', ''))
+                if memory_content:  # Only add non-empty memories
+                    relevant_memories[memory_id] = memory_content
         
         logger.info(f"🔍 [Search] Found {len(relevant_memories)} relevant memories for user {user_id}")
         logger.debug(f"🔍 [Search] Memories: {list(relevant_memories.keys())}")
@@ -1026,39 +1074,11 @@ Provide rich context that helps understand them deeply, but keep it conversation
     
     def _get_cached_context(self, cache_key: str) -> Optional[Dict]:
         """Get cached context if it exists and is still valid"""
-        if cache_key not in _context_cache:
-            return None
-        
-        cached = _context_cache[cache_key]
-        cache_time = cached.get('timestamp')
-        if not cache_time:
-            return None
-        
-        # Check if cache is still valid
-        if datetime.now() - cache_time > timedelta(minutes=_cache_ttl_minutes):
-            del _context_cache[cache_key]
-            return None
-        
-        return cached
+        return self.cache_manager.get_cached_context(cache_key)
     
     def _update_context_cache(self, cache_key: str, context_data: Dict, user_id: str):
         """Update the session cache with new context data"""
-        try:
-            _context_cache[cache_key] = {
-                'timestamp': datetime.now(),
-                'user_id': user_id,
-                'context_data': context_data
-            }
-            
-            # Cleanup old cache entries (keep only 100 most recent)
-            if len(_context_cache) > 100:
-                oldest_keys = sorted(_context_cache.keys(), 
-                                   key=lambda k: _context_cache[k]['timestamp'])[:50]
-                for old_key in oldest_keys:
-                    del _context_cache[old_key]
-                    
-        except Exception as e:
-            logger.error(f"Error updating context cache: {e}")
+        self.cache_manager.update_context_cache(cache_key, context_data, user_id)
     
     async def _gather_planned_context(self, plan: Dict, user_id: str, client_name: str) -> Dict:
         """
@@ -1223,68 +1243,18 @@ Provide rich context that helps understand them deeply, but keep it conversation
             logger.error(f"Error processing memory intelligently: {e}")
             return {"error": str(e), "memory_added": False}
     
-    async def _ai_memory_analysis(self, user_message: str) -> Dict:
+    async def _ai_memory_analysis(self, user_message: str, user_id: str = None) -> Dict:
         """
-        Use Gemini 2.5 Flash to intelligently analyze if message contains memorable content.
+        Decide whether a message contains memorable content, using the message analysis
+        shared with the context planner (one Gemini call per interaction).
         Returns analysis with decision and extracted content.
         """
         try:
-            gemini = self._get_gemini()
-            
-            prompt = f"""Analyze this message to determine if it contains NEW PERSONAL INFORMATION worth remembering in a personal memory system.
-
-USER MESSAGE: "{user_message}"
-
-ONLY SAVE if the message contains NEW INFORMATION ABOUT THE USER:
-- Personal facts (name, job, location, background, physical attributes)
-- Preferences and opinions (likes, dislikes, beliefs, values)
-- Goals, plans, and aspirations
-- Important life events or experiences  
-- Skills, expertise, and knowledge areas
-- Relationships and connections
-- Explicit requests to remember something ("remember that I...")
-
-DO NOT SAVE these types of messages:
-- Questions asking for information ("What's my eye color?", "Where do I work?", "What do I like?")
-- Requests for help or assistance ("Help me with...", "Can you...")
-- General knowledge questions ("What is...", "How does...")
-- Casual conversation without new personal info ("Thanks", "OK", "That's cool")
-- Temporary states (current mood, today's weather)
-- Commands or instructions without personal context
-
-CRITICAL: If the message is asking ABOUT the user rather than TELLING you about the user, it should be SKIPPED.
-
-RESPONSE FORMAT:
-Decision: REMEMBER or SKIP
-Content: [If REMEMBER, extract the specific memorable information. If SKIP, explain why.]
-
-Example 1 - REMEMBER:
-User Message: "I have a blue shirt"
-Decision: REMEMBER
-Content: User owns a blue shirt
-
-Example 2 - SKIP:
-User Message: "What's my eye color?"
-Decision: SKIP
-Content: Question asking for information about user, contains no new personal information
-
-Example 3 - SKIP:
-User Message: "Help me write an email"
-Decision: SKIP
-Content: Request for assistance, no personal information provided
-"""
-            
-            response = await gemini.generate_response(prompt)
-            
-            result = response.strip()
+            interaction_id = make_interaction_id(user_id, user_message) if user_id else None
+            analysis = await self.ai_service.analyze_message(user_message, interaction_id)
             
-            # Parse the response
-            lines = result.split('\n')
-            decision_line = next((line for line in lines if line.startswith('Decision:')), '')
-            content_line = next((line for line in lines if line.startswith('Content:')), '')
-            
-            should_remember = 'REMEMBER' in decision_line.upper()
-            content = content_line.replace('Content:', '').strip() if content_line else user_message
+            should_remember = bool(analysis.get("should_save_memory"))
+            content = analysis.get("memorable_content") or (user_message if should_remember else "")
             
             logger.info(f"AI memory analysis: '{user_message[:30]}...' -> {'REMEMBER' if should_remember else 'SKIP'}")
             
@@ -1521,152 +1491,169 @@ User Message: "what time is it?"
 
     async def _get_cached_narrative(self, user_id: str) -> Optional[str]:
         """
-        Check for cached user narrative that's still fresh.
-        Returns narrative content if found and fresh, None otherwise.
+        Get the user's narrative from the two-tier cache (in-process LRU, then user_narratives).
+        Narratives older than NARRATIVE_TTL_DAYS are still served while a background refresh
+        runs (stale-while-revalidate), and a refresh also starts once enough new memories
+        have accumulated since generation. Returns None if the user has no narrative yet.
         """
         try:
-            db = SessionLocal()
-            try:
-                # Get user by user_id string
-                from app.models import User
-                user = db.query(User).filter(User.user_id == user_id).first()
-                if not user:
-                    logger.warning(f"User not found for user_id: {user_id}")
+            entry = self.narrative_cache.get(user_id)
+            if entry is None:
+                entry = self._load_narrative_entry(user_id)
+                if entry is None:
                     return None
-                
-                # Check for existing narrative
-                narrative = db.query(UserNarrative).filter(UserNarrative.user_id == user.id).first()
-                if not narrative:
-                    logger.info(f"📝 [Narrative Cache] No cached narrative found for user {user_id}")
-                    return None
-                
-                # Check if narrative is fresh (within TTL)
-                now = datetime.now(narrative.generated_at.tzinfo or datetime.timezone.utc)
-                age_days = (now - narrative.generated_at).days
-                
-                if age_days <= NARRATIVE_TTL_DAYS:
-                    logger.info(f"✅ [Narrative Cache] Found fresh narrative for user {user_id} (age: {age_days} days)")
-                    return narrative.narrative_content
-                else:
-                    logger.info(f"⏰ [Narrative Cache] Found stale narrative for user {user_id} (age: {age_days} days)")
-                    return None
-                    
-            finally:
-                db.close()
+            
+            regen_threshold = config.NARRATIVE_REGEN_MEMORY_THRESHOLD
+            if entry.content is None:
+                logger.info(f"📝 [Narrative Cache] No cached narrative found for user {user_id}")
+                if entry.new_memories >= regen_threshold:
+                    self._schedule_narrative_refresh(user_id, f"first narrative from {entry.new_memories} memories")
+                return None
+            
+            age_days = (datetime.now(timezone.utc) - entry.generated_at).days
+            if age_days > NARRATIVE_TTL_DAYS:
+                logger.info(f"⏰ [Narrative Cache] Serving stale narrative for user {user_id} (age: {age_days} days) while it refreshes")
+                self._schedule_narrative_refresh(user_id, f"{age_days} days old")
+            elif entry.new_memories >= regen_threshold:
+                logger.info(f"✅ [Narrative Cache] Found narrative for user {user_id}; {entry.new_memories} memories added since it was generated")
+                self._schedule_narrative_refresh(user_id, f"{entry.new_memories} new memories")
+            else:
+                logger.info(f"✅ [Narrative Cache] Found fresh narrative for user {user_id} (age: {age_days} days)")
+            return entry.content
+            
         except Exception as e:
             logger.error(f"❌ [Narrative Cache] Error checking cached narrative for user {user_id}: {e}")
             return None
     
+    def _load_narrative_entry(self, user_id: str) -> Optional[NarrativeEntry]:
+        """
+        Revalidate a user's cache entry against user_narratives. The narrative text is
+        only re-read when the row's version changed. Returns None for unknown users.
+        """
+        db = SessionLocal()
+        try:
+            row = db.query(User.id, UserNarrative.id, UserNarrative.version, UserNarrative.generated_at).outerjoin(
+                UserNarrative, UserNarrative.user_id == User.id
+            ).filter(User.user_id == user_id).first()
+            if row is None:
+                logger.warning(f"User not found for user_id: {user_id}")
+                return None
+            user_pk, narrative_id, version, generated_at = row
+            if generated_at is not None and generated_at.tzinfo is None:
+                generated_at = generated_at.replace(tzinfo=timezone.utc)
+            
+            content = None
+            cached = self.narrative_cache.peek(user_id)
+            if narrative_id is not None:
+                if cached and cached.content is not None and (cached.version, cached.generated_at) == (version, generated_at):
+                    content = cached.content
+                else:
+                    content = db.query(UserNarrative.narrative_content).filter(UserNarrative.id == narrative_id).scalar()
+                    self.narrative_cache.record_reload()
+            
+            # Active memories added since the narrative was generated (all of them if there is none)
+            memories_query = db.query(func.count(Memory.id)).filter(
+                Memory.user_id == user_pk,
+                Memory.state == MemoryState.active
+            )
+            if generated_at is not None:
+                memories_query = memories_query.filter(
+                    Memory.created_at > generated_at.astimezone(timezone.utc).replace(tzinfo=None)
+                )
+            
+            entry = NarrativeEntry(
+                content=content,
+                version=version,
+                generated_at=generated_at,
+                new_memories=memories_query.scalar() or 0,
+                checked_at=time.monotonic()
+            )
+            self.narrative_cache.put(user_id, entry)
+            return entry
+        finally:
+            db.close()
+    
+    def _schedule_narrative_refresh(self, user_id: str, reason: str):
+        """Regenerate a user's narrative in the background, at most once per revalidation period"""
+        last_attempt = self._narrative_refreshes.get(user_id)
+        if last_attempt is not None and time.monotonic() - last_attempt < config.NARRATIVE_REVALIDATE_SECONDS:
+            return
+        self._narrative_refreshes[user_id] = time.monotonic()
+        if len(self._narrative_refreshes) > config.NARRATIVE_CACHE_SIZE:
+            cutoff = time.monotonic() - config.NARRATIVE_REVALIDATE_SECONDS
+            self._narrative_refreshes = {k: t for k, t in self._narrative_refreshes.items() if t > cutoff}
+        
+        logger.info(f"🔄 [Narrative Cache] Refreshing narrative for user {user_id} in the background ({reason})")
+        self.narrative_jobs.enqueue(user_id)
+    
+    async def _generate_narrative_job(self, user_id: str, memories_text: Optional[str] = None) -> Optional[str]:
+        """
+        Narrative job body: Gemini Pro narrative from the given memories text, or from the
+        user's recent memories. Errors propagate so the job queue can retry.
+        """
+        if memories_text is None:
+            memories = await self._get_user_memories(user_id, limit=50)
+            if not memories:
+                return None
+            memories_text = "\n".join([f"• {mem}" for mem in pack_memories(memories, "gemini-2.5-pro")])
+        
+        logger.info(f"🤖 [Narrative Jobs] Calling Gemini 2.5 Pro for user {user_id} ({len(memories_text)} chars of memories)")
+        return await self._get_gemini().generate_narrative_pro(memories_text)
+    
     async def _save_narrative_to_cache(self, user_id: str, narrative_content: str):
         """
-        Save a narrative to the cache in the background.
-        This is called as a background task to avoid blocking the user.
+        Save a narrative to user_narratives and the in-process cache.
+        Called by the narrative job queue, which retries on failure.
         """
         try:
             db = SessionLocal()
             try:
                 # Get user by user_id string
-                from app.models import User
                 user = db.query(User).filter(User.user_id == user_id).first()
                 if not user:
                     logger.warning(f"Cannot save narrative - user not found for user_id: {user_id}")
                     return
                 
-                # Delete any existing narrative for this user
-                existing = db.query(UserNarrative).filter(UserNarrative.user_id == user.id).first()
-                if existing:
-                    db.delete(existing)
+                # Update in place and bump the version so other workers' caches revalidate
+                generated_at = datetime.now(timezone.utc)
+                narrative = db.query(UserNarrative).filter(UserNarrative.user_id == user.id).first()
+                if narrative:
+                    narrative.narrative_content = narrative_content
+                    narrative.generated_at = generated_at
+                    narrative.version = (narrative.version or 0) + 1
                     logger.info(f"Replaced existing narrative for user {user_id}")
-                
-                # Create new narrative
-                narrative = UserNarrative(
-                    user_id=user.id,
-                    narrative_content=narrative_content,
-                    generated_at=datetime.utcnow()
-                )
-                db.add(narrative)
+                else:
+                    narrative = UserNarrative(
+                        user_id=user.id,
+                        narrative_content=narrative_content,
+                        generated_at=generated_at,
+                        version=1
+                    )
+                    db.add(narrative)
                 db.commit()
-                logger.info(f"✅ Saved narrative to cache for user {user_id} (length: {len(narrative_content)} chars)")
+                
+                self.narrative_cache.put(user_id, NarrativeEntry(
+                    content=narrative_content,
+                    version=narrative.version,
+                    generated_at=generated_at,
+                    new_memories=0,
+                    checked_at=time.monotonic()
+                ))
+                logger.info(f"✅ Saved narrative to cache for user {user_id} (length: {len(narrative_content)} chars, version {narrative.version})")
             finally:
                 db.close()
         except Exception as e:
             logger.error(f"Failed to save narrative to cache for user {user_id}: {e}")
+            raise  # Let the narrative job queue retry
 
-    async def _generate_and_cache_narrative(self, user_id: str, memories_text: str, background_tasks: BackgroundTasks):
+    async def _generate_and_cache_narrative(self, user_id: str, memories_text: str, background_tasks: BackgroundTasks = None):
         """
-        Generate a new narrative using Gemini 2.5 Pro and cache it.
-        This is run as a background task for maximum quality without blocking the user.
-        Enhanced with comprehensive debugging for production troubleshooting.
+        Queue narrative generation with Gemini 2.5 Pro and caching for a user.
+        Runs on the narrative job queue (deduplicated per user, retried with backoff),
+        so the caller never waits; background_tasks is accepted for compatibility.
         """
-        def background_narrative_generation():
-            import traceback
-            task_start_time = datetime.utcnow()
-            logger.info(f"🤖 [Background Task] Starting narrative generation for user {user_id} at {task_start_time}")
-            
-            try:
-                # Enhanced logging for background task execution
-                logger.info(f"🔧 [Background Task] Setting up async event loop for user {user_id}")
-                
-                # Use async context for Gemini Pro generation
-                import asyncio
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                logger.info(f"✅ [Background Task] Event loop created successfully for user {user_id}")
-                
-                try:
-                    # Log memory text details
-                    memory_length = len(memories_text)
-                    logger.info(f"📊 [Background Task] Processing {memory_length} chars of memories for user {user_id}")
-                    
-                    # Generate high-quality narrative with Pro model
-                    logger.info(f"🤖 [Background Task] Calling Gemini 2.5 Pro API for user {user_id}")
-                    api_start_time = datetime.utcnow()
-                    
-                    narrative = loop.run_until_complete(
-                        self._get_gemini().generate_narrative_pro(memories_text)
-                    )
-                    
-                    api_end_time = datetime.utcnow()
-                    api_duration = (api_end_time - api_start_time).total_seconds()
-                    
-                    if narrative and narrative.strip():
-                        logger.info(f"✅ [Background Task] Gemini API successful for user {user_id} (duration: {api_duration:.2f}s, response length: {len(narrative)} chars)")
-                        
-                        # Save to cache
-                        logger.info(f"💾 [Background Task] Attempting to save narrative to database for user {user_id}")
-                        save_start_time = datetime.utcnow()
-                        
-                        loop.run_until_complete(
-                            self._save_narrative_to_cache(user_id, narrative)
-                        )
-                        
-                        save_end_time = datetime.utcnow()
-                        save_duration = (save_end_time - save_start_time).total_seconds()
-                        
-                        task_end_time = datetime.utcnow()
-                        total_duration = (task_end_time - task_start_time).total_seconds()
-                        
-                        logger.info(f"✅ [Background Task] Database save completed for user {user_id} (save duration: {save_duration:.2f}s)")
-                        logger.info(f"🎉 [Background Task] COMPLETED successfully for user {user_id} (total duration: {total_duration:.2f}s)")
-                    else:
-                        logger.error(f"❌ [Background Task] Gemini returned empty narrative for user {user_id} after {api_duration:.2f}s")
-                        
-                except Exception as inner_e:
-                    logger.error(f"💥 [Background Task] Inner exception for user {user_id}: {str(inner_e)}")
-                    logger.error(f"💥 [Background Task] Inner traceback for user {user_id}: {traceback.format_exc()}")
-                finally:
-                    logger.info(f"🔄 [Background Task] Closing event loop for user {user_id}")
-                    loop.close()
-                    
-            except Exception as e:
-                task_end_time = datetime.utcnow()
-                task_duration = (task_end_time - task_start_time).total_seconds()
-                logger.error(f"💥 [Background Task] FAILED for user {user_id} after {task_duration:.2f}s: {str(e)}")
-                logger.error(f"💥 [Background Task] Full traceback for user {user_id}: {traceback.format_exc()}")
-        
-        logger.info(f"🔄 [Smart Cache] Adding background task to queue for user {user_id}")
-        background_tasks.add_task(background_narrative_generation)
-        logger.info(f"✅ [Smart Cache] Background task successfully queued for user {user_id}")
+        logger.info(f"🔄 [Smart Cache] Queueing narrative generation for user {user_id}")
+        self.narrative_jobs.enqueue(user_id, memories_text)
 
     async def _get_user_memories(self, user_id: str, limit: int = 50) -> List[str]:
         """
@@ -1746,7 +1733,7 @@ User Message: "what time is it?"
         """
         try:
             # 1. Use the lightweight AI analysis to check if the message is memorable.
-            analysis = await self._ai_memory_analysis(user_message)
+            analysis = await self._ai_memory_analysis(user_message, user_id)
 
             # 2. If the analysis confirms the content is memorable, save it.
             if analysis.get("should_remember"):
@@ -1802,7 +1789,21 @@ def clear_context_cache():
     from app.utils.mcp_modules.cache_manager import clear_context_cache as clear_cache
     clear_cache()
 
+def invalidate_narrative_cache(user_id: str):
+    """Drop a user's in-process narrative so the next new conversation re-reads user_narratives"""
+    if _orchestrator is not None:
+        _orchestrator.narrative_cache.invalidate(user_id)
+
 def get_cache_stats() -> Dict:
     """Get context cache statistics"""
     from app.utils.mcp_modules.cache_manager import get_cache_stats as get_stats
-    return get_stats() 
\ No newline at end of file
+    stats = get_stats()
+    if _orchestrator is not None:
+        stats["speculative_retrieval"] = dict(_orchestrator._speculation_stats)
+        stats["context_planner"] = _orchestrator.ai_service.get_plan_stats()
+        stats["narrative_cache"] = _orchestrator.narrative_cache.get_stats()
+        stats["narrative_jobs"] = _orchestrator.narrative_jobs.get_stats()
+    stats["single_flight"] = get_orchestration_single_flight().get_stats()
+    from app.utils.mcp_modules.deep_analysis_scheduler import get_deep_analysis_scheduler
+    stats["deep_analysis_scheduler"] = get_deep_analysis_scheduler().get_stats()
+    return stats
@@ -5,6 +5,7 @@ This implements the correct transport protocol required by Claude Web for
 persistent MCP connections with OAuth authentication.
 """
 
+import asyncio
 import logging
 import json
 import secrets
@@ -17,12 +18,16 @@ from starlette.datastructures import MutableHeaders
 
 from app.oauth_simple_new import get_current_user
 from app.routing.mcp import handle_request_logic
+from app.utils.mcp_modules.progress_stream import ProgressSink
 
 logger = logging.getLogger(__name__)
 
 # Session storage for Streamable HTTP (use Redis in production)
 active_sessions: Dict[str, Dict] = {}
 
+# Server-to-client message queues of sessions with an open GET /mcp-stream
+session_streams: Dict[str, asyncio.Queue] = {}
+
 # MCP Streamable HTTP router
 mcp_streamable_router = APIRouter(tags=["mcp-streamable"])
 
@@ -32,6 +37,62 @@ def generate_session_id() -> str:
     return f"mcp-session-{secrets.token_urlsafe(32)}"
 
 
+def format_sse_message(message: dict) -> str:
+    """One JSON-RPC message as a Server-Sent Event"""
+    return f"id: {secrets.token_urlsafe(8)}\nevent: message\ndata: {json.dumps(message)}\n\n"
+
+
+def wants_progress_stream(request: Request, body: Any) -> bool:
+    """A single tools/call with a progressToken from a client that accepts an SSE response"""
+    return (
+        isinstance(body, dict)
+        and body.get("method") == "tools/call"
+        and "progressToken" in ((body.get("params") or {}).get("_meta") or {})
+        and "text/event-stream" in request.headers.get("accept", "")
+    )
+
+
+def stream_tool_call(request: Request, message: dict, background_tasks: BackgroundTasks,
+                     user: dict, session_id: Optional[str]) -> StreamingResponse:
+    """
+    Answer a tools/call with an SSE stream (2025-03-26 Streamable HTTP): progress
+    notifications with partial context as the tool produces them, then the result.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    async def run_call():
+        try:
+            return await process_single_message(request, message, background_tasks, user, session_id, queue.put)
+        finally:
+            await queue.put(None)
+    
+    async def event_generator():
+        task = asyncio.ensure_future(run_call())
+        try:
+            while True:
+                notification = await queue.get()
+                if notification is None:
+                    break
+                yield format_sse_message(notification)
+            response = await task
+            if response:
+                yield format_sse_message(response)
+        finally:
+            if not task.done():
+                # Client disconnected mid-call
+                task.cancel()
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Access-Control-Allow-Origin": "*",
+            "Access-Control-Allow-Headers": "Cache-Control, mcp-session-id",
+        }
+    )
+
+
 def validate_origin(request: Request) -> bool:
     """Validate Origin header to prevent DNS rebinding attacks"""
     origin = request.headers.get("origin")
@@ -90,10 +151,16 @@ async def mcp_streamable_post(
             
             return JSONResponse(content=responses)
         
+        # Tool call from a client that takes an SSE response: stream partial context
+        elif wants_progress_stream(request, body):
+            return stream_tool_call(request, body, background_tasks, user, session_id)
+        
         # Handle single message
         else:
+            # Without an SSE response, progress goes to the session's GET stream if one is open
+            progress_sink = session_streams[session_id].put if session_id in session_streams else None
             response = await process_single_message(
-                request, body, background_tasks, user, session_id
+                request, body, background_tasks, user, session_id, progress_sink
             )
             
             # For initialize method, create session and add session header
@@ -166,6 +233,7 @@ async def mcp_streamable_get(
     active_sessions[session_id]["last_activity"] = datetime.now(timezone.utc).isoformat()
     
     logger.info(f"Opening SSE stream for session: {session_id}")
+    queue = session_streams[session_id] = asyncio.Queue()
     
     async def event_generator():
         """Generate Server-Sent Events stream"""
@@ -175,8 +243,7 @@ async def mcp_streamable_get(
             yield f"event: connected\n"
             yield f"data: {json.dumps({'type': 'connected', 'session': session_id})}\n\n"
             
-            # Keep connection alive with periodic heartbeats
-            import asyncio
+            # Deliver server-to-client messages (tool progress), with periodic heartbeats
             while True:
                 try:
                     # Check if session is still valid
@@ -184,14 +251,18 @@ async def mcp_streamable_get(
                         logger.info(f"Session {session_id} no longer active, closing stream")
                         break
                     
+                    try:
+                        message = await asyncio.wait_for(queue.get(), timeout=30)  # 30 second heartbeat
+                        yield format_sse_message(message)
+                        continue
+                    except asyncio.TimeoutError:
+                        pass
+                    
                     # Send heartbeat
                     yield f"id: {secrets.token_urlsafe(8)}\n"
                     yield f"event: heartbeat\n"
                     yield f"data: {json.dumps({'timestamp': datetime.now(timezone.utc).isoformat()})}\n\n"
                     
-                    # Wait before next heartbeat
-                    await asyncio.sleep(30)  # 30 second heartbeat
-                    
                 except asyncio.CancelledError:
                     logger.info(f"SSE stream cancelled for session: {session_id}")
                     break
@@ -202,6 +273,8 @@ async def mcp_streamable_get(
         except Exception as e:
             logger.error(f"Error in event generator: {e}")
         finally:
+            if session_streams.get(session_id) is queue:
+                del session_streams[session_id]
             logger.info(f"SSE stream closed for session: {session_id}")
     
     return StreamingResponse(
@@ -231,6 +304,7 @@ async def mcp_streamable_delete(
     session_id = request.headers.get("mcp-session-id")
     if session_id and session_id in active_sessions:
         del active_sessions[session_id]
+        session_streams.pop(session_id, None)
         logger.info(f"Terminated MCP session: {session_id}")
         return JSONResponse(content={"status": "session_terminated"})
     
@@ -245,7 +319,8 @@ async def process_single_message(
     message: dict, 
     background_tasks: BackgroundTasks,
     user: dict,
-    session_id: Optional[str] = None
+    session_id: Optional[str] = None,
+    progress_sink: Optional[ProgressSink] = None
 ) -> Optional[dict]:
     """Process a single JSON-RPC message with proper MCP handling"""
     
@@ -272,7 +347,7 @@ async def process_single_message(
     request._headers = headers
     
     # Route to existing MCP logic
-    response = await handle_request_logic(request, message, background_tasks)
+    response = await handle_request_logic(request, message, background_tasks, progress_sink)
     
     # Extract JSON content from response
     if hasattr(response, 'body'):
@@ -4,10 +4,11 @@ import datetime
 import logging
 from sqlalchemy import (
     Column, String, Boolean, ForeignKey, Enum, Table,
-    DateTime, JSON, Integer, UUID, Index, event, UniqueConstraint, Text, ARRAY, Float, func, text
+    DateTime, JSON, Integer, UUID, Index, event, UniqueConstraint, Text, func, text, Computed
 )
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from pgvector.sqlalchemy import Vector
+from sqlalchemy.orm import relationship, deferred
 from app.database import Base
 from sqlalchemy.orm import Session
 from app.utils.categorization import get_categories_for_memory
@@ -266,6 +267,10 @@ class Document(Base):
     chunks = relationship("DocumentChunk", back_populates="document", cascade="all, delete-orphan")
 
 
+# text-embedding-3-small, the memory engine's embedder
+CHUNK_EMBEDDING_DIMS = 1536
+
+
 class DocumentChunk(Base):
     __tablename__ = "document_chunks"
     
@@ -273,7 +278,9 @@ class DocumentChunk(Base):
     document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
     chunk_index = Column(Integer, nullable=False)
     content = Column(Text, nullable=False)
-    embedding = Column(ARRAY(Float), nullable=True)  # For future vector search
+    embedding = Column(Vector(CHUNK_EMBEDDING_DIMS), nullable=True)  # Same model as memory vectors, HNSW-indexed
+    # Maintained by Postgres for full-text chunk search (GIN-indexed); only loaded on access
+    content_tsv = deferred(Column(TSVECTOR, Computed("to_tsvector('english', content)", persisted=True)))
     metadata_ = Column('metadata', JSONB, nullable=True)  # Mapped to 'metadata' DB column
     created_at = Column(DateTime(timezone=True), default=get_current_utc_time, nullable=False)
     
@@ -10,7 +10,7 @@ from typing import List, Optional, Set, Dict, Any
 from uuid import UUID, uuid4
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from sqlalchemy import or_, func
 
 from app.database import get_db
@@ -24,6 +24,7 @@ from app.models import (
 )
 from app.schemas import MemoryResponse, PaginatedMemoryResponse
 from app.utils.permissions import check_memory_access_permissions
+from app.utils.mcp_modules.cache_manager import invalidate_user_context
 # Removed imports from deleted memories_modules - functions moved inline below
 
 logger = logging.getLogger(__name__)
@@ -36,6 +37,16 @@ class CreateMemoryRequestData(BaseModel):
     infer: bool = True
     app_name: str
 
+class BulkMemoryItemData(BaseModel):
+    # The memory engine rejects longer memories
+    text: str = Field(..., max_length=10000)
+    metadata: dict = {}
+
+class CreateMemoriesBulkRequestData(BaseModel):
+    memories: List[BulkMemoryItemData]
+    infer: bool = True
+    app_name: str
+
 class DeleteMemoriesRequestData(BaseModel):
     memory_ids: List[UUID]
 
@@ -485,6 +496,10 @@ async def get_user_narrative(
         db.commit()
         db.refresh(narrative)
         
+        # Drop the orchestrator's in-process copy so new conversations pick up this version
+        from app.mcp_orchestration import invalidate_narrative_cache
+        invalidate_narrative_cache(supabase_user_id_str)
+        
         logger.info(f"✅ Generated new narrative for user {supabase_user_id_str} using Jean Memory V2 (force_regenerate={force_regenerate})")
         
         return {
@@ -633,6 +648,7 @@ async def create_memory(
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
+    invalidate_user_context(supabase_user_id_str)
 
     return MemoryResponse(
         id=sql_memory.id,
@@ -646,6 +662,53 @@ async def create_memory(
     )
 
 
+@router.post("/bulk")
+async def create_memories_bulk(
+    request: CreateMemoriesBulkRequestData,
+    current_supa_user: SupabaseUser = Depends(get_current_supa_user),
+    db: Session = Depends(get_db)
+):
+    """Add many memories in one request; extraction, embedding and writes are batched"""
+    from app.config.memory_limits import MEMORY_LIMITS
+    from app.services.memory_ingestion import BulkMemoryItem, apply_memory_limits, ingest_memories_bulk
+
+    if len(request.memories) > MEMORY_LIMITS.bulk_add_max:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many memories in one request ({len(request.memories)} > {MEMORY_LIMITS.bulk_add_max})"
+        )
+
+    supabase_user_id_str = str(current_supa_user.id)
+    user, app_obj = get_user_and_app(db, supabase_user_id_str, request.app_name, current_supa_user.email)
+
+    if not app_obj.is_active:
+        raise HTTPException(status_code=403, detail=f"App {request.app_name} is currently paused. Cannot create new memories.")
+
+    items = [
+        BulkMemoryItem(
+            content=item.text,
+            metadata={**item.metadata, 'app_name': request.app_name, 'created_via': 'rest_api_bulk'}
+        )
+        for item in request.memories
+    ]
+
+    items, rejected = apply_memory_limits(db, user.id, supabase_user_id_str, items)
+    if not items:
+        raise HTTPException(status_code=403, detail=rejected[0])
+
+    try:
+        result = await ingest_memories_bulk(db, user.id, app_obj.id, supabase_user_id_str, items, infer=request.infer)
+    except Exception as e:
+        logger.error(f"❌ Bulk memory creation failed for user {supabase_user_id_str}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Bulk memory creation failed: {e}")
+
+    # Items past the memory limit are the tail of the request
+    result["rejected"] = len(rejected)
+    if rejected:
+        result["errors"] = [f"{len(rejected)} memories rejected: {rejected[0]}", *result["errors"]]
+    return result
+
+
 # IMPORTANT: Specific routes must come before general routes
 # Life Graph Data endpoint - must be before /{memory_id}
 @router.get("/life-graph-data")
@@ -1693,6 +1756,7 @@ async def delete_memories(
         db.rollback()
         logger.error(f"❌ Failed to commit SQL deletions: {e}")
         raise HTTPException(status_code=500, detail=f"Error committing deletions: {e}")
+    invalidate_user_context(supabase_user_id_str)
 
     # Build comprehensive response message
     message_parts = []
@@ -1744,6 +1808,7 @@ async def archive_memories(
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error committing archival: {e}")
+    invalidate_user_context(supabase_user_id_str)
     
     return {"message": f"Successfully archived {archived_count} memories. Not found: {not_found_count}."}
 
@@ -1809,6 +1874,7 @@ async def pause_memories(
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error committing state changes: {e}")
+    invalidate_user_context(supabase_user_id_str)
         
     return {"message": message}
 
@@ -1915,6 +1981,7 @@ async def update_memory(
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
+    invalidate_user_context(supabase_user_id_str)
         
     return MemoryResponse(
         id=memory_to_update.id,
@@ -10,8 +10,9 @@ from fastapi import APIRouter, Request, Response, BackgroundTasks
 from fastapi.responses import JSONResponse
 
 from app.clients import get_client_profile, get_client_name
-from app.context import user_id_var, client_name_var, background_tasks_var
+from app.context import user_id_var, client_name_var, background_tasks_var, progress_reporter_var
 from app.database import get_db
+from app.utils.mcp_modules.progress_stream import ProgressReporter, ProgressSink
 
 logger = logging.getLogger(__name__)
 
@@ -209,8 +210,13 @@ async def get_session_agents(session_id: str) -> list:
             except:
                 pass
 
-async def handle_request_logic(request: Request, body: dict, background_tasks: BackgroundTasks):
-    """Unified logic to handle an MCP request, abstracted from the transport."""
+async def handle_request_logic(request: Request, body: dict, background_tasks: BackgroundTasks,
+                               progress_sink: Optional[ProgressSink] = None):
+    """
+    Unified logic to handle an MCP request, abstracted from the transport.
+    Transports with an open event stream pass progress_sink; tool calls carrying a
+    progressToken then stream partial results to it as notifications/progress.
+    """
     from app.auth import get_user_from_api_key_header
 
     # 1. Determine Authentication and Client Identity
@@ -311,6 +317,9 @@ async def handle_request_logic(request: Request, body: dict, background_tasks: B
             if session_info["is_multi_agent"]:
                 logger.info(f"🔧 [MCP Tool Call] Multi-agent context - Session: {session_info['session_id']}, Agent: {session_info['agent_id']}")
             logger.info(f"🔧 [MCP Tool Call] Background tasks context: {background_tasks is not None}")
+            progress_token = (params.get("_meta") or {}).get("progressToken")
+            reporter = ProgressReporter(progress_token, progress_sink) if progress_token is not None and progress_sink else None
+            reporter_token = progress_reporter_var.set(reporter)
             try:
                 # Use the profile to handle the tool call, which encapsulates client-specific logic
                 result = await client_profile.handle_tool_call(tool_name, tool_args, real_user_id)
@@ -320,6 +329,10 @@ async def handle_request_logic(request: Request, body: dict, background_tasks: B
             except Exception as e:
                 logger.error(f"Error calling tool '{tool_name}' for client '{client_key}': {e}", exc_info=True)
                 return JSONResponse(status_code=500, content={"jsonrpc": "2.0", "error": {"code": -32603, "message": str(e)}, "id": request_id})
+            finally:
+                if reporter is not None:
+                    reporter.close()
+                progress_reporter_var.reset(reporter_token)
 
         # Handle other standard MCP methods
         elif method_name in ["notifications/initialized", "notifications/cancelled"]:
@@ -497,16 +510,25 @@ async def handle_sse_messages(client_name: str, user_id: str, request: Request,
     """
     try:
         body = await request.json()
+        connection_id = f"{client_name}_{user_id}"
+        
+        async def send_progress(notification: dict):
+            queue = sse_message_queues.get(connection_id)
+            if queue is None:
+                raise ConnectionError("SSE connection closed")
+            await queue.put(notification)
+        
+        # Progress notifications travel over the open SSE connection ahead of the result
+        progress_sink = send_progress if client_name != "cursor" and connection_id in sse_message_queues else None
         
         # This function will return a JSONResponse object
-        response = await handle_request_logic(request, body, background_tasks)
+        response = await handle_request_logic(request, body, background_tasks, progress_sink)
         response_payload = json.loads(response.body)
 
         # For Cursor, return JSON-RPC directly instead of SSE
         if client_name == "cursor":
             return response
 
-        connection_id = f"{client_name}_{user_id}"
         if connection_id in sse_message_queues:
             await sse_message_queues[connection_id].put(response_payload)
             # CRITICAL FIX: Immediately send a heartbeat after the message to keep the connection alive.
@@ -76,6 +76,8 @@ class BackgroundProcessor:
             if not documents:
                 # Also clean up orphaned documents (no active memories)
                 await self.cleanup_orphaned_documents(db)
+                # Idle pass: embed chunks stored without an embedding
+                await ChunkingService().embed_missing_chunks(db)
                 return
             
             logger.info(f"Processing {len(documents)} documents for chunking")
@@ -86,7 +88,7 @@ class BackgroundProcessor:
             for doc in documents:
                 try:
                     # Process chunks for this document
-                    chunks_created = chunking_service.chunk_document(db, doc)
+                    chunks_created = await chunking_service.chunk_and_embed_document(db, doc)
                     
                     # Mark as processed - ensure metadata exists and update correctly
                     if doc.metadata_ is None:
@@ -96,7 +98,7 @@ class BackgroundProcessor:
                     updated_metadata = dict(doc.metadata_) if doc.metadata_ else {}
                     updated_metadata["needs_chunking"] = False
                     updated_metadata["chunked_at"] = datetime.utcnow().isoformat()
-                    updated_metadata["chunks_created"] = len(chunks_created)
+                    updated_metadata["chunks_created"] = chunks_created
                     
                     # Assign the updated metadata
                     doc.metadata_ = updated_metadata
@@ -107,7 +109,7 @@ class BackgroundProcessor:
                     db.commit()
                     processed += 1
                     
-                    logger.info(f"Background chunking completed for: {doc.title} ({len(chunks_created)} chunks)")
+                    logger.info(f"Background chunking completed for: {doc.title} ({chunks_created} chunks)")
                     
                     # Small delay to prevent memory buildup
                     await asyncio.sleep(0.3)  # Reduced delay with more memory available
@@ -2,113 +2,293 @@
 Document Chunking Service
 
 This service handles chunking of documents for efficient retrieval.
-It can be run as a background job or called on-demand.
+It can be run as a background job or called on-demand. Documents stored by
+store_document and synced from Substack and Notion are all ingested through
+chunk_and_embed_document.
 """
 
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from app.models import Document, DocumentChunk
+import re
+import time
+import uuid
+from contextlib import contextmanager
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import Integer, func, insert, text
+from sqlalchemy.orm import Session, defer, joinedload
+from app.models import Document, DocumentChunk, User
+from app.services.text_chunker import TextChunk, TextChunker
+from app.utils.pgvector_connection import get_app_db_pgvector_version, supports_iterative_index_scans
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Chunk metadata key counting failed embedding backfill attempts
+EMBEDDING_ATTEMPTS_KEY = "embedding_attempts"
+
+# Document types whose content marks sections with Markdown headings (Notion sync writes them)
+HEADING_DOCUMENT_TYPES = {"markdown", "notion"}
+
+_QUERY_TERM_RE = re.compile(r"\w+")
+# Longer queries are truncated; the first terms carry the question
+_MAX_QUERY_TERMS = 16
+
+
+def to_any_terms_tsquery(query: str) -> str:
+    """
+    to_tsquery() input matching chunks that contain any of the query's words.
+    
+    Words are joined with OR (plainto/websearch_to_tsquery require all of them,
+    which natural-language questions rarely satisfy); ts_rank then favours
+    chunks matching more of them. Only word characters are kept, so the result
+    is always valid tsquery syntax. English stop words are dropped by Postgres.
+    """
+    terms = list(dict.fromkeys(term.lower() for term in _QUERY_TERM_RE.findall(query)))
+    return " | ".join(terms[:_MAX_QUERY_TERMS])
+
+
+@contextmanager
+def statement_timeout(db: Session, timeout_ms: int):
+    """
+    Cancel statements that run longer than timeout_ms within the block.
+    The previous timeout is restored afterwards; if a statement was cancelled
+    the caller rolls back, which discards the transaction-local setting anyway.
+    """
+    previous = db.execute(text("SHOW statement_timeout")).scalar()
+    db.execute(text("SELECT set_config('statement_timeout', :timeout, true)"), {"timeout": str(timeout_ms)})
+    yield
+    db.execute(text("SELECT set_config('statement_timeout', :timeout, true)"), {"timeout": previous})
+
+
+def _with_document_summary():
+    """Load each chunk's document without its (possibly very large) content"""
+    return joinedload(DocumentChunk.document).load_only(
+        Document.id, Document.title, Document.document_type, Document.source_url
+    )
+
 
 class ChunkingService:
-    def __init__(self, chunk_size: int = 2000, overlap: int = 200):
+    def __init__(self, max_tokens: Optional[int] = None, overlap_tokens: Optional[int] = None):
         """
         Initialize the chunking service.
         
         Args:
-            chunk_size: Target size for each chunk in characters
-            overlap: Number of characters to overlap between chunks
+            max_tokens: Maximum approximate tokens per chunk (CHUNK_MAX_TOKENS by default)
+            overlap_tokens: Approximate tokens to overlap between chunks (CHUNK_OVERLAP_TOKENS by default)
+        """
+        from app.settings import config
+        self.chunker = TextChunker(
+            max_tokens=max_tokens or config.CHUNK_MAX_TOKENS,
+            overlap_tokens=overlap_tokens if overlap_tokens is not None else config.CHUNK_OVERLAP_TOKENS
+        )
+    
+    def iter_chunks(self, text: str, document_type: Optional[str] = None) -> Iterator[TextChunk]:
+        """
+        Split text into overlapping chunks, yielding them one at a time so
+        callers can process a long document without holding all of its chunks.
+        
+        Args:
+            text: The text to chunk
+            document_type: Markdown and Notion documents are also split at headings
+            
+        Yields:
+            Chunks, in document order
         """
-        self.chunk_size = chunk_size
-        self.overlap = overlap
+        return self.chunker.iter_chunks(text, headings=document_type in HEADING_DOCUMENT_TYPES)
     
-    def chunk_text(self, text: str) -> List[str]:
+    def chunk_text(self, text: str, document_type: Optional[str] = None) -> List[str]:
         """
         Split text into overlapping chunks.
         
         Args:
             text: The text to chunk
+            document_type: Markdown and Notion documents are also split at headings
             
         Returns:
             List of text chunks
         """
-        if not text:
-            return []
-        
-        chunks = []
-        start = 0
-        text_length = len(text)
+        return [chunk.text for chunk in self.iter_chunks(text, document_type)]
+    
+    def iter_chunk_batches(self, document: Document, batch_size: Optional[int] = None) -> Iterator[List[TextChunk]]:
+        """Chunks of a document in batches of batch_size (CHUNK_EMBEDDING_BATCH_SIZE by default)"""
+        from app.settings import config
+        chunks = self.iter_chunks(document.content, document.document_type)
+        while batch := list(islice(chunks, batch_size or config.CHUNK_EMBEDDING_BATCH_SIZE)):
+            yield batch
+    
+    async def embed_texts(self, texts: List[str], supa_uid: str) -> List[Optional[List[float]]]:
+        """
+        Embed chunk texts with the memory engine's embedder, in batches.
         
-        while start < text_length:
-            # Calculate end position
-            end = start + self.chunk_size
+        Args:
+            texts: Chunk texts to embed
+            supa_uid: Supabase user ID of the document owner
             
-            # If this is not the last chunk, try to break at a sentence boundary
-            if end < text_length:
-                # Look for sentence endings near the chunk boundary
-                search_start = max(start + self.chunk_size - 100, start)
-                search_end = min(start + self.chunk_size + 100, text_length)
-                
-                # Find the last sentence ending in the search range
-                sentence_end = -1
-                for i in range(search_end - 1, search_start - 1, -1):
-                    if text[i] in '.!?' and i + 1 < text_length and text[i + 1] in ' \n\t':
-                        sentence_end = i + 1
-                        break
-                
-                # If we found a sentence boundary, use it
-                if sentence_end > 0:
-                    end = sentence_end
+        Returns:
+            One embedding per text, or None for every text when embeddings are
+            disabled or the request fails (chunks stay searchable by text)
+        """
+        from app.settings import config
+        if not texts or not config.CHUNK_EMBEDDINGS_ENABLED:
+            return [None] * len(texts)
+        
+        try:
+            from app.utils.memory import get_async_memory_client
+            memory_client = await get_async_memory_client()
+            return await memory_client.embed(
+                texts, supa_uid, memory_action="add", batch_size=config.CHUNK_EMBEDDING_BATCH_SIZE
+            )
+        except Exception as e:
+            logger.warning(f"Chunk embedding failed, storing {len(texts)} chunks without embeddings: {e}")
+            return [None] * len(texts)
+    
+    def _delete_chunks(self, db: Session, document: Document) -> None:
+        db.query(DocumentChunk).filter(
+            DocumentChunk.document_id == document.id
+        ).delete(synchronize_session=False)
+    
+    def _insert_chunks(self, db: Session, document: Document, first_index: int, chunks: List[TextChunk],
+                       embeddings: Optional[List[Optional[List[float]]]] = None) -> None:
+        """Write one batch of chunks with a single multi-row INSERT"""
+        embeddings = embeddings or [None] * len(chunks)
+        db.execute(insert(DocumentChunk), [
+            {
+                "id": uuid.uuid4(),
+                "document_id": document.id,
+                "chunk_index": first_index + i,
+                "content": chunk.text,
+                "embedding": embedding,
+                "metadata_": {
+                    "chunk_size": len(chunk.text),
+                    "token_count": chunk.tokens,
+                    "section": chunk.section,
+                    "document_title": document.title,
+                    "document_type": document.document_type
+                }
+            }
+            for i, (chunk, embedding) in enumerate(zip(chunks, embeddings))
+        ])
+    
+    def _set_total_chunks(self, db: Session, document: Document, total: int) -> None:
+        """Record the chunk count on every chunk once it is known (chunks are written as they are cut)"""
+        if total:
+            db.execute(
+                text("""
+                    UPDATE document_chunks
+                    SET metadata = jsonb_set(coalesce(metadata, '{}'::jsonb), '{total_chunks}', to_jsonb(CAST(:total AS integer)))
+                    WHERE document_id = :document_id
+                """),
+                {"total": total, "document_id": document.id}
+            )
+    
+    def chunk_document(self, db: Session, document: Document) -> int:
+        """
+        Chunk a single document and store the chunks in the database, without
+        embeddings (embed_missing_chunks backfills them).
+        
+        Args:
+            db: Database session
+            document: Document to chunk
             
-            # Extract the chunk
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
+        Returns:
+            Number of chunks created
+        """
+        self._delete_chunks(db, document)
+        
+        total = 0
+        for batch in self.iter_chunk_batches(document):
+            self._insert_chunks(db, document, total, batch)
+            total += len(batch)
+        self._set_total_chunks(db, document, total)
+        
+        db.commit()
+        logger.info(f"Created {total} chunks for document {document.id}")
+        return total
+    
+    async def chunk_and_embed_document(self, db: Session, document: Document,
+                                       supa_uid: Optional[str] = None, commit: bool = True) -> int:
+        """
+        Ingestion pipeline for a document: chunks stream out of the chunker in
+        batches, each batch is embedded and written with one multi-row INSERT,
+        so only one batch of chunks and embeddings is held at a time however
+        long the document is.
+        
+        Args:
+            db: Database session
+            document: Document to chunk (its existing chunks are replaced)
+            supa_uid: Supabase user ID of the owner (looked up when not given)
+            commit: Commit when done; False leaves it to the caller's transaction
             
-            # Move to the next chunk with overlap
-            start = end - self.overlap if end < text_length else text_length
+        Returns:
+            Number of chunks created
+        """
+        start_time = time.time()
+        supa_uid = supa_uid or document.user.user_id
+        self._delete_chunks(db, document)
         
-        return chunks
+        total = embedded = 0
+        for batch in self.iter_chunk_batches(document):
+            embeddings = await self.embed_texts([chunk.text for chunk in batch], supa_uid)
+            self._insert_chunks(db, document, total, batch, embeddings)
+            total += len(batch)
+            embedded += sum(1 for embedding in embeddings if embedding is not None)
+        self._set_total_chunks(db, document, total)
+        
+        if commit:
+            db.commit()
+        elapsed_time = time.time() - start_time
+        logger.info(f"Ingested {total} chunks ({embedded} embedded) for document {document.id} "
+                    f"({len(document.content or '')} chars) in {elapsed_time:.2f}s")
+        return total
     
-    def chunk_document(self, db: Session, document: Document) -> List[DocumentChunk]:
+    async def embed_missing_chunks(self, db: Session, limit: int = 256) -> int:
         """
-        Chunk a single document and store the chunks in the database.
+        Backfill embeddings for chunks stored without one (created before chunk
+        embeddings existed, or while the embedding API was failing). Failed
+        attempts are counted in the chunk's metadata; chunks that have failed
+        CHUNK_EMBEDDING_MAX_ATTEMPTS times are skipped so they don't hold up the
+        rest of the backlog.
         
         Args:
             db: Database session
-            document: Document to chunk
+            limit: Maximum number of chunks to embed in this call
             
         Returns:
-            List of created DocumentChunk objects
-        """
-        # Delete existing chunks for this document
-        db.query(DocumentChunk).filter(DocumentChunk.document_id == document.id).delete()
-        
-        # Create new chunks
-        chunks = self.chunk_text(document.content)
-        document_chunks = []
-        
-        for i, chunk_content in enumerate(chunks):
-            chunk = DocumentChunk(
-                document_id=document.id,
-                chunk_index=i,
-                content=chunk_content,
-                metadata_={
-                    "chunk_size": len(chunk_content),
-                    "total_chunks": len(chunks),
-                    "document_title": document.title,
-                    "document_type": document.document_type
-                }
-            )
-            db.add(chunk)
-            document_chunks.append(chunk)
+            Number of chunks embedded
+        """
+        from app.settings import config
+        if not config.CHUNK_EMBEDDINGS_ENABLED or not get_app_db_pgvector_version(db):
+            return 0
+        
+        attempts = func.coalesce(DocumentChunk.metadata_[EMBEDDING_ATTEMPTS_KEY].astext.cast(Integer), 0)
+        rows = db.query(DocumentChunk, User.user_id).join(Document).join(User).filter(
+            DocumentChunk.embedding.is_(None),
+            attempts < config.CHUNK_EMBEDDING_MAX_ATTEMPTS
+        ).options(defer(DocumentChunk.embedding)).limit(limit).all()
+        
+        chunks_by_user = {}
+        for chunk, supa_uid in rows:
+            chunks_by_user.setdefault(supa_uid, []).append(chunk)
+        
+        embedded = failed = 0
+        for supa_uid, chunks in chunks_by_user.items():
+            embeddings = await self.embed_texts([chunk.content for chunk in chunks], supa_uid)
+            for chunk, embedding in zip(chunks, embeddings):
+                if embedding is not None:
+                    chunk.embedding = embedding
+                    embedded += 1
+                else:
+                    metadata = dict(chunk.metadata_ or {})
+                    metadata[EMBEDDING_ATTEMPTS_KEY] = metadata.get(EMBEDDING_ATTEMPTS_KEY, 0) + 1
+                    chunk.metadata_ = metadata
+                    failed += 1
         
         db.commit()
-        logger.info(f"Created {len(document_chunks)} chunks for document {document.id}")
-        return document_chunks
+        if embedded:
+            logger.info(f"Backfilled embeddings for {embedded} document chunks")
+        if failed:
+            logger.warning(f"Could not embed {failed} document chunks; each is retried up to "
+                           f"{config.CHUNK_EMBEDDING_MAX_ATTEMPTS} times")
+        return embedded
     
     def chunk_all_documents(self, db: Session, user_id: Optional[str] = None) -> int:
         """
@@ -121,26 +301,30 @@ class ChunkingService:
         Returns:
             Number of documents processed
         """
-        query = db.query(Document)
+        query = db.query(Document.id)
         if user_id:
             query = query.filter(Document.user_id == user_id)
         
-        documents = query.all()
+        # Documents are loaded one at a time so only one document's content is in memory
+        document_ids = [document_id for document_id, in query.all()]
         processed = 0
         
-        for document in documents:
+        for document_id in document_ids:
             try:
-                self.chunk_document(db, document)
-                processed += 1
+                document = db.get(Document, document_id)
+                if document:
+                    self.chunk_document(db, document)
+                    processed += 1
             except Exception as e:
-                logger.error(f"Error chunking document {document.id}: {e}")
+                logger.error(f"Error chunking document {document_id}: {e}")
+                db.rollback()
         
         logger.info(f"Processed {processed} documents")
         return processed
     
     def search_chunks(self, db: Session, query: str, user_id: str, limit: int = 10) -> List[DocumentChunk]:
         """
-        Simple text search across chunks (can be enhanced with vector search later).
+        Full-text search across a user's chunks.
         
         Args:
             db: Database session
@@ -149,31 +333,186 @@ class ChunkingService:
             limit: Maximum number of chunks to return
             
         Returns:
-            List of relevant DocumentChunk objects
-        """
-        # For now, use simple ILIKE search
-        # This can be enhanced with vector embeddings later
-        # Avoid selecting metadata column to prevent schema issues
-        chunks = db.query(
-            DocumentChunk.id,
-            DocumentChunk.document_id, 
-            DocumentChunk.chunk_index,
-            DocumentChunk.content,
-            DocumentChunk.created_at
+            List of relevant DocumentChunk objects, best match first
+        """
+        return [chunk for chunk, rank in self.search_chunks_fulltext(db, query, user_id, total_limit=limit)]
+    
+    def search_chunks_fulltext(
+        self,
+        db: Session,
+        query: str,
+        user_id: str,
+        total_limit: int = 10,
+        limit_per_doc: Optional[int] = None,
+        document_ids: Optional[List[str]] = None
+    ) -> List[Tuple[DocumentChunk, float]]:
+        """
+        Full-text search on the GIN-indexed content_tsv column, ranked by ts_rank.
+        
+        The per-document limit is applied in SQL (row_number() over each
+        document's matches), and the search is bounded by CHUNK_SEARCH_TIMEOUT_MS.
+        
+        Args:
+            db: Database session
+            query: Search query
+            user_id: User ID (users.id) to filter documents
+            total_limit: Maximum number of chunks to return
+            limit_per_doc: Optional maximum number of chunks per document
+            document_ids: Optional list of document IDs to search within
+            
+        Returns:
+            (chunk, ts_rank) pairs, best first; empty if nothing matches, the
+            search times out or fails
+        """
+        from app.settings import config
+        terms = to_any_terms_tsquery(query)
+        if not terms:
+            return []
+        
+        tsquery = func.to_tsquery('english', terms)
+        rank = func.ts_rank(DocumentChunk.content_tsv, tsquery)
+        matches = db.query(
+            DocumentChunk.id.label("chunk_id"),
+            rank.label("rank"),
+            func.row_number().over(
+                partition_by=DocumentChunk.document_id,
+                order_by=rank.desc()
+            ).label("document_rank")
         ).join(Document).filter(
             Document.user_id == user_id,
-            DocumentChunk.content.ilike(f"%{query}%")
-        ).limit(limit).all()
-        
-        # Convert to DocumentChunk objects manually
-        result_chunks = []
-        for chunk_data in chunks:
-            chunk = DocumentChunk()
-            chunk.id = chunk_data.id
-            chunk.document_id = chunk_data.document_id
-            chunk.chunk_index = chunk_data.chunk_index
-            chunk.content = chunk_data.content
-            chunk.created_at = chunk_data.created_at
-            result_chunks.append(chunk)
-        
-        return result_chunks 
\ No newline at end of file
+            DocumentChunk.content_tsv.op('@@')(tsquery)
+        )
+        if document_ids:
+            matches = matches.filter(Document.id.in_(document_ids))
+        matches = matches.subquery()
+        
+        ranked = db.query(DocumentChunk, matches.c.rank).join(
+            matches, DocumentChunk.id == matches.c.chunk_id
+        ).options(defer(DocumentChunk.embedding), _with_document_summary())
+        if limit_per_doc:
+            ranked = ranked.filter(matches.c.document_rank <= limit_per_doc)
+        
+        try:
+            with statement_timeout(db, config.CHUNK_SEARCH_TIMEOUT_MS):
+                rows = ranked.order_by(matches.c.rank.desc()).limit(total_limit).all()
+        except Exception as e:
+            logger.warning(f"Full-text chunk search failed or timed out: {e}")
+            db.rollback()
+            return []
+        return [(chunk, float(chunk_rank)) for chunk, chunk_rank in rows]
+    
+    def search_chunks_by_embedding(
+        self,
+        db: Session,
+        query_embedding: List[float],
+        user_id: str,
+        limit: int = 10,
+        document_ids: Optional[List[str]] = None,
+        limit_per_doc: Optional[int] = None
+    ) -> List[Tuple[DocumentChunk, float]]:
+        """
+        Nearest chunks to a query embedding, through the HNSW index.
+        
+        With limit_per_doc, the nearest limit * limit_per_doc candidates are
+        fetched from the index and capped per document in SQL (row_number()).
+        
+        Args:
+            db: Database session
+            query_embedding: Embedding of the search query
+            user_id: User ID (users.id) to filter documents
+            limit: Maximum number of chunks to return
+            document_ids: Optional list of document IDs to search within
+            limit_per_doc: Optional maximum number of chunks per document
+            
+        Returns:
+            (chunk, cosine similarity) pairs, most similar first; empty when
+            pgvector is not available in the database
+        """
+        from app.settings import config
+        version = get_app_db_pgvector_version(db)
+        if not version:
+            return []
+        
+        candidates = limit * limit_per_doc if limit_per_doc else limit
+        # Both settings only last for the current transaction
+        db.execute(
+            text("SELECT set_config('hnsw.ef_search', :ef_search, true)"),
+            {"ef_search": str(max(config.CHUNK_VECTOR_EF_SEARCH, candidates))}
+        )
+        if supports_iterative_index_scans(version):
+            # The user filter is applied to the index scan's output; keep scanning
+            # until enough of the user's chunks are found instead of returning few or none
+            db.execute(text("SELECT set_config('hnsw.iterative_scan', 'relaxed_order', true)"))
+        
+        distance = DocumentChunk.embedding.cosine_distance(query_embedding)
+        nearest = db.query(
+            DocumentChunk.id.label("chunk_id"),
+            DocumentChunk.document_id.label("document_id"),
+            distance.label("distance")
+        ).join(Document).filter(
+            Document.user_id == user_id,
+            DocumentChunk.embedding.isnot(None)
+        )
+        if document_ids:
+            nearest = nearest.filter(Document.id.in_(document_ids))
+        nearest = nearest.order_by(distance).limit(candidates).subquery()
+        
+        ranked = db.query(
+            nearest.c.chunk_id,
+            nearest.c.distance,
+            func.row_number().over(
+                partition_by=nearest.c.document_id,
+                order_by=nearest.c.distance
+            ).label("document_rank")
+        ).subquery()
+        
+        query = db.query(DocumentChunk, ranked.c.distance).join(
+            ranked, DocumentChunk.id == ranked.c.chunk_id
+        ).options(defer(DocumentChunk.embedding), _with_document_summary())
+        if limit_per_doc:
+            query = query.filter(ranked.c.document_rank <= limit_per_doc)
+        
+        with statement_timeout(db, config.CHUNK_SEARCH_TIMEOUT_MS):
+            rows = query.order_by(ranked.c.distance).limit(limit).all()
+        return [(chunk, 1.0 - float(chunk_distance)) for chunk, chunk_distance in rows]
+    
+    async def search_chunks_semantic(
+        self,
+        db: Session,
+        query: str,
+        user: User,
+        limit: int = 10,
+        document_ids: Optional[List[str]] = None,
+        limit_per_doc: Optional[int] = None
+    ) -> List[Tuple[DocumentChunk, float]]:
+        """
+        Semantic search across a user's chunks: embeds the query with the memory
+        engine's embedder and runs search_chunks_by_embedding.
+        
+        Args:
+            db: Database session
+            query: Search query
+            user: Owner of the documents
+            limit: Maximum number of chunks to return
+            document_ids: Optional list of document IDs to search within
+            limit_per_doc: Optional maximum number of chunks per document
+            
+        Returns:
+            (chunk, cosine similarity) pairs, most similar first; empty when chunk
+            embeddings are disabled or unavailable (callers fall back to text search)
+        """
+        from app.settings import config
+        if not config.CHUNK_EMBEDDINGS_ENABLED or not get_app_db_pgvector_version(db):
+            return []
+        
+        try:
+            from app.utils.memory import get_async_memory_client
+            memory_client = await get_async_memory_client()
+            query_embedding = (await memory_client.embed([query], user.user_id, memory_action="search"))[0]
+            return self.search_chunks_by_embedding(
+                db, query_embedding, str(user.id), limit, document_ids, limit_per_doc
+            )
+        except Exception as e:
+            logger.warning(f"Semantic chunk search failed, falling back to text search: {e}")
+            db.rollback()
+            return []
@@ -0,0 +1,181 @@
+"""
+Bulk Memory Ingestion Service
+
+Stores many memories at once: the memory engine extracts, embeds and upserts
+them in batches, then the mirror rows in the memories table are written with
+a single multi-row INSERT. Used by the add_memories_bulk MCP tool, the bulk
+REST endpoint and the Substack/Twitter syncs.
+"""
+
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.config.memory_limits import MEMORY_LIMITS
+from app.models import Memory, MemoryState
+from app.utils.mcp_modules.cache_manager import invalidate_user_context
+
+logger = logging.getLogger(__name__)
+
+# Longest memory the engine accepts (AddMemoriesBulkRequest rejects a whole batch over it)
+MAX_MEMORY_CHARS = 10000
+
+
+@dataclass
+class BulkMemoryItem:
+    """One memory to ingest, with metadata stored in both the engine and the memories table"""
+    content: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+def apply_memory_limits(
+    db: Session,
+    user_id: uuid.UUID,
+    supabase_user_id: str,
+    items: List[BulkMemoryItem]
+) -> Tuple[List[BulkMemoryItem], List[str]]:
+    """
+    Run the single-add memory limit check for every item, counting the items
+    accepted before it, so a bulk request cannot exceed what one-by-one adds allow.
+
+    Returns:
+        (items within the limit, one rejection message per item over it)
+    """
+    from app.tools.memory_modules.utils import validate_memory_limits
+
+    current_count = db.query(Memory).filter(
+        Memory.user_id == user_id,
+        Memory.state == MemoryState.active
+    ).count()
+
+    allowed, rejected = [], []
+    for item in items:
+        can_add, limit_message = validate_memory_limits(
+            supabase_user_id, current_count + len(allowed), MEMORY_LIMITS.__dict__
+        )
+        if can_add:
+            allowed.append(item)
+        else:
+            rejected.append(limit_message)
+    return allowed, rejected
+
+
+async def ingest_memories_bulk(
+    db: Session,
+    user_id: uuid.UUID,
+    app_id: uuid.UUID,
+    supabase_user_id: str,
+    items: List[BulkMemoryItem],
+    infer: bool = True,
+    batch_size: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None
+) -> Dict[str, Any]:
+    """
+    Ingest memories in batches and mirror them into the memories table.
+
+    Args:
+        db: Session used for the multi-row insert (committed here)
+        user_id / app_id: Database IDs the mirror rows belong to
+        supabase_user_id: User ID the memory engine partitions by
+        items: Memories to add; empty contents are skipped, contents over
+            MAX_MEMORY_CHARS fail on their own without reaching the engine
+        infer: Extract facts with the LLM (False stores the contents verbatim)
+        batch_size: Memories per engine batch (engine default when None)
+        progress_callback: Called with (done, total) after each engine chunk
+
+    Returns:
+        Dict with added/skipped/failed counts, skipped_indices (positions in
+        items that were empty or had nothing memorable extracted), mirror row
+        IDs and memories_per_second
+    """
+    from app.utils.memory import get_async_memory_client
+
+    skipped_indices = [i for i, item in enumerate(items) if not (item.content and item.content.strip())]
+    oversized_indices = [i for i, item in enumerate(items)
+                         if item.content and len(item.content.strip()) > MAX_MEMORY_CHARS]
+    errors: List[str] = [f"Item {i}: longer than {MAX_MEMORY_CHARS} characters" for i in oversized_indices]
+    excluded = set(skipped_indices) | set(oversized_indices)
+    item_indices = [i for i in range(len(items)) if i not in excluded]
+    items = [items[i] for i in item_indices]
+    if not items:
+        return {"added": 0, "skipped": len(skipped_indices), "skipped_indices": skipped_indices,
+                "failed": len(oversized_indices), "memory_ids": [], "memories_per_second": 0.0, "errors": errors}
+
+    start_time = time.time()
+    memory_client = await get_async_memory_client()
+
+    # Mirror row IDs are assigned up front so the engine payload can link back to them
+    row_ids = [uuid.uuid4() for _ in items]
+    engine_metadata = [
+        {**item.metadata, "db_memory_id": str(row_id), "app_db_id": str(app_id)}
+        for item, row_id in zip(items, row_ids)
+    ]
+
+    # Large imports go to the engine in chunks so progress can be reported
+    chunk_size = max(1, (batch_size or 100) * 4)
+    engine_results: List[Dict[str, Any]] = []
+    for start in range(0, len(items), chunk_size):
+        chunk = items[start:start + chunk_size]
+        try:
+            result = await memory_client.add_bulk(
+                [item.content for item in chunk],
+                user_id=supabase_user_id,
+                item_metadata=engine_metadata[start:start + chunk_size],
+                infer=infer,
+                batch_size=batch_size
+            )
+            engine_results.extend(result["results"])
+            errors.extend(result.get("errors", []))
+        except Exception as e:
+            logger.error(f"❌ Bulk ingestion chunk at {start} failed: {e}", exc_info=True)
+            engine_results.extend({"ids": [], "memory": item.content, "failed": True} for item in chunk)
+            errors.append(f"Items {item_indices[start]}-{item_indices[start + len(chunk) - 1]}: {e}")
+        if progress_callback:
+            progress_callback(min(start + chunk_size, len(items)), len(items))
+
+    rows = []
+    failed = len(oversized_indices)
+    for index, item, row_id, result in zip(item_indices, items, row_ids, engine_results):
+        if result["failed"]:
+            failed += 1
+            continue
+        if not result["ids"]:
+            skipped_indices.append(index)  # Nothing memorable extracted
+            continue
+        rows.append({
+            "id": row_id,
+            "user_id": user_id,
+            "app_id": app_id,
+            "content": item.content,
+            "state": MemoryState.active,
+            "metadata_": {**item.metadata, "mem0_id": result["ids"][0], "mem0_ids": result["ids"]},
+        })
+
+    if rows:
+        try:
+            db.execute(insert(Memory), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        invalidate_user_context(supabase_user_id)
+
+    elapsed_time = time.time() - start_time
+    rate = len(items) / elapsed_time if elapsed_time > 0 else 0.0
+    logger.info(f"📦 Bulk ingested {len(rows)}/{len(items)} memories for user {supabase_user_id} "
+                f"in {elapsed_time:.2f}s ({rate:.1f} memories/s, {len(skipped_indices)} skipped, {failed} failed)")
+
+    return {
+        "added": len(rows),
+        "skipped": len(skipped_indices),
+        "skipped_indices": sorted(skipped_indices),
+        "failed": failed,
+        "memory_ids": [str(row["id"]) for row in rows],
+        "memories_per_second": round(rate, 2),
+        "errors": errors,
+    }
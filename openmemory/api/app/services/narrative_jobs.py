@@ -0,0 +1,173 @@
+"""
+Narrative Job Queue
+
+Deduplicated asyncio queue for user narrative generation (Gemini Pro). Runs
+on the caller's event loop with a bounded number of workers: a user has at
+most one job queued or running, a request that arrives while the user's job
+is running schedules one rerun after it, failed jobs are retried with
+exponential backoff, and throughput is tracked for backfills. Used by the live narrative
+cache and by scripts/utils/standalone_backfill.py.
+
+Jobs live in memory only. A job lost on restart is re-requested the next time
+the user's narrative is found missing or stale, or by the next backfill run.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Produces the narrative for a user (None when there isn't enough to write one)
+GenerateFn = Callable[[str, Optional[Any]], Awaitable[Optional[str]]]
+# Persists a generated narrative
+SaveFn = Callable[[str, str], Awaitable[None]]
+
+
+class NarrativeJobQueue:
+    """Bounded-worker narrative generation queue, one job per user at a time"""
+
+    def __init__(
+        self,
+        generate: GenerateFn,
+        save: SaveFn,
+        workers: int = 2,
+        max_retries: int = 3,
+        retry_base_seconds: float = 5.0,
+        start_interval_seconds: float = 0.0
+    ):
+        self._generate = generate
+        self._save = save
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.start_interval_seconds = start_interval_seconds
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list = []
+        self._payloads: Dict[str, Optional[Any]] = {}
+        self._running: set = set()
+        self._reruns: Dict[str, Optional[Any]] = {}
+        self._last_start = 0.0
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._started_at: Optional[float] = None
+        self._busy_seconds = 0.0
+        self._stats = {
+            "enqueued": 0, "deduplicated": 0, "succeeded": 0, "skipped": 0,
+            "failed": 0, "retries": 0, "reruns": 0,
+        }
+
+    def enqueue(self, user_id: str, payload: Optional[Any] = None) -> bool:
+        """
+        Queue a narrative job for a user. Returns False if one is already queued
+        for them. If their job is running, one rerun is scheduled to start when
+        it finishes, so changes made during the run are picked up. The payload
+        (e.g. prepared memories text) is passed to the generate function; a newer
+        payload replaces a queued one.
+        """
+        pending = self._reruns if user_id in self._running else self._payloads
+        if user_id in pending:
+            self._stats["deduplicated"] += 1
+            if payload is not None:
+                pending[user_id] = payload
+            logger.info(f"🔁 [Narrative Jobs] Job already pending for user {user_id}")
+            return False
+
+        if user_id in self._running:
+            self._reruns[user_id] = payload
+            self._stats["reruns"] += 1
+            logger.info(f"🔁 [Narrative Jobs] Rerun scheduled after the running job for user {user_id}")
+            return True
+
+        self._ensure_workers()
+        self._payloads[user_id] = payload
+        self._queue.put_nowait(user_id)
+        self._stats["enqueued"] += 1
+        logger.info(f"📥 [Narrative Jobs] Queued narrative for user {user_id} (depth {self._queue.qsize()})")
+        return True
+
+    def _ensure_workers(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._start_lock = asyncio.Lock()
+            self._started_at = time.monotonic()
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.workers:
+            self._workers.append(asyncio.ensure_future(self._worker()))
+
+    async def _worker(self):
+        while True:
+            user_id = await self._queue.get()
+            payload = self._payloads.pop(user_id, None)
+            self._running.add(user_id)
+            try:
+                await self._run_job(user_id, payload)
+            finally:
+                self._running.discard(user_id)
+                if user_id in self._reruns:
+                    # Requeued before task_done so join() also waits for the rerun
+                    self._payloads[user_id] = self._reruns.pop(user_id)
+                    self._queue.put_nowait(user_id)
+                self._queue.task_done()
+
+    async def _wait_for_start_slot(self):
+        """Space job starts (including retries) at least start_interval_seconds apart"""
+        if self.start_interval_seconds <= 0:
+            return
+        async with self._start_lock:
+            wait = self._last_start + self.start_interval_seconds - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_start = time.monotonic()
+
+    async def _run_job(self, user_id: str, payload: Optional[Any]):
+        for attempt in range(self.max_retries + 1):
+            await self._wait_for_start_slot()
+            job_start = time.monotonic()
+            try:
+                narrative = await self._generate(user_id, payload)
+                if not narrative or not narrative.strip():
+                    self._stats["skipped"] += 1
+                    logger.info(f"⚠️ [Narrative Jobs] No narrative generated for user {user_id}")
+                    return
+                await self._save(user_id, narrative.strip())
+                self._stats["succeeded"] += 1
+                logger.info(f"✅ [Narrative Jobs] Narrative saved for user {user_id} in {time.monotonic() - job_start:.1f}s")
+                return
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    self._stats["failed"] += 1
+                    logger.error(f"❌ [Narrative Jobs] Giving up on user {user_id} after {attempt + 1} attempts: {e}")
+                    return
+                self._stats["retries"] += 1
+                delay = self.retry_base_seconds * (2 ** attempt) * random.uniform(0.8, 1.2)
+                logger.warning(f"🔄 [Narrative Jobs] Attempt {attempt + 1} failed for user {user_id}: {e}. Retrying in {delay:.1f}s")
+            finally:
+                # Work time only: start spacing and backoff sleeps are excluded
+                self._busy_seconds += time.monotonic() - job_start
+            await asyncio.sleep(delay)
+
+    async def join(self):
+        """Wait until every queued job has finished"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self):
+        """Stop the workers (queued jobs are dropped)"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def get_stats(self) -> Dict:
+        finished = self._stats["succeeded"] + self._stats["skipped"] + self._stats["failed"]
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        return {
+            **self._stats,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "running": len(self._running),
+            "jobs_per_minute": round(finished / elapsed * 60, 2) if elapsed > 0 else 0.0,
+            "avg_job_seconds": round(self._busy_seconds / finished, 2) if finished else 0.0,
+        }
@@ -0,0 +1,269 @@
+"""
+Token-Aware Text Chunker
+
+Splits documents into chunks sized by an approximate token count. A chunk
+starts a new section at a heading (Markdown/Notion documents), prefers to end
+at a paragraph break, then at a sentence end, then at whitespace. Boundaries
+are looked up lazily in the UTF-8 encoded text, only in the bytes each chunk
+can end in: line-based boundaries by jumping between newlines with
+bytes.find, sentence ends by a regex scan backwards from the size limit in
+growing windows, so most of the text is never matched against a pattern.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+# OpenAI and Gemini tokenizers average ~4 UTF-8 bytes per token: ~4 chars of
+# English, while accented and CJK text (2-3 bytes per char) costs more per char
+BYTES_PER_TOKEN = 4
+
+# Matched on bytes, where offsets are proportional to the token estimate.
+# ASCII bytes never occur inside a multi-byte UTF-8 character, so every match
+# is at a character boundary.
+# Sentence end: [.!?] or "…", then any closing quotes/brackets (incl. "’", "”"), then whitespace
+_SENTENCE_RE = re.compile(rb"(?:[.!?]|\xe2\x80\xa6)(?:[\"')\]]|\xe2\x80[\x99\x9d])*(?=\s)")
+# Every byte a sentence end can contain, to back a scan up to the start of a match
+_SENTENCE_BYTES = frozenset(b".!?\"')]\xe2\x80\xa6\x99\x9d")
+# Paragraph break: a newline followed by a blank line (matched after the newline)
+_BLANK_LINE_RE = re.compile(rb"[ \t]*\n")
+# Heading: a Markdown heading marker at the start of a line
+_HEADING_LINE_RE = re.compile(rb"[ \t]*\#{1,6}[ \t]+(?=\S)")
+# First bytes of those lines, checked before running the patterns on a line
+_BLANK_LINE_LEAD = frozenset(b" \t\n")
+_HEADING_LINE_LEAD = frozenset(b" \t#")
+
+_NEWLINE = ord("\n")
+
+# A heading only starts a new chunk once the current one has this fraction of max_tokens
+_MIN_SECTION_FRACTION = 0.25
+# A chunk may end early at a paragraph break if it keeps this fraction of max_tokens
+_MIN_PARAGRAPH_FRACTION = 0.75
+# Bytes before the size limit first scanned for a sentence end; doubled until one is found
+_SENTENCE_SCAN_BYTES = 512
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text.encode("utf-8")) // BYTES_PER_TOKEN)
+
+
+@dataclass
+class TextChunk:
+    """A chunk of a document with its approximate size"""
+    text: str
+    tokens: int
+    section: Optional[str] = None  # Heading of the section the chunk starts in
+
+
+class _Boundaries:
+    """
+    Boundary positions (byte offsets) in the encoded text, found on demand:
+    sentence ends (the chunk ends after the closing punctuation), paragraph
+    breaks (the chunk ends before the blank line) and, with headings on,
+    heading starts (the chunk ends before the heading's line).
+    """
+
+    def __init__(self, data: bytes, headings: bool):
+        self.data = data
+        self.headings = headings
+
+    def _line_matches(self, position: int, lead: frozenset, pattern: re.Pattern) -> bool:
+        return position < len(self.data) and self.data[position] in lead and pattern.match(self.data, position) is not None
+
+    def is_heading(self, position: int) -> bool:
+        return (self.headings and (position == 0 or self.data[position - 1] == _NEWLINE)
+                and self._line_matches(position, _HEADING_LINE_LEAD, _HEADING_LINE_RE))
+
+    def headings_in(self, low: int, high: int) -> List[int]:
+        """Heading starts in (low, high], ascending"""
+        if not self.headings:
+            return []
+        find = self.data.find
+        positions = []
+        newline = find(b"\n", low, high)
+        while newline >= 0:
+            if self._line_matches(newline + 1, _HEADING_LINE_LEAD, _HEADING_LINE_RE):
+                positions.append(newline + 1)
+            newline = find(b"\n", newline + 1, high)
+        return positions
+
+    def last_paragraph(self, low: int, high: int) -> Optional[int]:
+        """Largest paragraph break in (low, high], if any"""
+        rfind = self.data.rfind
+        newline = rfind(b"\n", low + 1, high + 1)
+        while newline >= 0:
+            if self._line_matches(newline + 1, _BLANK_LINE_LEAD, _BLANK_LINE_RE):
+                return newline
+            newline = rfind(b"\n", low + 1, newline)
+        return None
+
+    def first_paragraph(self, low: int, high: int) -> Optional[int]:
+        """Smallest paragraph break in [low, high), if any"""
+        find = self.data.find
+        newline = find(b"\n", low, high)
+        while newline >= 0:
+            if self._line_matches(newline + 1, _BLANK_LINE_LEAD, _BLANK_LINE_RE):
+                return newline
+            newline = find(b"\n", newline + 1, high)
+        return None
+
+    def _scan_start(self, low: int) -> int:
+        """Back up from low to the start of any sentence end running into it"""
+        while low > 0 and self.data[low - 1] in _SENTENCE_BYTES:
+            low -= 1
+        return low
+
+    def first_sentence_end(self, low: int, high: int) -> Optional[int]:
+        """Smallest sentence end in [low, high), if any"""
+        position = self._scan_start(low)
+        while True:
+            match = _SENTENCE_RE.search(self.data, position, high)
+            if match is None:
+                return None
+            if match.end() >= low:
+                return match.end()
+            position = match.end()
+
+    def last_sentence_end(self, low: int, high: int) -> Optional[int]:
+        """Largest sentence end in (low, high], scanning backwards from high"""
+        window = _SENTENCE_SCAN_BYTES
+        while high > low:
+            window_low = max(low, high - window)
+            ends = [match.end() for match in
+                    _SENTENCE_RE.finditer(self.data, self._scan_start(window_low + 1), high + 1)]
+            if ends and ends[-1] > window_low:
+                return ends[-1]
+            high = window_low
+            window *= 2
+        return None
+
+    @staticmethod
+    def last_in(positions: List[int], low: int, high: int) -> Optional[int]:
+        """Largest position in (low, high], if any"""
+        i = bisect_right(positions, high) - 1
+        return positions[i] if i >= 0 and positions[i] > low else None
+
+    @staticmethod
+    def first_in(positions: List[int], low: int, high: int) -> Optional[int]:
+        """Smallest position in [low, high), if any"""
+        i = bisect_left(positions, low)
+        return positions[i] if i < len(positions) and positions[i] < high else None
+
+
+def _last(*positions: Optional[int]) -> Optional[int]:
+    return max((p for p in positions if p is not None), default=None)
+
+
+def _first(*positions: Optional[int]) -> Optional[int]:
+    return min((p for p in positions if p is not None), default=None)
+
+
+class TextChunker:
+    def __init__(self, max_tokens: int = 500, overlap_tokens: int = 50):
+        """
+        Initialize the chunker.
+
+        Args:
+            max_tokens: Maximum approximate tokens per chunk
+            overlap_tokens: Approximate tokens of trailing sentences repeated at
+                the start of the next chunk (never across a heading)
+        """
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+
+    def iter_chunks(self, text: str, headings: bool = False) -> Iterator[TextChunk]:
+        """
+        Split text into chunks of at most max_tokens (approximate) tokens.
+
+        Args:
+            text: The text to chunk
+            headings: Start a new chunk at Markdown headings ("# ", "## ", ...),
+                for Markdown and Notion documents
+
+        Yields:
+            Chunks in document order
+        """
+        if not text:
+            return
+
+        data = text.encode("utf-8")
+        boundaries = _Boundaries(data, headings)
+        size = len(data)
+        max_bytes = self.max_tokens * BYTES_PER_TOKEN
+        overlap_bytes = self.overlap_tokens * BYTES_PER_TOKEN
+        min_section_bytes = int(max_bytes * _MIN_SECTION_FRACTION)
+        min_paragraph_bytes = int(max_bytes * _MIN_PARAGRAPH_FRACTION)
+
+        start = 0
+        # Heading of the section `start` is in; chunk starts only move forward
+        section_start = 0 if boundaries.is_heading(0) else None
+        while start < size:
+            limit = min(start + max_bytes, size)
+            # Every boundary used for this chunk (its end, overlap and next section) is in (start, limit]
+            window_headings = boundaries.headings_in(start, limit)
+            end = self._chunk_end(data, boundaries, window_headings, start, limit,
+                                  min_section_bytes, min_paragraph_bytes)
+
+            chunk = data[start:end].strip()
+            if chunk:
+                yield TextChunk(
+                    text=chunk.decode("utf-8"),
+                    tokens=max(1, len(chunk) // BYTES_PER_TOKEN),
+                    section=self._heading_text(data, section_start) if section_start is not None else None
+                )
+            if end >= size:
+                break
+
+            # Repeat the trailing sentences as overlap, unless the next chunk starts a section
+            overlap_start = None
+            if boundaries.first_in(window_headings, end, end + 1) is None:
+                low = max(start + 1, end - overlap_bytes)
+                overlap_start = _first(
+                    boundaries.first_sentence_end(low, end),
+                    boundaries.first_paragraph(low, end),
+                    boundaries.first_in(window_headings, low, end)
+                )
+            next_start = overlap_start or end
+            section_start = boundaries.last_in(window_headings, start, next_start) or section_start
+            start = next_start
+
+    def _chunk_end(self, data: bytes, boundaries: _Boundaries, window_headings: List[int], start: int,
+                   limit: int, min_section_bytes: int, min_paragraph_bytes: int) -> int:
+        if limit >= len(data):
+            return len(data)
+
+        section_end = boundaries.first_in(window_headings, start + min_section_bytes, limit + 1)
+        if section_end is not None:
+            return section_end
+        paragraph_end = boundaries.last_paragraph(start + min_paragraph_bytes, limit)
+        if paragraph_end is not None:
+            return paragraph_end
+        # A small section's heading still ends the chunk, rather than trailing at its end
+        heading_end = boundaries.last_in(window_headings, start, limit)
+        if heading_end is not None:
+            return heading_end
+        # No heading in the window and no paragraph break past min_paragraph_bytes at this point
+        sentence_end = _last(
+            boundaries.last_sentence_end(start + min_section_bytes, limit),
+            boundaries.last_paragraph(start + min_section_bytes, start + min_paragraph_bytes)
+        )
+        if sentence_end is not None:
+            return sentence_end
+
+        # A sentence longer than a chunk (tables, code, unpunctuated text): split at whitespace
+        whitespace_end = max(data.rfind(b" ", start + 1, limit), data.rfind(b"\n", start + 1, limit))
+        if whitespace_end > start:
+            return whitespace_end
+        # No whitespace either: cut at the last character boundary
+        while limit > start + 1 and (data[limit] & 0xC0) == 0x80:
+            limit -= 1
+        return limit
+
+    @staticmethod
+    def _heading_text(data: bytes, position: int) -> str:
+        line_end = data.find(b"\n", position)
+        return data[position:line_end if line_end >= 0 else len(data)].decode("utf-8").strip(" \t#")
+
+    def chunk_text(self, text: str, headings: bool = False) -> List[str]:
+        return [chunk.text for chunk in self.iter_chunks(text, headings)]
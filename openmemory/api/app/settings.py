@@ -185,6 +185,67 @@ class Config:
         self.DEBUG = os.getenv("DEBUG", "false").lower() == "true"
         self.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
         
+        # Context orchestration: start the default ask_memory retrieval concurrently with planning
+        self.SPECULATIVE_CONTEXT_RETRIEVAL = os.getenv("SPECULATIVE_CONTEXT_RETRIEVAL", "true").lower() == "true"
+        # Context plan fast paths: fingerprint cache and local classifier (trained from PLAN_DECISION_LOG)
+        self.PLAN_CACHE_SIZE = int(os.getenv("PLAN_CACHE_SIZE", "2000"))
+        self.PLAN_CACHE_TTL_SECONDS = float(os.getenv("PLAN_CACHE_TTL_SECONDS", "3600"))
+        self.PLAN_CLASSIFIER_MIN_CONFIDENCE = float(os.getenv("PLAN_CLASSIFIER_MIN_CONFIDENCE", "0.9"))
+        self.PLAN_DECISION_LOG = os.getenv("PLAN_DECISION_LOG", "")
+        # One message analysis (plan + memory triage) per interaction, shared for this long
+        self.MESSAGE_ANALYSIS_TTL_SECONDS = float(os.getenv("MESSAGE_ANALYSIS_TTL_SECONDS", "300"))
+        # In-process narrative cache: revalidated against user_narratives' version this often,
+        # and regenerated in the background once this many memories were added since generation
+        self.NARRATIVE_CACHE_SIZE = int(os.getenv("NARRATIVE_CACHE_SIZE", "5000"))
+        self.NARRATIVE_REVALIDATE_SECONDS = float(os.getenv("NARRATIVE_REVALIDATE_SECONDS", "300"))
+        self.NARRATIVE_REGEN_MEMORY_THRESHOLD = int(os.getenv("NARRATIVE_REGEN_MEMORY_THRESHOLD", "25"))
+        # Narrative generation job queue (one job per user, retried with exponential backoff)
+        self.NARRATIVE_JOB_WORKERS = int(os.getenv("NARRATIVE_JOB_WORKERS", "2"))
+        self.NARRATIVE_JOB_MAX_RETRIES = int(os.getenv("NARRATIVE_JOB_MAX_RETRIES", "3"))
+        # Orchestrator context cache: LRU bounded by entries and approximate bytes, with a TTL
+        self.CONTEXT_CACHE_MAX_ENTRIES = int(os.getenv("CONTEXT_CACHE_MAX_ENTRIES", "1000"))
+        self.CONTEXT_CACHE_MAX_BYTES = int(os.getenv("CONTEXT_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+        self.CONTEXT_CACHE_TTL_SECONDS = float(os.getenv("CONTEXT_CACHE_TTL_SECONDS", "1800"))
+        # Context packing: memory token budget per target model, MMR relevance weight, and the
+        # cosine similarity above which a memory counts as a near-duplicate of one already packed
+        self.CONTEXT_PACK_FLASH_TOKENS = int(os.getenv("CONTEXT_PACK_FLASH_TOKENS", "800"))
+        self.CONTEXT_PACK_PRO_TOKENS = int(os.getenv("CONTEXT_PACK_PRO_TOKENS", "1500"))
+        self.CONTEXT_PACK_MMR_LAMBDA = float(os.getenv("CONTEXT_PACK_MMR_LAMBDA", "0.7"))
+        self.CONTEXT_PACK_DUPLICATE_SIMILARITY = float(os.getenv("CONTEXT_PACK_DUPLICATE_SIMILARITY", "0.92"))
+        self.CONTEXT_PACK_USE_STORED_EMBEDDINGS = os.getenv("CONTEXT_PACK_USE_STORED_EMBEDDINGS", "true").lower() == "true"
+        # Document chunk size and overlap between consecutive chunks, in approximate tokens
+        self.CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "500"))
+        self.CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "50"))
+        # Document chunk embeddings (pgvector): computed at chunking time in batches of this size,
+        # searched through the HNSW index with this candidate list size (hnsw.ef_search)
+        self.CHUNK_EMBEDDINGS_ENABLED = os.getenv("CHUNK_EMBEDDINGS_ENABLED", "true").lower() == "true"
+        self.CHUNK_EMBEDDING_BATCH_SIZE = int(os.getenv("CHUNK_EMBEDDING_BATCH_SIZE", "64"))
+        self.CHUNK_VECTOR_EF_SEARCH = int(os.getenv("CHUNK_VECTOR_EF_SEARCH", "100"))
+        # Failed backfill attempts after which a chunk is left without an embedding
+        self.CHUNK_EMBEDDING_MAX_ATTEMPTS = int(os.getenv("CHUNK_EMBEDDING_MAX_ATTEMPTS", "3"))
+        # Upper bound on each chunk search statement (vector or full-text), in milliseconds
+        self.CHUNK_SEARCH_TIMEOUT_MS = int(os.getenv("CHUNK_SEARCH_TIMEOUT_MS", "2000"))
+        # Deep search without an explicit deep_search request: off by default. Scores are
+        # cosine similarities, so calibrate the threshold on real queries before enabling
+        self.DEEP_SEARCH_AUTO_TRIGGER = os.getenv("DEEP_SEARCH_AUTO_TRIGGER", "false").lower() == "true"
+        self.DEEP_SEARCH_MIN_SCORE = float(os.getenv("DEEP_SEARCH_MIN_SCORE", "0.7"))
+        # Hybrid retrieval (deep search): candidates each retriever contributes before
+        # reciprocal rank fusion (0 turns a retriever off), and the RRF constant
+        self.HYBRID_GRAPH_CANDIDATES = int(os.getenv("HYBRID_GRAPH_CANDIDATES", "10"))
+        self.HYBRID_MEMORY_TEXT_CANDIDATES = int(os.getenv("HYBRID_MEMORY_TEXT_CANDIDATES", "20"))
+        self.HYBRID_CHUNK_VECTOR_CANDIDATES = int(os.getenv("HYBRID_CHUNK_VECTOR_CANDIDATES", "10"))
+        self.HYBRID_CHUNK_TEXT_CANDIDATES = int(os.getenv("HYBRID_CHUNK_TEXT_CANDIDATES", "10"))
+        self.HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", "60"))
+        # Identical concurrent orchestrations share one computation; its result is reused this long
+        self.SINGLE_FLIGHT_RESULT_TTL_SECONDS = float(os.getenv("SINGLE_FLIGHT_RESULT_TTL_SECONDS", "5"))
+        # Autonomous-mode background deep analysis: per-user coalescing, debounce and budgets
+        self.DEEP_ANALYSIS_MAX_CONCURRENCY = int(os.getenv("DEEP_ANALYSIS_MAX_CONCURRENCY", "2"))
+        self.DEEP_ANALYSIS_DEBOUNCE_SECONDS = float(os.getenv("DEEP_ANALYSIS_DEBOUNCE_SECONDS", "30"))
+        self.DEEP_ANALYSIS_MIN_INTERVAL_SECONDS = float(os.getenv("DEEP_ANALYSIS_MIN_INTERVAL_SECONDS", "600"))
+        self.DEEP_ANALYSIS_USER_BUDGET_PER_HOUR = int(os.getenv("DEEP_ANALYSIS_USER_BUDGET_PER_HOUR", "4"))
+        self.DEEP_ANALYSIS_GLOBAL_BUDGET_PER_HOUR = int(os.getenv("DEEP_ANALYSIS_GLOBAL_BUDGET_PER_HOUR", "200"))
+        self.DEEP_ANALYSIS_MAX_QUEUE = int(os.getenv("DEEP_ANALYSIS_MAX_QUEUE", "1000"))
+        
         # Development settings
         self.PYTHONUNBUFFERED = os.getenv("PYTHONUNBUFFERED", "1")
         
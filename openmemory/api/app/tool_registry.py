@@ -1,5 +1,6 @@
 from app.tools.memory import (
     add_memories,
+    add_memories_bulk,
     search_memory,
     search_memory_v2,
     list_memories,
@@ -31,6 +32,7 @@ from app.tools.coordination import (
 # This makes it easy to manage tools and decouples them from the server logic.
 tool_registry = {
     "add_memories": add_memories,
+    "add_memories_bulk": add_memories_bulk,
     "store_document": store_document,
     "get_document_status": get_document_status,
     "search_memory": search_memory,
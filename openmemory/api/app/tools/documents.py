@@ -11,6 +11,7 @@ from app.database import SessionLocal
 from app.utils.db import get_user_and_app
 from app.config.memory_limits import MEMORY_LIMITS
 from app.analytics import track_tool_usage
+from app.utils.mcp_modules.progress_stream import is_streaming, report_memory_hits, stream_synthesis
 
 logger = logging.getLogger(__name__)
 
@@ -125,45 +126,19 @@ async def _process_document_background(
             document_processing_status[job_id]["progress"] = 50
             document_processing_status[job_id]["message"] = "Creating searchable chunks..."
             
-            # 4. Create chunks for better search performance (for large documents)
-            if len(content) > 2000:  # Only chunk large documents
-                logger.info(f"🔍 [{job_id}] Document is large ({len(content)} chars), creating chunks...")
-                chunk_size = 1000
-                overlap = 200
-                chunks = []
-                
-                for i in range(0, len(content), chunk_size - overlap):
-                    chunk_content = content[i:i + chunk_size]
-                    if chunk_content.strip():
-                        chunks.append({
-                            "id": str(uuid.uuid4()),
-                            "document_id": document_id,
-                            "content": chunk_content,
-                            "chunk_index": len(chunks)
-                        })
-                
-                logger.info(f"📝 [{job_id}] Created {len(chunks)} chunks for document")
-                
-                # Insert chunks using SQLAlchemy ORM  
-                if chunks:
-                    logger.info(f"💾 [{job_id}] Creating {len(chunks)} chunks using SQLAlchemy ORM...")
-                    try:
-                        from app.models import DocumentChunk
-                        for chunk in chunks:
-                            chunk_obj = DocumentChunk(
-                                id=uuid.UUID(chunk["id"]),
-                                document_id=uuid.UUID(document_id), # Use the correct document_id
-                                content=chunk["content"],
-                                chunk_index=chunk["chunk_index"]
-                            )
-                            db.add(chunk_obj)
-                        db.flush()  # Save chunks without committing yet
-                        logger.info(f"✅ [{job_id}] {len(chunks)} chunks created successfully using SQLAlchemy ORM")
-                    except Exception as chunks_error:
-                        logger.error(f"💥 [{job_id}] Chunks creation failed: {chunks_error}")
-                        # Continue processing even if chunks fail - not critical
-            else:
-                logger.info(f"📝 [{job_id}] Document is small ({len(content)} chars), skipping chunking")
+            # 4. Chunk, embed and store the chunks through the shared ingestion pipeline
+            logger.info(f"🔍 [{job_id}] Chunking and embedding document ({len(content)} chars)...")
+            try:
+                from app.services.chunking_service import ChunkingService
+                # Savepoint: a failed chunk write must not lose the document
+                with db.begin_nested():
+                    chunks_created = await ChunkingService().chunk_and_embed_document(
+                        db, doc, supa_uid, commit=False
+                    )
+                logger.info(f"✅ [{job_id}] {chunks_created} chunks created successfully")
+            except Exception as chunks_error:
+                logger.error(f"💥 [{job_id}] Chunks creation failed: {chunks_error}")
+                # Continue processing even if chunks fail - not critical
                     
             document_processing_status[job_id]["progress"] = 70
             document_processing_status[job_id]["message"] = "Generating summary..."
@@ -661,11 +636,14 @@ async def _deep_memory_query_impl(search_query: str, supa_uid: str, client_name:
             
             # 1. Get ALL memories for comprehensive context
             mem_fetch_start_time = time.time()
-            all_memories_result = await memory_client.get_all(user_id=supa_uid, limit=memory_limit)
-            search_memories_result = await memory_client.search(
-                query=search_query,
-                user_id=supa_uid,
-                limit=memory_limit
+            # Listing is a Qdrant scroll (no embedding), so run it alongside the search
+            all_memories_result, search_memories_result = await asyncio.gather(
+                memory_client.get_all(user_id=supa_uid, limit=memory_limit, fields=["source_app"]),
+                memory_client.search(
+                    query=search_query,
+                    user_id=supa_uid,
+                    limit=memory_limit
+                )
             )
             mem_fetch_duration = time.time() - mem_fetch_start_time
             
@@ -701,6 +679,11 @@ async def _deep_memory_query_impl(search_query: str, supa_uid: str, client_name:
                     prioritized_memories.append(mem)
             
             logger.info(f"deep_memory_query: Memory fetching for user {supa_uid} took {mem_fetch_duration:.2f}s. Found {len(prioritized_memories)} memories.")
+            # Streaming clients get the top vector hits now; documents and synthesis take much longer
+            await report_memory_hits([
+                mem.get('memory', mem.get('content', '')) for mem in search_memories
+                if isinstance(mem, dict) and mem.get('memory', mem.get('content'))
+            ])
 
             # 2. Get documents for comprehensive analysis (increased limit for better coverage)
             doc_fetch_start_time = time.time()
@@ -758,13 +741,21 @@ async def _deep_memory_query_impl(search_query: str, supa_uid: str, client_name:
             # 3. Search document chunks
             chunk_search_start_time = time.time()
             relevant_chunks = []
-            semantic_chunks = chunking_service.search_chunks(
+            semantic_chunks = await chunking_service.search_chunks_semantic(
                 db=db,
                 query=search_query,
-                user_id=str(user.id),
+                user=user,
                 limit=chunk_limit
             )
-            relevant_chunks.extend(semantic_chunks)
+            relevant_chunks.extend(chunk for chunk, similarity in semantic_chunks)
+            if not relevant_chunks:
+                # No chunk embeddings to search (pgvector unavailable or chunks not embedded yet)
+                relevant_chunks.extend(chunking_service.search_chunks(
+                    db=db,
+                    query=search_query,
+                    user_id=str(user.id),
+                    limit=chunk_limit
+                ))
             chunk_search_duration = time.time() - chunk_search_start_time
             logger.info(f"deep_memory_query: Chunk searching for user {supa_uid} took {chunk_search_duration:.2f}s. Found {len(relevant_chunks)} chunks.")
             
@@ -866,7 +857,10 @@ Provide a thorough, insightful response."""
             gemini_start_time = time.time()
             logger.info(f"deep_memory_query: Starting Gemini Flash call for user {supa_uid}")
             
-            response_text = await gemini_service.generate_response(prompt)
+            if is_streaming():
+                response_text = await stream_synthesis(gemini_service, prompt)
+            else:
+                response_text = await gemini_service.generate_response(prompt)
 
             gemini_duration = time.time() - gemini_start_time
             logger.info(f"deep_memory_query: Gemini Flash call for user {supa_uid} took {gemini_duration:.2f}s")
@@ -6,19 +6,21 @@ Provides a clean API for memory operations by importing from modularized compone
 # Import from modularized components
 from .memory_modules.utils import safe_json_dumps, track_tool_usage
 from .memory_modules.search_operations import (
-    search_memory, search_memory_v2, ask_memory, smart_memory_query
+    search_memory, search_memory_v2, search_memory_batch, ask_memory, smart_memory_query
 )
 from .memory_modules.crud_operations import (
-    add_memories, add_observation, list_memories, 
+    add_memories, add_memories_bulk, add_observation, list_memories, 
     delete_all_memories, get_memory_details
 )
 
 # Re-export all functions for backward compatibility
 __all__ = [
     'add_memories',
+    'add_memories_bulk',
     'add_observation', 
     'search_memory',
     'search_memory_v2',
+    'search_memory_batch',
     'list_memories',
     'delete_all_memories',
     'get_memory_details',
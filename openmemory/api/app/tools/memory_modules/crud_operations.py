@@ -16,6 +16,7 @@ from app.utils.db import get_user_and_app, get_or_create_user
 from app.middleware.subscription_middleware import SubscriptionChecker
 from app.config.memory_limits import MEMORY_LIMITS
 from app.utils.decorators import retry_on_exception
+from app.utils.mcp_modules.cache_manager import invalidate_user_context
 from .utils import (
     safe_json_dumps, track_tool_usage, format_memory_response, 
     format_error_response, validate_memory_limits, truncate_text, sanitize_tags
@@ -231,6 +232,9 @@ async def _add_memories_background_claude(text: str, tags: Optional[List[str]],
             # Continue anyway since memory client succeeded
             logger.warning(f"💾 [Memory Add] ⚠️ Continuing despite local DB failure (memory client succeeded)")
         
+        # The memory client has the new memory either way; drop context cached before it
+        invalidate_user_context(supa_uid)
+        
         operation_time = time.time() - operation_start
         logger.info(f"💾 [Memory Add] ===== BACKGROUND MEMORY ADDITION COMPLETE in {operation_time:.2f}s =====")
         
@@ -255,6 +259,93 @@ async def _add_memories_background_claude(text: str, tags: Optional[List[str]],
         db.close()
 
 
+async def add_memories_bulk(texts: List[str], tags: Optional[List[str]] = None) -> str:
+    """
+    Add many memories in one call (imports, backfills, long lists of facts).
+    
+    Facts are extracted, embedded and stored in batches instead of one engine
+    round trip per memory.
+    
+    Args:
+        texts: The pieces of content to remember
+        tags: Optional list of tags applied to every memory
+    
+    Returns:
+        JSON string with added/skipped/failed counts and throughput
+    """
+    from app.services.memory_ingestion import BulkMemoryItem, apply_memory_limits, ingest_memories_bulk
+    
+    supa_uid = user_id_var.get(None)
+    client_name = client_name_var.get(None)
+    
+    if not supa_uid:
+        return format_error_response("Supabase user_id not available in context", "add_memories_bulk")
+    if not client_name:
+        return format_error_response("client_name not available in context", "add_memories_bulk")
+    
+    texts = [truncate_text(t.strip(), 5000) for t in (texts or []) if t and t.strip()]
+    if not texts:
+        return format_error_response("Memory content cannot be empty", "add_memories_bulk")
+    if len(texts) > MEMORY_LIMITS.bulk_add_max:
+        return format_error_response(
+            f"Too many memories in one request ({len(texts)} > {MEMORY_LIMITS.bulk_add_max})", "add_memories_bulk"
+        )
+    tags = sanitize_tags(tags or [])
+    
+    track_tool_usage('add_memories_bulk', {'count': len(texts), 'has_tags': bool(tags)})
+    logger.info(f"📦 [Add Memories Bulk] {len(texts)} memories for user {supa_uid} via {client_name}")
+    
+    db = SessionLocal()
+    try:
+        user, app = get_user_and_app(db, supa_uid, client_name)
+        if not app.is_active:
+            return format_error_response(f"App {app.name} is paused", "add_memories_bulk")
+        
+        added_at = datetime.datetime.now().isoformat()
+        items = [
+            BulkMemoryItem(content=t, metadata={
+                'app_name': client_name,
+                'added_at': added_at,
+                'source': 'add_memories_bulk',
+                **({'tags': tags} if tags else {})
+            })
+            for t in texts
+        ]
+        items, rejected = apply_memory_limits(db, user.id, supa_uid, items)
+        if not items:
+            return format_error_response(rejected[0], "add_memories_bulk")
+        
+        result = await asyncio.wait_for(
+            ingest_memories_bulk(db, user.id, app.id, supa_uid, items),
+            timeout=300.0
+        )
+        
+        errors = result["errors"]
+        if rejected:
+            errors = [f"{len(rejected)} memories rejected: {rejected[0]}", *errors]
+        return safe_json_dumps({
+            "status": "success" if not (result["failed"] or rejected) else "partial",
+            "message": f"Added {result['added']} of {len(texts)} memories",
+            "added": result["added"],
+            "skipped": result["skipped"],
+            "rejected": len(rejected),
+            "failed": result["failed"],
+            "memory_ids": result["memory_ids"],
+            "memories_per_second": result["memories_per_second"],
+            "errors": errors[:10],
+            "tags": tags
+        })
+    except asyncio.TimeoutError:
+        logger.error(f"📦 [Add Memories Bulk] ❌ Timed out for user {supa_uid}")
+        return format_error_response("Bulk memory addition timed out", "add_memories_bulk")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"📦 [Add Memories Bulk] ❌ Error for user {supa_uid}: {e}", exc_info=True)
+        return format_error_response(f"Failed to add memories: {e}", "add_memories_bulk")
+    finally:
+        db.close()
+
+
 async def add_observation(text: str) -> str:
     """
     Add an observation (lightweight memory without heavy processing).
@@ -363,6 +454,7 @@ async def delete_all_memories() -> str:
         })
         
         db.commit()
+        invalidate_user_context(supa_uid)
         
         return safe_json_dumps({
             "status": "success",
@@ -0,0 +1,241 @@
+"""
+Hybrid retrieval for memory search.
+Runs the engine search (vector hits and knowledge-graph relations), full-text
+search over the user's memories, and semantic and full-text search over their
+document chunks concurrently, then fuses the ranked lists with reciprocal rank
+fusion, deduplicated by content hash.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, literal_column
+
+from app.database import SessionLocal
+from app.models import Memory, MemoryState, User
+from app.services.chunking_service import ChunkingService, statement_timeout, to_any_terms_tsquery
+from .chunk_search import format_chunk_result, fuse_results
+
+logger = logging.getLogger(__name__)
+
+# Chunks per document in each chunk retriever's candidates
+_CHUNKS_PER_DOCUMENT = 3
+
+
+@dataclass
+class RetrievalBudgets:
+    """Candidates each retriever contributes to fusion; 0 turns a retriever off"""
+    vector: int = 20
+    graph: int = 10
+    memory_text: int = 20
+    chunk_vector: int = 10
+    chunk_text: int = 10
+
+    @classmethod
+    def from_config(cls, vector: int) -> "RetrievalBudgets":
+        from app.settings import config
+        return cls(
+            vector=vector,
+            graph=config.HYBRID_GRAPH_CANDIDATES,
+            memory_text=config.HYBRID_MEMORY_TEXT_CANDIDATES,
+            chunk_vector=config.HYBRID_CHUNK_VECTOR_CANDIDATES,
+            chunk_text=config.HYBRID_CHUNK_TEXT_CANDIDATES,
+        )
+
+
+def _tag(results: List[Dict], source_type: str) -> List[Dict]:
+    return [{**result, 'source_type': result.get('source_type', source_type)} for result in results]
+
+
+async def _engine_search(query: str, supa_uid: str, limit: int) -> List[Dict]:
+    """Vector hits fused with graph relations by the engine (graph ones tagged source_type='graph')"""
+    from app.utils.memory import get_async_memory_client
+    from .search_operations import _format_search_results
+    memory_client = await get_async_memory_client()
+    result = await memory_client.search(query, user_id=supa_uid, limit=limit)
+    results = result.get('results', []) if isinstance(result, dict) else (result or [])
+    return _format_search_results(results)
+
+
+def _resolve_user_id(supa_uid: str) -> Optional[str]:
+    """Internal users.id for a Supabase user ID (documents and SQL memories are keyed by it)"""
+    db = SessionLocal()
+    try:
+        user_id = db.query(User.id).filter(User.user_id == supa_uid).scalar()
+        return str(user_id) if user_id else None
+    except Exception as e:
+        logger.warning(f"Could not resolve user {supa_uid} for hybrid search: {e}")
+        return None
+    finally:
+        db.close()
+
+
+def _search_memories_fulltext(query: str, user_id: str, limit: int) -> List[Dict]:
+    """Active memories matching any query word, ranked by ts_rank (GIN expression index)"""
+    from app.settings import config
+    terms = to_any_terms_tsquery(query)
+    if not terms:
+        return []
+
+    # The literal config keeps the expression identical to the index's
+    document = func.to_tsvector(literal_column("'english'"), Memory.content)
+    tsquery = func.to_tsquery(literal_column("'english'"), terms)
+    rank = func.ts_rank(document, tsquery)
+
+    db = SessionLocal()
+    try:
+        with statement_timeout(db, config.CHUNK_SEARCH_TIMEOUT_MS):
+            rows = db.query(
+                Memory.id, Memory.content, Memory.created_at, Memory.metadata_, rank.label("rank")
+            ).filter(
+                Memory.user_id == user_id,
+                Memory.state == MemoryState.active,
+                document.op('@@')(tsquery)
+            ).order_by(rank.desc()).limit(limit).all()
+    except Exception as e:
+        logger.warning(f"Full-text memory search failed or timed out: {e}")
+        db.rollback()
+        return []
+    finally:
+        db.close()
+
+    results = []
+    for row in rows:
+        metadata = dict(row.metadata_ or {})
+        results.append({
+            # The engine's id when known, so the memory links up with vector results
+            'id': str(metadata.get('mem0_id') or row.id),
+            'content': row.content,
+            'created_at': row.created_at.isoformat() if row.created_at else None,
+            'categories': [],
+            'metadata': metadata,
+            'score': float(row.rank),
+        })
+    return results
+
+
+def _search_chunks_fulltext(query: str, user_id: str, limit: int,
+                            document_ids: Optional[List[str]]) -> List[Dict]:
+    db = SessionLocal()
+    try:
+        chunks = ChunkingService().search_chunks_fulltext(
+            db, query, user_id, total_limit=limit,
+            limit_per_doc=_CHUNKS_PER_DOCUMENT, document_ids=document_ids
+        )
+        return [format_chunk_result(chunk, rank) for chunk, rank in chunks]
+    finally:
+        db.close()
+
+
+async def _search_chunks_vector(query: str, supa_uid: str, user_id: str, limit: int,
+                                document_ids: Optional[List[str]]) -> List[Dict]:
+    from app.settings import config
+    from app.utils.memory import get_async_memory_client
+    if not config.CHUNK_EMBEDDINGS_ENABLED:
+        return []
+
+    memory_client = await get_async_memory_client()
+    query_embedding = (await memory_client.embed([query], supa_uid, memory_action="search"))[0]
+
+    def search() -> List[Dict]:
+        db = SessionLocal()
+        try:
+            chunks = ChunkingService().search_chunks_by_embedding(
+                db, query_embedding, user_id, limit, document_ids, limit_per_doc=_CHUNKS_PER_DOCUMENT
+            )
+            return [format_chunk_result(chunk, similarity) for chunk, similarity in chunks]
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    return await asyncio.to_thread(search)
+
+
+async def _timed(name: str, retrieval: Awaitable[List[Dict]]) -> Tuple[str, List[Dict], float]:
+    """Run one retriever; a failing retriever contributes nothing instead of failing the search"""
+    start_time = time.time()
+    try:
+        results = await retrieval
+    except Exception as e:
+        logger.warning(f"Hybrid retriever {name} failed: {e}")
+        results = []
+    return name, results, (time.time() - start_time) * 1000
+
+
+async def hybrid_search(
+    query: str,
+    supa_uid: str,
+    limit: int = 10,
+    budgets: Optional[RetrievalBudgets] = None,
+    engine_results: Optional[List[Dict]] = None,
+    document_ids: Optional[List[str]] = None
+) -> Tuple[List[Dict], Dict[str, Any]]:
+    """
+    Retrieve from every enabled retriever concurrently and fuse the results.
+
+    Args:
+        query: Search query
+        supa_uid: Supabase user ID
+        limit: Maximum number of fused results
+        budgets: Candidates per retriever (defaults from settings, vector = limit)
+        engine_results: Formatted engine search results the caller already has
+            (vector and graph); the engine is not searched again
+        document_ids: Optional list of document IDs to restrict chunk search to
+
+    Returns:
+        (fused results in the search_memory shape, per-retriever counts and latency)
+    """
+    from app.settings import config
+    budgets = budgets or RetrievalBudgets.from_config(vector=limit)
+    start_time = time.time()
+
+    user_id = await asyncio.to_thread(_resolve_user_id, supa_uid)
+
+    retrievals = []
+    if engine_results is None and (budgets.vector or budgets.graph):
+        retrievals.append(_timed("engine", _engine_search(query, supa_uid, max(budgets.vector, budgets.graph))))
+    if user_id and budgets.memory_text:
+        retrievals.append(_timed("memory_text", asyncio.to_thread(
+            _search_memories_fulltext, query, user_id, budgets.memory_text
+        )))
+    if user_id and budgets.chunk_vector:
+        retrievals.append(_timed("chunk_vector", _search_chunks_vector(
+            query, supa_uid, user_id, budgets.chunk_vector, document_ids
+        )))
+    if user_id and budgets.chunk_text:
+        retrievals.append(_timed("chunk_text", asyncio.to_thread(
+            _search_chunks_fulltext, query, user_id, budgets.chunk_text, document_ids
+        )))
+
+    retrieved = {name: (results, elapsed_ms) for name, results, elapsed_ms in await asyncio.gather(*retrievals)}
+
+    engine_ms = None
+    if engine_results is None:
+        engine_results, engine_ms = retrieved.pop("engine", ([], None))
+    latency_ms = {"vector": engine_ms, "graph": engine_ms}
+    latency_ms.update({name: elapsed_ms for name, (results, elapsed_ms) in retrieved.items()})
+    ranked_lists = {
+        "vector": _tag([r for r in engine_results if r.get('source_type') != 'graph'][:budgets.vector], 'vector'),
+        "graph": [r for r in engine_results if r.get('source_type') == 'graph'][:budgets.graph],
+    }
+    for name, (results, elapsed_ms) in retrieved.items():
+        ranked_lists[name] = _tag(results, 'memory_text') if name == "memory_text" else results
+
+    fused = fuse_results(ranked_lists, max_results=limit, k=config.HYBRID_RRF_K)
+
+    stats = {
+        "retrievers": {
+            name: {
+                "count": len(results),
+                "ms": round(latency_ms[name]) if latency_ms.get(name) is not None else None
+            }
+            for name, results in ranked_lists.items()
+        },
+        "total_ms": round((time.time() - start_time) * 1000),
+    }
+    return fused, stats
@@ -14,20 +14,19 @@ from app.models import Memory, MemoryState, User
 from app.utils.db import get_user_and_app
 from app.config.memory_limits import MEMORY_LIMITS
 from app.utils.decorators import retry_on_exception
+from app.utils.mcp_modules.context_packing import pack_memories
+from app.utils.mcp_modules.progress_stream import is_streaming, report_memory_hits, stream_synthesis
 from .utils import safe_json_dumps, track_tool_usage, format_memory_response, format_error_response, format_success_response
 from .chunk_search import (
-    search_document_chunks, 
     extract_document_ids_from_results,
-    merge_search_results,
     should_trigger_deep_search
 )
+from .hybrid_search import hybrid_search
 
 import json
 import time
 
 from mem0.llms.openai import OpenAILLM
-from mem0.llms.base import BaseLlmConfig
-from mem0.llms.gemini import GeminiLLM
 from app.tools.memory_modules.crud_operations import list_memories
 from app.utils.memory import get_async_memory_client
 
@@ -114,65 +113,12 @@ async def _search_memory_unified_impl(query: str, supa_uid: str, client_name: st
             return format_memory_response([], 0, query)
         
         # Format Jean Memory V2 results directly without SQL lookup
-        formatted_memories = []
-        for result in search_results:
-            if isinstance(result, dict):
-                # Extract content from different possible fields
-                content = result.get('memory', result.get('content', result.get('text', '')))
-                
-                # Apply tag filtering if specified
-                if tags_filter:
-                    result_tags = result.get('categories', [])
-                    if not all(tag.lower() in [t.lower() for t in result_tags] for tag in tags_filter):
-                        continue
-                
-                formatted_memories.append({
-                    'id': str(result.get('id', '')),
-                    'content': content,
-                    'created_at': result.get('created_at', result.get('timestamp', '')),
-                    'categories': result.get('categories', []),
-                    'metadata': result.get('metadata', {}),
-                    'score': result.get('score', 0.0)
-                })
-            else:
-                logger.warning(f"Unexpected result format in search: {type(result)}")
-                continue
+        formatted_memories = _format_search_results(search_results, tags_filter)
         
         # Handle deep search if requested or triggered automatically
-        # TEMPORARILY DISABLED: Deep search causing PostgreSQL hangs
-        if False:  # deep_search or await should_trigger_deep_search(query, formatted_memories):
+        if deep_search or await should_trigger_deep_search(query, formatted_memories):
             logger.info(f"Deep search activated for query: {query}")
-            
-            # Extract document IDs from vector results
-            document_ids = extract_document_ids_from_results(formatted_memories)
-            
-            if document_ids:
-                logger.info(f"Searching chunks for {len(document_ids)} documents")
-                
-                # Search through document chunks
-                chunk_results = await search_document_chunks(
-                    query=query,
-                    user_id=supa_uid,
-                    document_ids=list(document_ids),
-                    limit_per_doc=3,
-                    total_limit=15
-                )
-                
-                if chunk_results:
-                    logger.info(f"Found {len(chunk_results)} relevant chunks")
-                    
-                    # Merge vector and chunk results
-                    formatted_memories = merge_search_results(
-                        vector_results=formatted_memories,
-                        chunk_results=chunk_results,
-                        query=query,
-                        max_results=limit
-                    )
-                    
-                    # Add deep search metadata to response
-                    for memory in formatted_memories:
-                        if memory.get('source_type') == 'chunk':
-                            memory['metadata']['deep_search'] = True
+            formatted_memories = await _merge_deep_search_results(query, supa_uid, formatted_memories, limit)
         
         return format_memory_response(formatted_memories, len(formatted_memories), query)
         
@@ -181,6 +127,106 @@ async def _search_memory_unified_impl(query: str, supa_uid: str, client_name: st
         return format_error_response(f"Search failed: {str(e)}", "search_memory")
 
 
+async def _merge_deep_search_results(query: str, supa_uid: str, results: List[dict], limit: int) -> List[dict]:
+    """
+    Deep search: hybrid retrieval over the user's memories (full text) and
+    document chunks (vector and full text), fused with the results by
+    reciprocal rank fusion. Chunk search is scoped to the documents behind
+    the results when there are any.
+    """
+    document_ids = extract_document_ids_from_results(results)
+    logger.info(f"Searching chunks for {len(document_ids) or 'all'} documents")
+    
+    results, stats = await hybrid_search(
+        query,
+        supa_uid,
+        limit=limit,
+        engine_results=results,
+        document_ids=list(document_ids) or None
+    )
+    
+    # Add deep search metadata
+    for result in results:
+        if result.get('source_type') == 'chunk':
+            result['metadata']['deep_search'] = True
+    
+    retrievers = ", ".join(
+        f"{name}={info['count']}" + (f"/{info['ms']}ms" if info['ms'] is not None else "")
+        for name, info in stats['retrievers'].items()
+    )
+    logger.info(f"Deep search took {stats['total_ms']}ms ({retrievers})")
+    track_tool_usage('deep_search', {
+        'duration_ms': stats['total_ms'],
+        'retrievers': stats['retrievers'],
+        'scoped_documents': len(document_ids)
+    })
+    return results
+
+
+def _format_search_results(search_results: list, tags_filter: Optional[List[str]] = None) -> List[dict]:
+    """Convert memory client search results into the search_memory response shape"""
+    formatted_memories = []
+    for result in search_results:
+        if isinstance(result, dict):
+            # Extract content from different possible fields
+            content = result.get('memory', result.get('content', result.get('text', '')))
+            
+            # Apply tag filtering if specified
+            if tags_filter:
+                result_tags = result.get('categories', [])
+                if not all(tag.lower() in [t.lower() for t in result_tags] for tag in tags_filter):
+                    continue
+            
+            formatted_memories.append({
+                'id': str(result.get('id', '')),
+                'content': content,
+                'created_at': result.get('created_at', result.get('timestamp', '')),
+                'categories': result.get('categories', []),
+                'metadata': result.get('metadata', {}),
+                'score': result.get('score', 0.0)
+            })
+            if result.get('embedding') is not None:
+                formatted_memories[-1]['embedding'] = result['embedding']
+            if result.get('source') == 'graph':
+                # A relation from the knowledge graph, fused into the results by the engine
+                formatted_memories[-1]['source_type'] = 'graph'
+        else:
+            logger.warning(f"Unexpected result format in search: {type(result)}")
+    return formatted_memories
+
+
+async def search_memory_batch(queries: List[str], limit: int = None, with_vectors: bool = False) -> List[List[dict]]:
+    """
+    Search several queries for the current user in one round trip.
+    
+    Internal helper for orchestration fan-outs (not an MCP tool): all queries
+    are embedded in one request and searched with one Qdrant batch query.
+    
+    Returns:
+        One list of formatted memories (same shape as search_memory's "memories")
+        per query, in query order. A failed search yields an empty list.
+        with_vectors adds each memory's stored vector as 'embedding'.
+    """
+    supa_uid = user_id_var.get(None)
+    if not supa_uid:
+        raise ValueError("Supabase user_id not available in context")
+    if not queries:
+        return []
+    
+    if limit is None:
+        limit = MEMORY_LIMITS.search_default
+    limit = min(max(1, limit), MEMORY_LIMITS.search_max)
+    
+    track_tool_usage('search_memory_batch', {'query_count': len(queries), 'limit': limit})
+    
+    memory_client = await get_async_memory_client()
+    batch_results = await asyncio.wait_for(
+        memory_client.search_batch(queries, user_id=supa_uid, limit=limit, with_vectors=with_vectors),
+        timeout=30.0
+    )
+    return [_format_search_results(result.get('results', [])) for result in batch_results]
+
+
 async def search_memory_v2(query: str, limit: int = None, tags_filter: Optional[List[str]] = None, deep_search: bool = False) -> str:
     """
     Enhanced memory search with improved ranking and filtering.
@@ -263,41 +309,10 @@ async def _search_memory_v2_impl(query: str, supa_uid: str, client_name: str,
                 logger.warning(f"Unexpected result format in search: {type(result)}")
                 continue
         
-        # Handle deep search if requested
-        # TEMPORARILY DISABLED: Deep search causing PostgreSQL hangs
-        if False:  # deep_search or await should_trigger_deep_search(query, formatted_results):
+        # Handle deep search if requested or triggered automatically
+        if deep_search or await should_trigger_deep_search(query, formatted_results):
             logger.info(f"Deep search activated for v2 query: {query}")
-            
-            # Extract document IDs from vector results
-            document_ids = extract_document_ids_from_results(formatted_results)
-            
-            if document_ids:
-                logger.info(f"Searching chunks for {len(document_ids)} documents")
-                
-                # Search through document chunks
-                chunk_results = await search_document_chunks(
-                    query=query,
-                    user_id=supa_uid,
-                    document_ids=list(document_ids),
-                    limit_per_doc=3,
-                    total_limit=15
-                )
-                
-                if chunk_results:
-                    logger.info(f"Found {len(chunk_results)} relevant chunks")
-                    
-                    # Merge vector and chunk results
-                    formatted_results = merge_search_results(
-                        vector_results=formatted_results,
-                        chunk_results=chunk_results,
-                        query=query,
-                        max_results=limit
-                    )
-                    
-                    # Add deep search metadata
-                    for result in formatted_results:
-                        if result.get('source_type') == 'chunk':
-                            result['metadata']['deep_search'] = True
+            formatted_results = await _merge_deep_search_results(query, supa_uid, formatted_results, limit)
         
         return format_memory_response(formatted_results, len(formatted_results), query)
         
@@ -341,7 +356,10 @@ async def _lightweight_ask_memory_impl(question: str, supa_uid: str, client_name
     
     try:
         memory_client = await get_async_memory_client()
-        llm = GeminiLLM(config=BaseLlmConfig(model="gemini-2.5-flash"))
+        # GeminiService follows the engine profile: scripted offline model under
+        # ENGINE_PROFILE=local, async Gemini Flash calls otherwise
+        from app.utils.gemini import GeminiService
+        gemini_service = GeminiService()
         
         # Simple, direct memory search (the working approach)
         search_start_time = time.time()
@@ -360,12 +378,16 @@ async def _lightweight_ask_memory_impl(question: str, supa_uid: str, client_name
         search_duration = time.time() - search_start_time
         logger.info(f"ask_memory: Memory search completed in {search_duration:.2f}s. Found {len(memories)} memories.")
 
-        # Prepare memories for synthesis
-        memory_texts = []
-        for mem in memories[:30]:  # Limit to 30 for synthesis
+        # Prepare memories for synthesis: deduplicated, diverse, within the Flash token budget
+        synthesis_candidates = []
+        for mem in memories:
             content = mem.get('memory', mem.get('content', ''))
             if content and "SYSTEM DIRECTIVE" not in content and "User provided feedback" not in content:
-                memory_texts.append(f"- {content}")
+                synthesis_candidates.append(mem)
+        packed_memories = pack_memories(synthesis_candidates, "gemini-2.5-flash")
+        memory_texts = [f"- {content}" for content in packed_memories]
+        # Streaming clients get the vector hits now, ahead of synthesis
+        await report_memory_hits(packed_memories)
 
         # Generate response using Gemini 2.5 Flash
         if memory_texts:
@@ -382,7 +404,10 @@ Provide a helpful and conversational answer based on the memories above. If the
 No relevant memories were found. Provide a helpful response indicating that no relevant information was found in their memory."""
         
         synthesis_start_time = time.time()
-        response = llm.generate_response([{"role": "user", "content": prompt}])
+        if is_streaming():
+            response = await stream_synthesis(gemini_service, prompt)
+        else:
+            response = await gemini_service.generate_response(prompt)
         synthesis_duration = time.time() - synthesis_start_time
         
         total_duration = time.time() - start_time
@@ -5,6 +5,8 @@ import time
 from app.mcp_instance import mcp
 from app.context import user_id_var, client_name_var, background_tasks_var
 from app.mcp_orchestration import get_smart_orchestrator
+from app.utils.mcp_modules.deep_analysis_scheduler import get_deep_analysis_scheduler
+from app.utils.mcp_modules.single_flight import get_orchestration_single_flight, make_interaction_id
 from app.analytics import track_tool_usage
 
 
@@ -69,6 +71,15 @@ async def jean_memory(user_message: str, is_new_conversation: bool, needs_contex
     if not client_name:
         return "Error: Client name not available"
 
+    # Client retries of the same message share one in-flight computation
+    interaction_id = make_interaction_id(supa_uid, user_message)
+    return await get_orchestration_single_flight().run(
+        f"jean_memory:{interaction_id}:{is_new_conversation}:{needs_context}:{speed}",
+        lambda: _jean_memory_impl(user_message, supa_uid, client_name, is_new_conversation, needs_context, speed)
+    )
+
+
+async def _jean_memory_impl(user_message: str, supa_uid: str, client_name: str, is_new_conversation: bool, needs_context: bool, speed: str) -> str:
     # --- Speed-based routing ---
     if speed == "fast":
         from app.tools.memory import search_memory
@@ -110,16 +121,11 @@ async def jean_memory(user_message: str, is_new_conversation: bool, needs_contex
             client_name
         )
 
-        # 2. If context is needed, trigger a separate deep analysis in the background.
-        # This task should NOT return a value and runs independently.
+        # 2. If context is needed, request a separate deep analysis in the background.
+        # The scheduler coalesces these per user and runs them within cost budgets.
         if needs_context:
-            logger.info(f"🧠 [Async Analysis] Triggering independent deep analysis for: '{user_message[:50]}...'")
-            background_tasks.add_task(
-                orchestrator.run_deep_analysis_and_save_as_memory,
-                user_message,
-                supa_uid,
-                client_name
-            )
+            logger.info(f"🧠 [Async Analysis] Requesting independent deep analysis for: '{user_message[:50]}...'")
+            get_deep_analysis_scheduler().submit(user_message, supa_uid, client_name)
 
         # --- IMMEDIATE RESPONSE ---
         # This is now cleanly separated and will return the actual context.
@@ -103,8 +103,6 @@ class MemoryModeHandler:
     async def _balanced_mode(self, query: str, config: Dict, user_id: str) -> str:
         """Balanced mode - parallel searches with AI synthesis"""
         from app.utils.memory import get_async_memory_client
-        from mem0.llms.gemini import GeminiLLM
-        from mem0.llms.base import BaseLlmConfig
         
         memory_client = await get_async_memory_client()
         
@@ -175,11 +173,8 @@ class MemoryModeHandler:
         memories: list,
         config: Dict
     ) -> str:
-        """Synthesize memories using Gemini Flash"""
-        from mem0.llms.gemini import GeminiLLM
-        from mem0.llms.base import BaseLlmConfig
-        
-        llm = GeminiLLM(config=BaseLlmConfig(model="gemini-2.5-flash"))
+        """Synthesize memories using Gemini Flash (scripted offline model under ENGINE_PROFILE=local)"""
+        from app.utils.gemini import GeminiService
         
         # Prepare memory content
         memory_texts = []
@@ -199,8 +194,7 @@ Relevant Context:
 Provide a helpful, conversational answer. If memories don't fully answer the question, acknowledge what's known and what's missing."""
         
         try:
-            response = llm.generate_response([{"role": "user", "content": prompt}])
-            return response
+            return await GeminiService().generate_response(prompt)
         except Exception as e:
             logger.error(f"Gemini synthesis failed: {e}")
             return self._format_raw_memories(memories[:10])
@@ -7,6 +7,7 @@ from dotenv import load_dotenv
 from pydantic import BaseModel
 from tenacity import retry, stop_after_attempt, wait_exponential
 from app.utils.prompts import MEMORY_CATEGORIZATION_PROMPT
+from jean_memory.local_engine import get_scripted_llm, is_local_profile
 
 load_dotenv()
 
@@ -25,18 +26,24 @@ def get_openai_client():
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=15))
 def get_categories_for_memory(memory: str) -> List[str]:
     """Get categories for a memory."""
-    openai_client = get_openai_client()
+    messages = [
+        {"role": "system", "content": MEMORY_CATEGORIZATION_PROMPT},
+        {"role": "user", "content": memory}
+    ]
     try:
-        response = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": MEMORY_CATEGORIZATION_PROMPT},
-                {"role": "user", "content": memory}
-            ],
-            response_format={ "type": "json_object" },
-            temperature=0,
-        )
-        response_data = json.loads(response.choices[0].message.content)
+        if is_local_profile():
+            # Offline engine profile: scripted categorization, no OpenAI call
+            content = get_scripted_llm().generate_response(messages, response_format={"type": "json_object"})
+        else:
+            openai_client = get_openai_client()
+            response = openai_client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                response_format={ "type": "json_object" },
+                temperature=0,
+            )
+            content = response.choices[0].message.content
+        response_data = json.loads(content)
         categories = response_data.get('categories', [])
         categories = [cat.strip().lower() for cat in categories if isinstance(cat, str)]
         return categories
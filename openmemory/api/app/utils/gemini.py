@@ -4,7 +4,7 @@ Uses Gemini 2.0 Flash for efficient processing of large documents.
 """
 import os
 import google.generativeai as genai
-from typing import List, Dict, Union
+from typing import AsyncIterator, List, Dict, Union
 from app.models import Document
 import logging
 import asyncio
@@ -15,6 +15,15 @@ logger = logging.getLogger(__name__)
 
 class GeminiService:
     def __init__(self):
+        from jean_memory.local_engine import is_local_profile
+        if is_local_profile():
+            # Offline engine profile: scripted responses, no Gemini API calls
+            from jean_memory.local_engine import LocalGenerativeModel, get_scripted_llm
+            llm = get_scripted_llm()
+            self.model = LocalGenerativeModel(llm, 'gemini-2.5-flash')
+            self.model_pro = LocalGenerativeModel(llm, 'gemini-2.5-pro')
+            return
+        
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             raise ValueError("GEMINI_API_KEY environment variable not set")
@@ -45,6 +54,34 @@ class GeminiService:
             logger.error(f"❌ [GEMINI] API call failed after {time.time() - start_time:.2f}s: {e}")
             raise
 
+    async def generate_response_stream(self, prompt: str) -> AsyncIterator[str]:
+        """Yield the response text as Gemini Flash generates it"""
+        start_time = time.time()
+        logger.info(f"🤖 [GEMINI] Starting streaming API call")
+        
+        try:
+            response = await self.model.generate_content_async(prompt, stream=True)
+            if not hasattr(response, "__aiter__"):
+                # Offline engine profile: the scripted model answers in one piece
+                yield response.text
+                return
+            first_chunk = True
+            async for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunk without text parts (e.g. the final safety/finish metadata)
+                    continue
+                if first_chunk:
+                    logger.info(f"⏱️ [GEMINI] First streamed chunk after {time.time() - start_time:.2f}s")
+                    first_chunk = False
+                yield text
+            logger.info(f"⏱️ [GEMINI] Streaming API call completed: {time.time() - start_time:.2f}s")
+            
+        except Exception as e:
+            logger.error(f"❌ [GEMINI] Streaming API call failed after {time.time() - start_time:.2f}s: {e}")
+            raise
+
     async def query_documents(self, documents: List[Document], query: str) -> str:
         """Query documents using Gemini's long context capabilities"""
         
@@ -9,6 +9,10 @@ import logging
 import re
 from typing import Dict, List
 
+from app.settings import config
+from app.utils.mcp_modules.plan_fast_path import ContextPlanClassifier, PlanCache, log_plan_decision, message_fingerprint
+from app.utils.mcp_modules.single_flight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,6 +21,22 @@ class MCPAIService:
     
     def __init__(self):
         self._gemini_service = None
+        self.plan_cache = PlanCache(config.PLAN_CACHE_SIZE, config.PLAN_CACHE_TTL_SECONDS)
+        self.plan_classifier = ContextPlanClassifier(config.PLAN_CLASSIFIER_MIN_CONFIDENCE)
+        if config.PLAN_DECISION_LOG:
+            self.plan_classifier.load_decisions(config.PLAN_DECISION_LOG)
+        self._plan_stats = {"requests": 0, "cache_hits": 0, "classifier_hits": 0, "llm_calls": 0, "fallbacks": 0}
+        # Shares each message analysis between the foreground plan and background triage
+        self._analysis_flight = SingleFlight(config.MESSAGE_ANALYSIS_TTL_SECONDS)
+    
+    def get_plan_stats(self) -> Dict:
+        """Context planner counters, including how many Gemini calls the fast paths avoided"""
+        stats = dict(self._plan_stats)
+        flight = self._analysis_flight.get_stats()
+        stats["shared_analyses"] = flight["coalesced"] + flight["recent_hits"]
+        stats["llm_calls_avoided"] = stats["cache_hits"] + stats["classifier_hits"] + stats["shared_analyses"]
+        stats["cache_size"] = len(self.plan_cache)
+        return stats
     
     def _get_gemini(self):
         """Lazy load Gemini service"""
@@ -25,11 +45,44 @@ class MCPAIService:
             self._gemini_service = GeminiService()
         return self._gemini_service
     
-    async def create_context_plan(self, user_message: str) -> Dict:
+    async def create_context_plan(self, user_message: str, interaction_id: str = None) -> Dict:
         """
         Uses AI to create a comprehensive context engineering plan for continuing conversations.
         This is the core "brain" of the orchestrator - implementing top-down context theory.
+        The plan is the shared message analysis, so it also carries the memory triage decision.
+        """
+        return await self.analyze_message(user_message, interaction_id)
+    
+    async def analyze_message(self, user_message: str, interaction_id: str = None) -> Dict:
+        """
+        One analysis per message shared by the foreground plan and background triage:
+        context strategy, search queries, whether to save and the memorable content.
+        Concurrent and repeated requests for the same interaction share one result.
+        """
+        key = interaction_id or message_fingerprint(user_message)
+        analysis = await self._analysis_flight.run(f"analysis:{key}", lambda: self._analyze_message(user_message))
+        return dict(analysis)
+    
+    async def _analyze_message(self, user_message: str) -> Dict:
         """
+        Repeated messages are served from the plan cache and obvious ones by the local
+        classifier; everything else goes to Gemini in a single structured call.
+        """
+        self._plan_stats["requests"] += 1
+        
+        cached_plan = self.plan_cache.get(user_message)
+        if cached_plan is not None:
+            self._plan_stats["cache_hits"] += 1
+            logger.info(f"⚡ AI Context Plan served from cache: {cached_plan}")
+            return cached_plan
+        
+        local_plan = self.plan_classifier.classify(user_message)
+        if local_plan is not None:
+            self._plan_stats["classifier_hits"] += 1
+            logger.info(f"⚡ AI Context Plan from local classifier: {local_plan}")
+            return local_plan
+        
+        self._plan_stats["llm_calls"] += 1
         gemini = self._get_gemini()
         
         # Let the AI determine the appropriate strategy based on the message content
@@ -40,9 +93,9 @@ class MCPAIService:
 
 USER MESSAGE: "{safe_message}"
 
-Your role is to determine the appropriate depth of memory context retrieval needed for AI inference. Think about what level of personal context would be most helpful for understanding and responding to this user intelligently.
+You have two jobs: choose how much memory context to retrieve, and decide whether the message should be saved to memory.
 
-Choose the optimal context strategy:
+1. CONTEXT STRATEGY - the depth of memory context retrieval needed for AI inference. Think about what level of personal context would be most helpful for understanding and responding to this user intelligently.
 
 "relevant_context" (Level 2) - Focused memory search
 When the query can be answered with specific, targeted memories. Best for direct questions about known facts, recent events, or specific topics the user has mentioned before.
@@ -58,14 +111,23 @@ Consider:
 - How much personal context is needed to respond thoughtfully?
 - Is this about surface facts or deeper understanding?
 
-Also determine if this message contains content worth remembering for future context.
+2. MEMORY TRIAGE - save ONLY if the message contains new personal information about the user:
+- Personal facts (name, job, location, background, physical attributes)
+- Preferences and opinions (likes, dislikes, beliefs, values)
+- Goals, plans, and aspirations
+- Important life events or experiences
+- Skills, expertise, and knowledge areas
+- Relationships and connections
+- Explicit requests to remember something ("remember that I...")
+
+DO NOT SAVE questions asking for information ("What's my eye color?"), requests for help ("Help me write an email"), general knowledge questions, casual conversation ("Thanks", "OK"), temporary states, or commands without personal context. If the message is asking ABOUT the user rather than TELLING you about the user, do not save it.
 
 Respond with JSON only:
 {{
   "context_strategy": "choose one strategy above",
   "search_queries": ["1-3 specific search terms for memory retrieval"],
   "should_save_memory": true/false,
-  "memorable_content": "key content to remember for future context, or null"
+  "memorable_content": "the specific memorable information, e.g. 'User owns a blue shirt', or null"
 }}"""
 
         try:
@@ -80,16 +142,23 @@ Respond with JSON only:
             if json_match:
                 plan = json.loads(json_match.group())
                 logger.info(f"✅ AI Context Plan: {plan}")
+                self.plan_cache.put(user_message, plan)
+                self.plan_classifier.learn(user_message, plan)
+                if config.PLAN_DECISION_LOG:
+                    log_plan_decision(config.PLAN_DECISION_LOG, user_message, plan)
                 return plan
             else:
                 logger.warning("No JSON found in AI response, using fallback")
+                self._plan_stats["fallbacks"] += 1
                 return self._get_fallback_plan(user_message)
                 
         except asyncio.TimeoutError:
             logger.warning(f"⏰ AI planner timed out after 12s, using fallback")
+            self._plan_stats["fallbacks"] += 1
             return self._get_fallback_plan(user_message)
         except Exception as e:
             logger.error(f"❌ Error creating AI context plan: {e}. Defaulting to simple search.", exc_info=True)
+            self._plan_stats["fallbacks"] += 1
             return self._get_fallback_plan(user_message)
     
     def _get_fallback_plan(self, user_message: str) -> Dict:
@@ -107,11 +176,17 @@ Respond with JSON only:
         else:
             strategy = "relevant_context"    # Short messages get basic search
             
+        # The plan is also the triage decision, so only save substantial messages about the user
+        should_save = len(user_message) > 30 and any(
+            indicator in user_message.lower()
+            for indicator in ['i am', 'i\'m', 'my ', 'i like', 'i work', 'i live']
+        )
+            
         return {
             "context_strategy": strategy,
             "search_queries": [user_message[:50]],  # Simple search using first 50 chars
-            "should_save_memory": len(user_message) > 30,  # Save substantial messages  
-            "memorable_content": user_message if len(user_message) > 30 else None
+            "should_save_memory": should_save,
+            "memorable_content": user_message if should_save else None
         }
     
     async def analyze_memory_content(self, user_message: str) -> Dict:
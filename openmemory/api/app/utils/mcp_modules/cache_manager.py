@@ -3,72 +3,191 @@ Cache management utilities for MCP orchestration.
 Handles session-based context caching and TTL management.
 """
 
+import json
 import logging
-from typing import Dict, Optional
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
 
 logger = logging.getLogger(__name__)
 
+
+def _estimate_bytes(value: Any) -> int:
+    """Approximate in-memory footprint of a cached value by its JSON size"""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return len(str(value))
+
+
+class ContextCache:
+    """
+    LRU + TTL cache of per-user context with an entry count and byte budget.
+
+    Lookups, inserts and evictions are O(1): one OrderedDict keeps recency
+    order and a second keeps write order, which is also expiry order since
+    every entry has the same TTL. Expired entries are dropped lazily on read
+    and swept from the front of the write order at most every sweep_seconds.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 50 * 1024 * 1024,
+                 ttl_seconds: float = 1800, sweep_seconds: float = 60):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sweep_seconds = sweep_seconds
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._write_order: "OrderedDict[str, float]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._owners: Dict[str, str] = {}
+        self._user_keys: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._last_sweep = time.monotonic()
+        self._stats = {"hits": 0, "misses": 0, "expirations": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, cache_key: str) -> Optional[Dict]:
+        cached = self._entries.get(cache_key)
+        if cached is None:
+            self._stats["misses"] += 1
+            return None
+        if time.monotonic() - self._write_order[cache_key] > self.ttl_seconds:
+            self._remove(cache_key)
+            self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(cache_key)
+        self._stats["hits"] += 1
+        return cached
+
+    def put(self, cache_key: str, entry: Dict, user_id: str):
+        size = _estimate_bytes(entry.get("context_data"))
+        if size > self.max_bytes:
+            logger.warning(f"⚠️ [Context Cache] Entry {cache_key} ({size} bytes) exceeds the cache budget, not caching")
+            self._remove(cache_key)
+            return
+
+        self._remove(cache_key)
+        now = time.monotonic()
+        self._entries[cache_key] = entry
+        self._write_order[cache_key] = now
+        self._sizes[cache_key] = size
+        self._owners[cache_key] = user_id
+        self._user_keys.setdefault(user_id, set()).add(cache_key)
+        self._bytes += size
+
+        if now - self._last_sweep > self.sweep_seconds:
+            self._sweep_expired(now)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self._stats["evictions"] += 1
+
+    def _sweep_expired(self, now: float):
+        self._last_sweep = now
+        expired = 0
+        while self._write_order:
+            cache_key, written_at = next(iter(self._write_order.items()))
+            if now - written_at <= self.ttl_seconds:
+                break
+            self._remove(cache_key)
+            expired += 1
+        if expired:
+            self._stats["expirations"] += expired
+            logger.info(f"🧹 [Context Cache] Swept {expired} expired entries")
+
+    def _remove(self, cache_key: str):
+        if self._entries.pop(cache_key, None) is None:
+            return
+        del self._write_order[cache_key]
+        self._bytes -= self._sizes.pop(cache_key)
+        user_id = self._owners.pop(cache_key)
+        user_keys = self._user_keys.get(user_id)
+        if user_keys is not None:
+            user_keys.discard(cache_key)
+            if not user_keys:
+                del self._user_keys[user_id]
+
+    def invalidate_user(self, user_id: str) -> int:
+        """Drop every entry cached for a user; returns how many were dropped"""
+        keys = self._user_keys.pop(user_id, set())
+        for cache_key in list(keys):
+            self._remove(cache_key)
+        if keys:
+            self._stats["invalidations"] += len(keys)
+        return len(keys)
+
+    def clear(self):
+        self._entries.clear()
+        self._write_order.clear()
+        self._sizes.clear()
+        self._owners.clear()
+        self._user_keys.clear()
+        self._bytes = 0
+
+    def get_stats(self) -> Dict:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "cache_size": len(self._entries),
+            "cache_bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_minutes": self.ttl_seconds / 60,
+            "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+
 # Session-based context cache - stores user context profiles
-_context_cache: Dict[str, Dict] = {}
-_cache_ttl_minutes = 30  # Context cache TTL
+_context_cache: Optional[ContextCache] = None
+
+
+def _get_context_cache() -> ContextCache:
+    global _context_cache
+    if _context_cache is None:
+        from app.settings import config
+        _context_cache = ContextCache(
+            max_entries=config.CONTEXT_CACHE_MAX_ENTRIES,
+            max_bytes=config.CONTEXT_CACHE_MAX_BYTES,
+            ttl_seconds=config.CONTEXT_CACHE_TTL_SECONDS,
+        )
+    return _context_cache
 
 
 class ContextCacheManager:
     """Manages context caching for MCP orchestration."""
-    
+
     @staticmethod
     def get_cached_context(cache_key: str) -> Optional[Dict]:
         """Get cached context if it exists and is still valid"""
-        if cache_key not in _context_cache:
-            return None
-        
-        cached = _context_cache[cache_key]
-        cache_time = cached.get('timestamp')
-        if not cache_time:
-            return None
-        
-        # Check if cache is still valid
-        if datetime.now() - cache_time > timedelta(minutes=_cache_ttl_minutes):
-            del _context_cache[cache_key]
-            return None
-        
-        return cached
-    
+        return _get_context_cache().get(cache_key)
+
     @staticmethod
     def update_context_cache(cache_key: str, context_data: Dict, user_id: str):
         """Update the session cache with new context data"""
         try:
-            _context_cache[cache_key] = {
+            _get_context_cache().put(cache_key, {
                 'timestamp': datetime.now(),
                 'user_id': user_id,
                 'context_data': context_data
-            }
-            
-            # Cleanup old cache entries (keep only 100 most recent)
-            if len(_context_cache) > 100:
-                oldest_keys = sorted(_context_cache.keys(), 
-                                   key=lambda k: _context_cache[k]['timestamp'])[:50]
-                for old_key in oldest_keys:
-                    del _context_cache[old_key]
-                    
+            }, user_id)
         except Exception as e:
             logger.error(f"Error updating context cache: {e}")
-    
+
+    @staticmethod
+    def invalidate_user(user_id: str) -> int:
+        """Drop a user's cached context after their memories change"""
+        return _get_context_cache().invalidate_user(user_id)
+
     @staticmethod
     def clear_cache():
         """Clear the context cache (useful for testing)"""
-        global _context_cache
-        _context_cache.clear()
-    
+        _get_context_cache().clear()
+
     @staticmethod
     def get_cache_stats() -> Dict:
         """Get context cache statistics"""
-        return {
-            "cache_size": len(_context_cache),
-            "cache_keys": list(_context_cache.keys()),
-            "ttl_minutes": _cache_ttl_minutes
-        }
+        return _get_context_cache().get_stats()
 
 
 # Convenience functions for backward compatibility
@@ -82,6 +201,11 @@ def update_context_cache(cache_key: str, context_data: Dict, user_id: str):
     return ContextCacheManager.update_context_cache(cache_key, context_data, user_id)
 
 
+def invalidate_user_context(user_id: str) -> int:
+    """Drop a user's cached context after their memories change"""
+    return ContextCacheManager.invalidate_user(user_id)
+
+
 def clear_context_cache():
     """Clear the context cache (useful for testing)"""
     return ContextCacheManager.clear_cache()
@@ -89,4 +213,4 @@ def clear_context_cache():
 
 def get_cache_stats() -> Dict:
     """Get context cache statistics"""
-    return ContextCacheManager.get_cache_stats()
\ No newline at end of file
+    return ContextCacheManager.get_cache_stats()
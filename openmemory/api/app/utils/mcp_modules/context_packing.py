@@ -0,0 +1,152 @@
+"""
+Token-budgeted, diversity-aware packing of retrieved memories into prompts.
+Candidates are deduplicated, then picked greedily by maximal marginal relevance
+(relevance minus similarity to what is already picked) until the target model's
+token budget is full. Stored embeddings are used when the search returned them;
+otherwise texts are compared as hashed bag-of-words vectors.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Rough token estimate for English prose (Gemini and OpenAI tokenizers average ~4 chars/token)
+CHARS_PER_TOKEN = 4
+# Tokens taken by the bullet and newline each packed memory is joined with
+SEPARATOR_TOKENS = 2
+_HASH_DIMS = 1024
+_WORD_RE = re.compile(r"\w+")
+
+
+@dataclass
+class ContextCandidate:
+    """A retrieved memory competing for prompt space"""
+    text: str
+    score: float = 0.0
+    embedding: Optional[Sequence[float]] = None
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def token_budget_for(model: str) -> int:
+    """Memory token budget for prompts sent to the given Gemini model"""
+    from app.settings import config
+    if "pro" in model:
+        return config.CONTEXT_PACK_PRO_TOKENS
+    return config.CONTEXT_PACK_FLASH_TOKENS
+
+
+def _hashed_vectors(texts: List[str]) -> np.ndarray:
+    """Bag-of-words vectors via feature hashing (stable within the process, which is all we compare)"""
+    rows, cols = [], []
+    for row, text in enumerate(texts):
+        for word in _WORD_RE.findall(text.lower()):
+            rows.append(row)
+            cols.append(hash(word) % _HASH_DIMS)
+    vectors = np.zeros((len(texts), _HASH_DIMS), dtype=np.float32)
+    if rows:
+        np.add.at(vectors, (np.asarray(rows), np.asarray(cols)), 1.0)
+    return vectors
+
+
+def _unit_vectors(candidates: List[ContextCandidate]) -> np.ndarray:
+    embeddings = [c.embedding for c in candidates]
+    dims = {len(e) for e in embeddings if e is not None}
+    if all(e is not None for e in embeddings) and len(dims) == 1:
+        vectors = np.asarray(embeddings, dtype=np.float32)
+    else:
+        # Stored and hashed vectors live in different spaces, so one missing embedding means hashing all
+        vectors = _hashed_vectors([c.text for c in candidates])
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _relevance(candidates: List[ContextCandidate]) -> np.ndarray:
+    scores = np.asarray([c.score or 0.0 for c in candidates], dtype=np.float32)
+    spread = float(scores.max() - scores.min())
+    if spread < 1e-9:
+        # No usable scores: keep the caller's order (e.g. most recent first) as the relevance signal
+        return np.linspace(1.0, 0.5, len(candidates), dtype=np.float32)
+    return (scores - scores.min()) / spread
+
+
+def pack_context(
+    candidates: List[ContextCandidate],
+    budget_tokens: int,
+    mmr_lambda: float = 0.7,
+    duplicate_similarity: float = 0.92
+) -> List[ContextCandidate]:
+    """
+    Select candidates for a prompt, most valuable first.
+
+    Exact duplicates are merged (keeping the best score), candidates at least
+    duplicate_similarity (cosine) to an already packed one are dropped, and the
+    rest are picked by MMR with weight mmr_lambda on relevance until nothing
+    else fits in budget_tokens.
+    """
+    best: Dict[str, ContextCandidate] = {}
+    for candidate in candidates:
+        text = candidate.text.strip() if candidate.text else ""
+        if not text:
+            continue
+        key = " ".join(text.lower().split())
+        if key not in best or (candidate.score or 0.0) > (best[key].score or 0.0):
+            best[key] = ContextCandidate(text, candidate.score, candidate.embedding)
+    pool = list(best.values())
+    if not pool or budget_tokens <= 0:
+        return []
+
+    vectors = _unit_vectors(pool)
+    similarity = vectors @ vectors.T
+    relevance = _relevance(pool)
+    tokens = np.asarray([estimate_tokens(c.text) + SEPARATOR_TOKENS for c in pool])
+
+    available = np.ones(len(pool), dtype=bool)
+    max_similarity = np.zeros(len(pool), dtype=np.float32)
+    selected: List[int] = []
+    used = 0
+    while available.any():
+        mmr = mmr_lambda * relevance - (1.0 - mmr_lambda) * max_similarity
+        index = int(np.argmax(np.where(available, mmr, -np.inf)))
+        available[index] = False
+        if max_similarity[index] >= duplicate_similarity or used + tokens[index] > budget_tokens:
+            continue
+        selected.append(index)
+        used += int(tokens[index])
+        max_similarity = np.maximum(max_similarity, similarity[index])
+
+    logger.info(f"📦 [Context Packing] Packed {len(selected)}/{len(candidates)} memories "
+                f"into {used}/{budget_tokens} tokens")
+    return [pool[i] for i in selected]
+
+
+def pack_memories(memories: List[Union[str, Dict[str, Any]]], model: str) -> List[str]:
+    """
+    Pack search results (dicts with content/memory, score and optional embedding)
+    or plain memory strings for a prompt to the given model; returns the texts.
+    """
+    from app.settings import config
+    candidates = []
+    for memory in memories:
+        if isinstance(memory, str):
+            candidates.append(ContextCandidate(memory))
+        else:
+            candidates.append(ContextCandidate(
+                text=memory.get('memory', memory.get('content', '')) or "",
+                score=memory.get('score') or 0.0,
+                embedding=memory.get('embedding')
+            ))
+    packed = pack_context(
+        candidates,
+        token_budget_for(model),
+        mmr_lambda=config.CONTEXT_PACK_MMR_LAMBDA,
+        duplicate_similarity=config.CONTEXT_PACK_DUPLICATE_SIMILARITY
+    )
+    return [candidate.text for candidate in packed]
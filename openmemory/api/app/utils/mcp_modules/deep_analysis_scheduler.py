@@ -0,0 +1,251 @@
+"""
+Budgeted scheduler for autonomous-mode background deep analysis.
+Each analysis runs a full deep_memory_query plus a Gemini Pro synthesis, so
+requests are coalesced per user (one pending, debounced, latest message wins),
+run within per-user and global concurrency and hourly budgets, and dispatched
+stalest-first by the age of the user's last completed analysis.
+"""
+
+import asyncio
+import contextvars
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_HOUR_SECONDS = 3600
+
+
+@dataclass
+class _PendingAnalysis:
+    user_id: str
+    user_message: str
+    client_name: str
+    ready_at: float
+    context: contextvars.Context
+    deferred: bool = False  # Already counted as deferred by the global budget
+
+
+class DeepAnalysisScheduler:
+    """
+    Coalescing priority scheduler for run_deep_analysis_and_save_as_memory.
+
+    - At most one pending and one running analysis per user
+    - Pending analyses wait debounce_seconds after the user's latest message
+    - Users analyzed within min_interval_seconds are skipped
+    - Per-user and global hourly budgets; the global one defers, the per-user one drops
+    - Ready analyses run stalest-first, at most max_concurrency at a time
+      (users not analyzed in the last hour, or min_interval_seconds if longer,
+      count as never analyzed)
+    """
+
+    def __init__(
+        self,
+        run_analysis: Callable[[str, str, str], Awaitable[None]],
+        max_concurrency: int = 2,
+        debounce_seconds: float = 30.0,
+        min_interval_seconds: float = 600.0,
+        user_budget_per_hour: int = 4,
+        global_budget_per_hour: int = 200,
+        max_queue: int = 1000
+    ):
+        self._run_analysis = run_analysis
+        self.max_concurrency = max_concurrency
+        self.debounce_seconds = debounce_seconds
+        self.min_interval_seconds = min_interval_seconds
+        self.user_budget_per_hour = user_budget_per_hour
+        self.global_budget_per_hour = global_budget_per_hour
+        self.max_queue = max_queue
+
+        self._pending: Dict[str, _PendingAnalysis] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._last_completed: Dict[str, float] = {}
+        self._user_starts: Dict[str, Deque[float]] = {}
+        self._global_starts: Deque[float] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._stats = {
+            "submitted": 0, "coalesced": 0, "started": 0, "completed": 0, "failed": 0,
+            "dropped_fresh": 0, "dropped_user_budget": 0, "dropped_queue_full": 0, "deferred_global_budget": 0,
+        }
+
+    def submit(self, user_message: str, user_id: str, client_name: str) -> bool:
+        """
+        Request a deep analysis for a user. Returns False if it was dropped.
+        Must be called from the event loop; the caller's context (user and client
+        context vars) is what the analysis runs with.
+        """
+        now = time.monotonic()
+        self._stats["submitted"] += 1
+
+        last = self._last_completed.get(user_id)
+        if last is not None and now - last < self.min_interval_seconds:
+            self._stats["dropped_fresh"] += 1
+            logger.info(f"⏭️ [Deep Analysis Scheduler] Skipping user {user_id}: analyzed {now - last:.0f}s ago")
+            return False
+
+        if self._user_budget_left(user_id, now) <= 0:
+            self._stats["dropped_user_budget"] += 1
+            logger.info(f"💸 [Deep Analysis Scheduler] Hourly budget exhausted for user {user_id}, dropping analysis")
+            return False
+
+        previous = self._pending.get(user_id)
+        if previous is not None:
+            self._stats["coalesced"] += 1
+        elif len(self._pending) >= self.max_queue:
+            self._stats["dropped_queue_full"] += 1
+            logger.warning(f"⚠️ [Deep Analysis Scheduler] Queue full ({self.max_queue}), dropping analysis for user {user_id}")
+            return False
+
+        # Latest message wins and restarts the debounce window
+        self._pending[user_id] = _PendingAnalysis(
+            user_id=user_id,
+            user_message=user_message,
+            client_name=client_name,
+            ready_at=now + self.debounce_seconds,
+            context=contextvars.copy_context(),
+            deferred=previous is not None and previous.deferred,
+        )
+        self._ensure_dispatcher()
+        self._wakeup.set()
+        return True
+
+    def _user_budget_left(self, user_id: str, now: float) -> int:
+        starts = self._user_starts.get(user_id)
+        if starts is None:
+            return self.user_budget_per_hour
+        while starts and now - starts[0] > _HOUR_SECONDS:
+            starts.popleft()
+        if not starts:
+            del self._user_starts[user_id]
+        return self.user_budget_per_hour - len(starts)
+
+    def _global_budget_left(self, now: float) -> int:
+        while self._global_starts and now - self._global_starts[0] > _HOUR_SECONDS:
+            self._global_starts.popleft()
+        return self.global_budget_per_hour - len(self._global_starts)
+
+    def _staleness(self, user_id: str, now: float) -> float:
+        last = self._last_completed.get(user_id)
+        return float("inf") if last is None else now - last
+
+    def _record_completion(self, user_id: str, now: float):
+        # Re-inserted so the dict stays ordered by completion time, oldest first
+        self._last_completed.pop(user_id, None)
+        self._last_completed[user_id] = now
+        # Older entries no longer make a user fresh, and would grow one per user forever
+        retention = max(self.min_interval_seconds, _HOUR_SECONDS)
+        while self._last_completed:
+            oldest_user, completed_at = next(iter(self._last_completed.items()))
+            if now - completed_at <= retention:
+                break
+            del self._last_completed[oldest_user]
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            # Started from an empty context so it doesn't pin the first caller's context vars
+            self._dispatcher = contextvars.Context().run(asyncio.ensure_future, self._dispatch_loop())
+
+    async def _dispatch_loop(self):
+        while True:
+            self._wakeup.clear()
+            now = time.monotonic()
+            # None: nothing is waiting on a timer, sleep until a submit or a finished analysis
+            timeout = self._dispatch_ready(now)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _dispatch_ready(self, now: float) -> Optional[float]:
+        """Start every analysis the budgets allow; returns seconds until the next one could start"""
+        ready = [
+            p for p in self._pending.values()
+            if p.ready_at <= now and p.user_id not in self._running
+        ]
+        ready.sort(key=lambda p: self._staleness(p.user_id, now), reverse=True)
+
+        for i, pending in enumerate(ready):
+            if len(self._running) >= self.max_concurrency:
+                break
+            if self._global_budget_left(now) <= 0:
+                # Counted once per analysis, not on every dispatch pass while it waits
+                for deferred in ready[i:]:
+                    if not deferred.deferred:
+                        deferred.deferred = True
+                        self._stats["deferred_global_budget"] += 1
+                # Retry when the oldest start leaves the hourly window
+                return max(1.0, _HOUR_SECONDS - (now - self._global_starts[0]))
+            if self._staleness(pending.user_id, now) < self.min_interval_seconds:
+                # Analyzed while this request waited behind the user's running analysis
+                del self._pending[pending.user_id]
+                self._stats["dropped_fresh"] += 1
+                continue
+            if self._user_budget_left(pending.user_id, now) <= 0:
+                del self._pending[pending.user_id]
+                self._stats["dropped_user_budget"] += 1
+                continue
+            del self._pending[pending.user_id]
+            self._start(pending, now)
+
+        waiting = [p.ready_at - now for p in self._pending.values() if p.ready_at > now]
+        return max(0.0, min(waiting)) if waiting else None
+
+    def _start(self, pending: _PendingAnalysis, now: float):
+        self._stats["started"] += 1
+        self._global_starts.append(now)
+        self._user_starts.setdefault(pending.user_id, deque()).append(now)
+        logger.info(f"🧠 [Deep Analysis Scheduler] Starting analysis for user {pending.user_id} "
+                    f"({len(self._pending)} queued, {len(self._running) + 1} running)")
+        task = pending.context.run(asyncio.ensure_future, self._run(pending))
+        self._running[pending.user_id] = task
+
+    async def _run(self, pending: _PendingAnalysis):
+        try:
+            await self._run_analysis(pending.user_message, pending.user_id, pending.client_name)
+            self._record_completion(pending.user_id, time.monotonic())
+            self._stats["completed"] += 1
+        except Exception as e:
+            self._stats["failed"] += 1
+            logger.error(f"❌ [Deep Analysis Scheduler] Analysis failed for user {pending.user_id}: {e}", exc_info=True)
+        finally:
+            self._running.pop(pending.user_id, None)
+            self._wakeup.set()
+
+    async def wait_idle(self, poll_seconds: float = 0.05):
+        """Wait until nothing is queued or running (used by benchmarks and tests)"""
+        while self._pending or self._running:
+            await asyncio.sleep(poll_seconds)
+
+    def get_stats(self) -> Dict:
+        return {
+            **self._stats,
+            "queue_depth": len(self._pending),
+            "running": len(self._running),
+            "global_budget_left": self._global_budget_left(time.monotonic()),
+        }
+
+
+_scheduler = None
+
+
+def get_deep_analysis_scheduler() -> DeepAnalysisScheduler:
+    """Process-wide scheduler running the orchestrator's background deep analysis"""
+    global _scheduler
+    if _scheduler is None:
+        from app.settings import config
+        from app.mcp_orchestration import get_smart_orchestrator
+        _scheduler = DeepAnalysisScheduler(
+            run_analysis=lambda *args: get_smart_orchestrator().run_deep_analysis_and_save_as_memory(*args),
+            max_concurrency=config.DEEP_ANALYSIS_MAX_CONCURRENCY,
+            debounce_seconds=config.DEEP_ANALYSIS_DEBOUNCE_SECONDS,
+            min_interval_seconds=config.DEEP_ANALYSIS_MIN_INTERVAL_SECONDS,
+            user_budget_per_hour=config.DEEP_ANALYSIS_USER_BUDGET_PER_HOUR,
+            global_budget_per_hour=config.DEEP_ANALYSIS_GLOBAL_BUDGET_PER_HOUR,
+            max_queue=config.DEEP_ANALYSIS_MAX_QUEUE,
+        )
+    return _scheduler
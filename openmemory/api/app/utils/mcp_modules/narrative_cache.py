@@ -0,0 +1,71 @@
+"""
+In-process tier of the user narrative cache.
+Sits in front of the user_narratives table: entries are revalidated against
+the row's version periodically instead of re-reading the narrative on every
+new conversation, and users without a narrative are cached too.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class NarrativeEntry:
+    """Cached narrative state for a user; content is None when the user has no narrative"""
+    content: Optional[str]
+    version: Optional[int]
+    generated_at: Optional[datetime]
+    new_memories: int
+    checked_at: float
+
+
+class NarrativeCache:
+    """LRU of NarrativeEntry by Supabase user ID"""
+
+    def __init__(self, max_entries: int = 5000, revalidate_seconds: float = 300):
+        self.max_entries = max_entries
+        self.revalidate_seconds = revalidate_seconds
+        self._entries: "OrderedDict[str, NarrativeEntry]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "revalidations": 0, "reloads": 0, "invalidations": 0}
+
+    def get(self, user_id: str) -> Optional[NarrativeEntry]:
+        """The cached entry, or None if absent or due for revalidation"""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        if time.monotonic() - entry.checked_at > self.revalidate_seconds:
+            self._stats["revalidations"] += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self._stats["hits"] += 1
+        return entry
+
+    def peek(self, user_id: str) -> Optional[NarrativeEntry]:
+        """The cached entry regardless of age (used to revalidate by version)"""
+        return self._entries.get(user_id)
+
+    def put(self, user_id: str, entry: NarrativeEntry):
+        self._entries[user_id] = entry
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def record_reload(self):
+        self._stats["reloads"] += 1
+
+    def invalidate(self, user_id: str):
+        if self._entries.pop(user_id, None) is not None:
+            self._stats["invalidations"] += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        return {**self._stats, "size": len(self._entries)}
@@ -0,0 +1,226 @@
+"""
+Fast paths for MCP context planning.
+Serves context plans without a Gemini call when possible: a cache keyed by
+normalized message fingerprint, and a small in-process Naive Bayes classifier
+that recognizes obvious messages (greetings, acknowledgements, generic
+knowledge questions) and learns from the planner's own decisions.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import re
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+# Plans the classifier may serve on its own. Anything worth saving needs the
+# LLM to extract memorable content, so those labels always escalate.
+FAST_PATH_LABELS = {"relevant_context:skip"}
+
+# Obvious cases the classifier knows before any decisions have been logged
+SEED_EXAMPLES: List[Tuple[str, str]] = [
+    (text, "relevant_context:skip") for text in [
+        "hi", "hello", "hey", "hey there", "hi there", "good morning", "good evening",
+        "hello again", "yo", "sup", "what's up", "how are you", "how's it going",
+        "thanks", "thank you", "thanks a lot", "thank you so much", "ok", "okay",
+        "ok thanks", "got it", "sounds good", "cool", "great", "perfect", "nice",
+        "sure", "yes", "no", "yep", "nope", "makes sense", "awesome thanks", "bye",
+        "see you", "good night", "continue", "go on", "keep going", "next",
+        "what is the capital of france", "how do i reverse a list in python",
+        "what does http stand for", "explain recursion", "what is machine learning",
+        "how many days are in a leap year", "translate hello to spanish",
+        "what is the difference between tcp and udp", "define entropy",
+        "how do i center a div in css", "write a haiku about autumn",
+        "what time zone is tokyo in", "convert 10 miles to kilometers",
+    ]
+] + [
+    (text, "relevant_context:save") for text in [
+        "i just started a new job at a startup", "my sister is getting married in june",
+        "i moved to berlin last month", "i prefer working in the mornings",
+        "remember that i am allergic to peanuts", "my favorite band is radiohead",
+        "i'm training for a marathon", "we adopted a dog named max",
+    ]
+] + [
+    # Questions about the user get their own seed label so they never fast-path
+    # until the planner's logged decisions say otherwise
+    (text, "relevant_context:personal") for text in [
+        "what do you know about my work", "what did i say about my sister",
+        "what are my hobbies", "where do i live", "what projects am i working on",
+        "remind me what my goals were", "what was my favorite band",
+    ]
+] + [
+    (text, "comprehensive_analysis:skip") for text in [
+        "who am i", "tell me everything you know about me", "what are my core values",
+        "summarize my life story", "how have my beliefs changed over time",
+    ]
+]
+
+
+def normalize_message(user_message: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return " ".join(_WORD_RE.findall(user_message.lower()))
+
+
+def message_fingerprint(user_message: str) -> str:
+    """Stable cache key for messages that differ only in case, punctuation or spacing"""
+    return hashlib.md5(normalize_message(user_message).encode()).hexdigest()
+
+
+def plan_label(plan: Dict) -> str:
+    """Classifier label for a context plan: strategy plus whether it saves a memory"""
+    strategy = plan.get("context_strategy", "relevant_context")
+    return f"{strategy}:{'save' if plan.get('should_save_memory') else 'skip'}"
+
+
+class PlanCache:
+    """LRU + TTL cache of context plans keyed by message fingerprint"""
+
+    def __init__(self, max_entries: int = 2000, ttl_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+
+    def get(self, user_message: str) -> Optional[Dict]:
+        key = message_fingerprint(user_message)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, plan = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return dict(plan)
+
+    def put(self, user_message: str, plan: Dict):
+        key = message_fingerprint(user_message)
+        self._entries[key] = (time.monotonic(), dict(plan))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ContextPlanClassifier:
+    """
+    Multinomial Naive Bayes over words, bigrams and a few shape features.
+
+    Predicts the planner's label for a message in microseconds. Only labels in
+    FAST_PATH_LABELS predicted with at least min_confidence are served; the rest
+    escalate to the LLM planner, whose decisions are fed back through learn().
+    """
+
+    def __init__(self, min_confidence: float = 0.9, alpha: float = 0.5):
+        self.min_confidence = min_confidence
+        self.alpha = alpha
+        self._label_counts: Dict[str, int] = defaultdict(int)
+        self._feature_counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._feature_totals: Dict[str, int] = defaultdict(int)
+        self._vocabulary: set = set()
+        for text, label in SEED_EXAMPLES:
+            self.add_example(text, label)
+
+    @staticmethod
+    def _features(user_message: str) -> List[str]:
+        words = normalize_message(user_message).split()
+        features = list(words)
+        features += [f"{a}_{b}" for a, b in zip(words, words[1:])]
+        features.append(f"__len_{min(len(words), 12) // 3}")
+        if words:
+            features.append(f"__first_{words[0]}")
+        if user_message.rstrip().endswith("?"):
+            features.append("__question")
+        return features
+
+    def add_example(self, user_message: str, label: str):
+        self._label_counts[label] += 1
+        for feature in self._features(user_message):
+            self._feature_counts[label][feature] += 1
+            self._feature_totals[label] += 1
+            self._vocabulary.add(feature)
+
+    def learn(self, user_message: str, plan: Dict):
+        """Learn from a plan the LLM planner produced for this message"""
+        self.add_example(user_message, plan_label(plan))
+
+    def load_decisions(self, path: str) -> int:
+        """Train on a plan decision log written by log_plan_decision; returns examples loaded"""
+        loaded = 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        self.learn(record["message"], record["plan"])
+                        loaded += 1
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except FileNotFoundError:
+            return 0
+        logger.info(f"🧠 Plan classifier trained on {loaded} logged decisions from {path}")
+        return loaded
+
+    def predict(self, user_message: str) -> Tuple[Optional[str], float]:
+        """Most likely label and its posterior probability"""
+        features = self._features(user_message)
+        # Messages made only of unseen words carry no evidence beyond the prior
+        if not any(f in self._vocabulary for f in features if not f.startswith("__")):
+            return None, 0.0
+
+        total_examples = sum(self._label_counts.values())
+        vocabulary_size = len(self._vocabulary) + 1
+        scores = {}
+        for label, count in self._label_counts.items():
+            denominator = self._feature_totals[label] + self.alpha * vocabulary_size
+            counts = self._feature_counts[label]
+            score = math.log(count / total_examples)
+            for feature in features:
+                score += math.log((counts.get(feature, 0) + self.alpha) / denominator)
+            scores[label] = score
+
+        best = max(scores, key=scores.get)
+        normalizer = sum(math.exp(score - scores[best]) for score in scores.values())
+        return best, 1.0 / normalizer
+
+    def classify(self, user_message: str) -> Optional[Dict]:
+        """A context plan for obvious messages, or None to escalate to the LLM planner"""
+        label, confidence = self.predict(user_message)
+        if label not in FAST_PATH_LABELS or confidence < self.min_confidence:
+            return None
+        strategy = label.split(":", 1)[0]
+        return {
+            "context_strategy": strategy,
+            "search_queries": [user_message[:50]],
+            "should_save_memory": False,
+            "memorable_content": None,
+            "planner": "local_classifier",
+            "confidence": round(confidence, 3),
+        }
+
+
+def log_plan_decision(path: str, user_message: str, plan: Dict):
+    """Append an LLM plan decision to the JSONL log the classifier trains from"""
+    try:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "timestamp": datetime.now().isoformat(),
+                "message": user_message,
+                "plan": {
+                    "context_strategy": plan.get("context_strategy"),
+                    "should_save_memory": bool(plan.get("should_save_memory")),
+                },
+            }) + "\n")
+    except OSError as e:
+        logger.warning(f"⚠️ Could not log plan decision to {path}: {e}")
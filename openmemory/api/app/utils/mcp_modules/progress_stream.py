@@ -0,0 +1,157 @@
+"""
+Progressive context delivery over MCP progress notifications.
+When a tools/call carries a progressToken and the transport has an open event
+stream, tools report partial results (fast vector hits, then the synthesized
+context as Gemini generates it) before returning the complete result.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.context import progress_reporter_var
+
+logger = logging.getLogger(__name__)
+
+ProgressSink = Callable[[Dict], Awaitable[None]]
+
+# Synthesis deltas are batched into one notification per this many chars or seconds
+_FLUSH_CHARS = 200
+_FLUSH_SECONDS = 0.25
+
+
+class ProgressReporter:
+    """Sends notifications/progress for one tools/call to the transport's sink"""
+
+    def __init__(self, progress_token: Any, sink: ProgressSink):
+        self.progress_token = progress_token
+        self._sink = sink
+        self._progress = 0
+        self._closed = False
+        self._started_at = time.monotonic()
+
+    @property
+    def active(self) -> bool:
+        return not self._closed
+
+    async def report(self, message: str):
+        if self._closed:
+            return
+        self._progress += 1
+        if self._progress == 1:
+            logger.info(f"📡 [Progress] First partial result after {time.monotonic() - self._started_at:.2f}s")
+        try:
+            await self._sink({
+                "jsonrpc": "2.0",
+                "method": "notifications/progress",
+                "params": {
+                    "progressToken": self.progress_token,
+                    "progress": self._progress,
+                    "message": message,
+                },
+            })
+        except Exception as e:
+            # The client went away; the final result still goes through the normal response
+            logger.warning(f"⚠️ [Progress] Dropping progress stream: {e}")
+            self._closed = True
+
+    def close(self):
+        """Stop reporting (background work that inherited the context must not reach the client)"""
+        self._closed = True
+
+
+class HeldProgressReporter:
+    """
+    Stands in for the real reporter in a speculative branch: its progress is
+    buffered until the branch is chosen (release) and dropped if it is discarded (close).
+    """
+
+    def __init__(self, target: ProgressReporter):
+        self._target = target
+        self._buffer: List[str] = []
+        self._released = False
+        self._closed = False
+
+    @property
+    def active(self) -> bool:
+        return not self._closed and self._target.active
+
+    async def report(self, message: str):
+        if self._closed:
+            return
+        if self._released:
+            await self._target.report(message)
+        else:
+            self._buffer.append(message)
+
+    async def release(self):
+        """The branch was chosen: send what it reported so far and pass the rest through"""
+        if self._closed or self._released:
+            return
+        # Reports made while flushing join the buffer, so the order is kept
+        while self._buffer and not self._closed:
+            await self._target.report(self._buffer.pop(0))
+        self._released = True
+
+    def close(self):
+        self._closed = True
+        self._buffer = []
+
+
+def start_with_held_progress(factory: Callable[[], Awaitable[Any]]) -> Tuple[asyncio.Task, Optional[HeldProgressReporter]]:
+    """
+    Start a speculative task whose progress reaches the client only once released.
+    Returns (task, held reporter); the reporter is None when the call isn't streaming.
+    """
+    reporter = progress_reporter_var.get()
+    held = HeldProgressReporter(reporter) if reporter is not None and reporter.active else None
+
+    async def run():
+        # Set inside the task, so only the task's copy of the context sees it
+        progress_reporter_var.set(held)
+        return await factory()
+
+    return asyncio.create_task(run()), held
+
+
+def is_streaming() -> bool:
+    reporter = progress_reporter_var.get()
+    return reporter is not None and reporter.active
+
+
+async def report_progress(message: str):
+    """Report a partial result for the current tool call, if the client is listening"""
+    reporter = progress_reporter_var.get()
+    if reporter is not None:
+        await reporter.report(message)
+
+
+async def report_memory_hits(memories: List[str], limit: int = 10):
+    """Report the fast vector hits, ahead of synthesis"""
+    if not memories or not is_streaming():
+        return
+    hits = "\n".join(f"- {memory}" for memory in memories[:limit])
+    await report_progress(f"Relevant memories:\n{hits}")
+
+
+async def stream_synthesis(gemini_service, prompt: str) -> str:
+    """
+    Generate with Gemini Flash, reporting the text as it arrives; returns the full text.
+    Each notification carries only the new text since the previous one.
+    """
+    parts: List[str] = []
+    pending: List[str] = []
+    pending_chars = 0
+    last_flush = time.monotonic()
+    await report_progress("Synthesized context:\n")
+    async for chunk in gemini_service.generate_response_stream(prompt):
+        parts.append(chunk)
+        pending.append(chunk)
+        pending_chars += len(chunk)
+        if pending_chars >= _FLUSH_CHARS or time.monotonic() - last_flush >= _FLUSH_SECONDS:
+            await report_progress("".join(pending))
+            pending, pending_chars, last_flush = [], 0, time.monotonic()
+    if pending:
+        await report_progress("".join(pending))
+    return "".join(parts)
@@ -0,0 +1,114 @@
+"""
+Single-flight coalescing for MCP orchestration.
+Identical concurrent calls (client retries of the same message) share one
+in-flight computation, and its result is reused for a short window afterwards.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def make_interaction_id(user_id: str, user_message: str) -> str:
+    """Interaction ID for a user's message: the single-flight and deduplication key"""
+    return f"{user_id}_{hashlib.md5(user_message.encode()).hexdigest()}"
+
+
+class SingleFlight:
+    """Runs at most one computation per key; concurrent callers with the same key await it"""
+
+    def __init__(self, result_ttl_seconds: float = 5.0, max_results: int = 1000):
+        self.result_ttl_seconds = result_ttl_seconds
+        self.max_results = max_results
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._results: Dict[str, Tuple[float, Any]] = {}
+        self._stats = {"executions": 0, "coalesced": 0, "recent_hits": 0, "errors": 0}
+
+    def _get_recent(self, key: str):
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        finished_at, result = entry
+        if time.monotonic() - finished_at > self.result_ttl_seconds:
+            del self._results[key]
+            return None
+        return entry
+
+    def _store_result(self, key: str, result: Any):
+        if self.result_ttl_seconds <= 0:
+            return
+        self._results[key] = (time.monotonic(), result)
+        if len(self._results) > self.max_results:
+            now = time.monotonic()
+            expired = [k for k, (t, _) in self._results.items() if now - t > self.result_ttl_seconds]
+            for k in expired:
+                del self._results[k]
+            # Still over the limit with everything fresh: drop the oldest
+            while len(self._results) > self.max_results:
+                del self._results[next(iter(self._results))]
+
+    async def run(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return func()'s result, sharing it with identical calls in flight or finished
+        within result_ttl_seconds. Exceptions reach every waiter and are not reused.
+        """
+        recent = self._get_recent(key)
+        if recent is not None:
+            self._stats["recent_hits"] += 1
+            logger.info(f"♻️ [Single-flight] Reusing result finished {time.monotonic() - recent[0]:.1f}s ago for {key}")
+            return recent[1]
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+            logger.info(f"🔗 [Single-flight] Joining in-flight computation for {key}")
+        else:
+            self._stats["executions"] += 1
+            # Detached from the first caller's task: if that client disconnects,
+            # the computation (and background work it starts) keeps running
+            task = asyncio.get_running_loop().create_task(self._execute(key, func))
+            task.add_done_callback(self._on_done)
+            self._in_flight[key] = task
+
+        # Shielded so a cancelled caller (client disconnect) doesn't cancel the others' result
+        return await asyncio.shield(task)
+
+    async def _execute(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            result = await func()
+            self._store_result(key, result)
+            return result
+        except Exception:
+            self._stats["errors"] += 1
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    @staticmethod
+    def _on_done(task: asyncio.Task):
+        # Every waiter may have been cancelled; consume the outcome so a failure
+        # is logged here rather than as "Task exception was never retrieved"
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"⚠️ [Single-flight] Shared computation failed: {task.exception()}")
+
+    def get_stats(self) -> Dict:
+        return {**self._stats, "in_flight": len(self._in_flight), "recent_results": len(self._results)}
+
+    def clear(self):
+        self._results.clear()
+
+
+_orchestration_single_flight = None
+
+
+def get_orchestration_single_flight() -> SingleFlight:
+    """Shared single-flight group for orchestrate_smart_context and the jean_memory tool"""
+    global _orchestration_single_flight
+    if _orchestration_single_flight is None:
+        from app.settings import config
+        _orchestration_single_flight = SingleFlight(config.SINGLE_FLIGHT_RESULT_TTL_SECONDS)
+    return _orchestration_single_flight
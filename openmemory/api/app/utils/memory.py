@@ -1,6 +1,8 @@
 import os
 import sys
+import asyncio
 import logging
+import threading
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -18,6 +20,7 @@ if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 from jean_memory.mem0_adapter_optimized import get_memory_client_v2_optimized
+from jean_memory.local_engine import is_local_profile
 from app.settings import config  # Import the application config
 
 
@@ -37,11 +40,12 @@ def get_memory_client(custom_instructions: str = None):
         
         # For local development (localhost), QDRANT_API_KEY is optional
         # For cloud deployment, QDRANT_API_KEY is required
-        required_vars = ["QDRANT_HOST", "OPENAI_API_KEY"]
+        # The local engine profile needs no external services at all
+        required_vars = [] if is_local_profile() else ["QDRANT_HOST", "OPENAI_API_KEY"]
         missing_vars = [var for var in required_vars if not os.getenv(var)]
         
         # Check if QDRANT_API_KEY is required (cloud deployment)
-        if qdrant_host and qdrant_host != "localhost" and not qdrant_api_key:
+        if required_vars and qdrant_host and qdrant_host != "localhost" and not qdrant_api_key:
             missing_vars.append("QDRANT_API_KEY")
         
         if missing_vars:
@@ -69,119 +73,188 @@ def get_memory_client(custom_instructions: str = None):
         raise Exception(f"Could not initialize Jean Memory V2 client: {e}")
 
 
+# Environment variables that shape the async client's JeanMemoryConfig.
+# A change in any of them triggers a hot reload of the singleton.
+_ASYNC_CLIENT_ENV_VARS = (
+    "OPENAI_API_KEY", "QDRANT_HOST", "QDRANT_PORT", "QDRANT_API_KEY",
+    "NEO4J_URI", "NEO4J_USER", "NEO4J_PASSWORD", "GEMINI_API_KEY",
+    "QDRANT_STORAGE_MODE", "QDRANT_SHARED_COLLECTION", "QDRANT_SHARED_SHARDS",
+    "MEMORY_CACHE_MAX_SIZE", "MEMORY_CACHE_IDLE_TTL_SECONDS",
+    "ENGINE_MAX_WORKERS", "ENGINE_ADD_CONCURRENCY", "ENGINE_SEARCH_CONCURRENCY",
+    "ENGINE_SEARCH_RESERVED_WORKERS",
+    "ENGINE_OFFLOAD_ENABLED",
+    "EMBEDDING_CACHE_SIZE", "EMBEDDING_CACHE_TTL_SECONDS", "EMBEDDING_CACHE_REDIS_URL",
+    "ENGINE_PROFILE", "LOCAL_LLM_SCRIPT",
+    "LOCAL_LLM_LATENCY_MS", "LOCAL_EMBEDDING_LATENCY_MS", "LOCAL_VECTOR_LATENCY_MS",
+)
+
+# Seconds a replaced client stays open so in-flight requests can finish
+_RELOAD_GRACE_SECONDS = 30
+
+_async_memory_client = None
+_async_memory_client_fingerprint = None
+# A thread lock, not an asyncio.Lock: engine worker threads run their own event
+# loops and an asyncio.Lock is bound to the first loop that waits on it
+_async_memory_client_lock = threading.Lock()
+
+
+def _async_client_fingerprint() -> tuple:
+    """Current values of every env var the async client config depends on"""
+    return tuple(os.getenv(var) for var in _ASYNC_CLIENT_ENV_VARS)
+
+
+def _build_async_client_config():
+    """Validate the environment and build the JeanMemoryConfig for the async client"""
+    from jean_memory.config import JeanMemoryConfig
+    
+    qdrant_host = os.getenv("QDRANT_HOST")
+    qdrant_api_key = os.getenv("QDRANT_API_KEY")
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    
+    # For local development (localhost), QDRANT_API_KEY is optional
+    # For cloud deployment, QDRANT_API_KEY is required
+    # The local engine profile needs no external services at all
+    local_profile = is_local_profile()
+    required_vars = [] if local_profile else ["QDRANT_HOST", "OPENAI_API_KEY"]
+    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    
+    # Check if QDRANT_API_KEY is required (cloud deployment)
+    if not local_profile and qdrant_host and qdrant_host != "localhost" and not qdrant_api_key:
+        missing_vars.append("QDRANT_API_KEY")
+    
+    if missing_vars:
+        raise ValueError(f"Missing required environment variables for Jean Memory V2: {missing_vars}")
+    
+    # Optional: Check for Neo4j variables (used by graph memory)
+    neo4j_vars = ["NEO4J_URI", "NEO4J_USER", "NEO4J_PASSWORD"]
+    if local_profile:
+        logger.info("🔧 [Memory Client] 🧪 Local engine profile - in-process vector index, hashing embedder, scripted LLM")
+    elif not all(os.getenv(var) for var in neo4j_vars):
+        logger.warning("🔧 [Memory Client] ⚠️ Neo4j variables not found - Jean Memory V2 will run in mem0-only mode")
+    
+    config_dict = {
+        'OPENAI_API_KEY': openai_api_key,
+        'QDRANT_HOST': qdrant_host,
+        'QDRANT_PORT': os.getenv("QDRANT_PORT", "6333"),
+        'QDRANT_API_KEY': qdrant_api_key or "",  # Empty string for localhost
+        'NEO4J_URI': os.getenv("NEO4J_URI"),  # May be None if not configured
+        'NEO4J_USER': os.getenv("NEO4J_USER"),  # May be None if not configured
+        'NEO4J_PASSWORD': os.getenv("NEO4J_PASSWORD"),  # May be None if not configured
+        'GEMINI_API_KEY': os.getenv("GEMINI_API_KEY") or "",
+        'QDRANT_STORAGE_MODE': os.getenv("QDRANT_STORAGE_MODE", "per_user"),
+        'QDRANT_SHARED_COLLECTION': os.getenv("QDRANT_SHARED_COLLECTION", "jean_memory_shared"),
+        'QDRANT_SHARED_SHARDS': os.getenv("QDRANT_SHARED_SHARDS", "1"),
+        'MEMORY_CACHE_MAX_SIZE': os.getenv("MEMORY_CACHE_MAX_SIZE", "256"),
+        'MEMORY_CACHE_IDLE_TTL_SECONDS': os.getenv("MEMORY_CACHE_IDLE_TTL_SECONDS", "1800"),
+        'ENGINE_MAX_WORKERS': os.getenv("ENGINE_MAX_WORKERS", "16"),
+        'ENGINE_ADD_CONCURRENCY': os.getenv("ENGINE_ADD_CONCURRENCY", "4"),
+        'ENGINE_SEARCH_CONCURRENCY': os.getenv("ENGINE_SEARCH_CONCURRENCY", "12"),
+        'ENGINE_SEARCH_RESERVED_WORKERS': os.getenv("ENGINE_SEARCH_RESERVED_WORKERS", "4"),
+        'ENGINE_OFFLOAD_ENABLED': os.getenv("ENGINE_OFFLOAD_ENABLED", "true"),
+        'EMBEDDING_CACHE_SIZE': os.getenv("EMBEDDING_CACHE_SIZE", "4096"),
+        'EMBEDDING_CACHE_TTL_SECONDS': os.getenv("EMBEDDING_CACHE_TTL_SECONDS", "86400"),
+        'EMBEDDING_CACHE_REDIS_URL': os.getenv("EMBEDDING_CACHE_REDIS_URL", ""),
+        'ENGINE_PROFILE': os.getenv("ENGINE_PROFILE", "remote"),
+        'LOCAL_LLM_SCRIPT': os.getenv("LOCAL_LLM_SCRIPT", ""),
+        'LOCAL_LLM_LATENCY_MS': os.getenv("LOCAL_LLM_LATENCY_MS", "0"),
+        'LOCAL_EMBEDDING_LATENCY_MS': os.getenv("LOCAL_EMBEDDING_LATENCY_MS", "0"),
+        'LOCAL_VECTOR_LATENCY_MS': os.getenv("LOCAL_VECTOR_LATENCY_MS", "0")
+    }
+    
+    return JeanMemoryConfig.from_dict(config_dict)
+
+
+async def _close_client_later(client, delay: float):
+    """Close a replaced client once in-flight requests have had time to finish"""
+    try:
+        await asyncio.sleep(delay)
+        await client.close()
+        logger.info("🔧 [Memory Client] Closed replaced async memory client")
+    except Exception as e:
+        logger.warning(f"🔧 [Memory Client] Error closing replaced client: {e}")
+
+
 async def get_async_memory_client(custom_instructions: str = None):
     """
-    Initializes and returns an async Jean Memory V2 client with mem0-compatible API.
-    This is the async version for use in FastAPI endpoints with comprehensive logging.
+    Returns the process-wide async Jean Memory V2 client with mem0-compatible API.
+    
+    The client (and with it the collection and memory-instance caches of
+    JeanMemoryAPIOptimized) is built once and reused by every request. It is
+    rebuilt transparently when the environment it was configured from changes.
     """
-    import time
-    init_start = time.time()
+    fingerprint = _async_client_fingerprint()
     
-    logger.info(f"🔧 [Memory Client] ===== INITIALIZING ASYNC MEMORY CLIENT =====")
+    # Fast path: no lock, no logging
+    client = _async_memory_client
+    if client is not None and fingerprint == _async_memory_client_fingerprint:
+        return client
     
-    try:
-        # Import OPTIMIZED async adapter
-        logger.info(f"🔧 [Memory Client] Importing optimized async adapter")
-        from jean_memory.mem0_adapter_optimized import get_async_memory_client_v2_optimized
-        logger.info(f"🔧 [Memory Client] ✅ Import successful")
-        
-        # Verify required environment variables are set (same as sync version)
-        logger.info(f"🔧 [Memory Client] Checking environment variables")
-        qdrant_host = os.getenv("QDRANT_HOST")
-        qdrant_api_key = os.getenv("QDRANT_API_KEY")
-        openai_api_key = os.getenv("OPENAI_API_KEY")
-        
-        logger.info(f"🔧 [Memory Client] QDRANT_HOST: {qdrant_host}")
-        logger.info(f"🔧 [Memory Client] QDRANT_API_KEY: {'***set***' if qdrant_api_key else 'not set'}")
-        logger.info(f"🔧 [Memory Client] OPENAI_API_KEY: {'***set***' if openai_api_key else 'not set'}")
-        
-        # For local development (localhost), QDRANT_API_KEY is optional
-        # For cloud deployment, QDRANT_API_KEY is required
-        required_vars = ["QDRANT_HOST", "OPENAI_API_KEY"]
-        missing_vars = [var for var in required_vars if not os.getenv(var)]
-        
-        # Check if QDRANT_API_KEY is required (cloud deployment)
-        if qdrant_host and qdrant_host != "localhost" and not qdrant_api_key:
-            missing_vars.append("QDRANT_API_KEY")
-        
-        if missing_vars:
-            logger.error(f"🔧 [Memory Client] ❌ Missing environment variables: {missing_vars}")
-            raise ValueError(f"Missing required environment variables for Jean Memory V2: {missing_vars}")
-        
-        logger.info(f"🔧 [Memory Client] ✅ Required environment variables validated")
-        
-        # Optional: Check for Neo4j variables (used by Graphiti backend)
-        neo4j_vars = ["NEO4J_URI", "NEO4J_USER", "NEO4J_PASSWORD"]
-        neo4j_available = all(os.getenv(var) for var in neo4j_vars)
-        
-        logger.info(f"🔧 [Memory Client] Neo4j check: {neo4j_available}")
-        if neo4j_available:
-            neo4j_uri = os.getenv("NEO4J_URI")
-            logger.info(f"🔧 [Memory Client] NEO4J_URI: {neo4j_uri}")
-            logger.info(f"🔧 [Memory Client] NEO4J_USER: {os.getenv('NEO4J_USER')}")
-            logger.info(f"🔧 [Memory Client] NEO4J_PASSWORD: {'***set***' if os.getenv('NEO4J_PASSWORD') else 'not set'}")
-        else:
-            logger.warning(f"🔧 [Memory Client] ⚠️ Neo4j variables not found - Jean Memory V2 will run in mem0-only mode")
-            logger.info(f"🔧 [Memory Client] To enable graph memory, set: NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD")
-        
-        # Validate environment variables
-        logger.info(f"🔧 [Memory Client] Creating Jean Memory V2 configuration")
-        
-        # Create config from current environment variables (FIXED: No hardcoded values)
-        from jean_memory.config import JeanMemoryConfig
+    return await _create_async_memory_client(fingerprint)
+
+
+async def _create_async_memory_client(fingerprint: tuple):
+    """Build (or rebuild) the singleton under a lock so concurrent callers share one client"""
+    global _async_memory_client, _async_memory_client_fingerprint
+    import time
+    
+    # Construction is synchronous (nothing is awaited while the lock is held)
+    with _async_memory_client_lock:
+        # Another request may have finished initialization while we waited
+        if _async_memory_client is not None and fingerprint == _async_memory_client_fingerprint:
+            return _async_memory_client
         
-        # Get actual environment values - NO HARDCODED FALLBACKS
-        neo4j_uri_env = os.getenv("NEO4J_URI")
-        neo4j_user_env = os.getenv("NEO4J_USER") 
-        neo4j_password_env = os.getenv("NEO4J_PASSWORD")
+        init_start = time.time()
+        reloading = _async_memory_client is not None
+        logger.info(f"🔧 [Memory Client] {'Reloading' if reloading else 'Initializing'} async memory client")
         
-        # Validate critical environment variables
-        if not openai_api_key:
-            logger.error(f"🔧 [Memory Client] ❌ OPENAI_API_KEY is required but not set")
-            raise ValueError("OPENAI_API_KEY is required but not set in environment")
+        try:
+            from jean_memory.mem0_adapter_optimized import get_async_memory_client_v2_optimized
             
-        if not qdrant_host:
-            logger.error(f"🔧 [Memory Client] ❌ QDRANT_HOST is required but not set")
-            raise ValueError("QDRANT_HOST is required but not set in environment")
+            config = _build_async_client_config()
+            memory_instance = get_async_memory_client_v2_optimized(config={'jean_memory_config': config})
+        except Exception as e:
+            total_time = time.time() - init_start
+            logger.error(f"🔧 [Memory Client] ❌ INITIALIZATION FAILED after {total_time:.3f}s: {e}", exc_info=True)
+            logger.error(f"🔧 [Memory Client]   - QDRANT_HOST: {os.getenv('QDRANT_HOST')}")
+            logger.error(f"🔧 [Memory Client]   - OPENAI_API_KEY: {'set' if os.getenv('OPENAI_API_KEY') else 'NOT SET'}")
+            logger.error(f"🔧 [Memory Client]   - NEO4J_URI: {os.getenv('NEO4J_URI')}")
+            raise Exception(f"Could not initialize async Jean Memory V2 client: {e}")
         
-        config_dict = {
-            'OPENAI_API_KEY': openai_api_key,  # FIXED: Use actual environment value
-            'QDRANT_HOST': qdrant_host,
-            'QDRANT_PORT': os.getenv("QDRANT_PORT", "6333"),
-            'QDRANT_API_KEY': qdrant_api_key or "",  # Empty string for localhost
-            'NEO4J_URI': neo4j_uri_env,  # May be None if not configured
-            'NEO4J_USER': neo4j_user_env,  # May be None if not configured
-            'NEO4J_PASSWORD': neo4j_password_env,  # May be None if not configured
-            'GEMINI_API_KEY': os.getenv("GEMINI_API_KEY") or ""
-        }
+        previous = _async_memory_client
+        _async_memory_client = memory_instance
+        _async_memory_client_fingerprint = fingerprint
         
-        logger.info(f"🔧 [Memory Client] Configuration dict created with {len(config_dict)} keys")
-        logger.info(f"🔧 [Memory Client] Qdrant configured for: {qdrant_host}:{os.getenv('QDRANT_PORT', '6333')}")
+        if previous is not None:
+            asyncio.create_task(_close_client_later(previous, _RELOAD_GRACE_SECONDS))
         
-        # Create config from environment variables (clean config without hardcoded values)
-        config_start = time.time()
-        config = JeanMemoryConfig.from_dict(config_dict)
-        config_time = time.time() - config_start
-        logger.info(f"🔧 [Memory Client] ✅ Config created in {config_time:.3f}s")
-        
-        # Get async Jean Memory V2 OPTIMIZED adapter with explicit config
-        logger.info(f"🔧 [Memory Client] Initializing optimized memory adapter")
-        adapter_start = time.time()
-        memory_instance = get_async_memory_client_v2_optimized(config={'jean_memory_config': config})
-        adapter_time = time.time() - adapter_start
-        total_time = time.time() - init_start
-        
-        logger.info(f"🔧 [Memory Client] ✅ Adapter initialized in {adapter_time:.3f}s")
-        logger.info(f"🔧 [Memory Client] ===== ASYNC MEMORY CLIENT READY in {total_time:.3f}s =====")
-        logger.info(f"🔧 [Memory Client] Enhanced multi-source memory ready (3-5x faster performance)")
+        logger.info(f"🔧 [Memory Client] ✅ Async memory client ready in {time.time() - init_start:.3f}s")
         return memory_instance
 
+
+async def init_async_memory_client():
+    """Create the singleton at application startup (failures are logged, not fatal)"""
+    try:
+        await get_async_memory_client()
     except Exception as e:
-        total_time = time.time() - init_start
-        # Enhanced logging
-        logger.error(f"🔧 [Memory Client] ❌ INITIALIZATION FAILED after {total_time:.3f}s: {e}", exc_info=True)
-        logger.error(f"🔧 [Memory Client] ❌ Environment check:")
-        logger.error(f"🔧 [Memory Client]   - QDRANT_HOST: {os.getenv('QDRANT_HOST')}")
-        logger.error(f"🔧 [Memory Client]   - OPENAI_API_KEY: {'set' if os.getenv('OPENAI_API_KEY') else 'NOT SET'}")
-        logger.error(f"🔧 [Memory Client]   - NEO4J_URI: {os.getenv('NEO4J_URI')}")
-        raise Exception(f"Could not initialize async Jean Memory V2 client: {e}")
+        logger.warning(f"🔧 [Memory Client] ⚠️ Startup initialization failed, will retry on first use: {e}")
+
+
+async def reload_async_memory_client():
+    """Force a rebuild of the singleton, e.g. after updating configuration at runtime"""
+    global _async_memory_client_fingerprint
+    _async_memory_client_fingerprint = None
+    return await get_async_memory_client()
+
+
+async def close_async_memory_client():
+    """Close the singleton at application shutdown"""
+    global _async_memory_client, _async_memory_client_fingerprint
+    
+    with _async_memory_client_lock:
+        client = _async_memory_client
+        _async_memory_client = None
+        _async_memory_client_fingerprint = None
+    
+    if client is not None:
+        await client.close()
+        logger.info("🔧 [Memory Client] Async memory client closed")
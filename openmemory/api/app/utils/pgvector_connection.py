@@ -300,6 +300,61 @@ def get_pgvector_status() -> Dict[str, Any]:
     return status
 
 
+# pgvector in the application database (document chunk embeddings), checked once per process
+_UNCHECKED = object()
+_app_db_vector_version: Any = _UNCHECKED
+
+
+def get_app_db_pgvector_version(db) -> Optional[str]:
+    """
+    Version of the pgvector extension installed in the application database.
+    
+    Args:
+        db: SQLAlchemy session on the application database
+        
+    Returns:
+        The extension version (e.g. "0.8.0"), or None if it is not installed
+        or the database is not PostgreSQL
+    """
+    global _app_db_vector_version
+    if _app_db_vector_version is not _UNCHECKED:
+        return _app_db_vector_version
+    
+    if db.get_bind().dialect.name != "postgresql":
+        _app_db_vector_version = None
+        return None
+    
+    from sqlalchemy import text
+    try:
+        _app_db_vector_version = db.execute(
+            text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        ).scalar()
+    except Exception as e:
+        logger.warning(f"⚠️ Could not check pgvector in the application database: {e}")
+        db.rollback()
+        return None
+    
+    if _app_db_vector_version:
+        logger.info(f"✅ pgvector {_app_db_vector_version} available for document chunk search")
+    else:
+        logger.warning("⚠️ pgvector not installed in the application database, chunk search uses text matching")
+    return _app_db_vector_version
+
+
+def supports_iterative_index_scans(version: Optional[str]) -> bool:
+    """
+    Whether this pgvector version has iterative index scans (0.8.0+), which keep
+    an HNSW scan going until enough rows pass the query's filters.
+    """
+    if not version:
+        return False
+    try:
+        major, minor = (int(part) for part in version.split(".")[:2])
+    except ValueError:
+        return False
+    return (major, minor) >= (0, 8)
+
+
 # Phase 2 validation function
 def validate_pgvector_for_phase2() -> Tuple[bool, str]:
     """
@@ -66,6 +66,7 @@ from .models import (
     AddMemoryRequest, AddMemoryResponse,
     AddMemoriesBulkRequest, AddMemoriesBulkResponse,
     SearchMemoriesRequest, SearchMemoriesResponse,
+    ListMemoriesResponse,
     ClearMemoriesRequest, ClearMemoriesResponse,
     MemoryItem, MemoryType, SearchStrategy,
     SystemStatus, APIConfig
@@ -101,6 +102,7 @@ __all__ = [
     "AddMemoryRequest", "AddMemoryResponse",
     "AddMemoriesBulkRequest", "AddMemoriesBulkResponse", 
     "SearchMemoriesRequest", "SearchMemoriesResponse",
+    "ListMemoriesResponse",
     "ClearMemoriesRequest", "ClearMemoriesResponse",
     "MemoryItem", "MemoryType", "SearchStrategy",
     "SystemStatus", "APIConfig",
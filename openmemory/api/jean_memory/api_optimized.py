@@ -14,28 +14,50 @@ PERFORMANCE OPTIMIZATIONS:
 """
 
 import asyncio
+import copy
+import hashlib
 import json
 import logging
+import os
+import threading
 import time
 import traceback
 from typing import List, Optional, Dict, Any, Union, Set
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
 from .models import (
     AddMemoryRequest, AddMemoryResponse,
     AddMemoriesBulkRequest, AddMemoriesBulkResponse,
     SearchMemoriesRequest, SearchMemoriesResponse,
+    ListMemoriesResponse,
     ClearMemoriesRequest, ClearMemoriesResponse,
     MemoryItem, MemoryType, SearchStrategy, SystemStatus,
     DatabaseStatus, APIError, APIConfig
 )
 from .config import JeanMemoryConfig
 from .exceptions import ConfigurationError
+from .memory_cache import MemoryInstanceCache
+from .bulk_ingest import build_batch_extraction_messages, parse_batch_extraction
+from .engine_executor import EngineExecutor
+from .embedding_cache import CachingEmbedder, EmbeddingCache, embed_texts
+from .fusion import content_hash
+from .local_engine import LOCAL_EMBEDDING_MODEL, create_local_qdrant_client, install_local_models
 
 
 logger = logging.getLogger(__name__)
 
+# mem0 payload keys that are not user metadata (mirrors mem0's get_all)
+_MEM0_CORE_PAYLOAD_KEYS = {"data", "hash", "created_at", "updated_at", "user_id", "agent_id", "run_id", "actor_id", "role"}
+
+# Cursor prefixes: newest-first listings page by (created_at, point id), the fallback by point id
+_CURSOR_CREATED_AT = "t:"
+_CURSOR_OFFSET = "o:"
+
+# Graph relations carry no similarity score; in mixed results they rank after the
+# vector hits, scored at most this fraction of the weakest vector hit
+_GRAPH_SCORE_WEIGHT = 0.5
+
 
 class JeanMemoryAPIOptimized:
     """
@@ -71,16 +93,50 @@ class JeanMemoryAPIOptimized:
         
         self.config = config
         # Graph storage re-enabled - Neo4j connection is working!
-        default_api_config = APIConfig(enable_graph_storage=True)
+        # (the local profile has no graph store)
+        default_api_config = APIConfig(enable_graph_storage=not config.is_local_profile)
         self.api_config = api_config or default_api_config
         
         # Optimization: Track collection states to avoid repeated checks
-        self._collection_states: Dict[str, bool] = {}  # user_id -> collection_ready
+        self._collection_states: Dict[str, bool] = {}  # collection_name -> collection_ready
         self._collection_creating: Set[str] = set()  # Currently creating collections
         
         # Initialize components
-        self._mem0_memory = None
-        self._user_memory_cache: Dict[str, Any] = {}  # Cache user memory instances
+        # Clients shared by every memory instance: the first Memory built is the
+        # template whose embedder/LLM/graph/history clients all others reuse
+        # The local profile's in-process index lives inside its client, so it is
+        # created up front: a second lazily-built client would be an empty store
+        self._qdrant_client = (
+            create_local_qdrant_client(config.local_vector_latency_ms) if config.is_local_profile else None
+        )
+        self._base_memory = None
+        self._user_memory_cache = MemoryInstanceCache(  # collection_name -> Memory
+            max_size=config.memory_cache_max_size,
+            idle_ttl_seconds=config.memory_cache_idle_ttl_seconds,
+            on_evict=self._release_memory_instance
+        )
+        self._instance_build_lock = threading.Lock()
+        self._embedding_cache = EmbeddingCache(
+            max_size=config.embedding_cache_size,
+            ttl_seconds=config.embedding_cache_ttl_seconds,
+            redis_url=config.embedding_cache_redis_url
+        ) if config.embedding_cache_size > 0 else None
+        
+        # mem0, Qdrant and the LLM clients are synchronous: every call into them
+        # goes through this pool so the event loop keeps serving other requests
+        self._executor = EngineExecutor(
+            max_workers=config.engine_max_workers,
+            operation_limits={
+                "add": config.engine_add_concurrency,
+                "search": config.engine_search_concurrency,
+                "llm": config.engine_search_concurrency,
+                # Bulk document embedding must not crowd out interactive searches
+                "embed": config.engine_add_concurrency,
+            },
+            inline=not config.engine_offload_enabled,
+            reserved_workers=config.engine_search_reserved_workers,
+            priority_operations=("search", "llm")
+        )
         self._initialized = False
         
         logger.info(f"Jean Memory V2 API OPTIMIZED v{self.VERSION} initialized")
@@ -102,6 +158,31 @@ class JeanMemoryAPIOptimized:
             logger.error(f"❌ Jean Memory V2 API initialization failed: {e}")
             raise
     
+    def _create_qdrant_client(self):
+        """Create a Qdrant client for the configured deployment"""
+        from qdrant_client import QdrantClient
+        
+        # Handle localhost (no auth) vs cloud (with auth) environments
+        if self.config.qdrant_api_key:
+            return QdrantClient(url=self.config.qdrant_url, api_key=self.config.qdrant_api_key)
+        # Local development - no API key needed
+        return QdrantClient(url=self.config.qdrant_url)
+    
+    def _get_qdrant_client(self):
+        """Qdrant client shared by collection setup and all memory instances"""
+        if self._qdrant_client is None:
+            self._qdrant_client = self._create_qdrant_client()
+        return self._qdrant_client
+    
+    def _invalidate_user_caches(self, user_id: str) -> None:
+        """Drop cached collection state and memory instance for a user"""
+        if self.config.uses_shared_collection:
+            # Shared collections and their instances serve other users too
+            return
+        collection_name = self.config.get_collection_name(user_id)
+        self._collection_states.pop(collection_name, None)
+        self._user_memory_cache.pop(collection_name, None)
+    
     async def _ensure_collection_ready_optimized(self, user_id: str) -> str:
         """
         OPTIMIZED collection readiness check with smart caching and no waits
@@ -112,105 +193,42 @@ class JeanMemoryAPIOptimized:
         3. Skip index wait statements
         4. Only check/create when absolutely necessary
         
+        In shared storage mode every user maps onto one of a fixed set of
+        collections, so this only round-trips to Qdrant once per shard.
+        
         Args:
             user_id: User ID for collection naming
             
         Returns:
             Collection name (always succeeds)
         """
-        collection_name = f"mem0_{user_id}"
+        collection_name = self.config.get_collection_name(user_id)
         
         # Optimization 1: Check cache first
-        if self._collection_states.get(user_id, False):
+        if self._collection_states.get(collection_name, False):
             logger.debug(f"✅ Collection {collection_name} ready (cached)")
             return collection_name
         
         # Optimization 2: If another request is creating this collection, wait briefly
-        if user_id in self._collection_creating:
+        if collection_name in self._collection_creating:
             logger.debug(f"⏳ Collection {collection_name} being created by another request")
             for _ in range(10):  # Wait max 1 second (0.1s * 10)
-                if self._collection_states.get(user_id, False):
+                if self._collection_states.get(collection_name, False):
                     return collection_name
                 await asyncio.sleep(0.1)
         
         # Optimization 3: Quick collection creation without waits
         try:
-            self._collection_creating.add(user_id)
+            self._collection_creating.add(collection_name)
+            client = self._get_qdrant_client()
             
-            from qdrant_client import QdrantClient
-            from qdrant_client.http import models
-            
-            # Handle localhost (no auth) vs cloud (with auth) environments
-            if self.config.qdrant_api_key:
-                client = QdrantClient(url=self.config.qdrant_url, api_key=self.config.qdrant_api_key)
-            else:
-                # Local development - no API key needed
-                client = QdrantClient(url=self.config.qdrant_url)
-            
-            # Quick existence check
-            try:
-                collections = client.get_collections().collections
-                collection_names = [col.name for col in collections]
-                collection_exists = collection_name in collection_names
-            except Exception:
-                collection_exists = False
-            
-            if not collection_exists:
-                logger.info(f"🆕 Creating collection {collection_name} (no wait)")
-                
-                # Create collection without waiting
-                client.create_collection(
-                    collection_name=collection_name,
-                    vectors_config=models.VectorParams(
-                        size=1536,
-                        distance=models.Distance.COSINE
-                    )
-                )
-                
-                # Create both keyword AND UUID indexes (both required for user isolation)
-                indexes_created = 0
-                try:
-                    client.create_payload_index(
-                        collection_name=collection_name,
-                        field_name="user_id",
-                        field_schema=models.PayloadSchemaType.KEYWORD,
-                    )
-                    logger.info(f"✅ user_id KEYWORD index created for {collection_name}")
-                    indexes_created += 1
-                except Exception as e:
-                    if "already exists" not in str(e).lower():
-                        logger.warning(f"KEYWORD index creation issue: {e}")
-                
-                try:
-                    client.create_payload_index(
-                        collection_name=collection_name,
-                        field_name="user_id",
-                        field_schema=models.PayloadSchemaType.UUID,
-                    )
-                    logger.info(f"✅ user_id UUID index created for {collection_name}")
-                    indexes_created += 1
-                except Exception as e:
-                    if "already exists" not in str(e).lower():
-                        logger.warning(f"UUID index creation issue: {e}")
-                
-                logger.info(f"✅ Collection and {indexes_created} indexes created for {collection_name} (no wait)")
+            if self.config.uses_shared_collection:
+                await self._executor.run("collection", self._ensure_shared_collection, client, collection_name)
             else:
-                # CRITICAL FIX: Ensure existing collections have required user_id indexes
-                # This fixes collections created before index setup existed
-                logger.info(f"🔧 Collection {collection_name} exists - ensuring indexes")
-                try:
-                    client.create_payload_index(
-                        collection_name=collection_name,
-                        field_name="user_id",
-                        field_schema=models.PayloadSchemaType.KEYWORD,
-                    )
-                    logger.info(f"✅ user_id KEYWORD index ensured for existing collection {collection_name}")
-                except Exception as idx_e:
-                    if "already exists" not in str(idx_e).lower():
-                        logger.warning(f"Index ensure issue for existing collection: {idx_e}")
+                await self._executor.run("collection", self._ensure_per_user_collection, client, collection_name)
             
             # OPTIMIZATION: No wait! Mark as ready immediately
-            self._collection_states[user_id] = True
+            self._collection_states[collection_name] = True
             logger.info(f"✅ Collection {collection_name} marked ready (optimized)")
             
             return collection_name
@@ -221,92 +239,382 @@ class JeanMemoryAPIOptimized:
             # Let mem0 handle any remaining setup
             return collection_name
         finally:
-            self._collection_creating.discard(user_id)
+            self._collection_creating.discard(collection_name)
+    
+    def _ensure_per_user_collection(self, client, collection_name: str) -> None:
+        """Create (or repair indexes on) a legacy mem0_{user_id} collection"""
+        from qdrant_client.http import models
+        
+        # Quick existence check
+        try:
+            collection_exists = client.collection_exists(collection_name)
+        except Exception:
+            collection_exists = False
+        
+        if not collection_exists:
+            logger.info(f"🆕 Creating collection {collection_name} (no wait)")
+            
+            # Create collection without waiting
+            client.create_collection(
+                collection_name=collection_name,
+                vectors_config=models.VectorParams(
+                    size=1536,
+                    distance=models.Distance.COSINE
+                )
+            )
+            
+            # Create both keyword AND UUID indexes (both required for user isolation)
+            indexes_created = 0
+            try:
+                client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name="user_id",
+                    field_schema=models.PayloadSchemaType.KEYWORD,
+                )
+                logger.info(f"✅ user_id KEYWORD index created for {collection_name}")
+                indexes_created += 1
+            except Exception as e:
+                if "already exists" not in str(e).lower():
+                    logger.warning(f"KEYWORD index creation issue: {e}")
+            
+            try:
+                client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name="user_id",
+                    field_schema=models.PayloadSchemaType.UUID,
+                )
+                logger.info(f"✅ user_id UUID index created for {collection_name}")
+                indexes_created += 1
+            except Exception as e:
+                if "already exists" not in str(e).lower():
+                    logger.warning(f"UUID index creation issue: {e}")
+            
+            self._ensure_created_at_index(client, collection_name)
+            logger.info(f"✅ Collection and {indexes_created} indexes created for {collection_name} (no wait)")
+        else:
+            # CRITICAL FIX: Ensure existing collections have required user_id indexes
+            # This fixes collections created before index setup existed
+            logger.info(f"🔧 Collection {collection_name} exists - ensuring indexes")
+            try:
+                client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name="user_id",
+                    field_schema=models.PayloadSchemaType.KEYWORD,
+                )
+                logger.info(f"✅ user_id KEYWORD index ensured for existing collection {collection_name}")
+            except Exception as idx_e:
+                if "already exists" not in str(idx_e).lower():
+                    logger.warning(f"Index ensure issue for existing collection: {idx_e}")
+            self._ensure_created_at_index(client, collection_name)
+    
+    def _ensure_shared_collection(self, client, collection_name: str) -> None:
+        """
+        Create a shared multi-tenant collection partitioned by user_id.
+        
+        The global HNSW graph is disabled (m=0) and replaced by per-tenant
+        graphs (payload_m), and user_id is a tenant keyword index, so every
+        search stays scoped to one user's segment of the collection.
+        """
+        from qdrant_client.http import models
+        
+        try:
+            collection_exists = client.collection_exists(collection_name)
+        except Exception:
+            collection_exists = False
+        
+        if collection_exists:
+            # The collection may have been created elsewhere with default settings
+            # (e.g. by mem0's own constructor), so verify rather than trust it
+            logger.debug(f"🔧 Shared collection {collection_name} exists - verifying tenant setup")
+            self._verify_shared_collection(client, collection_name)
+            self._ensure_created_at_index(client, collection_name)
+            return
+        
+        logger.info(f"🆕 Creating shared multi-tenant collection {collection_name}")
+        client.create_collection(
+            collection_name=collection_name,
+            vectors_config=models.VectorParams(
+                size=1536,
+                distance=models.Distance.COSINE
+            ),
+            hnsw_config=models.HnswConfigDiff(payload_m=16, m=0),
+        )
+        self._ensure_tenant_index(client, collection_name)
+        self._ensure_created_at_index(client, collection_name)
+    
+    def _verify_shared_collection(self, client, collection_name: str) -> None:
+        """Repair the tenant index and per-tenant HNSW config of an existing shared collection"""
+        from qdrant_client.http import models
+        
+        try:
+            info = client.get_collection(collection_name)
+        except Exception as e:
+            logger.warning(f"Could not inspect shared collection {collection_name}: {e}")
+            self._ensure_tenant_index(client, collection_name)
+            return
+        
+        user_id_index = (info.payload_schema or {}).get("user_id")
+        index_params = getattr(user_id_index, "params", None)
+        if not getattr(index_params, "is_tenant", False):
+            logger.warning(f"⚠️ Shared collection {collection_name} has no user_id tenant index - creating it")
+            self._ensure_tenant_index(client, collection_name)
+        
+        hnsw = info.config.hnsw_config
+        if hnsw.m != 0 or hnsw.payload_m != 16:
+            logger.warning(f"⚠️ Shared collection {collection_name} has HNSW m={hnsw.m}, "
+                           f"payload_m={hnsw.payload_m} - switching to per-tenant graphs")
+            try:
+                client.update_collection(
+                    collection_name=collection_name,
+                    hnsw_config=models.HnswConfigDiff(payload_m=16, m=0),
+                )
+            except Exception as e:
+                logger.warning(f"HNSW config update issue for {collection_name}: {e}")
+    
+    def _ensure_tenant_index(self, client, collection_name: str) -> None:
+        """Keyword index on user_id flagged as the tenant key"""
+        from qdrant_client.http import models
+        
+        try:
+            client.create_payload_index(
+                collection_name=collection_name,
+                field_name="user_id",
+                field_schema=models.KeywordIndexParams(
+                    type=models.KeywordIndexType.KEYWORD,
+                    is_tenant=True,
+                ),
+            )
+            logger.info(f"✅ user_id tenant index created for {collection_name}")
+        except Exception as e:
+            if "already exists" not in str(e).lower():
+                logger.warning(f"Tenant index creation issue: {e}")
+    
+    def _ensure_created_at_index(self, client, collection_name: str) -> None:
+        """Datetime index on created_at, required for newest-first scroll ordering"""
+        from qdrant_client.http import models
+        
+        try:
+            client.create_payload_index(
+                collection_name=collection_name,
+                field_name="created_at",
+                field_schema=models.PayloadSchemaType.DATETIME,
+            )
+        except Exception as e:
+            if "already exists" not in str(e).lower():
+                logger.warning(f"created_at index creation issue: {e}")
+    
+    def _build_memory_config(self, collection_name: str) -> Dict[str, Any]:
+        """mem0 config for a collection, reusing the shared Qdrant client"""
+        if self.config.is_local_profile:
+            return self._build_local_memory_config(collection_name)
+        
+        # Optimization: Start with vector-only config for speed
+        qdrant_config = {
+            "url": self.config.qdrant_url,
+            "collection_name": collection_name,
+            "client": self._get_qdrant_client()
+        }
+        # Only add API key for cloud environments (not localhost)
+        if self.config.qdrant_api_key:
+            qdrant_config["api_key"] = self.config.qdrant_api_key
+        
+        user_config = {
+            "vector_store": {
+                "provider": "qdrant",
+                "config": qdrant_config
+            },
+            "llm": {
+                "provider": "openai",
+                "config": {
+                    "api_key": self.config.openai_api_key,
+                    "model": "gpt-4o-mini"
+                }
+            },
+            "embedder": {
+                "provider": "openai", 
+                "config": {
+                    "api_key": self.config.openai_api_key,
+                    "model": "text-embedding-3-small"
+                }
+            },
+            "version": "v1.1"
+        }
+        
+        # Optimization: Only add graph store if specifically requested and not rate limited
+        if self.api_config.enable_graph_storage:
+            user_config["graph_store"] = {
+                "provider": "neo4j",
+                "config": {
+                    "url": self.config.neo4j_uri,
+                    "username": self.config.neo4j_user,
+                    "password": self.config.neo4j_password
+                }
+            }
+        
+        return user_config
+    
+    def _build_local_memory_config(self, collection_name: str) -> Dict[str, Any]:
+        """
+        mem0 config for the local profile. The OpenAI providers only satisfy
+        mem0's config validation; install_local_models swaps them out before use.
+        """
+        return {
+            "vector_store": {
+                "provider": "qdrant",
+                "config": {
+                    "collection_name": collection_name,
+                    "path": ":memory:",
+                    "client": self._get_qdrant_client()
+                }
+            },
+            "llm": {
+                "provider": "openai",
+                "config": {"api_key": "sk-local", "model": "gpt-4o-mini"}
+            },
+            "embedder": {
+                "provider": "openai",
+                "config": {"api_key": "sk-local", "model": LOCAL_EMBEDDING_MODEL}
+            },
+            "history_db_path": ":memory:",
+            "version": "v1.1"
+        }
+    
+    def _create_memory_instance(self, collection_name: str):
+        """Build a standalone mem0 Memory with its own embedder/LLM/graph clients"""
+        if self.config.is_local_profile:
+            os.environ.setdefault("MEM0_TELEMETRY", "False")
+        from mem0 import Memory
+        
+        user_config = self._build_memory_config(collection_name)
+        graph_mode = "vector+graph" if "graph_store" in user_config else "vector-only"
+        logger.info(f"🔧 Creating {graph_mode} memory instance for {collection_name}")
+        
+        memory = Memory.from_config(config_dict=user_config)
+        if self.config.is_local_profile:
+            install_local_models(
+                memory, self.config.local_llm_script,
+                llm_latency_ms=self.config.local_llm_latency_ms,
+                embedding_latency_ms=self.config.local_embedding_latency_ms
+            )
+        self._install_embedding_cache(memory, user_config["embedder"]["config"]["model"])
+        
+        # Log memory instance details for debugging
+        logger.info(f"🔍 mem0 Memory instance details:")
+        logger.info(f"   - API version: {getattr(memory, 'api_version', 'unknown')}")
+        logger.info(f"   - enable_graph: {getattr(memory, 'enable_graph', 'unknown')}")
+        logger.info(f"   - graph_store type: {type(getattr(memory, 'graph_store', None))}")
+        return memory
+    
+    def _install_embedding_cache(self, memory: Any, model: str) -> None:
+        """Route the instance's (and its graph's) embedder through the shared embedding cache"""
+        if self._embedding_cache is None:
+            return
+        for owner in (memory, getattr(memory, 'graph', None)):
+            embedder = getattr(owner, 'embedding_model', None)
+            if embedder is not None and not isinstance(embedder, CachingEmbedder):
+                owner.embedding_model = CachingEmbedder(embedder, self._embedding_cache, model)
+    
+    def _clone_memory_instance(self, collection_name: str):
+        """
+        Derive a Memory for another collection from the template instance.
+        
+        Only the vector store binding differs; embedder, LLM, graph and history
+        clients are shared, so an extra user costs a few objects, not a client stack.
+        """
+        from mem0.utils.factory import VectorStoreFactory
+        
+        try:
+            memory = copy.copy(self._base_memory)
+            memory.vector_store = VectorStoreFactory.create("qdrant", {
+                "collection_name": collection_name,
+                "embedding_model_dims": 1536,
+                "client": self._get_qdrant_client()
+            })
+            memory.collection_name = collection_name
+            return memory
+        except Exception as e:
+            logger.warning(f"⚠️ Could not share clients for {collection_name}, building standalone instance: {e}")
+            return self._create_memory_instance(collection_name)
+    
+    def _release_memory_instance(self, collection_name: str, memory: Any) -> None:
+        """Close clients owned by an evicted instance (shared clients stay open)"""
+        base = self._base_memory
+        if memory is base:
+            return
+        
+        vector_client = getattr(getattr(memory, 'vector_store', None), 'client', None)
+        if vector_client is not None and vector_client is not self._qdrant_client:
+            _close_quietly(vector_client)
+        if base is None or getattr(memory, 'graph', None) is not getattr(base, 'graph', None):
+            _close_quietly(getattr(getattr(memory, 'graph', None), 'graph', None))
+        if base is None or getattr(memory, 'db', None) is not getattr(base, 'db', None):
+            _close_quietly(getattr(memory, 'db', None))
+        logger.debug(f"♻️ Released memory instance for {collection_name}")
+    
+    def _build_memory_instance(self, collection_name: str):
+        """Create the template instance on first use, clone it afterwards (runs on the engine pool)"""
+        with self._instance_build_lock:
+            if self._base_memory is None:
+                self._base_memory = self._create_memory_instance(collection_name)
+                return self._base_memory
+        return self._clone_memory_instance(collection_name)
     
     async def _get_user_memory_instance_optimized(self, user_id: str):
         """
         OPTIMIZED user memory instance creation with caching
         
         Key optimizations:
-        1. Cache memory instances to avoid recreation
-        2. Lazy Graphiti initialization  
+        1. Bounded LRU cache of instances keyed by collection (one per shard in shared mode)
+        2. Embedder/LLM/Qdrant/Neo4j clients shared across all instances
         3. Only create what's needed when needed
         """
+        collection_name = self.config.get_collection_name(user_id)
+        self._user_memory_cache.evict_idle()
+        
         # Optimization: Check cache first
-        if user_id in self._user_memory_cache:
-            logger.debug(f"✅ Using cached memory instance for user {user_id}")
-            return self._user_memory_cache[user_id]
+        memory = self._user_memory_cache.get(collection_name)
+        if memory is not None:
+            logger.debug(f"✅ Using cached memory instance for {collection_name}")
+            return memory
+        
+        # mem0's constructor creates a missing collection with default settings, so
+        # the collection (and its indexes) must exist before any instance is built
+        await self._ensure_collection_ready_optimized(user_id)
         
         try:
-            from mem0 import Memory
-            
-            collection_name = f"mem0_{user_id}"
-            
-            # Optimization: Start with vector-only config for speed
-            qdrant_config = {
-                "url": self.config.qdrant_url,
-                "collection_name": collection_name
-            }
-            # Only add API key for cloud environments (not localhost)
-            if self.config.qdrant_api_key:
-                qdrant_config["api_key"] = self.config.qdrant_api_key
-            
-            user_config = {
-                "vector_store": {
-                    "provider": "qdrant",
-                    "config": qdrant_config
-                },
-                "llm": {
-                    "provider": "openai",
-                    "config": {
-                        "api_key": self.config.openai_api_key,
-                        "model": "gpt-4o-mini"
-                    }
-                },
-                "embedder": {
-                    "provider": "openai", 
-                    "config": {
-                        "api_key": self.config.openai_api_key,
-                        "model": "text-embedding-3-small"
-                    }
-                },
-                "version": "v1.1"
-            }
+            memory = await self._executor.run("init", self._build_memory_instance, collection_name)
             
-            # Optimization: Only add graph store if specifically requested and not rate limited
-            if self.api_config.enable_graph_storage:
-                user_config["graph_store"] = {
-                    "provider": "neo4j",
-                    "config": {
-                        "url": self.config.neo4j_uri,
-                        "username": self.config.neo4j_user,
-                        "password": self.config.neo4j_password
-                    }
-                }
-                logger.info(f"🔧 Creating memory instance with vector+graph for user {user_id}")
-            else:
-                logger.info(f"🔧 Creating vector-only memory instance for user {user_id}")
-            
-            # Create Memory instance
-            memory = Memory.from_config(config_dict=user_config)
-            
-            # Log memory instance details for debugging
-            logger.info(f"🔍 mem0 Memory instance details:")
-            logger.info(f"   - API version: {getattr(memory, 'api_version', 'unknown')}")
-            logger.info(f"   - enable_graph: {getattr(memory, 'enable_graph', 'unknown')}")
-            logger.info(f"   - graph_store type: {type(getattr(memory, 'graph_store', None))}")
-            if hasattr(memory, 'config'):
-                logger.info(f"   - config keys: {list(memory.config.keys()) if hasattr(memory.config, 'keys') else 'not dict-like'}")
+            # Another request may have built the same instance while we waited
+            if collection_name in self._user_memory_cache:
+                self._release_memory_instance(collection_name, memory)
+                return self._user_memory_cache.get(collection_name)
             
             # Cache the instance
-            self._user_memory_cache[user_id] = memory
+            self._user_memory_cache.put(collection_name, memory)
             
-            logger.info(f"✅ Memory instance created and cached for user {user_id}")
+            logger.info(f"✅ Memory instance created and cached for user {user_id} ({collection_name})")
             return memory
             
         except Exception as e:
             logger.error(f"❌ Failed to create user Memory instance: {e}")
             raise
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Memory instance and embedding cache counters, collection state and executor load"""
+        return {
+            "memory_instances": self._user_memory_cache.stats(),
+            "collections_ready": sum(1 for ready in self._collection_states.values() if ready),
+            "storage_mode": self.config.qdrant_storage_mode,
+            "executor": self._executor.stats(),
+            "embeddings": self._embedding_cache.stats() if self._embedding_cache else None
+        }
+    
+    async def run_blocking(self, operation: str, func, *args, **kwargs) -> Any:
+        """
+        Run a blocking call (e.g. an LLM request made alongside a search) on the
+        engine pool, subject to the per-operation concurrency limit.
+        """
+        return await self._executor.run(operation, func, *args, **kwargs)
 
     async def add_memory(self, memory_text: str, user_id: str, metadata: Optional[Dict[str, Any]] = None, 
                         source_description: str = "user_input") -> AddMemoryResponse:
@@ -343,7 +651,7 @@ class JeanMemoryAPIOptimized:
             
             if isinstance(collection_name, Exception):
                 logger.warning(f"Collection setup issue: {collection_name}")
-                collection_name = f"mem0_{user_id}"  # Continue anyway
+                collection_name = self.config.get_collection_name(user_id)  # Continue anyway
             
             if isinstance(user_memory, Exception):
                 logger.error(f"Memory instance creation failed: {user_memory}")
@@ -353,7 +661,9 @@ class JeanMemoryAPIOptimized:
             logger.info(f"💾 Adding to integrated storage for user {user_id}")
             logger.info(f"🔧 Graph storage enabled: {self.api_config.enable_graph_storage}")
             
-            result = user_memory.add(
+            result = await self._executor.run(
+                "add",
+                user_memory.add,
                 memory_text,
                 user_id=user_id,
                 metadata=metadata or {}
@@ -433,6 +743,165 @@ class JeanMemoryAPIOptimized:
                 message=error_msg
             )
 
+    def _extract_facts_batch(self, user_memory: Any, texts: List[str]) -> List[List[str]]:
+        """One LLM call extracting facts for every text; unparsed items are kept verbatim"""
+        try:
+            response = user_memory.llm.generate_response(
+                messages=build_batch_extraction_messages(texts),
+                response_format={"type": "json_object"}
+            )
+            facts = parse_batch_extraction(response, len(texts))
+        except Exception as e:
+            logger.warning(f"⚠️ Batched fact extraction failed, storing {len(texts)} memories verbatim: {e}")
+            facts = [None] * len(texts)
+        return [item_facts if item_facts is not None else [text] for item_facts, text in zip(facts, texts)]
+    
+    def _ingest_batch(self, user_memory: Any, collection_name: str, user_id: str,
+                      texts: List[str], metadatas: List[Dict[str, Any]], infer: bool) -> tuple:
+        """
+        Store one batch: batched extraction, one embedding request, one Qdrant upsert
+        (runs on the engine pool).
+        
+        Facts already stored for the user (same content hash) are not re-inserted;
+        their existing IDs are returned instead.
+        
+        Returns:
+            (memory IDs per text, number of new points written)
+        """
+        from qdrant_client.http import models
+        
+        facts_per_text = self._extract_facts_batch(user_memory, texts) if infer else [[text] for text in texts]
+        
+        # Unique facts in this batch, keyed by mem0's content hash
+        fact_by_hash: Dict[str, tuple] = {}
+        hashes_per_text: List[List[str]] = []
+        for index, facts in enumerate(facts_per_text):
+            hashes = []
+            for fact in facts:
+                fact_hash = hashlib.md5(fact.encode()).hexdigest()
+                fact_by_hash.setdefault(fact_hash, (fact, index))
+                hashes.append(fact_hash)
+            hashes_per_text.append(hashes)
+        
+        if not fact_by_hash:
+            return [[] for _ in texts], 0
+        
+        client = self._get_qdrant_client()
+        existing, _ = client.scroll(
+            collection_name=collection_name,
+            scroll_filter=models.Filter(must=[
+                models.FieldCondition(key="user_id", match=models.MatchValue(value=user_id)),
+                models.FieldCondition(key="hash", match=models.MatchAny(any=list(fact_by_hash))),
+            ]),
+            limit=len(fact_by_hash),
+            with_payload=["hash"],
+            with_vectors=False,
+        )
+        id_by_hash = {point.payload["hash"]: str(point.id) for point in existing if point.payload}
+        
+        new_hashes = [fact_hash for fact_hash in fact_by_hash if fact_hash not in id_by_hash]
+        if new_hashes:
+            new_facts = [fact_by_hash[fact_hash][0] for fact_hash in new_hashes]
+            vectors = embed_texts(user_memory.embedding_model, new_facts, "add")
+            # Each point gets its own timestamp (base + index microseconds), so
+            # created_at keeps the input order and stays a usable sort key
+            base_time = datetime.now(timezone.utc)
+            
+            points = []
+            for index, (fact_hash, fact, vector) in enumerate(zip(new_hashes, new_facts, vectors)):
+                memory_id = str(uuid4())
+                id_by_hash[fact_hash] = memory_id
+                payload = {
+                    **metadatas[fact_by_hash[fact_hash][1]],
+                    "user_id": user_id,
+                    "data": fact,
+                    "hash": fact_hash,
+                    "created_at": (base_time + timedelta(microseconds=index)).isoformat(),
+                }
+                points.append(models.PointStruct(id=memory_id, vector=vector, payload=payload))
+            client.upsert(collection_name=collection_name, points=points, wait=True)
+        
+        return [[id_by_hash[fact_hash] for fact_hash in hashes] for hashes in hashes_per_text], len(new_hashes)
+    
+    async def add_memories_bulk(self, request: AddMemoriesBulkRequest,
+                                item_metadata: Optional[List[Dict[str, Any]]] = None,
+                                infer: bool = True,
+                                batch_size: Optional[int] = None) -> AddMemoriesBulkResponse:
+        """
+        Add many memories with batched extraction, embedding and upserts
+        
+        Each batch costs one LLM call (when infer=True), one embedding request and
+        one Qdrant upsert, instead of a full mem0 add pipeline per memory. Unlike
+        add_memory this skips mem0's update/delete reconciliation and graph writes,
+        which suits imports of posts, tweets and other standalone content.
+        
+        Args:
+            request: Memories, user and metadata shared by every memory
+            item_metadata: Optional per-memory metadata, aligned with request.memories
+            infer: Extract facts with the LLM (False stores the texts verbatim)
+            batch_size: Memories per batch (defaults to config.batch_size)
+        """
+        if not self._initialized:
+            await self.initialize()
+        
+        texts = request.memories
+        if item_metadata is not None and len(item_metadata) != len(texts):
+            raise ValueError("item_metadata must have one entry per memory")
+        
+        shared_metadata = {**(request.metadata or {}), "source_description": request.source_description}
+        metadatas = [{**shared_metadata, **(item_metadata[i] if item_metadata else {})} for i in range(len(texts))]
+        batch_size = max(1, batch_size or self.config.batch_size)
+        start_time = time.time()
+        
+        logger.info(f"📦 Bulk adding {len(texts)} memories for user {request.user_id} (batches of {batch_size})")
+        collection_name = await self._ensure_collection_ready_optimized(request.user_id)
+        user_memory = await self._get_user_memory_instance_optimized(request.user_id)
+        
+        # Batches run concurrently, bounded by the executor's add limit
+        batch_starts = list(range(0, len(texts), batch_size))
+        batch_results = await asyncio.gather(*(
+            self._executor.run(
+                "add", self._ingest_batch, user_memory, collection_name, request.user_id,
+                texts[i:i + batch_size], metadatas[i:i + batch_size], infer
+            )
+            for i in batch_starts
+        ), return_exceptions=True)
+        
+        item_memory_ids: List[Optional[List[str]]] = []
+        errors = []
+        failed = 0
+        stored = 0
+        for batch_start, result in zip(batch_starts, batch_results):
+            batch_len = len(texts[batch_start:batch_start + batch_size])
+            if isinstance(result, Exception):
+                logger.error(f"❌ Bulk batch at {batch_start} failed: {result}")
+                errors.append(f"Batch {batch_start}-{batch_start + batch_len - 1}: {result}")
+                item_memory_ids.extend([None] * batch_len)
+                failed += batch_len
+                continue
+            ids, new_points = result
+            item_memory_ids.extend(ids)
+            stored += new_points
+        
+        elapsed_time = time.time() - start_time
+        rate = len(texts) / elapsed_time if elapsed_time > 0 else 0.0
+        logger.info(f"✅ Bulk added {len(texts) - failed}/{len(texts)} memories ({stored} new points) "
+                    f"in {elapsed_time:.2f}s ({rate:.1f} memories/s)")
+        
+        return AddMemoriesBulkResponse(
+            success=failed == 0,
+            total_memories=len(texts),
+            successful_memories=len(texts) - failed,
+            failed_memories=failed,
+            vector_stored_count=stored,
+            graph_stored_count=0,
+            memory_ids=[memory_id for ids in item_memory_ids if ids for memory_id in ids],
+            item_memory_ids=item_memory_ids,
+            memories_per_second=round(rate, 2),
+            message=f"Bulk added {len(texts) - failed}/{len(texts)} memories in {elapsed_time:.2f}s",
+            errors=errors or None
+        )
+    
     async def search_memories(self, query: str, user_id: str, limit: int = 20,
                              strategy: SearchStrategy = SearchStrategy.HYBRID,
                              include_metadata: bool = True) -> SearchMemoriesResponse:
@@ -456,20 +925,25 @@ class JeanMemoryAPIOptimized:
                 user_memory = await self._get_user_memory_instance_optimized(user_id)
                 
                 # Search using mem0 (handles both vector and graph automatically)
-                result = user_memory.search(
+                result = await self._executor.run(
+                    "search",
+                    user_memory.search,
                     query,
                     user_id=user_id,
                     limit=limit
                 )
                 
-                memories = []
+                relations = []
                 if isinstance(result, dict) and 'results' in result:
                     results = result['results']
+                    # mem0 runs the graph search alongside the vector search when graph storage is on
+                    relations = result.get('relations') or []
                 elif isinstance(result, list):
                     results = result
                 else:
                     results = []
                 
+                vector_memories = []
                 for memory_data in results:
                     memory_item = MemoryItem(
                         id=memory_data.get('id', str(uuid4())),
@@ -477,12 +951,16 @@ class JeanMemoryAPIOptimized:
                         metadata=memory_data.get('metadata', {}),
                         score=memory_data.get('score', 0.0),
                         created_at=memory_data.get('created_at'),
-                        source=memory_data.get('source', 'hybrid')
+                        source=memory_data.get('source', MemoryType.VECTOR)
                     )
-                    memories.append(memory_item)
+                    vector_memories.append(memory_item)
+                
+                graph_memories = self._relations_to_memories(relations)
+                memories = self._combine_search_results(strategy, vector_memories, graph_memories, limit)
                 
                 elapsed_time = time.time() - start_time
-                logger.info(f"✅ Search completed in {elapsed_time:.2f}s, found {len(memories)} results")
+                logger.info(f"✅ Search completed in {elapsed_time:.2f}s, found {len(memories)} results "
+                            f"({len(vector_memories)} vector, {len(graph_memories)} graph)")
                 
                 return SearchMemoriesResponse(
                     success=True,
@@ -490,6 +968,8 @@ class JeanMemoryAPIOptimized:
                     total_results=len(memories),
                     memories=memories,
                     strategy_used=strategy,
+                    vector_results_count=len(vector_memories),
+                    graph_results_count=len(graph_memories),
                     search_time_ms=elapsed_time * 1000,
                     message=f"Search completed in {elapsed_time:.2f}s"
                 )
@@ -508,9 +988,10 @@ class JeanMemoryAPIOptimized:
                     logger.warning(f"⚠️ Index error detected, clearing cache and retrying: {e}")
                     
                     # Clear caches to force index recreation
-                    self._collection_states.pop(user_id, None)
-                    self._user_memory_cache.pop(user_id, None)
-                    self._collection_creating.discard(user_id)
+                    collection_name = self.config.get_collection_name(user_id)
+                    self._collection_states.pop(collection_name, None)
+                    self._user_memory_cache.pop(collection_name, None)
+                    self._collection_creating.discard(collection_name)
                     
                     # Wait briefly for Qdrant to be ready
                     await asyncio.sleep(2)
@@ -546,9 +1027,321 @@ class JeanMemoryAPIOptimized:
             unexpected_error=True
         )
 
-    async def get_all_memories(self, user_id: str, limit: Optional[int] = None) -> SearchMemoriesResponse:
-        """Get all memories using optimized wildcard search"""
-        return await self.search_memories("*", user_id, limit or 100)
+    @staticmethod
+    def _relations_to_memories(relations: Any) -> List[MemoryItem]:
+        """Turn mem0 graph search relations (source, relationship, destination) into memory items"""
+        if not isinstance(relations, list):
+            return []
+        memories = []
+        for relation in relations:
+            if not isinstance(relation, dict):
+                continue
+            relationship = relation.get('relationship', relation.get('relation'))
+            parts = [relation.get('source'), relationship, relation.get('destination')]
+            if not all(parts):
+                continue
+            text = " ".join(str(part).replace("_", " ") for part in parts)
+            memories.append(MemoryItem(
+                id=f"graph_{content_hash(text)[:16]}",
+                text=text,
+                metadata={
+                    "source_entity": relation.get('source'),
+                    "relationship": relationship,
+                    "destination_entity": relation.get('destination')
+                },
+                score=0.0,
+                source=MemoryType.GRAPH
+            ))
+        return memories
+    
+    @staticmethod
+    def _combine_search_results(strategy: SearchStrategy, vector_memories: List[MemoryItem],
+                                graph_memories: List[MemoryItem], limit: int) -> List[MemoryItem]:
+        """
+        Apply the search strategy to vector hits and graph relations. HYBRID and
+        VECTOR_GRAPH_FUSION keep the vector ranking and fill the remaining slots
+        with graph relations not already among the hits; GRAPH_ONLY and
+        VECTOR_ONLY return one side.
+        
+        Graph relations have no similarity score, so they are scored by graph
+        rank, below the weakest vector hit in mixed results; scores stay
+        comparable with the vector hits' cosine similarities.
+        """
+        if strategy == SearchStrategy.GRAPH_ONLY:
+            return _score_by_rank(graph_memories[:limit], ceiling=1.0)
+        if strategy == SearchStrategy.VECTOR_ONLY or not graph_memories:
+            return vector_memories
+        
+        combined = list(vector_memories[:limit])
+        seen = {content_hash(memory.text) for memory in combined}
+        extra = [memory for memory in graph_memories if content_hash(memory.text) not in seen]
+        weakest = min((memory.score or 0.0 for memory in combined), default=1.0)
+        return combined + _score_by_rank(extra[:limit - len(combined)], ceiling=weakest * _GRAPH_SCORE_WEIGHT)
+    
+    def _scroll_page(self, collection_name: str, user_id: str, limit: int,
+                     cursor: Optional[str], fields: Optional[List[str]]):
+        """
+        Read one page of a user's points straight from Qdrant (runs on the engine pool).
+        
+        Pages newest-first using the created_at datetime index; if the collection
+        cannot order (older Qdrant, index missing) it falls back to point-id order.
+        
+        Returns:
+            (points, next_cursor)
+        """
+        from qdrant_client.http import models
+        
+        client = self._get_qdrant_client()
+        must = [models.FieldCondition(key="user_id", match=models.MatchValue(value=user_id))]
+        if fields is None:
+            with_payload = True
+        else:
+            with_payload = sorted({"data", "created_at", "updated_at", *fields})
+        
+        if not cursor or cursor.startswith(_CURSOR_CREATED_AT):
+            before, seen_ids = _parse_created_at_cursor(cursor) if cursor else (None, [])
+            must_not = []
+            if before and seen_ids:
+                # Several points can share a timestamp, so the page boundary is
+                # (created_at, id): include the timestamp, minus ids already returned
+                must.append(models.FieldCondition(key="created_at", range=models.DatetimeRange(lte=before)))
+                must_not.append(models.HasIdCondition(has_id=seen_ids))
+            elif before:
+                must.append(models.FieldCondition(key="created_at", range=models.DatetimeRange(lt=before)))
+            scroll_filter = models.Filter(must=must, must_not=must_not or None)
+            try:
+                points, _ = client.scroll(
+                    collection_name=collection_name,
+                    scroll_filter=scroll_filter,
+                    limit=limit,
+                    with_payload=with_payload,
+                    with_vectors=False,
+                    order_by=models.OrderBy(key="created_at", direction=models.Direction.DESC),
+                )
+                next_cursor = None
+                last_created_at = (points[-1].payload or {}).get("created_at") if points else None
+                if len(points) == limit and last_created_at:
+                    at_boundary = [str(p.id) for p in points if (p.payload or {}).get("created_at") == last_created_at]
+                    if last_created_at == before:
+                        at_boundary = seen_ids + at_boundary
+                    next_cursor = f"{_CURSOR_CREATED_AT}{last_created_at}|{','.join(at_boundary)}"
+                return points, next_cursor
+            except Exception as e:
+                if cursor:
+                    raise
+                logger.warning(f"⚠️ Ordered scroll unavailable for {collection_name}, paging by point id: {e}")
+        
+        offset = cursor[len(_CURSOR_OFFSET):] if cursor else None
+        points, next_offset = client.scroll(
+            collection_name=collection_name,
+            scroll_filter=models.Filter(must=must),
+            limit=limit,
+            offset=offset,
+            with_payload=with_payload,
+            with_vectors=False,
+        )
+        points = sorted(points, key=lambda p: (p.payload or {}).get("created_at") or "", reverse=True)
+        return points, (f"{_CURSOR_OFFSET}{next_offset}" if next_offset is not None else None)
+    
+    async def list_memories(self, user_id: str, limit: int = 100, cursor: Optional[str] = None,
+                            fields: Optional[List[str]] = None) -> ListMemoriesResponse:
+        """
+        List one page of a user's memories, newest first, without any embedding call
+        
+        Args:
+            user_id: User whose memories to list
+            limit: Page size
+            cursor: next_cursor from the previous page (None for the first page)
+            fields: Metadata keys to return (None returns the full payload);
+                memory text and timestamps are always included
+        """
+        if not self._initialized:
+            await self.initialize()
+        
+        start_time = time.time()
+        try:
+            collection_name = await self._ensure_collection_ready_optimized(user_id)
+            points, next_cursor = await self._executor.run(
+                "list", self._scroll_page, collection_name, user_id, limit, cursor, fields
+            )
+            
+            memories = []
+            for point in points:
+                payload = point.payload or {}
+                memories.append(MemoryItem(
+                    id=str(point.id),
+                    text=payload.get("data", ""),
+                    metadata={k: v for k, v in payload.items() if k not in _MEM0_CORE_PAYLOAD_KEYS},
+                    created_at=payload.get("created_at"),
+                    updated_at=payload.get("updated_at"),
+                    source=MemoryType.VECTOR
+                ))
+            
+            elapsed_time = time.time() - start_time
+            logger.info(f"✅ Listed {len(memories)} memories for user {user_id} in {elapsed_time:.2f}s")
+            return ListMemoriesResponse(
+                success=True,
+                total_results=len(memories),
+                memories=memories,
+                next_cursor=next_cursor,
+                list_time_ms=elapsed_time * 1000,
+                message=f"Listed {len(memories)} memories in {elapsed_time:.2f}s"
+            )
+        except Exception as e:
+            elapsed_time = time.time() - start_time
+            error_msg = f"Listing failed after {elapsed_time:.2f}s: {e}"
+            logger.error(f"❌ {error_msg}")
+            return ListMemoriesResponse(
+                success=False,
+                total_results=0,
+                list_time_ms=elapsed_time * 1000,
+                message=error_msg
+            )
+    
+    def _embed_queries(self, user_memory: Any, queries: List[str]) -> List[List[float]]:
+        """Embed all queries in one request, reusing cached query embeddings"""
+        embedder = user_memory.embedding_model
+        if isinstance(embedder, CachingEmbedder):
+            return embedder.embed_batch(queries, "search")
+        return embed_texts(embedder, queries, "search")
+
+    async def embed(self, texts: List[str], user_id: str, memory_action: str = "add",
+                    batch_size: int = 64) -> List[List[float]]:
+        """
+        Embed texts with the user's embedder, batch_size texts per API request.
+
+        For content stored outside the engine (e.g. document chunks in Postgres),
+        so it shares the model and dimensions of the memory vectors. "search"
+        embeddings go through the embedding cache, "add" embeddings do not.
+        """
+        if not texts:
+            return []
+        if not self._initialized:
+            await self.initialize()
+
+        user_memory = await self._get_user_memory_instance_optimized(user_id)
+        embedder = user_memory.embedding_model
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            if memory_action == "search" and isinstance(embedder, CachingEmbedder):
+                vectors.extend(await self._executor.run("embed", embedder.embed_batch, batch, memory_action))
+            else:
+                vectors.extend(await self._executor.run("embed", embed_texts, embedder, batch, memory_action))
+        return vectors
+
+    def _query_batch(self, collection_name: str, user_id: str,
+                     vectors: List[List[float]], limit: int, with_vectors: bool = False) -> List[list]:
+        """Run one Qdrant batch query for all vectors, scoped to the user"""
+        from qdrant_client.http import models
+        
+        user_filter = models.Filter(must=[
+            models.FieldCondition(key="user_id", match=models.MatchValue(value=user_id))
+        ])
+        responses = self._get_qdrant_client().query_batch_points(
+            collection_name=collection_name,
+            requests=[
+                models.QueryRequest(query=vector, filter=user_filter, limit=limit,
+                                    with_payload=True, with_vector=with_vectors)
+                for vector in vectors
+            ],
+        )
+        return [response.points for response in responses]
+    
+    async def search_memories_batch(self, queries: List[str], user_id: str,
+                                    limit: int = 20, with_vectors: bool = False) -> List[SearchMemoriesResponse]:
+        """
+        Search several queries at once: one embedding request for all queries
+        and one Qdrant batch query, with duplicate memories removed per query.
+        
+        Vector-only (graph relations are not returned by search either). If the
+        batch path fails the queries are searched individually (without vectors).
+        with_vectors returns each hit's stored embedding, e.g. for diversity ranking.
+        
+        Returns:
+            One SearchMemoriesResponse per query, in query order
+        """
+        if not queries:
+            return []
+        if not self._initialized:
+            await self.initialize()
+        
+        start_time = time.time()
+        try:
+            collection_name = await self._ensure_collection_ready_optimized(user_id)
+            user_memory = await self._get_user_memory_instance_optimized(user_id)
+            vectors = await self._executor.run("search", self._embed_queries, user_memory, queries)
+            hits_per_query = await self._executor.run(
+                "search", self._query_batch, collection_name, user_id, vectors, limit, with_vectors
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Batch search failed, searching {len(queries)} queries individually: {e}")
+            return list(await asyncio.gather(*(self.search_memories(q, user_id, limit) for q in queries)))
+        
+        elapsed_time = time.time() - start_time
+        responses = []
+        for query, hits in zip(queries, hits_per_query):
+            memories = []
+            seen = set()
+            for hit in hits:
+                payload = hit.payload or {}
+                text = payload.get("data", "")
+                dedup_key = payload.get("hash") or text
+                if not text or dedup_key in seen:
+                    continue
+                seen.add(dedup_key)
+                memories.append(MemoryItem(
+                    id=str(hit.id),
+                    text=text,
+                    metadata={k: v for k, v in payload.items() if k not in _MEM0_CORE_PAYLOAD_KEYS},
+                    score=hit.score,
+                    created_at=payload.get("created_at"),
+                    updated_at=payload.get("updated_at"),
+                    source=MemoryType.VECTOR,
+                    embedding=hit.vector if isinstance(hit.vector, list) else None
+                ))
+            responses.append(SearchMemoriesResponse(
+                success=True,
+                query=query,
+                total_results=len(memories),
+                memories=memories,
+                strategy_used=SearchStrategy.VECTOR_ONLY,
+                collection_name=collection_name,
+                vector_results_count=len(memories),
+                search_time_ms=elapsed_time * 1000,
+                message=f"Batch search of {len(queries)} queries completed in {elapsed_time:.2f}s"
+            ))
+        
+        logger.info(f"✅ Batch search of {len(queries)} queries for user {user_id} completed in {elapsed_time:.2f}s")
+        return responses
+    
+    async def get_all_memories(self, user_id: str, limit: Optional[int] = None, cursor: Optional[str] = None,
+                               fields: Optional[List[str]] = None, page_size: int = 256) -> ListMemoriesResponse:
+        """Collect up to `limit` memories (newest first) by scrolling page by page"""
+        limit = limit or 100
+        memories: List[MemoryItem] = []
+        start_time = time.time()
+        
+        while len(memories) < limit:
+            page = await self.list_memories(user_id, min(page_size, limit - len(memories)), cursor, fields)
+            if not page.success:
+                if not memories:
+                    return page
+                break
+            memories.extend(page.memories)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        
+        elapsed_time = time.time() - start_time
+        return ListMemoriesResponse(
+            success=True,
+            total_results=len(memories),
+            memories=memories,
+            next_cursor=cursor,
+            list_time_ms=elapsed_time * 1000,
+            message=f"Listed {len(memories)} memories in {elapsed_time:.2f}s"
+        )
 
     async def delete_memory(self, memory_id: str, user_id: str) -> Dict[str, Any]:
         """
@@ -575,7 +1368,7 @@ class JeanMemoryAPIOptimized:
             user_memory = await self._get_user_memory_instance_optimized(user_id)
             if user_memory:
                 # Use mem0's delete method (only needs memory_id)
-                result = user_memory.delete(memory_id)
+                result = await self._executor.run("delete", user_memory.delete, memory_id)
                 
                 # Check if deletion was successful
                 if result and isinstance(result, dict) and result.get('message'):
@@ -635,7 +1428,7 @@ class JeanMemoryAPIOptimized:
             user_memory = await self._get_user_memory_instance_optimized(user_id)
             if user_memory:
                 # Use mem0's update method
-                result = user_memory.update(memory_id=memory_id, data=data)
+                result = await self._executor.run("update", user_memory.update, memory_id=memory_id, data=data)
                 
                 # Check if update was successful
                 if result:
@@ -678,11 +1471,10 @@ class JeanMemoryAPIOptimized:
             user_memory = await self._get_user_memory_instance_optimized(user_id)
             
             # Clear memories using mem0
-            result = user_memory.delete_all(user_id=user_id)
+            result = await self._executor.run("delete", user_memory.delete_all, user_id=user_id)
             
             # Invalidate caches
-            self._collection_states.pop(user_id, None)
-            self._user_memory_cache.pop(user_id, None)
+            self._invalidate_user_caches(user_id)
             
             deleted_count = result.get('deleted_count', 0) if isinstance(result, dict) else 0
             
@@ -706,14 +1498,8 @@ class JeanMemoryAPIOptimized:
         
         # Quick health checks without expensive operations
         try:
-            from qdrant_client import QdrantClient
-            # Handle localhost (no auth) vs cloud (with auth) environments
-            if self.config.qdrant_api_key:
-                client = QdrantClient(url=self.config.qdrant_url, api_key=self.config.qdrant_api_key)
-            else:
-                # Local development - no API key needed
-                client = QdrantClient(url=self.config.qdrant_url)
-            client.get_collections()  # Quick connection test
+            client = self._get_qdrant_client()
+            await self._executor.run("status", client.get_collections)  # Quick connection test
             databases.append(DatabaseStatus(name="Qdrant", connected=True))
         except Exception as e:
             databases.append(DatabaseStatus(name="Qdrant", connected=False, error=str(e)))
@@ -810,10 +1596,49 @@ class JeanMemoryAPIOptimized:
         self._collection_states.clear()
         self._user_memory_cache.clear()
         self._collection_creating.clear()
+        if self._embedding_cache is not None:
+            self._embedding_cache.clear()
+        
+        # Shared clients live on the template instance
+        if self._base_memory is not None:
+            _close_quietly(getattr(getattr(self._base_memory, 'graph', None), 'graph', None))
+            _close_quietly(getattr(self._base_memory, 'db', None))
+            self._base_memory = None
+        if self._qdrant_client is not None:
+            _close_quietly(self._qdrant_client)
+            self._qdrant_client = None
+        self._executor.shutdown()
+        
         self._initialized = False
         logger.info("🔌 Jean Memory V2 API OPTIMIZED resources cleaned up")
 
 
+def _score_by_rank(memories: List[MemoryItem], ceiling: float) -> List[MemoryItem]:
+    """Score unscored results from ceiling down, linearly by rank"""
+    for rank, memory in enumerate(memories):
+        memory.score = round(ceiling * (1 - rank / len(memories)), 4)
+    return memories
+
+
+def _parse_created_at_cursor(cursor: str) -> tuple:
+    """Split a "t:<created_at>|<id>,<id>" cursor into (created_at, ids already returned)"""
+    created_at, _, ids = cursor[len(_CURSOR_CREATED_AT):].partition("|")
+    return created_at, [point_id for point_id in ids.split(",") if point_id]
+
+
+def _close_quietly(resource: Any) -> None:
+    """Close a client/driver/connection if it supports it, ignoring errors"""
+    if resource is None:
+        return
+    target = getattr(resource, '_driver', resource)  # Neo4jGraph wraps the driver
+    close = getattr(target, 'close', None)
+    if callable(close):
+        try:
+            close()
+        except Exception as e:
+            logger.debug(f"Ignoring error while closing {type(target).__name__}: {e}")
+
+
 # Convenience functions
 async def add_memory_optimized(memory_text: str, user_id: str, **kwargs) -> AddMemoryResponse:
     """Optimized convenience function to add a single memory"""
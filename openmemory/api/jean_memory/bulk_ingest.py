@@ -0,0 +1,59 @@
+"""
+Jean Memory V2 Bulk Ingestion Helpers
+=====================================
+
+Prompt building and parsing for batched fact extraction: one LLM call
+extracts facts for a whole batch of inputs instead of one call per memory.
+"""
+
+import json
+import logging
+import re
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+BATCH_EXTRACTION_INSTRUCTIONS = """
+
+You will receive several numbered inputs instead of a single conversation.
+Extract facts from each input independently, following the rules above.
+Return a JSON object of the form:
+{"items": [{"index": 0, "facts": ["fact", ...]}, {"index": 1, "facts": []}, ...]}
+with exactly one entry per input index, in order.
+"""
+
+
+def build_batch_extraction_messages(texts: List[str]) -> List[Dict[str, str]]:
+    """System + user messages asking the LLM to extract facts for every text at once"""
+    from mem0.configs.prompts import FACT_RETRIEVAL_PROMPT
+
+    numbered = "\n\n".join(f"Input {i}:\n{text}" for i, text in enumerate(texts))
+    return [
+        {"role": "system", "content": FACT_RETRIEVAL_PROMPT + BATCH_EXTRACTION_INSTRUCTIONS},
+        {"role": "user", "content": numbered},
+    ]
+
+
+def parse_batch_extraction(response: str, count: int) -> List[Optional[List[str]]]:
+    """
+    Parse the batched extraction response.
+
+    Returns one fact list per input; None marks inputs the LLM skipped or
+    returned malformed output for, so the caller can store them verbatim.
+    """
+    facts: List[Optional[List[str]]] = [None] * count
+    try:
+        cleaned = re.sub(r"^```(?:json)?\s*|\s*```$", "", (response or "").strip())
+        items = json.loads(cleaned).get("items", [])
+    except (json.JSONDecodeError, AttributeError) as e:
+        logger.warning(f"⚠️ Could not parse batched fact extraction response: {e}")
+        return facts
+
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        index = item.get("index")
+        item_facts = item.get("facts")
+        if isinstance(index, int) and 0 <= index < count and isinstance(item_facts, list):
+            facts[index] = [str(fact).strip() for fact in item_facts if str(fact).strip()]
+    return facts
@@ -9,6 +9,7 @@ Use the set_env_all.sh script to set environment variables before running Jean M
 """
 
 import os
+import hashlib
 import logging
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
@@ -31,12 +32,29 @@ class JeanMemoryConfig:
     neo4j_password: str
     gemini_api_key: Optional[str] = None
     
+    # Engine Profile
+    # "remote": Qdrant, OpenAI, Gemini and Neo4j services (production)
+    # "local": in-process vector index, hashing embedder and scripted LLM (no network)
+    engine_profile: str = "remote"
+    local_llm_script: Optional[str] = None
+    # Fixed per-call latency added by the local stand-ins (for benchmarking)
+    local_llm_latency_ms: float = 0.0
+    local_embedding_latency_ms: float = 0.0
+    local_vector_latency_ms: float = 0.0
+    
     # Qdrant Configuration
     qdrant_host: Optional[str] = None
     qdrant_port: Optional[str] = None
     qdrant_url: Optional[str] = None
     qdrant_collection_prefix: str = "jeanmemory_v2"
     
+    # Qdrant Storage Layout
+    # "per_user": one mem0_{user_id} collection per user (legacy)
+    # "shared": all users in a fixed set of collections partitioned by user_id payload
+    qdrant_storage_mode: str = "per_user"
+    qdrant_shared_collection: str = "jean_memory_shared"
+    qdrant_shared_shards: int = 1
+    
     # Search Configuration
     default_search_limit: int = 20
     max_search_limit: int = 100
@@ -52,6 +70,24 @@ class JeanMemoryConfig:
     connection_timeout: int = 30
     max_retries: int = 3
     
+    # Memory Instance Cache Configuration
+    memory_cache_max_size: int = 256
+    memory_cache_idle_ttl_seconds: int = 1800
+    
+    # Engine Executor Configuration
+    # Blocking mem0/Qdrant/LLM calls run on a dedicated pool; the reserved
+    # workers are only used by searches, so bulk writes can never starve them
+    engine_max_workers: int = 16
+    engine_add_concurrency: int = 4
+    engine_search_concurrency: int = 12
+    engine_search_reserved_workers: int = 4
+    engine_offload_enabled: bool = True
+    
+    # Query Embedding Cache Configuration (size 0 disables the cache)
+    embedding_cache_size: int = 4096
+    embedding_cache_ttl_seconds: int = 86400
+    embedding_cache_redis_url: Optional[str] = None
+    
     # Dynamic Index Configuration
     qdrant_index_wait_time: int = 5
     auto_create_indexes: bool = True
@@ -60,9 +96,13 @@ class JeanMemoryConfig:
     
     def __post_init__(self):
         """Validate configuration after initialization"""
-        self._validate_required_fields()
-        self._setup_qdrant_url()
-        self._validate_api_keys()
+        self._validate_engine_profile()
+        if not self.is_local_profile:
+            self._validate_required_fields()
+            self._setup_qdrant_url()
+            self._validate_api_keys()
+        self._validate_storage_mode()
+        self._validate_engine_limits()
     
     def _validate_required_fields(self):
         """Validate that all required fields are provided"""
@@ -101,6 +141,59 @@ class JeanMemoryConfig:
         if self.gemini_api_key and not self.gemini_api_key.startswith('AIza'):
             raise ConfigurationError("Gemini API key should start with 'AIza'")
     
+    def _validate_engine_profile(self):
+        """Validate the engine profile"""
+        if self.engine_profile not in ("remote", "local"):
+            raise ConfigurationError(
+                f"engine_profile must be 'remote' or 'local', got '{self.engine_profile}'"
+            )
+    
+    def _validate_storage_mode(self):
+        """Validate Qdrant storage layout settings"""
+        if self.qdrant_storage_mode not in ("per_user", "shared"):
+            raise ConfigurationError(
+                f"qdrant_storage_mode must be 'per_user' or 'shared', got '{self.qdrant_storage_mode}'"
+            )
+        if self.qdrant_shared_shards < 1:
+            raise ConfigurationError("qdrant_shared_shards must be at least 1")
+    
+    def _validate_engine_limits(self):
+        """Validate engine executor pool and concurrency limits"""
+        if min(self.engine_max_workers, self.engine_add_concurrency, self.engine_search_concurrency) < 1:
+            raise ConfigurationError("engine worker and concurrency limits must be at least 1")
+        if not 0 <= self.engine_search_reserved_workers < self.engine_max_workers:
+            raise ConfigurationError("engine_search_reserved_workers must be between 0 and engine_max_workers - 1")
+    
+    @property
+    def is_local_profile(self) -> bool:
+        """Whether the engine runs fully in-process with offline stand-ins"""
+        return self.engine_profile == "local"
+    
+    @property
+    def uses_shared_collection(self) -> bool:
+        """Whether all users are stored in shared, tenant-partitioned collections"""
+        return self.qdrant_storage_mode == "shared"
+    
+    def get_collection_name(self, user_id: str) -> str:
+        """
+        Resolve the Qdrant collection that holds a user's memories.
+        
+        Shard assignment uses a stable hash so every process (and the migration
+        script) maps a user to the same shared collection.
+        """
+        if not self.uses_shared_collection:
+            return f"mem0_{user_id}"
+        if self.qdrant_shared_shards == 1:
+            return self.qdrant_shared_collection
+        shard = int(hashlib.md5(user_id.encode()).hexdigest(), 16) % self.qdrant_shared_shards
+        return f"{self.qdrant_shared_collection}_{shard}"
+    
+    def get_shared_collection_names(self) -> list:
+        """All shared collection names for the configured shard count"""
+        if self.qdrant_shared_shards == 1:
+            return [self.qdrant_shared_collection]
+        return [f"{self.qdrant_shared_collection}_{i}" for i in range(self.qdrant_shared_shards)]
+    
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> 'JeanMemoryConfig':
         """Create configuration from dictionary"""
@@ -114,7 +207,15 @@ class JeanMemoryConfig:
             neo4j_user=config_dict.get('NEO4J_USER', ''),
             neo4j_password=config_dict.get('NEO4J_PASSWORD', ''),
             gemini_api_key=config_dict.get('GEMINI_API_KEY'),
+            engine_profile=(config_dict.get('ENGINE_PROFILE') or 'remote').lower(),
+            local_llm_script=config_dict.get('LOCAL_LLM_SCRIPT') or None,
+            local_llm_latency_ms=float(config_dict.get('LOCAL_LLM_LATENCY_MS') or 0),
+            local_embedding_latency_ms=float(config_dict.get('LOCAL_EMBEDDING_LATENCY_MS') or 0),
+            local_vector_latency_ms=float(config_dict.get('LOCAL_VECTOR_LATENCY_MS') or 0),
             qdrant_collection_prefix=config_dict.get('QDRANT_COLLECTION_PREFIX', 'jeanmemory_v2'),
+            qdrant_storage_mode=(config_dict.get('QDRANT_STORAGE_MODE') or 'per_user').lower(),
+            qdrant_shared_collection=config_dict.get('QDRANT_SHARED_COLLECTION') or 'jean_memory_shared',
+            qdrant_shared_shards=int(config_dict.get('QDRANT_SHARED_SHARDS') or 1),
             default_search_limit=int(config_dict.get('DEFAULT_SEARCH_LIMIT', 20)),
             max_search_limit=int(config_dict.get('MAX_SEARCH_LIMIT', 100)),
             enable_graph_memory=config_dict.get('ENABLE_GRAPH_MEMORY', 'true').lower() == 'true',
@@ -124,6 +225,16 @@ class JeanMemoryConfig:
             enable_deduplication=config_dict.get('ENABLE_DEDUPLICATION', 'true').lower() == 'true',
             connection_timeout=int(config_dict.get('CONNECTION_TIMEOUT', 30)),
             max_retries=int(config_dict.get('MAX_RETRIES', 3)),
+            memory_cache_max_size=int(config_dict.get('MEMORY_CACHE_MAX_SIZE') or 256),
+            memory_cache_idle_ttl_seconds=int(config_dict.get('MEMORY_CACHE_IDLE_TTL_SECONDS') or 1800),
+            engine_max_workers=int(config_dict.get('ENGINE_MAX_WORKERS') or 16),
+            engine_add_concurrency=int(config_dict.get('ENGINE_ADD_CONCURRENCY') or 4),
+            engine_search_concurrency=int(config_dict.get('ENGINE_SEARCH_CONCURRENCY') or 12),
+            engine_search_reserved_workers=int(config_dict.get('ENGINE_SEARCH_RESERVED_WORKERS') or 4),
+            engine_offload_enabled=(config_dict.get('ENGINE_OFFLOAD_ENABLED') or 'true').lower() == 'true',
+            embedding_cache_size=int(config_dict.get('EMBEDDING_CACHE_SIZE') or 4096),
+            embedding_cache_ttl_seconds=int(config_dict.get('EMBEDDING_CACHE_TTL_SECONDS') or 86400),
+            embedding_cache_redis_url=config_dict.get('EMBEDDING_CACHE_REDIS_URL') or None,
             # Dynamic Index Configuration
             qdrant_index_wait_time=int(config_dict.get('QDRANT_INDEX_WAIT_TIME', 5)),
             auto_create_indexes=config_dict.get('AUTO_CREATE_INDEXES', 'true').lower() == 'true',
@@ -0,0 +1,241 @@
+"""
+Jean Memory V2 Embedding Cache
+==============================
+
+Caches query embeddings so repeated and templated queries (the fixed deep
+analysis and life-graph queries, planner search queries, follow-up searches)
+skip the embedding API round trip.
+
+Two tiers:
+- In-process LRU with TTL, vectors stored as compact float32 bytes
+- Optional shared Redis tier so all API workers benefit from each other's misses
+
+Keys are a hash of the embedding model, the mem0 memory action and the
+whitespace/unicode-normalized text, so switching models never serves stale vectors.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_REDIS_KEY_PREFIX = "jm:emb:"
+
+
+def normalize_text(text: str) -> str:
+    """Unicode-normalize and collapse whitespace (case is preserved: it changes embeddings)"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class EmbeddingCache:
+    """Thread-safe two-tier (local LRU + optional Redis) float32 embedding cache"""
+
+    def __init__(self, max_size: int = 4096, ttl_seconds: int = 86400, redis_url: Optional[str] = None):
+        """
+        Args:
+            max_size: Max vectors kept in process (1536-dim float32 is ~6 KB each)
+            ttl_seconds: Time-to-live for both tiers (0 disables expiry)
+            redis_url: Optional Redis URL for the shared tier
+        """
+        self.max_size = max(1, max_size)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = self._connect_redis(redis_url) if redis_url else None
+
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.shared_errors = 0
+
+    @staticmethod
+    def _connect_redis(redis_url: str):
+        try:
+            import redis
+            client = redis.Redis.from_url(redis_url, socket_timeout=0.25, socket_connect_timeout=0.5)
+            client.ping()
+            logger.info("✅ Embedding cache shared tier connected")
+            return client
+        except Exception as e:
+            logger.warning(f"⚠️ Embedding cache shared tier unavailable, using local cache only: {e}")
+            return None
+
+    @staticmethod
+    def make_key(model: str, text: str, action: Optional[str] = None) -> str:
+        return hashlib.blake2b(
+            f"{model}\x00{action or ''}\x00{normalize_text(text)}".encode("utf-8"),
+            digest_size=20
+        ).hexdigest()
+
+    def _get_local(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            data, expires_at = entry
+            if expires_at and time.monotonic() > expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return data
+
+    def _put_local(self, key: str, data: bytes) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0.0
+        with self._lock:
+            self._entries[key] = (data, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """Return the cached vector for a key, checking the local then the shared tier"""
+        data = self._get_local(key)
+        if data is not None:
+            self.local_hits += 1
+            return np.frombuffer(data, dtype=np.float32).tolist()
+
+        if self._redis is not None:
+            try:
+                data = self._redis.get(_REDIS_KEY_PREFIX + key)
+            except Exception as e:
+                self.shared_errors += 1
+                logger.debug(f"Embedding cache shared tier read failed: {e}")
+                data = None
+            if data is not None:
+                self.shared_hits += 1
+                self._put_local(key, data)
+                return np.frombuffer(data, dtype=np.float32).tolist()
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, vector: List[float]) -> None:
+        """Store a vector in both tiers"""
+        data = np.asarray(vector, dtype=np.float32).tobytes()
+        self._put_local(key, data)
+        if self._redis is not None:
+            try:
+                if self.ttl_seconds:
+                    self._redis.setex(_REDIS_KEY_PREFIX + key, self.ttl_seconds, data)
+                else:
+                    self._redis.set(_REDIS_KEY_PREFIX + key, data)
+            except Exception as e:
+                self.shared_errors += 1
+                logger.debug(f"Embedding cache shared tier write failed: {e}")
+
+    def clear(self) -> None:
+        """Drop the local tier (the shared tier expires on its own)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate counters per tier"""
+        lookups = self.local_hits + self.shared_hits + self.misses
+        with self._lock:
+            size = len(self._entries)
+            size_bytes = sum(len(data) for data, _ in self._entries.values())
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "bytes": size_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "shared_tier": self._redis is not None,
+            "local_hits": self.local_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "shared_errors": self.shared_errors,
+            "hit_rate": round((self.local_hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+def embed_texts(embedder: Any, texts: List[str], memory_action: Optional[str] = None) -> List[List[float]]:
+    """
+    Embed many texts with one API request when the embedder wraps an OpenAI client
+    (mem0's OpenAIEmbedding); otherwise fall back to one embed() call per text.
+    """
+    client = getattr(embedder, "client", None)
+    config = getattr(embedder, "config", None)
+    model = getattr(config, "model", None)
+    if client is not None and hasattr(client, "embeddings") and model:
+        request = {"model": model, "input": [text.replace("\n", " ") for text in texts]}
+        dims = getattr(config, "embedding_dims", None)
+        if dims:
+            request["dimensions"] = dims
+        response = client.embeddings.create(**request)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    if memory_action is None:
+        return [embedder.embed(text) for text in texts]
+    return [embedder.embed(text, memory_action) for text in texts]
+
+
+class CachingEmbedder:
+    """
+    Wraps a mem0 embedder so query embeddings go through the cache.
+
+    Only ``memory_action="search"`` calls are cached: memory text embedded for
+    "add"/"update" is almost never queried verbatim, and caching it would let
+    bulk ingestion evict the hot query vectors. Other calls pass straight through.
+
+    Attribute access falls through to the wrapped embedder, so mem0 code that
+    reads e.g. ``embedder.config`` keeps working.
+    """
+
+    CACHED_ACTIONS = frozenset({"search"})
+
+    def __init__(self, embedder: Any, cache: EmbeddingCache, model: str):
+        self._embedder = embedder
+        self._cache = cache
+        self._model = model
+
+    def embed(self, text, memory_action: Optional[str] = None):
+        if not isinstance(text, str) or memory_action not in self.CACHED_ACTIONS:
+            return self._call(text, memory_action)
+
+        key = EmbeddingCache.make_key(self._model, text, memory_action)
+        vector = self._cache.get(key)
+        if vector is not None:
+            return vector
+
+        vector = self._call(text, memory_action)
+        self._cache.put(key, vector)
+        return vector
+
+    def embed_batch(self, texts: List[str], memory_action: Optional[str] = None) -> List[List[float]]:
+        """Embed several texts, sending only distinct cache misses to the API in one request"""
+        if memory_action not in self.CACHED_ACTIONS:
+            return embed_texts(self._embedder, texts, memory_action)
+        keys = [EmbeddingCache.make_key(self._model, text, memory_action) for text in texts]
+        vectors: Dict[str, List[float]] = {}
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in vectors or key in missing:
+                continue
+            vector = self._cache.get(key)
+            if vector is None:
+                missing[key] = text
+            else:
+                vectors[key] = vector
+
+        if missing:
+            embedded = embed_texts(self._embedder, list(missing.values()), memory_action)
+            for key, vector in zip(missing, embedded):
+                self._cache.put(key, vector)
+                vectors[key] = vector
+
+        return [vectors[key] for key in keys]
+
+    def _call(self, text, memory_action: Optional[str]):
+        if memory_action is None:
+            return self._embedder.embed(text)
+        return self._embedder.embed(text, memory_action)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._embedder, name)
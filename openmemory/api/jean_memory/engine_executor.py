@@ -0,0 +1,158 @@
+"""
+Jean Memory V2 Engine Executor
+==============================
+
+Runs the blocking parts of the memory engine (mem0, Qdrant, OpenAI, Gemini
+clients are all synchronous) on a dedicated, bounded thread pool so a slow
+fact extraction never stalls the event loop serving other MCP requests.
+
+Each operation type gets its own concurrency limit on top of the pool size.
+In addition, every operation outside ``priority_operations`` (adds, embedding,
+collection setup and anything unlisted) draws from one shared background
+bucket of ``max_workers - reserved_workers`` slots, so searches always have
+``reserved_workers`` threads available however many other operations run.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EngineExecutor:
+    """Bounded thread pool with per-operation concurrency limits"""
+
+    def __init__(
+        self,
+        max_workers: int = 16,
+        operation_limits: Optional[Dict[str, int]] = None,
+        inline: bool = False,
+        reserved_workers: int = 0,
+        priority_operations: Iterable[str] = ("search",)
+    ):
+        """
+        Args:
+            max_workers: Size of the dedicated thread pool
+            operation_limits: Max concurrent calls per operation name; operations
+                not listed are only bounded by the bucket they draw from
+            inline: Run calls directly on the event loop (legacy behaviour,
+                kept for benchmarking and as a kill switch)
+            reserved_workers: Pool threads only priority operations may use
+            priority_operations: Operations exempt from the shared background bucket
+        """
+        if not 0 <= reserved_workers < max_workers:
+            raise ValueError("reserved_workers must be between 0 and max_workers - 1")
+        self.max_workers = max_workers
+        self.inline = inline
+        self.reserved_workers = reserved_workers
+        self.background_limit = max_workers - reserved_workers
+        self._priority_operations = frozenset(priority_operations)
+        self._operation_limits = dict(operation_limits or {})
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # Semaphores are bound to an event loop, so keep one set per loop
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._in_flight: Dict[str, int] = {}
+        self._waiting: Dict[str, int] = {}
+        self._completed: Dict[str, int] = {}
+        self._busy_seconds: Dict[str, float] = {}
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="jean-memory-engine"
+            )
+        return self._pool
+
+    def _get_semaphore(self, operation: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores.get(loop)
+        if semaphores is None:
+            semaphores = self._semaphores[loop] = {}
+        semaphore = semaphores.get(operation)
+        if semaphore is None:
+            semaphore = semaphores[operation] = asyncio.Semaphore(self._limit(operation))
+        return semaphore
+
+    def _limit(self, operation: str) -> int:
+        default = self.max_workers if operation in self._priority_operations else self.background_limit
+        return self._operation_limits.get(operation, default)
+
+    def _get_background_semaphore(self, operation: str) -> Optional[asyncio.Semaphore]:
+        """Shared bucket for every non-priority operation (None when nothing is reserved)"""
+        if not self.reserved_workers or operation in self._priority_operations:
+            return None
+        # Operation names cannot start with a space, so this key never collides
+        return self._get_semaphore(" background")
+
+    async def run(self, operation: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking callable for the given operation without blocking the loop.
+
+        Context variables (user_id, client_name, ...) are propagated into the worker thread.
+        """
+        if self.inline:
+            return func(*args, **kwargs)
+
+        semaphore = self._get_semaphore(operation)
+        background = self._get_background_semaphore(operation)
+        self._waiting[operation] = self._waiting.get(operation, 0) + 1
+        try:
+            await semaphore.acquire()
+            if background is not None:
+                try:
+                    await background.acquire()
+                except BaseException:
+                    semaphore.release()
+                    raise
+        finally:
+            self._waiting[operation] -= 1
+
+        self._in_flight[operation] = self._in_flight.get(operation, 0) + 1
+        start_time = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            context = contextvars.copy_context()
+            call = functools.partial(context.run, func, *args, **kwargs)
+            return await loop.run_in_executor(self._get_pool(), call)
+        finally:
+            self._in_flight[operation] -= 1
+            self._completed[operation] = self._completed.get(operation, 0) + 1
+            self._busy_seconds[operation] = self._busy_seconds.get(operation, 0.0) + time.perf_counter() - start_time
+            if background is not None:
+                background.release()
+            semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-operation queue depth, in-flight count and completed totals"""
+        operations = set(self._completed) | set(self._in_flight) | set(self._waiting)
+        return {
+            "max_workers": self.max_workers,
+            "reserved_workers": self.reserved_workers,
+            "inline": self.inline,
+            "operations": {
+                op: {
+                    "limit": self._limit(op),
+                    "in_flight": self._in_flight.get(op, 0),
+                    "waiting": self._waiting.get(op, 0),
+                    "completed": self._completed.get(op, 0),
+                    "busy_seconds": round(self._busy_seconds.get(op, 0.0), 3),
+                }
+                for op in sorted(operations)
+            }
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the worker threads (queued calls are cancelled)"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+            logger.info("🔌 Engine executor shut down")
@@ -0,0 +1,88 @@
+"""
+Jean Memory V2 Result Fusion
+============================
+
+Reciprocal rank fusion (RRF) of ranked result lists from different retrievers
+(vector, graph, full-text, document chunks). Scores from different retrievers
+are not comparable, so only ranks are used: each list contributes
+weight / (k + rank) for every result it contains, and results found by
+several retrievers accumulate score from each.
+
+Results are deduplicated by a hash of their normalized text, so the same
+memory returned by two backends (e.g. Qdrant and Postgres, with different ids)
+is fused into one entry.
+"""
+
+import hashlib
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Generic, List, Optional, Sequence, TypeVar
+
+# Standard RRF constant: damps the advantage of the very first ranks
+RRF_K = 60
+
+T = TypeVar("T")
+
+
+def content_hash(text: str) -> str:
+    """Hash of the text with unicode, case and whitespace differences removed"""
+    normalized = " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class FusedResult(Generic[T]):
+    """One deduplicated result with its fused score and the retrievers that found it"""
+    item: T
+    score: float
+    sources: List[str] = field(default_factory=list)
+    best_rank: int = 0
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: Dict[str, Sequence[T]],
+    text_of: Callable[[T], str],
+    k: int = RRF_K,
+    weights: Optional[Dict[str, float]] = None,
+    limit: Optional[int] = None
+) -> List[FusedResult[T]]:
+    """
+    Fuse ranked lists into one ranking.
+
+    Args:
+        ranked_lists: Retriever name -> results, best first
+        text_of: Text used for deduplication
+        k: RRF constant
+        weights: Optional per-retriever weight (default 1.0)
+        limit: Maximum number of fused results
+
+    Returns:
+        Fused results, highest score first. Each keeps the item from the
+        retriever that ranked it best (ties go to the first list given).
+    """
+    fused: Dict[str, FusedResult[T]] = {}
+    for source, results in ranked_lists.items():
+        weight = (weights or {}).get(source, 1.0)
+        seen_in_list = set()
+        for rank, item in enumerate(results, start=1):
+            text = text_of(item)
+            if not text:
+                continue
+            key = content_hash(text)
+            if key in seen_in_list:
+                # A duplicate within one list only counts at its best rank
+                continue
+            seen_in_list.add(key)
+
+            entry = fused.get(key)
+            if entry is None:
+                fused[key] = FusedResult(item=item, score=weight / (k + rank), sources=[source], best_rank=rank)
+                continue
+            entry.score += weight / (k + rank)
+            entry.sources.append(source)
+            if rank < entry.best_rank:
+                entry.item = item
+                entry.best_rank = rank
+
+    ordered = sorted(fused.values(), key=lambda entry: entry.score, reverse=True)
+    return ordered[:limit] if limit is not None else ordered
@@ -0,0 +1,310 @@
+"""
+Jean Memory V2 Local Engine Profile
+===================================
+
+Offline stand-ins used when ENGINE_PROFILE=local, so the API can be run,
+load tested and profiled with no Qdrant, OpenAI, Gemini or Neo4j:
+
+- Vectors live in qdrant-client's in-process local mode (NumPy brute-force
+  index), so every Qdrant call the engine makes keeps working unchanged
+- HashingEmbedder: deterministic feature-hashing embeddings
+- ScriptedLLM: canned responses chosen by regex rules from a JSON script,
+  with built-in handling of mem0's fact extraction and update prompts
+- LocalGenerativeModel: the ScriptedLLM behind the google.generativeai
+  model interface GeminiService uses
+
+Script format (LOCAL_LLM_SCRIPT, defaults to local_llm_script.json here):
+    {"rules": [{"name": "...", "match": "<regex>", "response": "<text>" | {...}}],
+     "default_text": "..."}
+Rules are tried in order against the whole prompt; named groups are
+substituted into the response with $name. Object responses are serialized
+to JSON after substitution, so captured text is escaped correctly.
+
+Each stand-in can add a fixed latency per call (LOCAL_LLM_LATENCY_MS,
+LOCAL_EMBEDDING_LATENCY_MS, LOCAL_VECTOR_LATENCY_MS) to approximate the
+services it replaces when benchmarking.
+"""
+
+import asyncio
+import ast
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from string import Template
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+LOCAL_EMBEDDING_MODEL = "local-hashing"
+DEFAULT_SCRIPT_PATH = Path(__file__).parent / "local_llm_script.json"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+_BATCH_INPUT_RE = re.compile(r"^Input (\d+):\n", re.MULTILINE)
+
+
+class HashingEmbedder:
+    """
+    Deterministic mem0-compatible embedder (feature hashing of words and bigrams).
+
+    Texts sharing words land close together under cosine similarity, which is
+    enough for retrieval paths to return plausible results offline.
+    """
+
+    class _Config:
+        def __init__(self, model: str, embedding_dims: int):
+            self.model = model
+            self.embedding_dims = embedding_dims
+
+    def __init__(self, dims: int = 1536, latency_ms: float = 0.0):
+        self.dims = dims
+        self.latency_ms = latency_ms
+        self.config = self._Config(LOCAL_EMBEDDING_MODEL, dims)
+
+    def _bucket(self, feature: str):
+        digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+        return digest % self.dims, 1.0 if digest >> 63 else -1.0
+
+    def embed(self, text, memory_action: Optional[str] = None) -> List[float]:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        tokens = _TOKEN_RE.findall(str(text).lower())
+        features = [(token, 1.0) for token in tokens]
+        features += [(f"{a} {b}", 0.5) for a, b in zip(tokens, tokens[1:])]
+
+        vector = np.zeros(self.dims, dtype=np.float32)
+        for feature, weight in features:
+            index, sign = self._bucket(feature)
+            vector[index] += sign * weight
+
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            vector[0] = 1.0  # Cosine distance is undefined for the zero vector
+            return vector.tolist()
+        return (vector / norm).tolist()
+
+
+class ScriptedLLM:
+    """
+    Deterministic mem0-compatible LLM driven by a JSON rule script.
+
+    Besides script rules it understands the prompts the engine itself sends:
+    mem0 fact extraction (one fact per sentence of the input), mem0 memory
+    updates (ADD every new fact not already stored) and batched extraction.
+    """
+
+    def __init__(self, script_path: Optional[str] = None, latency_ms: float = 0.0):
+        self.script_path = str(script_path or DEFAULT_SCRIPT_PATH)
+        self.latency_ms = latency_ms
+        self.rules: List[Dict[str, Any]] = []
+        self.default_text = "Local engine response."
+        self.calls = 0
+        self.rule_hits: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._last_facts = threading.local()
+        self.load_script(self.script_path)
+
+    def load_script(self, script_path: str) -> None:
+        """Replace the rule set with the rules in a JSON script file"""
+        with open(script_path, "r", encoding="utf-8") as f:
+            script = json.load(f)
+        self.rules = []
+        for rule in script.get("rules", []):
+            self.add_rule(rule["match"], rule["response"], rule.get("name"))
+        self.default_text = script.get("default_text", self.default_text)
+        logger.info(f"🧪 Local LLM loaded {len(self.rules)} rules from {script_path}")
+
+    def add_rule(self, pattern: str, response: Any, name: Optional[str] = None) -> None:
+        """Append a rule; earlier rules win"""
+        self.rules.append({
+            "name": name or pattern[:40],
+            "pattern": re.compile(pattern, re.DOTALL | re.IGNORECASE),
+            "response": response,
+        })
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"calls": self.calls, "rule_hits": dict(self.rule_hits)}
+
+    def _record(self, name: str) -> None:
+        with self._lock:
+            self.calls += 1
+            self.rule_hits[name] = self.rule_hits.get(name, 0) + 1
+
+    @staticmethod
+    def _render(response: Any, groups: Dict[str, str]) -> Any:
+        if isinstance(response, str):
+            return Template(response).safe_substitute(groups)
+        if isinstance(response, list):
+            return [ScriptedLLM._render(item, groups) for item in response]
+        if isinstance(response, dict):
+            return {key: ScriptedLLM._render(value, groups) for key, value in response.items()}
+        return response
+
+    def complete(self, prompt: str, json_mode: bool = False) -> str:
+        """Response text for a flat prompt (used by both the mem0 and Gemini paths)"""
+        for rule in self.rules:
+            match = rule["pattern"].search(prompt)
+            if match:
+                self._record(rule["name"])
+                groups = {key: (value or "").strip() for key, value in match.groupdict().items()}
+                rendered = self._render(rule["response"], groups)
+                return rendered if isinstance(rendered, str) else json.dumps(rendered)
+
+        self._record("default")
+        return "{}" if json_mode else self.default_text
+
+    def generate_response(self, messages: List[Dict[str, str]], response_format=None,
+                          tools=None, tool_choice: str = "auto") -> str:
+        """mem0 LLM interface"""
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        system = "\n".join(m.get("content", "") for m in messages if m.get("role") == "system")
+        user = "\n".join(m.get("content", "") for m in messages if m.get("role") != "system")
+        prompt = f"{system}\n{user}" if system else user
+
+        if '{"items"' in system:
+            self._record("batch_extraction")
+            return json.dumps({"items": self._batch_facts(user)})
+        if '"event"' in prompt:
+            self._record("update_memory")
+            return json.dumps({"memory": self._memory_updates(prompt)})
+        if '"facts"' in prompt:
+            self._record("fact_extraction")
+            facts = self._facts(user)
+            self._last_facts.value = facts
+            return json.dumps({"facts": facts})
+
+        json_mode = bool(response_format) and response_format.get("type") == "json_object"
+        return self.complete(prompt, json_mode=json_mode)
+
+    @staticmethod
+    def _facts(text: str) -> List[str]:
+        """One fact per sentence of the input, without mem0's 'Input:' and role prefixes"""
+        text = re.sub(r"^\s*Input:\s*", "", text)
+        text = re.sub(r"^(user|assistant|system):\s*", "", text, flags=re.MULTILINE)
+        return [s.strip() for s in _SENTENCE_RE.split(text) if len(s.split()) >= 2]
+
+    def _batch_facts(self, text: str) -> List[Dict[str, Any]]:
+        parts = _BATCH_INPUT_RE.split(text)
+        # split() yields [preamble, index, body, index, body, ...]
+        return [
+            {"index": int(parts[i]), "facts": self._facts(parts[i + 1])}
+            for i in range(1, len(parts) - 1, 2)
+        ]
+
+    def _memory_updates(self, prompt: str) -> List[Dict[str, str]]:
+        """ADD each new fact unless an identical memory is already stored"""
+        facts = None
+        fenced = re.findall(r"```\s*(\[.*?\])\s*```", prompt, re.DOTALL)
+        if fenced:
+            try:
+                facts = [str(fact) for fact in ast.literal_eval(fenced[-1])]
+            except (ValueError, SyntaxError):
+                facts = None
+        if facts is None:
+            facts = getattr(self._last_facts, "value", [])
+
+        existing_section = prompt.split(fenced[-1])[0] if fenced else prompt
+        return [
+            {"event": "NONE" if f"'{fact}'" in existing_section or f'"{fact}"' in existing_section else "ADD",
+             "text": fact}
+            for fact in facts
+        ]
+
+
+class LocalGenerationResponse:
+    """Minimal stand-in for a google.generativeai GenerateContentResponse"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.candidates = []
+
+
+class LocalGenerativeModel:
+    """The ScriptedLLM behind the genai.GenerativeModel methods GeminiService calls"""
+
+    def __init__(self, llm: ScriptedLLM, model_name: str):
+        self._llm = llm
+        self.model_name = model_name
+
+    def generate_content(self, prompt, generation_config=None, **kwargs) -> LocalGenerationResponse:
+        if self._llm.latency_ms:
+            time.sleep(self._llm.latency_ms / 1000)
+        return LocalGenerationResponse(self._llm.complete(str(prompt)))
+
+    async def generate_content_async(self, prompt, generation_config=None, **kwargs) -> LocalGenerationResponse:
+        if self._llm.latency_ms:
+            await asyncio.sleep(self._llm.latency_ms / 1000)
+        return LocalGenerationResponse(self._llm.complete(str(prompt)))
+
+
+class LatencyInjectingClient:
+    """Proxy that delays every method call on the wrapped (in-process) Qdrant client"""
+
+    def __init__(self, client: Any, latency_ms: float):
+        self._client = client
+        self._latency_s = latency_ms / 1000
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        def delayed(*args, **kwargs):
+            time.sleep(self._latency_s)
+            return attr(*args, **kwargs)
+        return delayed
+
+
+def is_local_profile() -> bool:
+    """Whether the process runs with the offline engine profile (ENGINE_PROFILE=local)"""
+    return os.getenv("ENGINE_PROFILE", "remote").lower() == "local"
+
+
+_scripted_llm: Optional[ScriptedLLM] = None
+_scripted_llm_lock = threading.Lock()
+
+
+def _env_latency_ms(name: str) -> float:
+    return float(os.getenv(name) or 0)
+
+
+def get_scripted_llm(script_path: Optional[str] = None, latency_ms: Optional[float] = None) -> ScriptedLLM:
+    """
+    Process-wide ScriptedLLM shared by the memory engine, GeminiService and
+    categorization. Script and latency default to LOCAL_LLM_SCRIPT and
+    LOCAL_LLM_LATENCY_MS; an explicit latency updates the shared instance.
+    """
+    global _scripted_llm
+    with _scripted_llm_lock:
+        if _scripted_llm is None:
+            _scripted_llm = ScriptedLLM(
+                script_path or os.getenv("LOCAL_LLM_SCRIPT") or None,
+                latency_ms=_env_latency_ms("LOCAL_LLM_LATENCY_MS")
+            )
+        if latency_ms is not None:
+            _scripted_llm.latency_ms = latency_ms
+        return _scripted_llm
+
+
+def create_local_qdrant_client(latency_ms: float = 0.0):
+    """In-process Qdrant (NumPy brute-force search, nothing persisted)"""
+    from qdrant_client import QdrantClient
+    client = QdrantClient(location=":memory:")
+    return LatencyInjectingClient(client, latency_ms) if latency_ms else client
+
+
+def install_local_models(memory: Any, script_path: Optional[str] = None,
+                         llm_latency_ms: Optional[float] = None, embedding_latency_ms: float = 0.0) -> None:
+    """Swap a freshly built mem0 Memory's OpenAI embedder and LLM for the local stand-ins"""
+    dims = getattr(getattr(memory.embedding_model, "config", None), "embedding_dims", None) or 1536
+    memory.embedding_model = HashingEmbedder(dims, latency_ms=embedding_latency_ms)
+    memory.llm = get_scripted_llm(script_path, latency_ms=llm_latency_ms)
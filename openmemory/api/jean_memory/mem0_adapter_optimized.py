@@ -13,14 +13,17 @@ PERFORMANCE TARGET: 3-5x faster than original adapter
 
 import asyncio
 import logging
-from typing import List, Dict, Any, Union, Optional
+from typing import AsyncIterator, List, Dict, Any, Union, Optional
 
 from .api_optimized import JeanMemoryAPIOptimized
-from .models import SearchStrategy
+from .models import AddMemoriesBulkRequest, SearchStrategy
 
 
 logger = logging.getLogger(__name__)
 
+# Upper bound for a single get_all call; use iter_all to stream larger listings
+MAX_GET_ALL_LIMIT = 1000
+
 
 class AsyncMemoryAdapterOptimized:
     """
@@ -75,6 +78,19 @@ class AsyncMemoryAdapterOptimized:
         """Create AsyncMemory instance from config dict (mem0 compatibility)"""
         return cls(config=config_dict)
     
+    def get_cache_stats(self) -> Dict:
+        """Memory instance cache hit/miss/eviction counters"""
+        return self._api.get_cache_stats()
+
+    async def run_blocking(self, operation: str, func, *args, **kwargs):
+        """Run a blocking call on the engine thread pool (e.g. operation="llm")"""
+        return await self._api.run_blocking(operation, func, *args, **kwargs)
+
+    async def close(self):
+        """Release cached memory instances and shared clients"""
+        await self._api.close()
+        self._initialized = False
+    
     async def add(
         self, 
         messages: Union[str, List[str], List[Dict]], 
@@ -183,6 +199,43 @@ class AsyncMemoryAdapterOptimized:
         
         return {'results': results}
     
+    async def add_bulk(
+        self,
+        texts: List[str],
+        user_id: str,
+        metadata: Optional[Dict] = None,
+        item_metadata: Optional[List[Dict]] = None,
+        infer: bool = True,
+        batch_size: Optional[int] = None
+    ) -> Dict:
+        """
+        Add many memories in batches (one extraction call, one embedding request
+        and one Qdrant upsert per batch)
+        
+        Returns:
+            {'results': [{'ids': [...], 'memory': text, 'failed': bool}, ...] in input order,
+             'failed': int, 'memories_per_second': float, 'errors': [...]}
+            An item with no ids that did not fail had nothing memorable to extract.
+        """
+        await self._ensure_initialized()
+        
+        request = AddMemoriesBulkRequest(memories=texts, user_id=user_id, metadata=metadata)
+        if len(request.memories) != len(texts):
+            raise ValueError("add_bulk texts must be non-empty strings")
+        
+        result = await self._api.add_memories_bulk(
+            request, item_metadata=item_metadata, infer=infer, batch_size=batch_size
+        )
+        return {
+            'results': [
+                {'ids': ids or [], 'memory': text, 'failed': ids is None}
+                for ids, text in zip(result.item_memory_ids, request.memories)
+            ],
+            'failed': result.failed_memories,
+            'memories_per_second': result.memories_per_second,
+            'errors': result.errors or []
+        }
+    
     async def search(
         self, 
         query: str, 
@@ -208,65 +261,140 @@ class AsyncMemoryAdapterOptimized:
         )
         
         if result.success:
-            mem0_results = []
-            for memory in result.memories:
-                mem0_result = {
-                    'id': memory.id,
-                    'memory': memory.text,
-                    'content': memory.text,
-                    'score': memory.score,
-                    'metadata': memory.metadata,
-                    'created_at': memory.created_at
-                }
-                
-                # Add source information if available
-                if hasattr(memory, 'source'):
-                    mem0_result['source'] = memory.source
-                
-                mem0_results.append(mem0_result)
-            
-            return {'results': mem0_results}
+            return {'results': [self._to_mem0_search_result(memory) for memory in result.memories]}
         else:
             return {'results': []}
     
+    async def search_batch(
+        self,
+        queries: List[str],
+        user_id: str,
+        limit: int = 10,
+        with_vectors: bool = False
+    ) -> List[Dict]:
+        """
+        Search several queries with one embedding request and one Qdrant batch query
+        
+        Args:
+            with_vectors: Include each result's stored vector as 'embedding'
+        
+        Returns:
+            One mem0-style {'results': [...]} dict per query, in query order
+        """
+        await self._ensure_initialized()
+        
+        logger.info(f"🔍 Batch searching {len(queries)} queries for user {user_id}")
+        
+        responses = await self._api.search_memories_batch(
+            queries=queries, user_id=user_id, limit=limit, with_vectors=with_vectors
+        )
+        return [
+            {'results': [self._to_mem0_search_result(memory) for memory in response.memories]}
+            if response.success else {'results': []}
+            for response in responses
+        ]
+
+    async def embed(
+        self,
+        texts: List[str],
+        user_id: str,
+        memory_action: str = "add",
+        batch_size: int = 64
+    ) -> List[List[float]]:
+        """
+        Embed texts with the same model as the user's memories (batched requests)
+
+        Args:
+            memory_action: "search" for queries (cached), "add" for stored content
+        """
+        await self._ensure_initialized()
+        return await self._api.embed(texts, user_id, memory_action=memory_action, batch_size=batch_size)
+
+    @staticmethod
+    def _to_mem0_search_result(memory) -> Dict:
+        """Convert a searched MemoryItem to mem0's search result format"""
+        mem0_result = {
+            'id': memory.id,
+            'memory': memory.text,
+            'content': memory.text,
+            'score': memory.score,
+            'metadata': memory.metadata,
+            'created_at': memory.created_at
+        }
+        
+        # Add source information if available
+        if hasattr(memory, 'source'):
+            mem0_result['source'] = memory.source
+        if getattr(memory, 'embedding', None) is not None:
+            mem0_result['embedding'] = memory.embedding
+        
+        return mem0_result
+    
+    @staticmethod
+    def _to_mem0_list_result(memory) -> Dict:
+        """Convert a listed MemoryItem to mem0's get_all result format"""
+        return {
+            'id': memory.id,
+            'memory': memory.text,
+            'content': memory.text,
+            'metadata': memory.metadata,
+            'created_at': memory.created_at,
+            'updated_at': memory.updated_at,
+            'source': memory.source
+        }
+    
     async def get_all(
         self, 
         user_id: str,
         agent_id: Optional[str] = None,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> Union[List[Dict], Dict]:
         """
         OPTIMIZED Get all memories for a user (async)
         
-        Uses optimized wildcard search
+        Scrolls Qdrant directly (newest first, no embedding call). Pass the returned
+        'next_cursor' back as `cursor` to continue, and `fields` to project metadata.
         """
         await self._ensure_initialized()
         
         result = await self._api.get_all_memories(
             user_id=user_id,
-            limit=min(limit or 100, 100)
+            limit=min(limit or 100, MAX_GET_ALL_LIMIT),
+            cursor=cursor,
+            fields=fields
         )
         
         if result.success:
-            mem0_results = []
-            for memory in result.memories:
-                mem0_result = {
-                    'id': memory.id,
-                    'memory': memory.text,
-                    'content': memory.text,
-                    'metadata': memory.metadata,
-                    'created_at': memory.created_at
-                }
-                
-                if hasattr(memory, 'source'):
-                    mem0_result['source'] = memory.source
-                
-                mem0_results.append(mem0_result)
-            
-            return {'results': mem0_results}
+            return {
+                'results': [self._to_mem0_list_result(memory) for memory in result.memories],
+                'next_cursor': result.next_cursor
+            }
         else:
             return {'results': []}
     
+    async def iter_all(
+        self,
+        user_id: str,
+        page_size: int = 256,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """Yield a user's memories page by page (newest first) without materializing them all"""
+        await self._ensure_initialized()
+        
+        cursor = None
+        while True:
+            page = await self._api.list_memories(user_id, limit=page_size, cursor=cursor, fields=fields)
+            if not page.success:
+                logger.error(f"❌ Memory listing stopped for user {user_id}: {page.message}")
+                return
+            if page.memories:
+                yield [self._to_mem0_list_result(memory) for memory in page.memories]
+            cursor = page.next_cursor
+            if cursor is None:
+                return
+    
     async def delete_all(self, user_id: str, agent_id: Optional[str] = None) -> Dict:
         """
         OPTIMIZED Delete all memories for a user (async)
@@ -422,12 +550,14 @@ class MemoryAdapterOptimized:
         self, 
         user_id: str,
         agent_id: Optional[str] = None,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> Union[List[Dict], Dict]:
         """
         OPTIMIZED Get all memories for a user (sync wrapper)
         """
-        return asyncio.run(self._async_adapter.get_all(user_id, agent_id, limit))
+        return asyncio.run(self._async_adapter.get_all(user_id, agent_id, limit, cursor, fields))
     
     def delete_all(self, user_id: str, agent_id: Optional[str] = None) -> Dict:
         """
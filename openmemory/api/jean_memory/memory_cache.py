@@ -0,0 +1,177 @@
+"""
+Jean Memory V2 Memory Instance Cache
+====================================
+
+Bounded LRU cache for mem0 Memory instances.
+
+Entries are evicted when the cache exceeds its size limit or when they have
+not been used for longer than the idle TTL. Evicted entries are handed to an
+``on_evict`` callback so the owner can close any clients they hold.
+
+The cache is shared by the event loop and the engine pool's worker threads,
+so it is guarded by a thread lock; ``on_evict`` runs outside that lock.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryInstanceCache:
+    """
+    Size- and idle-time-bounded LRU cache with hit/miss/eviction counters
+
+    Entries are kept in last-used order, so both LRU eviction and idle expiry
+    only ever look at the oldest end of the ordered dict.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 256,
+        idle_ttl_seconds: float = 1800,
+        on_evict: Optional[Callable[[str, Any], None]] = None
+    ):
+        """
+        Args:
+            max_size: Maximum number of cached instances
+            idle_ttl_seconds: Evict entries unused for this long (0 disables)
+            on_evict: Called with (key, value) whenever an entry leaves the cache
+        """
+        self.max_size = max(1, max_size)
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self._on_evict = on_evict
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _is_expired(self, last_used: float, now: float) -> bool:
+        return bool(self.idle_ttl_seconds) and now - last_used > self.idle_ttl_seconds
+
+    def _release(self, key: str, value: Any) -> None:
+        if self._on_evict is None:
+            return
+        try:
+            self._on_evict(key, value)
+        except Exception as e:
+            logger.warning(f"Error releasing cached instance {key}: {e}")
+
+    def _release_all(self, released: List[Tuple[str, Any]]) -> None:
+        for key, value in released:
+            self._release(key, value)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value and mark it most recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            now = time.monotonic()
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, last_used = entry
+            if not self._is_expired(last_used, now):
+                self._entries[key] = (value, now)
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+
+        self._release(key, value)
+        return None
+
+    def put(self, key: str, value: Any) -> None:
+        """Insert or replace a value, evicting idle and least recently used entries"""
+        released: List[Tuple[str, Any]] = []
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None and previous[0] is not value:
+                released.append((key, previous[0]))
+
+            self._entries[key] = (value, time.monotonic())
+            released.extend(self._pop_idle())
+
+            while len(self._entries) > self.max_size:
+                old_key, (old_value, _) = self._entries.popitem(last=False)
+                self.evictions += 1
+                logger.info(f"♻️ Evicted memory instance {old_key} (LRU, size limit {self.max_size})")
+                released.append((old_key, old_value))
+
+        self._release_all(released)
+
+    def _pop_idle(self) -> List[Tuple[str, Any]]:
+        """Remove expired entries from the oldest end (caller holds the lock)"""
+        if not self.idle_ttl_seconds:
+            return []
+
+        now = time.monotonic()
+        expired = []
+        while self._entries:
+            key, (value, last_used) = next(iter(self._entries.items()))
+            if not self._is_expired(last_used, now):
+                break
+            del self._entries[key]
+            self.expirations += 1
+            expired.append((key, value))
+        return expired
+
+    def evict_idle(self) -> int:
+        """Drop entries idle for longer than the TTL; returns number expired"""
+        with self._lock:
+            expired = self._pop_idle()
+
+        if expired:
+            logger.info(f"♻️ Expired {len(expired)} idle memory instances")
+            self._release_all(expired)
+        return len(expired)
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        """Remove an entry (explicit invalidation) and release it"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            return default
+        self._release(key, entry[0])
+        return entry[0]
+
+    def clear(self) -> None:
+        """Release and remove every entry"""
+        with self._lock:
+            released = [(key, value) for key, (value, _) in self._entries.items()]
+            self._entries.clear()
+        self._release_all(released)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for sizing the cache"""
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "idle_ttl_seconds": self.idle_ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -144,6 +144,7 @@ class MemoryItem(BaseModel):
     metadata: Optional[Dict[str, Any]] = Field(default=None, description="Memory metadata")
     created_at: Optional[datetime] = Field(default=None, description="Creation timestamp")
     updated_at: Optional[datetime] = Field(default=None, description="Last update timestamp")
+    embedding: Optional[List[float]] = Field(default=None, description="Stored vector (batch search with_vectors only)")
 
 
 class AddMemoryResponse(BaseModel):
@@ -165,6 +166,11 @@ class AddMemoriesBulkResponse(BaseModel):
     vector_stored_count: int = Field(default=0, description="Number stored in vector database")
     graph_stored_count: int = Field(default=0, description="Number stored in graph database")
     memory_ids: List[str] = Field(default_factory=list, description="IDs of created memories")
+    item_memory_ids: List[Optional[List[str]]] = Field(
+        default_factory=list,
+        description="Memory IDs per input memory, in input order (None if its batch failed, empty if nothing was memorable)"
+    )
+    memories_per_second: Optional[float] = Field(default=None, description="Ingestion throughput (input memories per second)")
     message: str = Field(..., description="Operation result message")
     errors: Optional[List[str]] = Field(default=None, description="List of errors encountered")
 
@@ -185,6 +191,16 @@ class SearchMemoriesResponse(BaseModel):
     unexpected_error: Optional[bool] = Field(default=False, description="Whether an unexpected error occurred")
 
 
+class ListMemoriesResponse(BaseModel):
+    """Response model for one page of a memory listing (newest first)"""
+    success: bool = Field(..., description="Whether the listing succeeded")
+    total_results: int = Field(..., description="Number of memories in this response")
+    memories: List[MemoryItem] = Field(default_factory=list, description="Memory items, newest first")
+    next_cursor: Optional[str] = Field(default=None, description="Opaque cursor for the next page, None when exhausted")
+    list_time_ms: Optional[float] = Field(default=None, description="Listing execution time in milliseconds")
+    message: str = Field(..., description="Listing result message")
+
+
 class ClearMemoriesResponse(BaseModel):
     """Response model for clearing memories"""
     success: bool = Field(..., description="Whether the operation succeeded")
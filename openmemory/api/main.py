@@ -102,6 +102,10 @@ async def lifespan(app: FastAPI):
     # Schema fix completed successfully - this code block has been removed
     logger.info("Database and services initialization completed.")
     
+    # Build the shared async memory client once so its caches persist across requests
+    from app.utils.memory import init_async_memory_client, close_async_memory_client
+    await init_async_memory_client()
+    
     # Start periodic cleanup task
     async def periodic_cleanup():
         while True:
@@ -135,6 +139,11 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         pass
     
+    try:
+        await close_async_memory_client()
+    except Exception as e:
+        logger.error(f"Error closing memory client: {e}")
+    
     logger.info("Application shutdown.")
 
 app = FastAPI(
@@ -218,6 +227,11 @@ async def detailed_health_check():
             }
         }
         
+        # Memory client cache counters (only if the singleton has been created)
+        from app.utils import memory as memory_utils
+        if memory_utils._async_memory_client is not None:
+            health_data["memory_client"] = memory_utils._async_memory_client.get_cache_stats()
+        
         # Add error details if Neo4j has issues
         if not neo4j_status["connected"] and "result" in neo4j_status:
             health_data["neo4j"]["error"] = neo4j_status["result"].get("error", "Unknown error")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk memory ingestion against one-at-a-time adds.
+
+Adds the same set of memories twice for a throwaway user, once with a loop of
+adapter.add() calls (the old sync path: one extraction, embedding and upsert
+per memory) and once with adapter.add_bulk(), and reports memories/second.
+
+Usage:
+    python scripts/benchmark_bulk_ingest.py
+    python scripts/benchmark_bulk_ingest.py --count 200 --batch-size 50
+    python scripts/benchmark_bulk_ingest.py --modes bulk --no-infer
+
+Uses the same environment as the API (OPENAI_API_KEY, QDRANT_*, NEO4J_*).
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from jean_memory.config import JeanMemoryConfig
+from jean_memory.mem0_adapter_optimized import AsyncMemoryAdapterOptimized
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+SAMPLE_FACTS = [
+    "I prefer working on backend systems in Python and Go",
+    "My sister lives in Lisbon and works as an architect",
+    "I'm training for a half marathon in the spring",
+    "Our team ships releases every other Thursday",
+    "I'm allergic to peanuts",
+    "I started learning the cello last year",
+    "I drink my coffee black, no sugar",
+    "My favourite author is Ursula K. Le Guin",
+]
+
+
+def make_texts(count: int) -> list:
+    """Distinct memories so content-hash deduplication doesn't skew the comparison"""
+    return [f"{SAMPLE_FACTS[i % len(SAMPLE_FACTS)]} (import note {i})" for i in range(count)]
+
+
+async def run_mode(adapter: AsyncMemoryAdapterOptimized, mode: str, texts: list, args) -> dict:
+    user_id = f"benchmark-{uuid4()}"
+    metadata = {"source": "benchmark"}
+    errors = 0
+
+    start = time.perf_counter()
+    if mode == "loop":
+        for text in texts:
+            try:
+                await adapter.add(text, user_id=user_id, metadata=metadata)
+            except Exception as e:
+                errors += 1
+                logger.warning(f"⚠️ add failed: {e}")
+    else:
+        result = await adapter.add_bulk(
+            texts, user_id=user_id, metadata=metadata,
+            infer=not args.no_infer, batch_size=args.batch_size
+        )
+        errors = result["failed"]
+    elapsed = time.perf_counter() - start
+
+    if not args.keep:
+        await adapter.delete_all(user_id=user_id)
+
+    return {
+        "mode": mode,
+        "count": len(texts),
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "memories_per_second": len(texts) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def print_report(results: list) -> None:
+    header = f"{'mode':<6} {'count':>6} {'errors':>7} {'elapsed s':>10} {'mem/s':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['mode']:<6} {r['count']:>6} {r['errors']:>7} {r['elapsed_s']:>10.2f} {r['memories_per_second']:>8.2f}")
+    if len(results) == 2 and results[0]["memories_per_second"]:
+        print(f"\nspeedup: {results[1]['memories_per_second'] / results[0]['memories_per_second']:.1f}x")
+
+
+async def main_async(args) -> bool:
+    adapter = AsyncMemoryAdapterOptimized(config={"jean_memory_config": JeanMemoryConfig.from_environment()})
+    texts = make_texts(args.count)
+    results = []
+    try:
+        for mode in args.modes:
+            logger.info(f"🏁 Running {mode} mode with {len(texts)} memories")
+            results.append(await run_mode(adapter, mode, texts, args))
+    finally:
+        await adapter.close()
+    print_report(results)
+    return all(r["errors"] == 0 for r in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk ingestion throughput vs one-at-a-time adds")
+    parser.add_argument("--count", type=int, default=100, help="Memories to add per mode")
+    parser.add_argument("--batch-size", type=int, default=None, help="Memories per bulk batch (engine default)")
+    parser.add_argument("--no-infer", action="store_true", help="Store bulk memories verbatim (skip fact extraction)")
+    parser.add_argument("--modes", nargs="+", choices=["loop", "bulk"], default=["loop", "bulk"])
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark users' memories")
+    args = parser.parse_args()
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the token-aware chunker against the character chunker it replaced.
+
+Chunks synthetic Markdown documents (headings, paragraphs, long unpunctuated
+lines, non-ASCII text) of the given sizes with both chunkers and reports the
+time per document, throughput, chunk count and the spread of chunk token
+counts. Token counts use tiktoken's cl100k_base encoding when it is installed
+and the chunker's own estimate otherwise. No database or API access needed.
+
+Usage:
+    python scripts/benchmark_chunker.py
+    python scripts/benchmark_chunker.py --sizes 200000 5000000 --repeat 5
+    python scripts/benchmark_chunker.py --max-tokens 300 --overlap-tokens 30 --no-headings
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.text_chunker import BYTES_PER_TOKEN, TextChunker, estimate_tokens
+
+WORDS = (
+    "the archive keeps every draft and most of them are worse than final essay still reading "
+    "back shows how an argument found its shape which sentences survived usually plain ones "
+    "café naïve façade résumé 東京 データ"
+).split()
+
+
+def make_document(size: int, seed: int = 0) -> str:
+    """Markdown-like text: sections of paragraphs of sentences, some very long lines"""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    section = 0
+    while length < size:
+        section += 1
+        parts.append(f"{'#' * rng.randint(1, 3)} Section {section}\n\n")
+        for _ in range(rng.randint(2, 6)):
+            if rng.random() < 0.1:
+                # Table row or code without sentence punctuation
+                sentences = [" | ".join(rng.choices(WORDS, k=rng.randint(80, 200)))]
+            else:
+                sentences = [
+                    " ".join(rng.choices(WORDS, k=rng.randint(5, 30))).capitalize() + rng.choice(".!?")
+                    for _ in range(rng.randint(1, 8))
+                ]
+            parts.append(" ".join(sentences) + "\n\n")
+        length = sum(len(part) for part in parts)
+    return "".join(parts)[:size]
+
+
+def legacy_chunk_text(text: str, chunk_size: int = 2000, overlap: int = 200) -> list:
+    """The character chunker ChunkingService used before, kept here as the baseline"""
+    chunks = []
+    start = 0
+    text_length = len(text)
+    while start < text_length:
+        end = start + chunk_size
+        if end < text_length:
+            search_start = max(start + chunk_size - 100, start)
+            search_end = min(start + chunk_size + 100, text_length)
+            sentence_end = -1
+            for i in range(search_end - 1, search_start - 1, -1):
+                if text[i] in '.!?' and i + 1 < text_length and text[i + 1] in ' \n\t':
+                    sentence_end = i + 1
+                    break
+            if sentence_end > 0:
+                end = sentence_end
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = end - overlap if end < text_length else text_length
+    return chunks
+
+
+def token_counter():
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("cl100k_base")
+        return "cl100k_base", lambda text: len(encoding.encode(text))
+    except ImportError:
+        return f"estimate ({BYTES_PER_TOKEN} bytes/token)", estimate_tokens
+
+
+def run(name: str, chunk, document: str, repeat: int, count_tokens) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chunks = chunk(document)
+        timings.append(time.perf_counter() - start)
+    tokens = [count_tokens(text) for text in chunks]
+    elapsed = statistics.median(timings)
+    mean = statistics.mean(tokens)
+    return {
+        "chunker": name,
+        "size": len(document),
+        "ms": elapsed * 1000,
+        "mb_per_second": len(document) / 1_000_000 / elapsed if elapsed > 0 else 0.0,
+        "chunks": len(chunks),
+        "min": min(tokens),
+        "mean": mean,
+        "max": max(tokens),
+        "cv": statistics.pstdev(tokens) / mean if mean else 0.0,
+    }
+
+
+def print_report(results: list, counter_name: str) -> None:
+    print(f"chunk tokens counted with {counter_name}; cv = stdev / mean\n")
+    header = (f"{'chunker':<8} {'size':>9} {'ms':>9} {'MB/s':>7} {'chunks':>7} "
+              f"{'min tok':>8} {'mean tok':>9} {'max tok':>8} {'cv':>6}")
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['chunker']:<8} {r['size']:>9} {r['ms']:>9.1f} {r['mb_per_second']:>7.2f} {r['chunks']:>7} "
+              f"{r['min']:>8} {r['mean']:>9.1f} {r['max']:>8} {r['cv']:>6.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Token-aware chunker vs character chunker on large documents")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[200000, 1000000, 5000000],
+                        help="Document sizes in characters")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per chunker and size (median reported)")
+    parser.add_argument("--max-tokens", type=int, default=500, help="Token-aware chunk size")
+    parser.add_argument("--overlap-tokens", type=int, default=50, help="Token-aware overlap")
+    parser.add_argument("--no-headings", action="store_true", help="Chunk as plain text (Substack posts)")
+    args = parser.parse_args()
+
+    chunker = TextChunker(max_tokens=args.max_tokens, overlap_tokens=args.overlap_tokens)
+    counter_name, count_tokens = token_counter()
+    results = []
+    for size in args.sizes:
+        document = make_document(size)
+        results.append(run("chars", legacy_chunk_text, document, args.repeat, count_tokens))
+        results.append(run("tokens", lambda text: chunker.chunk_text(text, headings=not args.no_headings),
+                           document, args.repeat, count_tokens))
+    print_report(results, counter_name)
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
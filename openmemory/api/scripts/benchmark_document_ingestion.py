@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark document chunk ingestion: the old per-object ORM writes against the
+streaming pipeline (ChunkingService.chunk_and_embed_document).
+
+Stores synthetic documents of the given sizes (Substack posts go up to
+sync_max_post_size, 200KB) for an existing user, ingests their chunks with
+each mode and reports chunks/second, MB/second and the peak Python memory
+allocated while ingesting one document (tracemalloc). The documents and their
+chunks are deleted afterwards.
+
+Modes:
+    orm       chunk_text() into a list, one DocumentChunk object per chunk, no embeddings
+    pipeline  streamed chunk batches with one multi-row INSERT each, no embeddings
+    embed     the full pipeline, embedding each batch (needs OPENAI_API_KEY)
+
+Usage:
+    python scripts/benchmark_document_ingestion.py --user-id <supabase user id>
+    python scripts/benchmark_document_ingestion.py --user-id <id> --sizes 200000 1000000 --documents 5
+    python scripts/benchmark_document_ingestion.py --user-id <id> --modes orm pipeline embed
+
+Uses the same environment as the API (DATABASE_URL, OPENAI_API_KEY).
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.database import SessionLocal
+from app.models import Document, DocumentChunk
+from app.services.chunking_service import ChunkingService
+from app.utils.db import get_or_create_app, get_or_create_user
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+SAMPLE_PARAGRAPH = (
+    "The archive keeps every draft, and most of them are worse than the final essay. "
+    "Still, reading them back shows how an argument found its shape! "
+    "Which sentences survived, and why? Usually the plain ones.\n\n"
+)
+
+
+def make_content(size: int, seed: int) -> str:
+    """Prose-like text of the given length with sentence and paragraph breaks"""
+    paragraph = f"[{seed}] {SAMPLE_PARAGRAPH}"
+    return (paragraph * (size // len(paragraph) + 1))[:size]
+
+
+def ingest_orm(db, document: Document, chunking_service: ChunkingService) -> int:
+    """The write path the pipeline replaced, kept here as the baseline"""
+    db.query(DocumentChunk).filter(DocumentChunk.document_id == document.id).delete()
+    chunks = chunking_service.chunk_text(document.content)
+    for i, chunk_content in enumerate(chunks):
+        db.add(DocumentChunk(
+            document_id=document.id,
+            chunk_index=i,
+            content=chunk_content,
+            metadata_={"chunk_size": len(chunk_content), "total_chunks": len(chunks)}
+        ))
+    db.commit()
+    return len(chunks)
+
+
+async def ingest(db, mode: str, document: Document, supa_uid: str, chunking_service: ChunkingService) -> int:
+    if mode == "orm":
+        return ingest_orm(db, document, chunking_service)
+    if mode == "pipeline":
+        return chunking_service.chunk_document(db, document)
+    return await chunking_service.chunk_and_embed_document(db, document, supa_uid)
+
+
+async def run_mode(db, mode: str, documents: list, supa_uid: str) -> dict:
+    chunking_service = ChunkingService()
+    chunks = 0
+    chars = 0
+    peak_bytes = 0
+    elapsed = 0.0
+    for document in documents:
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        chunks += await ingest(db, mode, document, supa_uid, chunking_service)
+        elapsed += time.perf_counter() - start
+        peak_bytes = max(peak_bytes, tracemalloc.get_traced_memory()[1])
+        chars += len(document.content)
+    return {
+        "mode": mode,
+        "documents": len(documents),
+        "chunks": chunks,
+        "elapsed_s": elapsed,
+        "chunks_per_second": chunks / elapsed if elapsed > 0 else 0.0,
+        "mb_per_second": chars / 1_000_000 / elapsed if elapsed > 0 else 0.0,
+        "peak_mb": peak_bytes / 1_000_000,
+    }
+
+
+def print_report(results: list) -> None:
+    header = f"{'mode':<9} {'size':>9} {'docs':>5} {'chunks':>7} {'elapsed s':>10} {'chunks/s':>9} {'MB/s':>7} {'peak MB':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['mode']:<9} {r['size']:>9} {r['documents']:>5} {r['chunks']:>7} {r['elapsed_s']:>10.2f} "
+              f"{r['chunks_per_second']:>9.1f} {r['mb_per_second']:>7.2f} {r['peak_mb']:>8.2f}")
+
+
+async def main_async(args) -> bool:
+    db = SessionLocal()
+    document_ids = []
+    results = []
+    tracemalloc.start()
+    try:
+        user = get_or_create_user(db, args.user_id)
+        app = get_or_create_app(db, user, "document_storage")
+        for size in args.sizes:
+            documents = []
+            for i in range(args.documents):
+                document = Document(
+                    user_id=user.id,
+                    app_id=app.id,
+                    title=f"Ingestion benchmark {size} #{i}",
+                    content=make_content(size, i),
+                    document_type="benchmark",
+                    metadata_={"source": "benchmark"}
+                )
+                db.add(document)
+                documents.append(document)
+            db.commit()
+            document_ids.extend(document.id for document in documents)
+
+            for mode in args.modes:
+                logger.info(f"🏁 Running {mode} ingestion of {len(documents)} documents of {size} chars")
+                result = await run_mode(db, mode, documents, args.user_id)
+                results.append({**result, "size": size})
+    finally:
+        tracemalloc.stop()
+        if document_ids:
+            db.rollback()
+            db.query(DocumentChunk).filter(DocumentChunk.document_id.in_(document_ids)).delete(synchronize_session=False)
+            db.query(Document).filter(Document.id.in_(document_ids)).delete(synchronize_session=False)
+            db.commit()
+        db.close()
+    print_report(results)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Document chunk ingestion throughput and memory")
+    parser.add_argument("--user-id", required=True, help="Supabase user ID that owns the benchmark documents")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[20000, 200000, 1000000],
+                        help="Document sizes in characters")
+    parser.add_argument("--documents", type=int, default=3, help="Documents per size")
+    parser.add_argument("--modes", nargs="+", choices=["orm", "pipeline", "embed"], default=["orm", "pipeline"])
+    args = parser.parse_args()
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
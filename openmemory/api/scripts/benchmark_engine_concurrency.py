@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark search latency while memories are being added.
+
+Runs a stream of concurrent search_memories calls while background writers
+call add_memory, once with blocking calls inline on the event loop (the old
+behaviour) and once with the engine thread pool, and reports p50/p95/p99
+search latency plus the worst event-loop stall seen by a heartbeat task.
+
+Usage:
+    python scripts/benchmark_engine_concurrency.py
+    python scripts/benchmark_engine_concurrency.py --searches 200 --adds 40 --writers 4
+    python scripts/benchmark_engine_concurrency.py --modes offload --keep
+
+Uses the same environment as the API (OPENAI_API_KEY, QDRANT_*, NEO4J_*) and
+writes to a throwaway benchmark user that is cleared afterwards.
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from jean_memory.config import JeanMemoryConfig
+from jean_memory.api_optimized import JeanMemoryAPIOptimized
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+SAMPLE_MEMORIES = [
+    "I prefer working on backend systems in Python and Go",
+    "My sister lives in Lisbon and works as an architect",
+    "I'm training for a half marathon in the spring",
+    "Our team ships releases every other Thursday",
+    "I'm allergic to peanuts",
+    "I started learning the cello last year",
+]
+
+SAMPLE_QUERIES = [
+    "What programming languages do I like?",
+    "Where does my family live?",
+    "What are my fitness goals?",
+    "How often does the team release?",
+    "Do I have any allergies?",
+    "What hobbies do I have?",
+]
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile of a list of latencies"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def heartbeat(stop: asyncio.Event, interval: float, stalls: list):
+    """Record how late the event loop wakes us up (a blocked loop shows up here)"""
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        stalls.append(max(0.0, time.perf_counter() - expected))
+
+
+async def run_mode(config: JeanMemoryConfig, offload: bool, args) -> dict:
+    """Seed, then run searches concurrently with adds; returns latency summary"""
+    mode_config = dataclasses.replace(config, engine_offload_enabled=offload)
+    api = JeanMemoryAPIOptimized(config=mode_config)
+    user_id = f"benchmark-{uuid4()}"
+
+    # Seed so searches have something to find, and warm the instance cache
+    for text in SAMPLE_MEMORIES:
+        await api.add_memory(text, user_id, source_description="benchmark")
+
+    search_latencies = []
+    add_latencies = []
+    stalls = []
+    stop = asyncio.Event()
+    search_slots = asyncio.Semaphore(args.search_concurrency)
+
+    async def one_search(i: int):
+        async with search_slots:
+            start = time.perf_counter()
+            result = await api.search_memories(SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)], user_id, limit=10)
+            if result.success:
+                search_latencies.append((time.perf_counter() - start) * 1000)
+
+    async def writer(worker: int):
+        for i in range(worker, args.adds, args.writers):
+            start = time.perf_counter()
+            await api.add_memory(
+                f"{SAMPLE_MEMORIES[i % len(SAMPLE_MEMORIES)]} (benchmark note {i})",
+                user_id,
+                source_description="benchmark"
+            )
+            add_latencies.append((time.perf_counter() - start) * 1000)
+
+    heartbeat_task = asyncio.create_task(heartbeat(stop, 0.01, stalls))
+    started = time.perf_counter()
+    writers = [asyncio.create_task(writer(w)) for w in range(args.writers)]
+    await asyncio.gather(*(one_search(i) for i in range(args.searches)))
+    await asyncio.gather(*writers)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await heartbeat_task
+
+    executor_stats = api.get_cache_stats()["executor"]
+    if not args.keep:
+        await api.clear_memories(user_id, confirm=True)
+    await api.close()
+
+    return {
+        "mode": "offload" if offload else "inline",
+        "searches": len(search_latencies),
+        "adds": len(add_latencies),
+        "elapsed_s": elapsed,
+        "search_p50": percentile(search_latencies, 50),
+        "search_p95": percentile(search_latencies, 95),
+        "search_p99": percentile(search_latencies, 99),
+        "search_mean": statistics.mean(search_latencies) if search_latencies else 0.0,
+        "add_p50": percentile(add_latencies, 50),
+        "max_loop_stall_ms": max(stalls) * 1000 if stalls else 0.0,
+        "executor": executor_stats,
+    }
+
+
+def print_report(results: list) -> None:
+    header = f"{'mode':<8} {'searches':>8} {'adds':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'add p50':>9} {'max stall':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['mode']:<8} {r['searches']:>8} {r['adds']:>5} {r['search_p50']:>9.1f} {r['search_p95']:>9.1f} "
+              f"{r['search_p99']:>9.1f} {r['add_p50']:>9.1f} {r['max_loop_stall_ms']:>10.1f}")
+
+
+async def main_async(args) -> bool:
+    config = JeanMemoryConfig.from_environment()
+    results = []
+    for mode in args.modes:
+        logger.info(f"🏁 Running {mode} mode: {args.searches} searches, {args.adds} adds, {args.writers} writers")
+        results.append(await run_mode(config, mode == "offload", args))
+    print_report(results)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search latency under concurrent add_memory load")
+    parser.add_argument("--searches", type=int, default=100, help="Total search calls")
+    parser.add_argument("--search-concurrency", type=int, default=10, help="Concurrent searches in flight")
+    parser.add_argument("--adds", type=int, default=20, help="Total add_memory calls made during the run")
+    parser.add_argument("--writers", type=int, default=4, help="Concurrent add_memory writers")
+    parser.add_argument("--modes", nargs="+", choices=["inline", "offload"], default=["inline", "offload"])
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark user's memories")
+    args = parser.parse_args()
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
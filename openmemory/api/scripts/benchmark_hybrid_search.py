@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Compare hybrid retrieval with vector-only search on recall and latency.
+
+Runs every query of a labelled query set for an existing user twice: once
+through the engine's vector-only search (the search_memory path before hybrid
+retrieval) and once through hybrid_search (vector, graph, memory full text,
+chunk vectors and chunk full text fused with RRF). Recall@k is the fraction
+of each query's expected snippets found (case-insensitively) in the top k
+results' content; latency is reported as p50/p95.
+
+Query file format (JSON):
+    [
+        {"query": "where does my sister live", "expected": ["Lisbon"]},
+        {"query": "what did I write about stoicism", "expected": ["Marcus Aurelius", "Epictetus"]}
+    ]
+
+Usage:
+    python scripts/benchmark_hybrid_search.py --user-id <supabase user id> --queries queries.json
+    python scripts/benchmark_hybrid_search.py --user-id <id> --queries queries.json --k 5 --repeat 3
+    python scripts/benchmark_hybrid_search.py --user-id <id> --queries queries.json --chunk-vector 0 --graph 0
+
+Uses the same environment as the API (DATABASE_URL, OPENAI_API_KEY, QDRANT_*, NEO4J_*).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.settings import config
+from app.tools.memory_modules.hybrid_search import RetrievalBudgets, hybrid_search
+from app.utils.memory import get_async_memory_client
+from jean_memory.models import SearchStrategy
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile of a list of latencies"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def recall_at_k(contents: list, expected: list, k: int) -> float:
+    if not expected:
+        return 1.0
+    top = " \n".join(content.lower() for content in contents[:k])
+    return sum(1 for snippet in expected if snippet.lower() in top) / len(expected)
+
+
+async def vector_only(memory_client, query: str, user_id: str, k: int, budgets: RetrievalBudgets) -> list:
+    response = await memory_client._api.search_memories(
+        query=query, user_id=user_id, limit=k, strategy=SearchStrategy.VECTOR_ONLY
+    )
+    return [memory.text for memory in response.memories]
+
+
+async def hybrid(memory_client, query: str, user_id: str, k: int, budgets: RetrievalBudgets) -> list:
+    results, _ = await hybrid_search(query, user_id, limit=k, budgets=budgets)
+    return [result.get('content', '') for result in results]
+
+
+MODES = {"vector": vector_only, "hybrid": hybrid}
+
+
+async def run_mode(memory_client, mode: str, queries: list, args, budgets: RetrievalBudgets) -> dict:
+    search = MODES[mode]
+    latencies, recalls, errors = [], [], 0
+    for _ in range(args.repeat):
+        for item in queries:
+            start = time.perf_counter()
+            try:
+                contents = await search(memory_client, item["query"], args.user_id, args.k, budgets)
+            except Exception as e:
+                errors += 1
+                logger.warning(f"⚠️ {mode} search failed for {item['query']!r}: {e}")
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+            recalls.append(recall_at_k(contents, item.get("expected", []), args.k))
+    return {
+        "mode": mode,
+        "searches": len(latencies),
+        "errors": errors,
+        "recall": sum(recalls) / len(recalls) if recalls else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+    }
+
+
+def print_report(results: list, k: int) -> None:
+    header = f"{'mode':<8} {'searches':>8} {'errors':>7} {f'recall@{k}':>10} {'p50 ms':>9} {'p95 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['mode']:<8} {r['searches']:>8} {r['errors']:>7} {r['recall']:>10.3f} "
+              f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f}")
+
+
+async def main_async(args) -> bool:
+    queries = json.loads(Path(args.queries).read_text())
+    budgets = RetrievalBudgets(
+        vector=args.k,
+        graph=args.graph if args.graph is not None else config.HYBRID_GRAPH_CANDIDATES,
+        memory_text=args.memory_text if args.memory_text is not None else config.HYBRID_MEMORY_TEXT_CANDIDATES,
+        chunk_vector=args.chunk_vector if args.chunk_vector is not None else config.HYBRID_CHUNK_VECTOR_CANDIDATES,
+        chunk_text=args.chunk_text if args.chunk_text is not None else config.HYBRID_CHUNK_TEXT_CANDIDATES,
+    )
+    memory_client = await get_async_memory_client()
+
+    # Warm up connections, memory instances and the embedding cache before timing
+    for mode in args.modes:
+        await MODES[mode](memory_client, queries[0]["query"], args.user_id, args.k, budgets)
+
+    results = []
+    for mode in args.modes:
+        logger.info(f"🏁 Running {mode} search over {len(queries)} queries x {args.repeat}")
+        results.append(await run_mode(memory_client, mode, queries, args, budgets))
+    print_report(results, args.k)
+    return all(r["errors"] == 0 for r in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hybrid retrieval vs vector-only search: recall and latency")
+    parser.add_argument("--user-id", required=True, help="Supabase user ID whose memories and documents are searched")
+    parser.add_argument("--queries", required=True, help="JSON file of {query, expected} items")
+    parser.add_argument("--k", type=int, default=10, help="Results per search (recall@k)")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the query set per mode")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--graph", type=int, default=None, help="Graph candidates (settings default)")
+    parser.add_argument("--memory-text", type=int, default=None, help="Memory full-text candidates (settings default)")
+    parser.add_argument("--chunk-vector", type=int, default=None, help="Chunk vector candidates (settings default)")
+    parser.add_argument("--chunk-text", type=int, default=None, help="Chunk full-text candidates (settings default)")
+    args = parser.parse_args()
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Replay the stored test conversations against the jean_memory tool and report latency.
+
+Every turn of every conversation in test_datasets/ is sent to jean_memory in
+each speed mode (fast, balanced, autonomous, comprehensive) with
+is_new_conversation true and false, for a throwaway user seeded with the
+conversations' relevant memories. Each call is timed end to end and per
+orchestration stage (planning, narrative lookup, ask_memory, engine searches,
+background triage/deep analysis, ...), p50/p95/p99 are printed per mode and
+stage, and every sample is appended to evaluation_metrics/metrics_<date>.jsonl
+in the metrics format used there, tagged with the git commit so runs can be
+compared commit to commit.
+
+By default the engine runs with the offline local profile (ENGINE_PROFILE=local:
+in-process vector index, hashing embedder, scripted LLM); the stand-ins'
+per-call latencies are configurable so results approximate production.
+
+Usage:
+    python scripts/benchmark_jean_memory_modes.py
+    python scripts/benchmark_jean_memory_modes.py --modes fast autonomous --repeat 3
+    python scripts/benchmark_jean_memory_modes.py --llm-latency-ms 900 --embedding-latency-ms 150 --vector-latency-ms 40
+    python scripts/benchmark_jean_memory_modes.py --profile remote --datasets test_datasets/conversation_Simple_Test_20250816_003342.json
+
+Needs DATABASE_URL (the local Docker Postgres is enough). The remote profile
+uses the same environment as the API (OPENAI_API_KEY, QDRANT_*, GEMINI_API_KEY).
+"""
+
+import argparse
+import asyncio
+import contextvars
+import functools
+import importlib
+import inspect
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+MODES = ["fast", "balanced", "autonomous", "comprehensive"]
+CLIENT_NAME = "benchmark"
+
+# (module, class or None for module-level functions, attribute, stage name).
+# Missing targets are skipped, so the harness keeps working as internals move.
+STAGE_TARGETS = [
+    ("app.mcp_orchestration", "SmartContextOrchestrator", "_ai_create_context_plan", "plan"),
+    ("app.mcp_orchestration", "SmartContextOrchestrator", "_get_cached_narrative", "narrative_lookup"),
+    ("app.mcp_orchestration", "SmartContextOrchestrator", "_standard_orchestration", "standard_orchestration"),
+    ("app.mcp_orchestration", "SmartContextOrchestrator", "_execute_deep_comprehensive_analysis", "comprehensive_analysis"),
+    ("app.mcp_orchestration", "SmartContextOrchestrator", "triage_and_save_memory_background", "background_triage"),
+    ("app.mcp_orchestration", "SmartContextOrchestrator", "run_deep_analysis_and_save_as_memory", "background_deep_analysis"),
+    ("app.mcp_orchestration", None, "ask_memory", "ask_memory"),
+    ("app.tools.memory", None, "ask_memory", "ask_memory"),
+    ("app.tools.memory", None, "search_memory", "search_memory"),
+    ("app.tools.documents", None, "deep_memory_query", "deep_memory_query"),
+    ("jean_memory.api_optimized", "JeanMemoryAPIOptimized", "search_memories", "engine_search"),
+    ("jean_memory.api_optimized", "JeanMemoryAPIOptimized", "search_memories_batch", "engine_search_batch"),
+    ("jean_memory.api_optimized", "JeanMemoryAPIOptimized", "add_memory", "engine_add"),
+]
+
+# Samples recorded by the timing wrappers for the call in progress
+_stage_log: contextvars.ContextVar = contextvars.ContextVar("benchmark_stage_log", default=None)
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile of a list of latencies"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def _timed(stage: str, func):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        ok = True
+        try:
+            return await func(*args, **kwargs)
+        except Exception:
+            ok = False
+            raise
+        finally:
+            log = _stage_log.get()
+            if log is not None:
+                log.append((stage, (time.perf_counter() - start) * 1000, ok))
+    wrapper._benchmark_stage = stage
+    return wrapper
+
+
+def instrument_stages() -> list:
+    """Wrap each stage target with a timer; returns the stage names instrumented"""
+    instrumented = []
+    for module_name, class_name, attribute, stage in STAGE_TARGETS:
+        try:
+            owner = importlib.import_module(module_name)
+            if class_name:
+                owner = getattr(owner, class_name)
+            func = getattr(owner, attribute)
+        except (ImportError, AttributeError) as e:
+            logger.warning(f"⚠️ Stage '{stage}' not instrumented: {e}")
+            continue
+        if hasattr(func, "_benchmark_stage") or not inspect.iscoroutinefunction(func):
+            continue
+        setattr(owner, attribute, _timed(stage, func))
+        instrumented.append(stage)
+    return sorted(set(instrumented))
+
+
+def load_conversations(paths: list) -> list:
+    files = []
+    for path in paths:
+        path = Path(path)
+        files.extend(sorted(path.glob("conversation_*.json")) if path.is_dir() else [path])
+    conversations = []
+    for file in files:
+        with open(file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data["_file"] = file.name
+        conversations.append(data)
+    return conversations
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=project_root, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def metric_row(function_name: str, latency_ms: float, success: bool, error, memory_delta_mb, metadata: dict) -> dict:
+    timestamp = datetime.now().isoformat()
+    return {
+        "function_name": function_name,
+        "latency_ms": latency_ms,
+        "success": success,
+        "timestamp": timestamp,
+        "metadata": {"timestamp": timestamp, **metadata},
+        "error": error,
+        "memory_delta_mb": memory_delta_mb,
+    }
+
+
+async def seed_user(supa_uid: str, conversations: list) -> int:
+    """Store every relevant memory referenced by the conversations (verbatim, batched)"""
+    from app.database import SessionLocal
+    from app.services.memory_ingestion import BulkMemoryItem, ingest_memories_bulk
+    from app.utils.db import get_user_and_app
+
+    contents = []
+    for conversation in conversations:
+        for turn in conversation.get("turns", []):
+            for memory in turn.get("relevant_memories", []):
+                if memory.get("content") and memory["content"] not in contents:
+                    contents.append(memory["content"])
+
+    db = SessionLocal()
+    try:
+        user, app = get_user_and_app(db, supa_uid, CLIENT_NAME, f"{supa_uid}@benchmark.local")
+        result = await ingest_memories_bulk(
+            db, user.id, app.id, supa_uid,
+            [BulkMemoryItem(content=c, metadata={"source": "benchmark"}) for c in contents],
+            infer=False
+        )
+        return result["added"]
+    finally:
+        db.close()
+
+
+async def run_call(jean_memory, mode: str, message: str, is_new: bool, run_background: bool, process) -> dict:
+    """One jean_memory call; background tasks run afterwards and are timed separately"""
+    from fastapi import BackgroundTasks
+    from app.context import background_tasks_var
+    from app.utils.mcp_modules.deep_analysis_scheduler import get_deep_analysis_scheduler
+
+    stages = []
+    background_tasks = BackgroundTasks()
+    background_tasks_var.set(background_tasks)
+    _stage_log.set(stages)
+
+    rss_before = process.memory_info().rss if process else None
+    error = None
+    start = time.perf_counter()
+    try:
+        response = await jean_memory(user_message=message, is_new_conversation=is_new, speed=mode)
+        if response.startswith("Error") or response.startswith("I had trouble processing"):
+            error = response[:200]
+    except Exception as e:
+        error = str(e)
+    latency_ms = (time.perf_counter() - start) * 1000
+    memory_delta_mb = (process.memory_info().rss - rss_before) / (1024 * 1024) if process else None
+
+    background_stages = []
+    background_ms = None
+    if run_background and background_tasks.tasks:
+        _stage_log.set(background_stages)
+        bg_start = time.perf_counter()
+        try:
+            await background_tasks()
+            await get_deep_analysis_scheduler().wait_idle()
+        except Exception as e:
+            logger.warning(f"⚠️ Background task failed: {e}")
+        background_ms = (time.perf_counter() - bg_start) * 1000
+    _stage_log.set(None)
+
+    return {
+        "latency_ms": latency_ms,
+        "success": error is None,
+        "error": error,
+        "memory_delta_mb": memory_delta_mb,
+        "stages": stages + background_stages,
+        "background_ms": background_ms,
+    }
+
+
+def print_report(samples: dict) -> None:
+    header = f"{'mode':<14} {'new':<5} {'stage':<26} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>6}"
+    print(header)
+    print("-" * len(header))
+    for (mode, is_new, stage), entries in sorted(samples.items(), key=lambda item: (
+            MODES.index(item[0][0]), not item[0][1], item[0][2] != "total", item[0][2])):
+        latencies = [latency for latency, _ in entries]
+        errors = sum(1 for _, ok in entries if not ok)
+        print(f"{mode:<14} {str(is_new).lower():<5} {stage:<26} {len(entries):>5} {percentile(latencies, 50):>9.1f} "
+              f"{percentile(latencies, 95):>9.1f} {percentile(latencies, 99):>9.1f} {errors:>6}")
+
+
+async def main_async(args) -> bool:
+    import psutil
+    from app.context import user_id_var, client_name_var
+    from app.tools.orchestration import jean_memory
+    from app.utils.memory import get_async_memory_client
+
+    stages = instrument_stages()
+    logger.info(f"⏱️ Instrumented stages: {', '.join(stages)}")
+
+    conversations = load_conversations(args.datasets)
+    if not conversations:
+        logger.error("No conversations found")
+        return False
+
+    supa_uid = str(uuid4())
+    user_id_var.set(supa_uid)
+    client_name_var.set(CLIENT_NAME)
+    seeded = await seed_user(supa_uid, conversations)
+    logger.info(f"🌱 Seeded {seeded} memories for benchmark user {supa_uid}")
+
+    process = psutil.Process()
+    commit = git_commit()
+    run_id = str(uuid4())
+    new_conversation_values = {"true": [True], "false": [False], "both": [True, False]}[args.new_conversation]
+    base_metadata = {
+        "user_id": supa_uid,
+        "client_name": CLIENT_NAME,
+        "run_id": run_id,
+        "git_commit": commit,
+        "engine_profile": args.profile,
+        "stand_in_latency_ms": {
+            "llm": args.llm_latency_ms, "embedding": args.embedding_latency_ms, "vector": args.vector_latency_ms
+        },
+    }
+
+    # Warm up instance caches and lazy imports so the first measured call isn't an outlier
+    await run_call(jean_memory, "fast", "warm up", False, False, None)
+
+    samples = defaultdict(list)
+    rows = []
+    for repeat in range(args.repeat):
+        for mode in args.modes:
+            for is_new in new_conversation_values:
+                logger.info(f"🏁 Replaying {len(conversations)} conversations: mode={mode} new={is_new} pass={repeat + 1}")
+                for conversation in conversations:
+                    for turn in conversation.get("turns", []):
+                        result = await run_call(
+                            jean_memory, mode, turn["user_message"], is_new, not args.skip_background, process
+                        )
+                        metadata = {
+                            **base_metadata,
+                            "is_new_conversation": is_new,
+                            "mode": mode,
+                            "dataset": conversation["_file"],
+                            "turn": turn.get("turn_number"),
+                        }
+                        samples[(mode, is_new, "total")].append((result["latency_ms"], result["success"]))
+                        rows.append(metric_row(f"jean_memory.{mode}", result["latency_ms"], result["success"],
+                                               result["error"], result["memory_delta_mb"], {**metadata, "stage": "total"}))
+                        if result["background_ms"] is not None:
+                            samples[(mode, is_new, "background_total")].append((result["background_ms"], True))
+                        for stage, latency_ms, ok in result["stages"]:
+                            samples[(mode, is_new, stage)].append((latency_ms, ok))
+                            rows.append(metric_row(f"jean_memory.{mode}.{stage}", latency_ms, ok, None, None,
+                                                   {**metadata, "stage": stage}))
+
+    print_report(samples)
+
+    output = Path(args.output) if args.output else (
+        project_root / "evaluation_metrics" / f"metrics_{datetime.now().strftime('%Y-%m-%d')}.jsonl"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "a", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+    print(f"\n{len(rows)} samples written to {output} (run {run_id}, commit {commit})")
+
+    if args.profile == "local":
+        from jean_memory.local_engine import get_scripted_llm
+        stats = get_scripted_llm().stats()
+        print(f"Local LLM calls: {stats['calls']} {json.dumps(stats['rule_hits'], sort_keys=True)}")
+
+    if not args.keep:
+        from app.tools.memory import delete_all_memories
+        await delete_all_memories()
+        memory_client = await get_async_memory_client()
+        await memory_client.delete_all(user_id=supa_uid)
+        await memory_client.close()
+
+    return all(ok for entries in samples.values() for _, ok in entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay test conversations against jean_memory and report latency")
+    parser.add_argument("--datasets", nargs="+", default=[str(project_root / "test_datasets")],
+                        help="Conversation JSON files or directories")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--new-conversation", choices=["true", "false", "both"], default="both",
+                        help="is_new_conversation values to replay")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the datasets")
+    parser.add_argument("--profile", choices=["local", "remote"], default="local", help="Engine profile")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Local stand-in LLM latency per call")
+    parser.add_argument("--embedding-latency-ms", type=float, default=0.0, help="Local stand-in embedding latency per call")
+    parser.add_argument("--vector-latency-ms", type=float, default=0.0, help="Local stand-in vector store latency per call")
+    parser.add_argument("--skip-background", action="store_true", help="Don't run the background triage/analysis tasks")
+    parser.add_argument("--output", help="Metrics JSONL file to append to (default evaluation_metrics/metrics_<date>.jsonl)")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark user's memories")
+    args = parser.parse_args()
+
+    # The engine, GeminiService and the stand-ins read these when first used
+    os.environ["ENGINE_PROFILE"] = args.profile
+    os.environ["LOCAL_LLM_LATENCY_MS"] = str(args.llm_latency_ms)
+    os.environ["LOCAL_EMBEDDING_LATENCY_MS"] = str(args.embedding_latency_ms)
+    os.environ["LOCAL_VECTOR_LATENCY_MS"] = str(args.vector_latency_ms)
+    # Repeated passes must measure the work, not the single-flight result reuse
+    os.environ.setdefault("SINGLE_FLIGHT_RESULT_TTL_SECONDS", "0")
+    # Background deep analysis runs right after each call instead of after the debounce window
+    os.environ.setdefault("DEEP_ANALYSIS_DEBOUNCE_SECONDS", "0")
+
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
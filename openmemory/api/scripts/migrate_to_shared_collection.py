@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Migrate per-user mem0_{user_id} Qdrant collections into shared collections.
+
+Streams every legacy collection page by page (vectors + payloads) into the
+shared, tenant-partitioned collection that JeanMemoryConfig assigns to that
+user, so memory never holds more than one page of points at a time.
+
+Usage:
+    python scripts/migrate_to_shared_collection.py --dry-run
+    python scripts/migrate_to_shared_collection.py --batch-size 256
+    python scripts/migrate_to_shared_collection.py --delete-source
+
+Run with QDRANT_STORAGE_MODE=shared (and the same QDRANT_SHARED_COLLECTION /
+QDRANT_SHARED_SHARDS the API will use) so users land in the right shard.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from qdrant_client.http import models
+
+from jean_memory.config import JeanMemoryConfig
+from jean_memory.api_optimized import JeanMemoryAPIOptimized
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LEGACY_PREFIX = "mem0_"
+
+
+def migrate_collection(client, source: str, target: str, user_id: str,
+                       batch_size: int, dry_run: bool) -> int:
+    """Copy all points of one legacy collection into its shared collection"""
+    copied = 0
+    offset = None
+
+    while True:
+        points, offset = client.scroll(
+            collection_name=source,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        if not points:
+            break
+
+        batch = []
+        for point in points:
+            payload = dict(point.payload or {})
+            # Older collections relied on the collection name for isolation
+            payload.setdefault("user_id", user_id)
+            batch.append(models.PointStruct(id=point.id, vector=point.vector, payload=payload))
+
+        if not dry_run:
+            client.upsert(collection_name=target, points=batch, wait=offset is None)
+        copied += len(batch)
+
+        if offset is None:
+            break
+
+    return copied
+
+
+def verify_collection(client, source: str, target: str, user_id: str) -> bool:
+    """Check the shared collection holds at least as many points for the user"""
+    source_count = client.count(collection_name=source, exact=True).count
+    target_count = client.count(
+        collection_name=target,
+        count_filter=models.Filter(must=[
+            models.FieldCondition(key="user_id", match=models.MatchValue(value=user_id))
+        ]),
+        exact=True,
+    ).count
+    if target_count < source_count:
+        logger.error(f"❌ {source}: {source_count} points but only {target_count} in {target}")
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate per-user Qdrant collections into shared collections")
+    parser.add_argument("--batch-size", type=int, default=256, help="Points per scroll/upsert page")
+    parser.add_argument("--dry-run", action="store_true", help="Read source collections without writing")
+    parser.add_argument("--delete-source", action="store_true",
+                        help="Delete each legacy collection after its copy is verified")
+    parser.add_argument("--limit", type=int, default=None, help="Only migrate the first N collections")
+    args = parser.parse_args()
+
+    config = JeanMemoryConfig.from_environment()
+    if not config.uses_shared_collection:
+        logger.error("QDRANT_STORAGE_MODE must be 'shared' to run the migration")
+        return False
+
+    api = JeanMemoryAPIOptimized(config=config)
+    client = api._create_qdrant_client()
+    shared_names = set(config.get_shared_collection_names())
+
+    sources = sorted(
+        c.name for c in client.get_collections().collections
+        if c.name.startswith(LEGACY_PREFIX) and c.name not in shared_names
+    )
+    if args.limit:
+        sources = sources[:args.limit]
+
+    logger.info(f"🔄 Migrating {len(sources)} collections into {sorted(shared_names)}"
+                f"{' (dry run)' if args.dry_run else ''}")
+
+    start_time = time.time()
+    total_points = 0
+    failed = []
+
+    for i, source in enumerate(sources, 1):
+        user_id = source[len(LEGACY_PREFIX):]
+        try:
+            # Creates the shared collection + tenant index on first use
+            target = asyncio.run(api._ensure_collection_ready_optimized(user_id))
+            copied = migrate_collection(client, source, target, user_id, args.batch_size, args.dry_run)
+            total_points += copied
+
+            if not args.dry_run:
+                if not verify_collection(client, source, target, user_id):
+                    failed.append(source)
+                    continue
+                if args.delete_source:
+                    client.delete_collection(collection_name=source)
+
+            logger.info(f"✅ [{i}/{len(sources)}] {source} -> {target}: {copied} points")
+        except Exception as e:
+            logger.error(f"❌ [{i}/{len(sources)}] {source} failed: {e}")
+            failed.append(source)
+
+    elapsed = time.time() - start_time
+    rate = total_points / elapsed if elapsed > 0 else 0
+    logger.info(f"🎉 Migrated {total_points} points from {len(sources) - len(failed)} collections "
+                f"in {elapsed:.1f}s ({rate:.0f} points/s)")
+    if failed:
+        logger.error(f"❌ {len(failed)} collections need attention: {failed}")
+
+    return not failed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
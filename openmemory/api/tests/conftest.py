@@ -0,0 +1,11 @@
+"""
+Shared test setup: app.settings and app.database read the environment at
+import time, so offline defaults are set before any app module is imported.
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'jean_memory_tests.db')}")
+# No Qdrant, OpenAI, Gemini or Neo4j: the engine runs with its offline stand-ins
+os.environ.setdefault("ENGINE_PROFILE", "local")
@@ -0,0 +1,184 @@
+"""Tests for bulk memory ingestion against a stubbed memory engine"""
+
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Memory, MemoryState
+from app.services import memory_ingestion
+from app.services.memory_ingestion import BulkMemoryItem, apply_memory_limits, ingest_memories_bulk
+from jean_memory.bulk_ingest import parse_batch_extraction
+from jean_memory.mem0_adapter_optimized import AsyncMemoryAdapterOptimized
+
+
+USER_ID = "bulk-user"
+
+
+class _Client:
+    """add_bulk stand-in: texts containing "nothing" extract no facts, "fail" fails"""
+
+    def __init__(self, raise_on_call=None):
+        self.calls = []
+        self.raise_on_call = raise_on_call
+
+    async def add_bulk(self, texts, user_id, item_metadata=None, infer=True, batch_size=None):
+        self.calls.append(list(texts))
+        if self.raise_on_call == len(self.calls):
+            raise RuntimeError("engine down")
+        results = []
+        for i, text in enumerate(texts):
+            failed = "fail" in text
+            ids = [] if failed or "nothing" in text else [f"mem-{len(self.calls)}-{i}"]
+            results.append({"ids": ids, "memory": text, "failed": failed})
+        return {"results": results, "failed": sum(r["failed"] for r in results),
+                "memories_per_second": 0.0, "errors": []}
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Memory.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    stub = _Client()
+
+    async def get_client():
+        return stub
+
+    monkeypatch.setattr("app.utils.memory.get_async_memory_client", get_client)
+    return stub
+
+
+async def _ingest(db, contents, **kwargs):
+    return await ingest_memories_bulk(db, uuid.uuid4(), uuid.uuid4(), USER_ID,
+                                      [BulkMemoryItem(content=c, metadata={"source": "test"}) for c in contents],
+                                      **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_writes_one_mirror_row_per_stored_memory(db, client):
+    result = await _ingest(db, ["likes tea", "nothing here", "lives in Oslo"])
+
+    rows = db.query(Memory).all()
+    assert result["added"] == 2
+    assert result["skipped_indices"] == [1]
+    assert {row.content for row in rows} == {"likes tea", "lives in Oslo"}
+    assert {str(row.id) for row in rows} == set(result["memory_ids"])
+    assert all(row.state == MemoryState.active for row in rows)
+    assert rows[0].metadata_["source"] == "test"
+    assert rows[0].metadata_["mem0_id"] == rows[0].metadata_["mem0_ids"][0]
+
+
+@pytest.mark.asyncio
+async def test_empty_items_are_skipped_without_reaching_the_engine(db, client):
+    result = await _ingest(db, ["", "likes tea", "   "])
+
+    assert client.calls == [["likes tea"]]
+    assert result["added"] == 1
+    assert result["skipped"] == 2
+    assert result["skipped_indices"] == [0, 2]
+
+
+@pytest.mark.asyncio
+async def test_oversized_item_fails_alone(db, client):
+    too_long = "x" * (memory_ingestion.MAX_MEMORY_CHARS + 1)
+    result = await _ingest(db, ["likes tea", too_long, "lives in Oslo"])
+
+    assert client.calls == [["likes tea", "lives in Oslo"]]
+    assert result["added"] == 2
+    assert result["failed"] == 1
+    assert result["errors"] == [f"Item 1: longer than {memory_ingestion.MAX_MEMORY_CHARS} characters"]
+
+
+@pytest.mark.asyncio
+async def test_only_invalid_items_never_call_the_engine(db, client):
+    result = await _ingest(db, ["", "x" * (memory_ingestion.MAX_MEMORY_CHARS + 1)])
+
+    assert client.calls == []
+    assert (result["added"], result["skipped"], result["failed"]) == (0, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_failures_are_counted_per_item_and_per_chunk(db, client):
+    client.raise_on_call = 2
+    progress = []
+    # batch_size 1 sends chunks of 4 items to the engine
+    contents = ["", "fail one"] + [f"fact {i}" for i in range(8)]
+    result = await _ingest(db, contents, batch_size=1, progress_callback=lambda done, total: progress.append(done))
+
+    assert [len(call) for call in client.calls] == [4, 4, 1]
+    assert progress == [4, 8, 9]
+    assert result["added"] == 4
+    assert result["failed"] == 5
+    assert result["errors"] == ["Items 5-8: engine down"]
+    assert db.query(Memory).count() == 4
+
+
+def test_memory_limits_split_items_at_the_limit(db, monkeypatch):
+    monkeypatch.setattr("app.tools.memory_modules.utils.validate_memory_limits",
+                        lambda user_id, count, limits: (count < 3, "limit reached"))
+    user_id = uuid.uuid4()
+    db.execute(insert(Memory), [{"user_id": user_id, "app_id": uuid.uuid4(), "content": "existing",
+                                 "state": MemoryState.active}])
+    db.commit()
+
+    items = [BulkMemoryItem(content=f"fact {i}") for i in range(4)]
+    allowed, rejected = apply_memory_limits(db, user_id, USER_ID, items)
+
+    assert allowed == items[:2]
+    assert rejected == ["limit reached", "limit reached"]
+
+
+def test_parse_batch_extraction_maps_facts_by_index():
+    response = '```json\n{"items": [{"index": 1, "facts": ["b", " "]}, {"index": 0, "facts": ["a"]}]}\n```'
+
+    assert parse_batch_extraction(response, 3) == [["a"], ["b"], None]
+
+
+def test_parse_batch_extraction_ignores_malformed_entries():
+    response = '{"items": [{"index": 5, "facts": ["x"]}, {"index": 0, "facts": "x"}, "x", {"index": 1, "facts": []}]}'
+
+    assert parse_batch_extraction(response, 2) == [None, []]
+    assert parse_batch_extraction("not json", 2) == [None, None]
+    assert parse_batch_extraction(None, 1) == [None]
+
+
+def _adapter(item_memory_ids):
+    class _Api:
+        async def add_memories_bulk(self, request, item_metadata=None, infer=True, batch_size=None):
+            self.request = request
+            return SimpleNamespace(item_memory_ids=item_memory_ids, failed_memories=1,
+                                   memories_per_second=12.5, errors=["boom"])
+
+    adapter = AsyncMemoryAdapterOptimized.__new__(AsyncMemoryAdapterOptimized)
+    adapter._api = _Api()
+    adapter._initialized = True
+    return adapter
+
+
+@pytest.mark.asyncio
+async def test_add_bulk_maps_engine_ids_to_results():
+    adapter = _adapter([["id-1", "id-2"], [], None])
+
+    result = await adapter.add_bulk(["a", "b", "c"], user_id=USER_ID)
+
+    assert result["results"] == [
+        {"ids": ["id-1", "id-2"], "memory": "a", "failed": False},
+        {"ids": [], "memory": "b", "failed": False},
+        {"ids": [], "memory": "c", "failed": True},
+    ]
+    assert (result["failed"], result["memories_per_second"], result["errors"]) == (1, 12.5, ["boom"])
+
+
+@pytest.mark.asyncio
+async def test_add_bulk_rejects_empty_texts():
+    with pytest.raises(ValueError):
+        await _adapter([]).add_bulk(["a", " "], user_id=USER_ID)
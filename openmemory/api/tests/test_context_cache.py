@@ -0,0 +1,90 @@
+"""Tests for the per-user context cache and its use by fast deep analysis"""
+
+import pytest
+
+import app.tools  # noqa: F401  (app.tools must be imported before app.mcp_orchestration)
+from app import mcp_orchestration
+from app.utils.mcp_modules import cache_manager
+from app.utils.mcp_modules.cache_manager import ContextCache
+
+
+def _clock(monkeypatch, start=1000.0):
+    now = [start]
+    monkeypatch.setattr("app.utils.mcp_modules.cache_manager.time.monotonic", lambda: now[0])
+    return now
+
+
+def _entry(data="context"):
+    return {"context_data": data}
+
+
+def test_least_recently_read_entry_is_evicted(monkeypatch):
+    _clock(monkeypatch)
+    cache = ContextCache(max_entries=2)
+    cache.put("a", _entry(), "u1")
+    cache.put("b", _entry(), "u1")
+    cache.get("a")
+    cache.put("c", _entry(), "u1")
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = _clock(monkeypatch)
+    cache = ContextCache(ttl_seconds=60)
+    cache.put("a", _entry(), "u1")
+
+    now[0] += 59
+    assert cache.get("a") is not None
+    now[0] += 2
+    assert cache.get("a") is None
+    assert cache.get_stats()["expirations"] == 1
+
+
+def test_byte_budget_is_enforced(monkeypatch):
+    _clock(monkeypatch)
+    cache = ContextCache(max_bytes=100)
+    cache.put("big", _entry("x" * 200), "u1")
+    cache.put("a", _entry("x" * 40), "u1")
+    cache.put("b", _entry("x" * 40), "u1")
+    cache.put("c", _entry("x" * 40), "u1")
+
+    stats = cache.get_stats()
+    assert cache.get("big") is None and cache.get("a") is None
+    assert stats["cache_size"] == 2 and stats["cache_bytes"] <= 100
+
+
+def test_invalidate_user_drops_only_that_users_entries(monkeypatch):
+    _clock(monkeypatch)
+    cache = ContextCache()
+    cache.put("a", _entry(), "u1")
+    cache.put("b", _entry(), "u1")
+    cache.put("c", _entry(), "u2")
+
+    assert cache.invalidate_user("u1") == 2
+    assert cache.get("a") is None and cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+@pytest.mark.asyncio
+async def test_fast_deep_memories_are_cached_until_the_user_changes(monkeypatch):
+    monkeypatch.setattr(cache_manager, "_context_cache", ContextCache())
+    orchestrator = mcp_orchestration.SmartContextOrchestrator()
+    searches = []
+
+    async def search_many(queries, limit, with_vectors=False):
+        searches.append(len(queries))
+        return [[{"id": f"m{n}", "memory": f"memory {n}", "score": 0.5} for n in range(3)]]
+
+    monkeypatch.setattr(orchestrator, "_search_many", search_many)
+
+    first = await orchestrator._get_fast_deep_memories("u1")
+    second = await orchestrator._get_fast_deep_memories("u1")
+    cache_manager.invalidate_user_context("u1")
+    third = await orchestrator._get_fast_deep_memories("u1")
+
+    assert first == second == third
+    assert first[0] == 3 and len(first[1]) == 3
+    assert len(searches) == 2
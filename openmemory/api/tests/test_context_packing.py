@@ -0,0 +1,69 @@
+"""Tests for token-budgeted, diversity-aware context packing"""
+
+from app.utils.mcp_modules.context_packing import (
+    SEPARATOR_TOKENS,
+    ContextCandidate,
+    estimate_tokens,
+    pack_context,
+)
+
+
+def _texts(packed):
+    return [candidate.text for candidate in packed]
+
+
+def test_packing_stays_within_the_token_budget():
+    candidates = [ContextCandidate(f"memory number {n} " + "word " * 20, score=1.0 - n / 100) for n in range(50)]
+    budget = 200
+
+    packed = pack_context(candidates, budget)
+
+    used = sum(estimate_tokens(c.text) + SEPARATOR_TOKENS for c in packed)
+    assert packed and used <= budget
+    # A short memory that still fits is packed even after a longer one did not
+    assert pack_context([ContextCandidate("x" * 400, 0.9), ContextCandidate("short", 0.1)], 20)[0].text == "short"
+
+
+def test_exact_duplicates_are_merged_keeping_the_best_score():
+    packed = pack_context([
+        ContextCandidate("Likes  tea", score=0.2),
+        ContextCandidate("likes tea", score=0.9),
+        ContextCandidate("Works at a bakery", score=0.5),
+    ], budget_tokens=1000)
+
+    assert len(packed) == 2
+    assert packed[0].score == 0.9
+
+
+def test_near_duplicates_are_dropped_and_diverse_memories_kept():
+    packed = pack_context([
+        ContextCandidate("a", score=0.9, embedding=[1.0, 0.0]),
+        ContextCandidate("b", score=0.8, embedding=[0.99, 0.01]),
+        ContextCandidate("c", score=0.1, embedding=[0.0, 1.0]),
+    ], budget_tokens=1000)
+
+    assert _texts(packed) == ["a", "c"]
+
+
+def test_mmr_prefers_a_diverse_memory_over_a_similar_one():
+    candidates = [
+        ContextCandidate("a", score=1.0, embedding=[1.0, 0.0]),
+        ContextCandidate("b", score=0.9, embedding=[0.8, 0.6]),
+        ContextCandidate("c", score=0.7, embedding=[0.0, 1.0]),
+    ]
+
+    assert _texts(pack_context(candidates, 1000, mmr_lambda=0.5))[:2] == ["a", "c"]
+    assert _texts(pack_context(candidates, 1000, mmr_lambda=1.0))[:2] == ["a", "b"]
+
+
+def test_without_scores_the_input_order_is_kept():
+    packed = pack_context([ContextCandidate("newest fact"), ContextCandidate("older thing"),
+                           ContextCandidate("oldest item")], budget_tokens=1000, mmr_lambda=1.0)
+
+    assert _texts(packed) == ["newest fact", "older thing", "oldest item"]
+
+
+def test_empty_input_and_zero_budget_pack_nothing():
+    assert pack_context([], 100) == []
+    assert pack_context([ContextCandidate("  ")], 100) == []
+    assert pack_context([ContextCandidate("fact", 1.0)], 0) == []
@@ -0,0 +1,14 @@
+"""Tests for create_all on databases without PostgreSQL-only types"""
+
+from app import db_init
+
+
+def test_tables_sqlite_cannot_render_are_left_to_migrations():
+    names = {table.name for table in db_init._creatable_tables()}
+
+    assert "document_chunks" not in names
+    assert {"users", "memories", "documents"} <= names
+
+
+def test_init_database_succeeds_on_sqlite():
+    db_init.init_database()
@@ -0,0 +1,157 @@
+"""Tests for the budgeted, coalescing deep-analysis scheduler"""
+
+import asyncio
+import contextvars
+
+import pytest
+
+from app.utils.mcp_modules.deep_analysis_scheduler import DeepAnalysisScheduler
+
+
+class _Analyses:
+    def __init__(self, delay=0.0, fail_for=()):
+        self.delay = delay
+        self.fail_for = set(fail_for)
+        self.runs = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, user_message, user_id, client_name):
+        self.runs.append((user_id, user_message))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if user_id in self.fail_for:
+                raise RuntimeError("gemini unavailable")
+        finally:
+            self.active -= 1
+
+
+def _scheduler(analyses, **overrides):
+    settings = dict(max_concurrency=2, debounce_seconds=0, min_interval_seconds=0,
+                    user_budget_per_hour=10, global_budget_per_hour=100)
+    settings.update(overrides)
+    return DeepAnalysisScheduler(analyses, **settings)
+
+
+async def _drain(scheduler):
+    await asyncio.wait_for(scheduler.wait_idle(poll_seconds=0.005), timeout=2)
+
+
+@pytest.mark.asyncio
+async def test_requests_for_one_user_coalesce_and_latest_message_wins():
+    analyses = _Analyses()
+    scheduler = _scheduler(analyses, debounce_seconds=0.05)
+
+    for message in ("first", "second", "third"):
+        assert scheduler.submit(message, "u1", "client")
+    await _drain(scheduler)
+
+    assert analyses.runs == [("u1", "third")]
+    assert scheduler.get_stats()["coalesced"] == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    analyses = _Analyses(delay=0.03)
+    scheduler = _scheduler(analyses, max_concurrency=2)
+
+    for n in range(6):
+        scheduler.submit("msg", f"u{n}", "client")
+    await _drain(scheduler)
+
+    assert len(analyses.runs) == 6
+    assert analyses.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_recently_analyzed_users_are_skipped():
+    analyses = _Analyses()
+    scheduler = _scheduler(analyses, min_interval_seconds=600)
+
+    scheduler.submit("msg", "u1", "client")
+    await _drain(scheduler)
+
+    assert scheduler.submit("again", "u1", "client") is False
+    assert scheduler.get_stats()["dropped_fresh"] == 1
+    assert len(analyses.runs) == 1
+
+
+@pytest.mark.asyncio
+async def test_user_budget_drops_and_global_budget_defers():
+    analyses = _Analyses()
+    scheduler = _scheduler(analyses, user_budget_per_hour=1, global_budget_per_hour=2)
+
+    scheduler.submit("msg", "u1", "client")
+    await _drain(scheduler)
+    assert scheduler.submit("msg", "u1", "client") is False
+
+    scheduler.submit("msg", "u2", "client")
+    await _drain(scheduler)
+    scheduler.submit("msg", "u3", "client")
+    await asyncio.sleep(0.02)
+    # Each submit wakes the dispatcher for another pass over the same deferred analysis
+    scheduler.submit("again", "u3", "client")
+    await asyncio.sleep(0.02)
+
+    stats = scheduler.get_stats()
+    assert stats["dropped_user_budget"] == 1
+    assert stats["deferred_global_budget"] == 1
+    assert stats["queue_depth"] == 1
+    assert [user for user, _ in analyses.runs] == ["u1", "u2"]
+
+
+def test_completions_outside_the_retention_window_are_forgotten():
+    scheduler = _scheduler(_Analyses(), min_interval_seconds=7200)
+
+    scheduler._record_completion("old", 0.0)
+    scheduler._record_completion("recent", 5000.0)
+    scheduler._record_completion("old", 6000.0)
+    scheduler._record_completion("new", 12500.0)
+
+    assert list(scheduler._last_completed) == ["old", "new"]
+
+
+@pytest.mark.asyncio
+async def test_never_analyzed_users_run_first():
+    analyses = _Analyses()
+    scheduler = _scheduler(analyses, max_concurrency=1, debounce_seconds=0.02)
+
+    scheduler.submit("msg", "seen", "client")
+    await _drain(scheduler)
+    scheduler.submit("msg", "seen", "client")
+    scheduler.submit("msg", "new", "client")
+    await _drain(scheduler)
+
+    assert [user for user, _ in analyses.runs] == ["seen", "new", "seen"]
+
+
+@pytest.mark.asyncio
+async def test_failures_are_counted_and_do_not_stop_the_dispatcher():
+    analyses = _Analyses(fail_for={"u1"})
+    scheduler = _scheduler(analyses)
+
+    scheduler.submit("msg", "u1", "client")
+    scheduler.submit("msg", "u2", "client")
+    await _drain(scheduler)
+
+    stats = scheduler.get_stats()
+    assert (stats["failed"], stats["completed"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_analysis_runs_with_the_submitting_context():
+    user_var = contextvars.ContextVar("user_var", default=None)
+    seen = []
+
+    async def analysis(user_message, user_id, client_name):
+        seen.append(user_var.get())
+
+    scheduler = _scheduler(analysis)
+    token = user_var.set("u1-context")
+    scheduler.submit("msg", "u1", "client")
+    user_var.reset(token)
+    await _drain(scheduler)
+
+    assert seen == ["u1-context"]
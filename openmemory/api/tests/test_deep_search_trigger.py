@@ -0,0 +1,26 @@
+"""Tests for automatic deep search triggering"""
+
+import pytest
+
+from app.settings import config
+from app.tools.memory_modules.chunk_search import should_trigger_deep_search
+
+LOW_SCORE = [{"score": 0.3, "metadata": {}}]
+
+
+@pytest.mark.asyncio
+async def test_auto_trigger_is_off_by_default(monkeypatch):
+    monkeypatch.setattr(config, "DEEP_SEARCH_AUTO_TRIGGER", False)
+
+    assert await should_trigger_deep_search("the exact details", LOW_SCORE) is False
+
+
+@pytest.mark.asyncio
+async def test_enabled_auto_trigger_uses_the_configured_threshold(monkeypatch):
+    monkeypatch.setattr(config, "DEEP_SEARCH_AUTO_TRIGGER", True)
+    monkeypatch.setattr(config, "DEEP_SEARCH_MIN_SCORE", 0.25)
+    results = LOW_SCORE * 3
+
+    assert await should_trigger_deep_search("what do I like", results) is False
+    monkeypatch.setattr(config, "DEEP_SEARCH_MIN_SCORE", 0.5)
+    assert await should_trigger_deep_search("what do I like", results) is True
@@ -0,0 +1,79 @@
+"""Tests for the query embedding cache and the caching embedder wrapper"""
+
+from jean_memory.embedding_cache import CachingEmbedder, EmbeddingCache
+
+
+class _CountingEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, text, memory_action=None):
+        self.calls.append((text, memory_action))
+        return [float(len(text)), 1.0]
+
+
+def test_keys_depend_on_model_and_action_but_not_whitespace():
+    key = EmbeddingCache.make_key("model-a", "hello  world", "search")
+
+    assert key == EmbeddingCache.make_key("model-a", " hello world\n", "search")
+    assert key != EmbeddingCache.make_key("model-b", "hello world", "search")
+    assert key != EmbeddingCache.make_key("model-a", "hello world", "add")
+    assert key != EmbeddingCache.make_key("model-a", "Hello world", "search")
+
+
+def test_lru_eviction_keeps_recently_used_vectors():
+    cache = EmbeddingCache(max_size=2, ttl_seconds=0)
+    cache.put("a", [1.0])
+    cache.put("b", [2.0])
+    assert cache.get("a") == [1.0]
+    cache.put("c", [3.0])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0] and cache.get("c") == [3.0]
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("jean_memory.embedding_cache.time.monotonic", lambda: now[0])
+    cache = EmbeddingCache(max_size=8, ttl_seconds=10)
+    cache.put("a", [1.0])
+
+    now[0] += 9
+    assert cache.get("a") == [1.0]
+    now[0] += 2
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_only_search_embeddings_are_cached():
+    embedder = _CountingEmbedder()
+    caching = CachingEmbedder(embedder, EmbeddingCache(max_size=8), "model-a")
+
+    caching.embed("what do I like", "search")
+    caching.embed("what do I like", "search")
+    caching.embed("I like tea", "add")
+    caching.embed("I like tea", "add")
+    caching.embed("I like tea", "update")
+    caching.embed_batch(["note one", "note one"], "add")
+
+    assert embedder.calls.count(("what do I like", "search")) == 1
+    assert embedder.calls.count(("I like tea", "add")) == 2
+    assert caching._cache.stats()["size"] == 1
+
+
+def test_embed_batch_sends_only_distinct_misses():
+    embedder = _CountingEmbedder()
+    caching = CachingEmbedder(embedder, EmbeddingCache(max_size=8), "model-a")
+    caching.embed("cached", "search")
+
+    vectors = caching.embed_batch(["cached", "new", "new"], "search")
+
+    assert vectors == [[6.0, 1.0], [3.0, 1.0], [3.0, 1.0]]
+    assert embedder.calls == [("cached", "search"), ("new", "search")]
+
+
+def test_attribute_access_falls_through():
+    embedder = _CountingEmbedder()
+    embedder.config = "embedder-config"
+
+    assert CachingEmbedder(embedder, EmbeddingCache(), "m").config == "embedder-config"
@@ -0,0 +1,101 @@
+"""Tests for the bounded engine thread pool"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from jean_memory.engine_executor import EngineExecutor
+
+
+class _Probe:
+    """Blocking callable that records peak concurrency"""
+
+    def __init__(self, seconds=0.05):
+        self.seconds = seconds
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.seconds)
+        with self._lock:
+            self.active -= 1
+
+
+@pytest.mark.asyncio
+async def test_operation_limit_bounds_concurrency():
+    executor = EngineExecutor(max_workers=8, operation_limits={"add": 2})
+    probe = _Probe()
+    try:
+        await asyncio.gather(*(executor.run("add", probe) for _ in range(6)))
+    finally:
+        executor.shutdown()
+
+    assert probe.peak == 2
+    assert executor.stats()["operations"]["add"]["completed"] == 6
+
+
+@pytest.mark.asyncio
+async def test_unlisted_operations_share_the_background_bucket():
+    executor = EngineExecutor(max_workers=6, operation_limits={"add": 4}, reserved_workers=2)
+    probe = _Probe()
+    try:
+        await asyncio.gather(
+            *(executor.run("add", probe) for _ in range(6)),
+            *(executor.run("init", probe) for _ in range(6)),
+            *(executor.run("collection", probe) for _ in range(6)),
+        )
+    finally:
+        executor.shutdown()
+
+    assert probe.peak == 4
+
+
+@pytest.mark.asyncio
+async def test_searches_keep_reserved_workers_while_background_is_saturated():
+    executor = EngineExecutor(max_workers=4, reserved_workers=2)
+    release = threading.Event()
+    try:
+        background = [asyncio.create_task(executor.run("add", release.wait)) for _ in range(8)]
+        await asyncio.sleep(0.05)
+
+        started = time.perf_counter()
+        results = await asyncio.wait_for(
+            asyncio.gather(executor.run("search", lambda: "hit"), executor.run("search", lambda: "hit")),
+            timeout=1
+        )
+        assert results == ["hit", "hit"]
+        assert time.perf_counter() - started < 0.5
+        assert executor.stats()["operations"]["add"]["in_flight"] == 2
+    finally:
+        release.set()
+        await asyncio.gather(*background)
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_context_variables_reach_the_worker_thread():
+    import contextvars
+    user = contextvars.ContextVar("user")
+    user.set("u-1")
+    executor = EngineExecutor(max_workers=2)
+    try:
+        assert await executor.run("search", user.get) == "u-1"
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_inline_mode_runs_on_the_calling_thread():
+    executor = EngineExecutor(inline=True)
+    assert await executor.run("search", threading.get_ident) == threading.get_ident()
+
+
+def test_reserved_workers_must_leave_a_background_slot():
+    with pytest.raises(ValueError):
+        EngineExecutor(max_workers=4, reserved_workers=4)
@@ -0,0 +1,84 @@
+"""Tests for result fusion and for combining vector hits with graph relations"""
+
+from jean_memory.api_optimized import JeanMemoryAPIOptimized
+from jean_memory.fusion import content_hash, reciprocal_rank_fusion
+from jean_memory.models import MemoryItem, MemoryType, SearchStrategy
+
+
+def _vector(text, score):
+    return MemoryItem(id=f"v-{text}", text=text, score=score, source=MemoryType.VECTOR)
+
+
+def _graph(text):
+    return MemoryItem(id=f"g-{text}", text=text, score=0.0, source=MemoryType.GRAPH)
+
+
+def test_content_hash_ignores_case_whitespace_and_unicode_forms():
+    assert content_hash("Likes  Tea\n") == content_hash("likes tea")
+    assert content_hash("ﬁne") == content_hash("fine")
+    assert content_hash("likes tea") != content_hash("likes coffee")
+
+
+def test_rrf_rewards_results_found_by_several_retrievers():
+    fused = reciprocal_rank_fusion(
+        {"vector": ["a", "b", "c"], "text": ["c", "d"]},
+        text_of=lambda item: item,
+        k=60
+    )
+
+    assert [entry.item for entry in fused][:2] == ["c", "a"]
+    assert fused[0].sources == ["vector", "text"]
+    assert fused[0].score == 1 / 63 + 1 / 61
+
+
+def test_rrf_merges_duplicates_keeping_the_best_ranked_item_and_limit():
+    fused = reciprocal_rank_fusion(
+        {"first": [{"text": "x", "id": 1}], "second": [{"text": "y"}, {"text": "X ", "id": 2}]},
+        text_of=lambda item: item["text"],
+        weights={"second": 2.0},
+        limit=1
+    )
+
+    assert len(fused) == 1
+    assert fused[0].item == {"text": "x", "id": 1}
+    assert fused[0].sources == ["first", "second"]
+
+
+def test_graph_relations_fill_slots_after_the_vector_hits():
+    vector = [_vector("likes tea", 0.62), _vector("works at a bakery", 0.41)]
+    graph = [_graph("likes tea"), _graph("alice sister of bob"), _graph("bob lives in paris")]
+
+    combined = JeanMemoryAPIOptimized._combine_search_results(SearchStrategy.HYBRID, vector, graph, limit=3)
+
+    assert [memory.text for memory in combined] == ["likes tea", "works at a bakery", "alice sister of bob"]
+    assert combined[0].source == MemoryType.VECTOR
+    assert 0 < combined[2].score < 0.41
+
+
+def test_graph_scores_decrease_with_rank_and_stay_below_vector_hits():
+    vector = [_vector("likes tea", 0.3)]
+    graph = [_graph("a knows b"), _graph("b knows c")]
+
+    combined = JeanMemoryAPIOptimized._combine_search_results(SearchStrategy.VECTOR_GRAPH_FUSION, vector, graph, limit=10)
+
+    scores = [memory.score for memory in combined]
+    assert scores == sorted(scores, reverse=True)
+    assert scores[1] < 0.3
+
+
+def test_a_full_vector_page_is_not_displaced_by_graph_relations():
+    vector = [_vector(f"memory {n}", 0.5) for n in range(3)]
+
+    combined = JeanMemoryAPIOptimized._combine_search_results(
+        SearchStrategy.HYBRID, vector, [_graph("a knows b")], limit=3
+    )
+
+    assert combined == vector
+
+
+def test_graph_only_results_are_scored_by_rank():
+    graph = [_graph("a knows b"), _graph("b knows c")]
+
+    combined = JeanMemoryAPIOptimized._combine_search_results(SearchStrategy.GRAPH_ONLY, [], graph, limit=5)
+
+    assert [memory.score for memory in combined] == [1.0, 0.5]
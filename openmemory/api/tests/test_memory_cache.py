@@ -0,0 +1,92 @@
+"""Tests for the bounded mem0 Memory instance cache"""
+
+import threading
+
+from jean_memory.memory_cache import MemoryInstanceCache
+
+
+def test_lru_eviction_releases_least_recently_used():
+    released = []
+    cache = MemoryInstanceCache(max_size=2, idle_ttl_seconds=0, on_evict=lambda k, v: released.append(k))
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert released == ["b"]
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_idle_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("jean_memory.memory_cache.time.monotonic", lambda: now[0])
+    released = []
+    cache = MemoryInstanceCache(max_size=10, idle_ttl_seconds=60, on_evict=lambda k, v: released.append(k))
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    now[0] += 30
+    assert cache.get("b") == 2
+    now[0] += 45  # "a" idle for 75s, "b" for 45s
+
+    assert cache.evict_idle() == 1
+    assert released == ["a"]
+    assert cache.get("b") == 2
+
+    now[0] += 61
+    assert cache.get("b") is None
+    assert cache.stats()["expirations"] == 2
+
+
+def test_replacing_a_value_releases_the_old_one():
+    released = []
+    cache = MemoryInstanceCache(on_evict=lambda k, v: released.append(v))
+
+    cache.put("a", "old")
+    cache.put("a", "old")
+    cache.put("a", "new")
+
+    assert released == ["old"]
+    assert cache.get("a") == "new"
+
+
+def test_on_evict_errors_do_not_propagate():
+    def fail(key, value):
+        raise RuntimeError("close failed")
+
+    cache = MemoryInstanceCache(max_size=1, on_evict=fail)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    assert cache.pop("b") == 2
+    assert len(cache) == 0
+
+
+def test_hit_rate_counters():
+    cache = MemoryInstanceCache()
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("missing")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_concurrent_access_from_threads_keeps_size_bound():
+    cache = MemoryInstanceCache(max_size=8, idle_ttl_seconds=0)
+
+    def worker(offset):
+        for i in range(500):
+            cache.put(f"k{(offset + i) % 32}", i)
+            cache.get(f"k{i % 32}")
+
+    threads = [threading.Thread(target=worker, args=(n * 7,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache) <= 8
@@ -0,0 +1,66 @@
+"""Cursor pagination of list_memories against the local (in-process) Qdrant profile"""
+
+import uuid
+
+import pytest
+
+from jean_memory.api_optimized import JeanMemoryAPIOptimized
+from jean_memory.config import JeanMemoryConfig
+
+
+USER_ID = "pagination-user"
+
+
+@pytest.fixture
+def api():
+    return JeanMemoryAPIOptimized(config=JeanMemoryConfig.from_dict({"ENGINE_PROFILE": "local"}))
+
+
+async def _store(api, created_at_by_text):
+    from qdrant_client.http import models
+
+    collection_name = await api._ensure_collection_ready_optimized(USER_ID)
+    api._get_qdrant_client().upsert(collection_name=collection_name, points=[
+        models.PointStruct(
+            id=str(uuid.uuid4()),
+            vector=[1.0] + [0.0] * 1535,
+            payload={"user_id": USER_ID, "data": text, "created_at": created_at},
+        )
+        for text, created_at in created_at_by_text.items()
+    ])
+
+
+async def _list_all(api, limit):
+    texts, cursor, pages = [], None, 0
+    while True:
+        page = await api.list_memories(USER_ID, limit=limit, cursor=cursor)
+        assert page.success, page.message
+        texts.extend(memory.text for memory in page.memories)
+        pages += 1
+        cursor = page.next_cursor
+        if not cursor:
+            return texts, pages
+        assert pages < 50, "pagination did not terminate"
+
+
+@pytest.mark.asyncio
+async def test_pages_through_points_sharing_one_timestamp(api):
+    # One bulk batch worth of points with the same created_at, more than a page
+    same_instant = {f"batch-{i}": "2024-01-01T00:00:00+00:00" for i in range(7)}
+    newer = {f"newer-{i}": f"2024-01-02T00:00:0{i}+00:00" for i in range(3)}
+    await _store(api, {**same_instant, **newer})
+
+    texts, pages = await _list_all(api, limit=3)
+
+    assert sorted(texts) == sorted([*same_instant, *newer])
+    assert texts[:3] == ["newer-2", "newer-1", "newer-0"]
+    assert pages == 4
+
+
+@pytest.mark.asyncio
+async def test_distinct_timestamps_page_newest_first(api):
+    await _store(api, {f"m{i}": f"2024-01-01T00:00:{i:02d}+00:00" for i in range(5)})
+
+    texts, _ = await _list_all(api, limit=2)
+
+    assert texts == ["m4", "m3", "m2", "m1", "m0"]
@@ -0,0 +1,65 @@
+"""Tests for the in-process narrative cache tier"""
+
+from datetime import datetime
+
+from app.utils.mcp_modules.narrative_cache import NarrativeCache, NarrativeEntry
+
+
+def _entry(content="narrative", version=1, checked_at=0.0):
+    return NarrativeEntry(content=content, version=version, generated_at=datetime(2024, 1, 1),
+                          new_memories=0, checked_at=checked_at)
+
+
+def _clock(monkeypatch, start=1000.0):
+    now = [start]
+    monkeypatch.setattr("app.utils.mcp_modules.narrative_cache.time.monotonic", lambda: now[0])
+    return now
+
+
+def test_fresh_entries_are_hits_and_due_entries_need_revalidation(monkeypatch):
+    now = _clock(monkeypatch)
+    cache = NarrativeCache(revalidate_seconds=300)
+    cache.put("u1", _entry(checked_at=now[0]))
+
+    now[0] += 299
+    assert cache.get("u1").content == "narrative"
+    now[0] += 2
+    assert cache.get("u1") is None
+    # Stale entries stay available for version-based revalidation
+    assert cache.peek("u1").version == 1
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["revalidations"]) == (1, 1)
+
+
+def test_users_without_a_narrative_are_cached_too(monkeypatch):
+    now = _clock(monkeypatch)
+    cache = NarrativeCache()
+    cache.put("u1", _entry(content=None, version=None, checked_at=now[0]))
+
+    entry = cache.get("u1")
+    assert entry is not None and entry.content is None
+
+
+def test_lru_eviction_keeps_recently_read_users(monkeypatch):
+    now = _clock(monkeypatch)
+    cache = NarrativeCache(max_entries=2)
+    cache.put("a", _entry(checked_at=now[0]))
+    cache.put("b", _entry(checked_at=now[0]))
+    cache.get("a")
+    cache.put("c", _entry(checked_at=now[0]))
+
+    assert cache.peek("b") is None
+    assert cache.peek("a") is not None and cache.peek("c") is not None
+
+
+def test_invalidate_counts_only_present_entries(monkeypatch):
+    now = _clock(monkeypatch)
+    cache = NarrativeCache()
+    cache.put("u1", _entry(checked_at=now[0]))
+
+    cache.invalidate("u1")
+    cache.invalidate("u1")
+
+    assert cache.get("u1") is None
+    assert cache.get_stats()["invalidations"] == 1
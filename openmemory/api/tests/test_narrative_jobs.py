@@ -0,0 +1,92 @@
+"""Tests for the deduplicated narrative job queue"""
+
+import asyncio
+
+import pytest
+
+from app.services.narrative_jobs import NarrativeJobQueue
+
+
+class _Narratives:
+    def __init__(self, delay=0.0, failures=0):
+        self.delay = delay
+        self.failures = failures
+        self.calls = []
+        self.saved = {}
+
+    async def generate(self, user_id, payload):
+        self.calls.append((user_id, payload))
+        await asyncio.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("gemini unavailable")
+        return f"narrative from {payload}"
+
+    async def save(self, user_id, narrative):
+        self.saved[user_id] = narrative
+
+
+def _queue(narratives, **overrides):
+    settings = dict(workers=2, max_retries=2, retry_base_seconds=0.0)
+    settings.update(overrides)
+    return NarrativeJobQueue(narratives.generate, narratives.save, **settings)
+
+
+async def _join(queue):
+    await asyncio.wait_for(queue.join(), timeout=2)
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_queued_jobs_are_deduplicated_and_take_the_latest_payload():
+    narratives = _Narratives()
+    queue = _queue(narratives)
+
+    assert queue.enqueue("u1", "v1")
+    assert queue.enqueue("u1", "v2") is False
+    await _join(queue)
+
+    assert narratives.calls == [("u1", "v2")]
+    assert queue.get_stats()["deduplicated"] == 1
+
+
+@pytest.mark.asyncio
+async def test_enqueue_during_a_running_job_schedules_one_rerun():
+    narratives = _Narratives(delay=0.03)
+    queue = _queue(narratives)
+
+    queue.enqueue("u1", "v1")
+    await asyncio.sleep(0.01)
+    assert queue.enqueue("u1", "v2")
+    assert queue.enqueue("u1", "v3") is False
+    await _join(queue)
+
+    assert narratives.calls == [("u1", "v1"), ("u1", "v3")]
+    assert narratives.saved["u1"] == "narrative from v3"
+    assert queue.get_stats()["reruns"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failures_are_retried_then_given_up():
+    narratives = _Narratives(failures=5)
+    queue = _queue(narratives, max_retries=2)
+
+    queue.enqueue("u1", "v1")
+    await _join(queue)
+
+    stats = queue.get_stats()
+    assert (stats["retries"], stats["failed"], stats["succeeded"]) == (2, 1, 0)
+    assert len(narratives.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_average_job_time_excludes_backoff_sleeps():
+    narratives = _Narratives(failures=1)
+    queue = _queue(narratives, max_retries=1, retry_base_seconds=0.1)
+
+    queue.enqueue("u1", "v1")
+    await _join(queue)
+
+    stats = queue.get_stats()
+    assert stats["succeeded"] == 1
+    assert stats["avg_job_seconds"] < 0.05
@@ -0,0 +1,104 @@
+"""Tests for MCP progress notifications, including held-back speculative progress"""
+
+import asyncio
+
+import pytest
+
+from app.context import progress_reporter_var
+from app.utils.mcp_modules.progress_stream import (
+    ProgressReporter,
+    is_streaming,
+    report_progress,
+    start_with_held_progress,
+)
+
+
+def _reporter():
+    sent = []
+
+    async def sink(notification):
+        sent.append(notification["params"]["message"])
+
+    return ProgressReporter("token-1", sink), sent
+
+
+async def _speculative_branch(started: asyncio.Event, proceed: asyncio.Event):
+    await report_progress("hits")
+    started.set()
+    await proceed.wait()
+    await report_progress("synthesis")
+    return is_streaming()
+
+
+@pytest.mark.asyncio
+async def test_progress_is_numbered_and_sent_to_the_sink():
+    reporter, sent = _reporter()
+    token = progress_reporter_var.set(reporter)
+    try:
+        await report_progress("one")
+        await report_progress("two")
+    finally:
+        progress_reporter_var.reset(token)
+
+    assert sent == ["one", "two"]
+    assert reporter._progress == 2
+
+
+@pytest.mark.asyncio
+async def test_held_progress_is_sent_only_after_release_in_order():
+    reporter, sent = _reporter()
+    token = progress_reporter_var.set(reporter)
+    started, proceed = asyncio.Event(), asyncio.Event()
+    try:
+        task, held = start_with_held_progress(lambda: _speculative_branch(started, proceed))
+        await started.wait()
+        assert sent == []
+
+        await held.release()
+        proceed.set()
+        assert await task is True
+    finally:
+        progress_reporter_var.reset(token)
+
+    assert sent == ["hits", "synthesis"]
+
+
+@pytest.mark.asyncio
+async def test_discarded_branch_never_reaches_the_client():
+    reporter, sent = _reporter()
+    token = progress_reporter_var.set(reporter)
+    started, proceed = asyncio.Event(), asyncio.Event()
+    try:
+        task, held = start_with_held_progress(lambda: _speculative_branch(started, proceed))
+        await started.wait()
+        held.close()
+        proceed.set()
+        await task
+        # The caller's own reporter is untouched by the speculative task
+        await report_progress("final")
+    finally:
+        progress_reporter_var.reset(token)
+
+    assert sent == ["final"]
+
+
+@pytest.mark.asyncio
+async def test_without_a_listening_client_nothing_is_held():
+    started, proceed = asyncio.Event(), asyncio.Event()
+    proceed.set()
+
+    task, held = start_with_held_progress(lambda: _speculative_branch(started, proceed))
+
+    assert held is None
+    assert await task is False
+
+
+@pytest.mark.asyncio
+async def test_failed_sink_closes_the_stream():
+    async def broken_sink(notification):
+        raise ConnectionError("client went away")
+
+    reporter = ProgressReporter("token-1", broken_sink)
+    await reporter.report("lost")
+
+    assert not reporter.active
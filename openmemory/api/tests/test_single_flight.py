@@ -0,0 +1,126 @@
+"""Tests for single-flight coalescing of identical orchestration calls"""
+
+import asyncio
+
+import pytest
+
+from app.utils.mcp_modules.single_flight import SingleFlight, make_interaction_id
+
+
+class _Computation:
+    def __init__(self, result="context", delay=0.05, error=None):
+        self.result = result
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.finished = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        self.finished += 1
+        return f"{self.result}-{self.calls}"
+
+
+def test_interaction_id_is_per_user_and_message():
+    assert make_interaction_id("u1", "hi") == make_interaction_id("u1", "hi")
+    assert make_interaction_id("u1", "hi") != make_interaction_id("u2", "hi")
+    assert make_interaction_id("u1", "hi") != make_interaction_id("u1", "hello")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_execution():
+    flight = SingleFlight(result_ttl_seconds=0)
+    compute = _Computation()
+
+    results = await asyncio.gather(*(flight.run("k", compute) for _ in range(5)))
+
+    assert results == ["context-1"] * 5
+    assert compute.calls == 1
+    stats = flight.get_stats()
+    assert (stats["executions"], stats["coalesced"], stats["in_flight"]) == (1, 4, 0)
+
+
+@pytest.mark.asyncio
+async def test_different_keys_run_separately():
+    flight = SingleFlight(result_ttl_seconds=0)
+    compute = _Computation()
+
+    await asyncio.gather(flight.run("a", compute), flight.run("b", compute))
+
+    assert compute.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_first_caller_does_not_cancel_the_others():
+    flight = SingleFlight(result_ttl_seconds=0)
+    compute = _Computation(delay=0.1)
+
+    first = asyncio.create_task(flight.run("k", compute))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(flight.run("k", compute))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "context-1"
+    assert first.cancelled()
+    assert compute.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_computation_finishes_when_every_caller_is_cancelled():
+    flight = SingleFlight(result_ttl_seconds=5)
+    compute = _Computation(delay=0.05)
+
+    caller = asyncio.create_task(flight.run("k", compute))
+    await asyncio.sleep(0.01)
+    caller.cancel()
+    await asyncio.sleep(0.1)
+
+    assert compute.finished == 1
+    # The detached result is reused by the client's retry
+    assert await flight.run("k", compute) == "context-1"
+    assert compute.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter_and_are_not_reused():
+    flight = SingleFlight(result_ttl_seconds=5)
+    compute = _Computation(error=RuntimeError("planner down"))
+
+    results = await asyncio.gather(flight.run("k", compute), flight.run("k", compute), return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert compute.calls == 1
+    with pytest.raises(RuntimeError):
+        await flight.run("k", compute)
+    assert compute.calls == 2
+    assert flight.get_stats()["errors"] == 2
+
+
+@pytest.mark.asyncio
+async def test_recent_results_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("app.utils.mcp_modules.single_flight.time.monotonic", lambda: now[0])
+    flight = SingleFlight(result_ttl_seconds=5)
+    compute = _Computation(delay=0)
+
+    assert await flight.run("k", compute) == "context-1"
+    now[0] += 4
+    assert await flight.run("k", compute) == "context-1"
+    now[0] += 2
+    assert await flight.run("k", compute) == "context-2"
+    assert flight.get_stats()["recent_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_recent_results_are_bounded():
+    flight = SingleFlight(result_ttl_seconds=60, max_results=3)
+    compute = _Computation(delay=0)
+
+    for key in "abcde":
+        await flight.run(key, compute)
+
+    assert flight.get_stats()["recent_results"] == 3
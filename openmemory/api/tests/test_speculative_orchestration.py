@@ -0,0 +1,108 @@
+"""Tests for speculative retrieval alongside context planning in _standard_orchestration"""
+
+import asyncio
+
+import pytest
+
+import app.tools  # noqa: F401  (app.tools must be imported before app.mcp_orchestration)
+from app import mcp_orchestration
+from app.settings import config
+
+
+class _Calls:
+    def __init__(self):
+        self.ask_memory = 0
+        self.ask_memory_cancelled = 0
+        self.deep = 0
+
+
+@pytest.fixture
+def orchestrator(monkeypatch):
+    calls = _Calls()
+
+    async def ask_memory(question):
+        calls.ask_memory += 1
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            calls.ask_memory_cancelled += 1
+            raise
+        return f"answer to {question}"
+
+    async def no_saving(*args, **kwargs):
+        return None
+
+    async def deep_analysis(plan, user_message, user_id, client_name):
+        calls.deep += 1
+        return "deep context"
+
+    monkeypatch.setattr(mcp_orchestration, "ask_memory", ask_memory)
+    monkeypatch.setattr(config, "SPECULATIVE_CONTEXT_RETRIEVAL", True)
+    instance = mcp_orchestration.SmartContextOrchestrator()
+    monkeypatch.setattr(instance, "_handle_background_memory_saving_from_plan", no_saving)
+    monkeypatch.setattr(instance, "_execute_deep_comprehensive_analysis", deep_analysis)
+    instance.calls = calls
+    return instance
+
+
+def _plan(orchestrator, monkeypatch, strategy, delay=0.05):
+    async def create_plan(user_message, interaction_id):
+        await asyncio.sleep(delay)
+        return {"context_strategy": strategy}
+
+    monkeypatch.setattr(orchestrator, "_ai_create_context_plan", create_plan)
+
+
+@pytest.mark.asyncio
+async def test_retrieval_overlaps_planning_and_is_reused(orchestrator, monkeypatch):
+    _plan(orchestrator, monkeypatch, "targeted_search")
+
+    started = asyncio.get_running_loop().time()
+    result = await orchestrator._standard_orchestration("what do I like?", "u1", "client", False, "i1")
+    elapsed = asyncio.get_running_loop().time() - started
+
+    assert result == "answer to what do I like?"
+    assert orchestrator.calls.ask_memory == 1
+    assert orchestrator._speculation_stats == {"used": 1, "discarded": 0}
+    # Planning (50ms) and retrieval (50ms) ran concurrently, not back to back
+    assert elapsed < 0.09
+
+
+@pytest.mark.asyncio
+async def test_comprehensive_plan_cancels_the_speculative_retrieval(orchestrator, monkeypatch):
+    _plan(orchestrator, monkeypatch, "comprehensive_analysis", delay=0.01)
+
+    result = await orchestrator._standard_orchestration("tell me everything", "u1", "client", False, "i2")
+    await asyncio.sleep(0)
+
+    assert result == "deep context"
+    assert orchestrator.calls.deep == 1
+    assert orchestrator.calls.ask_memory_cancelled == 1
+    assert orchestrator._speculation_stats == {"used": 0, "discarded": 1}
+
+
+@pytest.mark.asyncio
+async def test_planner_failure_discards_the_speculative_retrieval(orchestrator, monkeypatch):
+    async def failing_plan(user_message, interaction_id):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("planner unavailable")
+
+    monkeypatch.setattr(orchestrator, "_ai_create_context_plan", failing_plan)
+
+    result = await orchestrator._standard_orchestration("hello", "u1", "client", False, "i3")
+    await asyncio.sleep(0)
+
+    assert "technical difficulties" in result
+    assert orchestrator.calls.ask_memory_cancelled == 1
+    assert orchestrator._speculation_stats["discarded"] == 1
+
+
+@pytest.mark.asyncio
+async def test_speculation_disabled_runs_retrieval_after_the_plan(orchestrator, monkeypatch):
+    monkeypatch.setattr(config, "SPECULATIVE_CONTEXT_RETRIEVAL", False)
+    _plan(orchestrator, monkeypatch, "targeted_search")
+
+    result = await orchestrator._standard_orchestration("hi", "u1", "client", False, "i4")
+
+    assert result == "answer to hi"
+    assert orchestrator._speculation_stats == {"used": 0, "discarded": 0}
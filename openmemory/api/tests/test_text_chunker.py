@@ -0,0 +1,92 @@
+"""Tests for the token-aware text chunker"""
+
+import random
+
+from app.services.text_chunker import BYTES_PER_TOKEN, TextChunker, _Boundaries
+
+WORDS = "the archive keeps every draft café naïve 東京 データ".split()
+
+
+def _document(seed, sections=20):
+    rng = random.Random(seed)
+    parts = []
+    for section in range(sections):
+        parts.append(f"{'#' * rng.randint(1, 3)} Section {section}\n\n")
+        for _ in range(rng.randint(1, 5)):
+            sentences = [" ".join(rng.choices(WORDS, k=rng.randint(3, 40))) + rng.choice(".!?")
+                         for _ in range(rng.randint(1, 8))]
+            if rng.random() < 0.1:
+                sentences = [" ".join(rng.choices(WORDS, k=300))]
+            parts.append(" ".join(sentences) + "\n\n")
+    return "".join(parts)
+
+
+def test_chunks_never_exceed_max_tokens_and_cover_the_text():
+    chunker = TextChunker(max_tokens=60, overlap_tokens=10)
+    for seed in range(5):
+        text = _document(seed)
+        for headings in (False, True):
+            chunks = list(chunker.iter_chunks(text, headings))
+            assert all(len(chunk.text.encode("utf-8")) <= 60 * BYTES_PER_TOKEN for chunk in chunks)
+            # Every word of the document is in some chunk, in order
+            position = 0
+            for chunk in chunks:
+                found = text.find(chunk.text, max(0, position - 60 * BYTES_PER_TOKEN))
+                assert found >= 0
+                position = found + len(chunk.text)
+            assert text.rstrip().endswith(chunks[-1].text)
+
+
+def test_chunks_end_at_sentence_ends_with_closing_quotes():
+    text = " ".join(f'She said "item {n} is done." Then ’quoted {n}.’' for n in range(40))
+    chunks = TextChunker(max_tokens=20, overlap_tokens=0).chunk_text(text)
+
+    assert len(chunks) > 1
+    assert all(chunk.endswith(('."', ".’")) for chunk in chunks[:-1])
+
+
+def test_apostrophes_and_closing_quotes_alone_do_not_end_a_sentence():
+    data = "The users’ settings and the teams’ plans ” are kept. Done".encode("utf-8")
+    boundaries = _Boundaries(data, headings=False)
+
+    assert boundaries.last_sentence_end(0, len(data)) == data.index(b"kept.") + len(b"kept.")
+    assert boundaries.first_sentence_end(0, data.index(b"kept")) is None
+
+
+def test_paragraph_breaks_are_preferred_over_sentence_ends():
+    paragraph = ("One short sentence here. " * 7).strip()
+    text = "\n\n".join([paragraph] * 4)
+    chunks = TextChunker(max_tokens=100, overlap_tokens=0).chunk_text(text)
+
+    # Two paragraphs pass 75% of the budget, so the chunk ends at the break after them
+    assert chunks[0] == f"{paragraph}\n\n{paragraph}"
+
+
+def test_headings_start_sections_and_label_chunks():
+    body = "Some text about the topic. " * 20
+    text = f"# Intro\n\n{body}\n\n## Details\n\n{body}"
+    chunks = list(TextChunker(max_tokens=120, overlap_tokens=10).iter_chunks(text, headings=True))
+
+    assert chunks[0].section == "Intro"
+    details = [chunk for chunk in chunks if chunk.text.startswith("## Details")]
+    assert len(details) == 1 and details[0].section == "Details"
+    # Overlap never carries text across a heading
+    assert chunks[chunks.index(details[0]) - 1].section == "Intro"
+
+
+def test_overlap_repeats_whole_trailing_sentences():
+    text = " ".join(f"Sentence number {n} is here." for n in range(60))
+    chunks = TextChunker(max_tokens=50, overlap_tokens=15).chunk_text(text)
+
+    for previous, chunk in zip(chunks, chunks[1:]):
+        first_sentence = chunk.split(" is here.")[0] + " is here."
+        assert first_sentence.startswith("Sentence number")
+        assert first_sentence in previous and previous.endswith("is here.")
+
+
+def test_text_without_whitespace_is_cut_at_character_boundaries():
+    text = "東京データ" * 200
+    chunks = TextChunker(max_tokens=25, overlap_tokens=0).chunk_text(text)
+
+    assert "".join(chunks) == text
+    assert all(len(chunk.encode("utf-8")) <= 100 for chunk in chunks)
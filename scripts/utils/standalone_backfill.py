@@ -26,18 +26,22 @@ current_dir = Path(__file__).parent.resolve()  # scripts/utils/
 scripts_dir = current_dir.parent  # scripts/
 project_root = scripts_dir.parent  # your-memory/
 
-# Add project root to Python path
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
+# Add the API root to Python path for Jean Memory V2 and the narrative job queue
+api_root = project_root / "openmemory" / "api"
+for path in (project_root, api_root):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from app.services.narrative_jobs import NarrativeJobQueue
 
 # Configuration
 MEMORY_THRESHOLD = 5
 NARRATIVE_TTL_DAYS = 7
-BATCH_SIZE = 10
-CONCURRENT_USERS = 3
+CONCURRENT_USERS = 3        # Narrative job queue workers
 MAX_RETRIES = 3
-RETRY_DELAYS = [5, 15, 30]  # Progressive backoff: 5s, 15s, 30s
-API_RATE_LIMIT_DELAY = 3    # Delay between API calls
+RETRY_BASE_DELAY = 5        # Exponential backoff: ~5s, 10s, 20s
+API_RATE_LIMIT_DELAY = 3    # Minimum delay between Gemini calls
+PROGRESS_LOG_INTERVAL = 30  # Seconds between throughput reports
 
 # Logging
 logging.basicConfig(
@@ -301,190 +305,85 @@ async def get_user_context_with_jean_memory(user_id: str):
         logger.error(f"❌ [User {user_id}] Failed to get Jean Memory V2 context: {str(e)}")
         return None
 
-async def generate_narrative_for_user(user_id: str, gemini: GeminiService, retry_count: int = 0):
-    """Generate narrative for a user using proven deep_memory strategy with robust retry logic"""
-    attempt_num = retry_count + 1
-    logger.info(f"🤖 [User {user_id}] Generating narrative (attempt {attempt_num}/{MAX_RETRIES + 1})...")
+async def generate_narrative_for_user(user_id: str, gemini: GeminiService):
+    """
+    Generate narrative for a user using proven deep_memory strategy.
+    Returns None when the user can't get a narrative; raises on errors worth
+    retrying (the narrative job queue retries with backoff).
+    """
+    logger.info(f"🤖 [User {user_id}] Generating narrative...")
+    
+    # Get comprehensive context using Jean Memory V2 (same as live API)
+    context_text = await get_user_context_with_jean_memory(user_id)
+    
+    if not context_text or len(context_text) < 200:
+        logger.warning(f"⚠️ [User {user_id}] Insufficient context ({len(context_text) if context_text else 0} chars)")
+        return None
+    
+    logger.info(f"📊 [User {user_id}] Processing context: {len(context_text)} chars")
     
+    start_time = datetime.now()
     try:
-        # Get comprehensive context using Jean Memory V2 (same as live API)
-        context_text = await get_user_context_with_jean_memory(user_id)
-        
-        if not context_text or len(context_text) < 200:
-            logger.warning(f"⚠️ [User {user_id}] Insufficient context ({len(context_text) if context_text else 0} chars)")
-            return None
-        
-        logger.info(f"📊 [User {user_id}] Processing context: {len(context_text)} chars")
-        
-        # Generate narrative using proven method
-        start_time = datetime.now()
         narrative = await gemini.generate_narrative_pro(context_text)
-        duration = (datetime.now() - start_time).total_seconds()
-        
-        if narrative and len(narrative) > 100:  # Ensure meaningful response
-            logger.info(f"✅ [User {user_id}] Generated narrative (attempt {attempt_num}, duration: {duration:.2f}s, length: {len(narrative)} chars)")
-            return narrative.strip()
-        else:
-            logger.warning(f"⚠️ [User {user_id}] Insufficient narrative response ({len(narrative) if narrative else 0} chars)")
-            
-            # If we got a response but it's too short, don't retry - likely user doesn't have good content
-            if narrative and len(narrative) > 20:
-                logger.info(f"📝 [User {user_id}] Short but valid response, not retrying")
-                return narrative.strip()
-            
-            # Empty response - worth retrying
-            if retry_count < MAX_RETRIES:
-                delay = RETRY_DELAYS[min(retry_count, len(RETRY_DELAYS) - 1)]
-                logger.info(f"🔄 [User {user_id}] Retrying in {delay}s due to empty response...")
-                await asyncio.sleep(delay)
-                return await generate_narrative_for_user(user_id, gemini, retry_count + 1)
-                
-            return None
-            
     except Exception as e:
         error_str = str(e).lower()
-        duration = (datetime.now() - start_time).total_seconds() if 'start_time' in locals() else 0
-        
-        # Categorize errors for different retry strategies
-        is_safety_filter = any(word in error_str for word in ['safety', 'finish_reason', 'blocked', 'filtered'])
-        is_rate_limit = any(word in error_str for word in ['rate', 'quota', 'limit', '429'])
-        is_network = any(word in error_str for word in ['connection', 'timeout', 'network', 'dns'])
-        
-        logger.error(f"💥 [User {user_id}] Generation failed (attempt {attempt_num}, duration: {duration:.2f}s): {str(e)}")
-        
-        # Handle different error types
-        if is_safety_filter:
-            logger.warning(f"🛡️ [User {user_id}] Safety filter detected - this is handled by fallback prompts in Gemini class")
+        if any(word in error_str for word in ['safety', 'finish_reason', 'blocked', 'filtered']):
             # Don't retry safety filters - the GeminiService already handles fallbacks
-    return None
-
-        elif is_rate_limit:
-            if retry_count < MAX_RETRIES:
-                # Longer delay for rate limits
-                delay = RETRY_DELAYS[min(retry_count, len(RETRY_DELAYS) - 1)] * 2  # Double delay for rate limits
-                logger.info(f"⏳ [User {user_id}] Rate limit hit, retrying in {delay}s...")
-                await asyncio.sleep(delay)
-                return await generate_narrative_for_user(user_id, gemini, retry_count + 1)
-                
-        elif is_network:
-            if retry_count < MAX_RETRIES:
-                delay = RETRY_DELAYS[min(retry_count, len(RETRY_DELAYS) - 1)]
-                logger.info(f"🌐 [User {user_id}] Network error, retrying in {delay}s...")
-                await asyncio.sleep(delay)
-                return await generate_narrative_for_user(user_id, gemini, retry_count + 1)
-                
-        else:
-            # Generic error - still worth retrying
-            if retry_count < MAX_RETRIES:
-                delay = RETRY_DELAYS[min(retry_count, len(RETRY_DELAYS) - 1)]
-                logger.info(f"🔄 [User {user_id}] Generic error, retrying in {delay}s...")
-                await asyncio.sleep(delay)
-                return await generate_narrative_for_user(user_id, gemini, retry_count + 1)
-        
-        logger.error(f"💥 [User {user_id}] Max retries exceeded or non-retryable error")
-        return None
-
-def save_narrative_to_db(user_id: str, narrative_content: str, retry_count: int = 0):
-    """Save narrative to database with retry logic"""
-    attempt_num = retry_count + 1
-    logger.info(f"💾 [User {user_id}] Saving narrative (attempt {attempt_num})...")
+            logger.warning(f"🛡️ [User {user_id}] Safety filter detected, skipping: {str(e)}")
+            return None
+        raise
+    duration = (datetime.now() - start_time).total_seconds()
     
-    try:
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cur:
-                # Get user internal ID
-                cur.execute("SELECT id FROM users WHERE user_id = %s", (user_id,))
-                user_row = cur.fetchone()
-                if not user_row:
-            logger.error(f"❌ [User {user_id}] User not found in database")
-            return False
-        
-                user_internal_id = user_row[0]
-                
-                # Delete existing narrative (upsert pattern)
-                cur.execute("DELETE FROM user_narratives WHERE user_id = %s", (user_internal_id,))
-                
-                # Insert new narrative
-                cur.execute("""
-                    INSERT INTO user_narratives (id, user_id, narrative_content, generated_at)
-                    VALUES (gen_random_uuid(), %s, %s, %s)
-                """, (user_internal_id, narrative_content, datetime.now(UTC)))
-                
-                conn.commit()
-                logger.info(f"✅ [User {user_id}] Saved narrative successfully (attempt {attempt_num})")
-                return True
-                
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
-            
-    except Exception as e:
-        error_str = str(e).lower()
-        is_connection_error = any(word in error_str for word in ['connection', 'timeout', 'network', 'dns', 'refused'])
-        is_deadlock = any(word in error_str for word in ['deadlock', 'lock', 'timeout'])
-        
-        logger.error(f"❌ [User {user_id}] Database save failed (attempt {attempt_num}): {str(e)}")
-        
-        # Retry database errors with progressive backoff
-        if (is_connection_error or is_deadlock) and retry_count < MAX_RETRIES:
-            delay = RETRY_DELAYS[min(retry_count, len(RETRY_DELAYS) - 1)]
-            logger.info(f"🔄 [User {user_id}] Database error, retrying in {delay}s...")
-            import time
-            time.sleep(delay)  # Use sync sleep for database operations
-            return save_narrative_to_db(user_id, narrative_content, retry_count + 1)
-        
-        return False
-
-async def process_batch(user_ids, gemini):
-    """Process a batch of users with enhanced error handling"""
-    logger.info(f"🔄 Processing batch of {len(user_ids)} users")
+    if not narrative or not narrative.strip():
+        # Empty response - worth retrying
+        raise ValueError(f"Empty narrative response after {duration:.2f}s")
     
-    results = {'successful': 0, 'failed': 0, 'skipped': 0, 'errors': []}
+    if len(narrative) <= 100:
+        # Short but valid response, don't retry - likely user doesn't have good content
+        logger.info(f"📝 [User {user_id}] Short narrative response ({len(narrative)} chars)")
+    else:
+        logger.info(f"✅ [User {user_id}] Generated narrative (duration: {duration:.2f}s, length: {len(narrative)} chars)")
+    return narrative.strip()
+
+def save_narrative_to_db(user_id: str, narrative_content: str):
+    """Upsert a user's narrative, bumping its version so API workers revalidate their caches"""
+    logger.info(f"💾 [User {user_id}] Saving narrative...")
     
-    for i, user_id in enumerate(user_ids):
-        try:
-            # Rate limiting - respect API limits
-            if i > 0:  # Skip delay for first user in batch
-                await asyncio.sleep(API_RATE_LIMIT_DELAY)
-            
-            logger.info(f"📍 [{i+1}/{len(user_ids)}] Processing user {user_id}")
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cur:
+            # Get user internal ID
+            cur.execute("SELECT id FROM users WHERE user_id = %s", (user_id,))
+            user_row = cur.fetchone()
+            if not user_row:
+                logger.error(f"❌ [User {user_id}] User not found in database")
+                return
             
-            # Generate narrative with built-in retry logic
-        narrative = await generate_narrative_for_user(user_id, gemini)
+            cur.execute("""
+                INSERT INTO user_narratives (id, user_id, narrative_content, version, generated_at)
+                VALUES (gen_random_uuid(), %s, %s, 1, %s)
+                ON CONFLICT (user_id) DO UPDATE SET
+                    narrative_content = EXCLUDED.narrative_content,
+                    generated_at = EXCLUDED.generated_at,
+                    version = user_narratives.version + 1
+            """, (user_row[0], narrative_content, datetime.now(UTC)))
             
-            if not narrative:
-                results['skipped'] += 1
-                logger.info(f"⚠️ [User {user_id}] Skipped (no narrative generated)")
-                continue
-            
-            # Save to database with built-in retry logic
-            if save_narrative_to_db(user_id, narrative):
-                results['successful'] += 1
-                logger.info(f"🎉 [User {user_id}] Processing completed successfully")
-            else:
-                results['failed'] += 1
-                error_msg = f"Database save failed for user {user_id}"
-                results['errors'].append(error_msg)
-                logger.error(f"❌ [User {user_id}] {error_msg}")
-                
-        except Exception as e:
-            error_msg = f"Unexpected error for user {user_id}: {str(e)}"
-            logger.error(f"💥 [User {user_id}] {error_msg}")
-            results['failed'] += 1
-            results['errors'].append(error_msg)
-    
-    success_rate = (results['successful'] / len(user_ids) * 100) if user_ids else 0
-    logger.info(f"✅ Batch complete: {results['successful']}/{len(user_ids)} successful ({success_rate:.1f}%)")
-    
-    if results['errors']:
-        logger.warning(f"⚠️ Batch had {len(results['errors'])} errors:")
-        for error in results['errors'][-3:]:  # Log last 3 errors
-            logger.warning(f"   • {error}")
-    
-    return results
+            conn.commit()
+            logger.info(f"✅ [User {user_id}] Saved narrative successfully")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+async def log_progress(queue: NarrativeJobQueue, total_users: int):
+    """Periodically report backfill throughput"""
+    while True:
+        await asyncio.sleep(PROGRESS_LOG_INTERVAL)
+        stats = queue.get_stats()
+        done = stats['succeeded'] + stats['skipped'] + stats['failed']
+        logger.info(f"📈 Progress: {done}/{total_users} users ({stats['jobs_per_minute']} users/min, "
+                    f"avg {stats['avg_job_seconds']}s per job, {stats['retries']} retries, {stats['running']} running)")
 
 async def main():
     """Main function"""
@@ -502,51 +401,53 @@ async def main():
         conn.close()
         
         logger.info("🔍 Testing Gemini API...")
-    gemini = GeminiService()
+        gemini = GeminiService()
         test_response = await gemini.generate_narrative_pro("Test connection")
         logger.info(f"✅ Gemini API connected: {len(test_response)} chars response")
         
         # Get eligible users
         eligible_users = get_eligible_users()
-    if not eligible_users:
+        if not eligible_users:
             logger.info("🎯 No users need narrative generation")
-        return
-
-        total_users = len(eligible_users)
-        logger.info(f"📊 Processing {total_users} users in batches of {BATCH_SIZE}")
+            return
         
-        # Process in batches
-        total_successful = 0
-        total_failed = 0
-        total_skipped = 0
+        total_users = len(eligible_users)
+        logger.info(f"📊 Processing {total_users} users with {CONCURRENT_USERS} workers")
+        
+        # Same job queue as the live API: one job per user, bounded workers, retries with backoff
+        async def save(user_id: str, narrative: str):
+            await asyncio.to_thread(save_narrative_to_db, user_id, narrative)
+        
+        queue = NarrativeJobQueue(
+            generate=lambda user_id, _payload: generate_narrative_for_user(user_id, gemini),
+            save=save,
+            workers=CONCURRENT_USERS,
+            max_retries=MAX_RETRIES,
+            retry_base_seconds=RETRY_BASE_DELAY,
+            start_interval_seconds=API_RATE_LIMIT_DELAY
+        )
+        for user_id in eligible_users:
+            queue.enqueue(user_id)
         
-        for i in range(0, total_users, BATCH_SIZE):
-            batch_users = eligible_users[i:i + BATCH_SIZE]
-            batch_num = (i // BATCH_SIZE) + 1
-            total_batches = (total_users + BATCH_SIZE - 1) // BATCH_SIZE
-            
-            logger.info(f"📦 BATCH {batch_num}/{total_batches}: {len(batch_users)} users")
-            
-            batch_results = await process_batch(batch_users, gemini)
-            
-            total_successful += batch_results['successful']
-            total_failed += batch_results['failed']
-            total_skipped += batch_results['skipped']
-            
-            # Brief pause between batches
-            if i + BATCH_SIZE < total_users:
-                logger.info("⏸️ Pausing 5 seconds...")
-                await asyncio.sleep(5)
+        progress_task = asyncio.create_task(log_progress(queue, total_users))
+        try:
+            await queue.join()
+        finally:
+            progress_task.cancel()
+            await queue.close()
         
         # Final results
+        stats = queue.get_stats()
         duration = datetime.now() - start_time
-        success_rate = (total_successful / total_users * 100) if total_users > 0 else 0
+        success_rate = (stats['succeeded'] / total_users * 100) if total_users > 0 else 0
         
         logger.info("🎉 JEAN MEMORY V2 ENHANCED NARRATIVE BACKFILL COMPLETED")
-        logger.info(f"📊 RESULTS: {total_successful}/{total_users} successful ({success_rate:.1f}%)")
-        logger.info(f"   • ✅ Successful: {total_successful}")
-        logger.info(f"   • ❌ Failed: {total_failed}")
-        logger.info(f"   • ⚠️ Skipped: {total_skipped}")
+        logger.info(f"📊 RESULTS: {stats['succeeded']}/{total_users} successful ({success_rate:.1f}%)")
+        logger.info(f"   • ✅ Successful: {stats['succeeded']}")
+        logger.info(f"   • ❌ Failed: {stats['failed']}")
+        logger.info(f"   • ⚠️ Skipped: {stats['skipped']}")
+        logger.info(f"   • 🔄 Retries: {stats['retries']}")
+        logger.info(f"   • 🚀 Throughput: {stats['jobs_per_minute']} users/min (avg {stats['avg_job_seconds']}s per job)")
         logger.info(f"   • ⏱️ Duration: {duration}")
         
     except Exception as e:
@@ -562,4 +463,4 @@ if __name__ == "__main__":
         sys.exit(1)
     except Exception as e:
         logger.error(f"💥 Unexpected error: {str(e)}")
-        sys.exit(1) 
\ No newline at end of file
+        sys.exit(1)